@@ -13,10 +13,13 @@
 #     limitations under the License.
 
 from datetime import datetime
-from typing import List
+from typing import List, Union
 
 from pandas import concat
 from sklearn import linear_model
+
+from qf_lib.backtesting.portfolio.backtest_position import BacktestPositionSummary
+from qf_lib.backtesting.portfolio.positions_history_table import PositionsHistoryTable
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.utils.data_cleaner import DataCleaner
@@ -50,19 +53,27 @@ class ExposureGenerator:
         self._factor_exposure_tickers = None
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
-    def set_positions_history(self, positions_history: QFDataFrame, frequency: Frequency = Frequency.MONTHLY):
+    def set_positions_history(self, positions_history: Union[QFDataFrame, PositionsHistoryTable],
+                              frequency: Frequency = Frequency.MONTHLY):
         """
         Sets the positions history with defined frequency sampling
 
         Parameters
         ----------
-        positions_history: QFDataFrame
-            QFDataFrame containing summary of the positions in the portfolio for each day
+        positions_history: QFDataFrame, PositionsHistoryTable
+            PositionsHistoryTable of the portfolio (see Portfolio.positions_history_table) or QFDataFrame containing
+            summary of the positions in the portfolio for each day (see Portfolio.positions_history)
         frequency: Frequency
             Data frequency. Default: Frequency.MONTHLY
         """
+        if isinstance(positions_history, PositionsHistoryTable):
+            exposures_history = positions_history.to_wide_frame("total exposure")
+        else:
+            exposures_history = positions_history.map(
+                lambda x: x.total_exposure if isinstance(x, BacktestPositionSummary) else x).astype(float)
+
         if frequency == Frequency.MONTHLY:
-            self.positions_history = positions_history.resample('M').last()
+            self.positions_history = exposures_history.resample('M').last()
         else:
             raise NotImplementedError("{} sampling is not implemented".format(frequency))
 
@@ -151,7 +162,7 @@ class ExposureGenerator:
         for portfolio_date, positions in self.positions_history.iterrows():
             positions = positions.dropna()
             positions_tickers = positions.index.tolist()
-            exposure = QFSeries([x.total_exposure for x in positions])
+            exposure = QFSeries(positions.values)
             portfolio_net_liquidation = self.portfolio_nav_history.asof(portfolio_date)
             positions_allocation = exposure / portfolio_net_liquidation
             from_date = portfolio_date - RelativeDelta(months=regression_len)
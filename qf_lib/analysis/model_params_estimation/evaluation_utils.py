@@ -16,7 +16,10 @@ from datetime import datetime
 from math import sqrt
 from typing import Sequence
 
+import pandas as pd
+
 from qf_lib.backtesting.fast_alpha_model_tester.backtest_summary import BacktestSummary
+from qf_lib.backtesting.portfolio.trades_table import TradesTable
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.returns.cagr import cagr
@@ -42,7 +45,7 @@ class BacktestSummaryEvaluator:
                                                         "FastAlphaModelTesterConfig match those you want to test"
         backtest_elem = backtest_elements_for_tickers[0]
         returns_tms = backtest_elem.returns_tms.dropna(how="all")
-        trades = backtest_elem.trades
+        trades = TradesTable.from_trades(backtest_elem.trades)
 
         # Create the TradesEvaluationResult object
         ticker_evaluation = TradesEvaluationResult()
@@ -61,11 +64,13 @@ class BacktestSummaryEvaluator:
             # Do not compute further fields - return the default None values
             return ticker_evaluation
 
-        avg_nr_of_trades = avg_nr_of_trades_per1y(QFSeries([t for t in trades if t.start_time >= start_date
-                                                            and t.end_time <= end_date]), start_date, end_date)
+        trades_in_period = (trades.start_times >= pd.Timestamp(start_date).to_datetime64()) & \
+                           (trades.end_times <= pd.Timestamp(end_date).to_datetime64())
+        trades_pnl = QFSeries(trades.pnl[trades_in_period])
+
+        avg_nr_of_trades = avg_nr_of_trades_per1y(trades_pnl, start_date, end_date)
         ticker_evaluation.avg_nr_of_trades_1Y = avg_nr_of_trades
-        ticker_evaluation.sqn_per_avg_nr_trades = sqn(QFSeries([t.pnl for t in trades if t.start_time >= start_date
-                                                                and t.end_time <= end_date])) * sqrt(avg_nr_of_trades)
+        ticker_evaluation.sqn_per_avg_nr_trades = sqn(trades_pnl) * sqrt(avg_nr_of_trades)
 
         returns_tms = returns_tms.loc[start_date:end_date]
         if not returns_tms.empty:
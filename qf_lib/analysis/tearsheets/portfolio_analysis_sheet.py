@@ -22,7 +22,6 @@ from qf_lib.analysis.common.abstract_document import AbstractDocument
 from qf_lib.common.utils.error_handling import ErrorHandling
 from qf_lib.analysis.trade_analysis.trades_generator import TradesGenerator
 from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
-from qf_lib.backtesting.portfolio.backtest_position import BacktestPositionSummary
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.series.qf_series import QFSeries
@@ -96,7 +95,7 @@ class PortfolioAnalysisSheet(AbstractDocument):
         chart.add_decorator(AxesPositionDecorator(*self.full_image_axis_position))
         legend = LegendDecorator(key="legend_decorator")
 
-        positions_history = self.backtest_result.portfolio.positions_history()
+        positions_history = self.backtest_result.portfolio.positions_history_table().to_wide_frame("total exposure")
 
         # Find all not NaN values (not NaN values indicate that the position was open for this contract at that time)
         # and count their number for each row (for each of the dates)
@@ -134,12 +133,11 @@ class PortfolioAnalysisSheet(AbstractDocument):
         chart.add_decorator(legend)
 
         # Add top asset contribution
-        positions_history = self.backtest_result.portfolio.positions_history()
+        positions_history = self.backtest_result.portfolio.positions_history_table().to_wide_frame("total exposure")
         if positions_history.empty:
             raise ValueError("No positions found in positions history")
 
-        positions_history = positions_history.map(
-            lambda x: x.total_exposure if isinstance(x, BacktestPositionSummary) else 0)
+        positions_history = positions_history.fillna(0)
 
         # Group all the tickers by their names and take the maximal total exposure for each of the groups - in case
         # if two contracts for a single asset will be included in the open positions in the portfolio at any point of
@@ -209,9 +207,8 @@ class PortfolioAnalysisSheet(AbstractDocument):
         chart.add_decorator(AxesPositionDecorator(*self.full_image_axis_position))
 
         # Get the assets history
-        assets_history = self.backtest_result.portfolio.positions_history()
-        assets_history = assets_history.map(
-            lambda x: x.total_exposure if isinstance(x, BacktestPositionSummary) else 0)
+        assets_history = self.backtest_result.portfolio.positions_history_table().to_wide_frame("total exposure")
+        assets_history = assets_history.fillna(0)
 
         def gini(group):
             # Function computing the Gini coefficients for each row
@@ -294,17 +291,19 @@ class PortfolioAnalysisSheet(AbstractDocument):
         closed_positions_pnl = closed_positions_pnl.sort_values(by="Time")
 
         # Get all open positions history
-        open_positions_history = self.backtest_result.portfolio.positions_history()
-        open_positions_history = open_positions_history.reset_index().melt(
-            id_vars='index', value_vars=open_positions_history.columns, var_name='Ticker',
-            value_name='Position summary')
+        positions_history_table = self.backtest_result.portfolio.positions_history_table()
+
+        def melt(field: str):
+            history = positions_history_table.to_wide_frame(field).fillna(0)
+            return history.reset_index().melt(id_vars='index', value_vars=history.columns, var_name='Ticker',
+                                              value_name=field)
+
+        open_positions_directions = melt("direction")
         open_positions_pnl = QFDataFrame(data={
-            "Tickers name": open_positions_history["Ticker"].apply(lambda t: t.name),
-            "Time": open_positions_history["index"],
-            "Direction": open_positions_history["Position summary"].apply(
-                lambda p: p.direction if isinstance(p, BacktestPositionSummary) else 0),
-            "Total PnL of open position": open_positions_history["Position summary"].apply(
-                lambda p: p.total_pnl if isinstance(p, BacktestPositionSummary) else 0)
+            "Tickers name": open_positions_directions["Ticker"].apply(lambda t: t.name),
+            "Time": open_positions_directions["index"],
+            "Direction": open_positions_directions["direction"].astype(int),
+            "Total PnL of open position": melt("total pnl")["total pnl"]
         })
 
         all_positions_pnl = pd.concat([closed_positions_pnl, open_positions_pnl], sort=False)
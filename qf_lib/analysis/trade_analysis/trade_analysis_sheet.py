@@ -25,6 +25,7 @@ from qf_lib.analysis.common.abstract_document import AbstractDocument
 from qf_lib.common.utils.error_handling import ErrorHandling
 from qf_lib.backtesting.fast_alpha_model_tester.scenarios_generator import ScenariosGenerator
 from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.backtesting.portfolio.trades_table import TradesTable
 from qf_lib.common.utils.miscellaneous.constants import DAYS_PER_YEAR_AVG
 from qf_lib.common.utils.numberutils.is_finite_number import is_finite_number
 from qf_lib.common.utils.returns.max_drawdown import max_drawdown
@@ -65,16 +66,16 @@ class TradeAnalysisSheet(AbstractDocument):
         tool that creates the pdf with the result
     nr_of_assets_traded: int
         number of assets traded
-    trades: Sequence[Trade]
-        list of trades
+    trades: Sequence[Trade], TradesTable
+        trades, either as a sequence of Trade objects or as a columnar TradesTable
     start_date: datetime
     end_date: datetime
     title: str
         title of the document, will be a part of the filename. Do not use special characters
     """
 
-    def __init__(self, settings: Settings, pdf_exporter: PDFExporter, nr_of_assets_traded: int, trades: Sequence[Trade],
-                 start_date: datetime, end_date: datetime, initial_risk: Optional[float] = None, title: str = "Trades"):
+    def __init__(self, settings: Settings, pdf_exporter: PDFExporter, nr_of_assets_traded: int,
+                 trades: Union[Sequence[Trade], TradesTable], start_date: datetime, end_date: datetime, initial_risk: Optional[float] = None, title: str = "Trades"):
 
         super().__init__(settings, pdf_exporter, title)
 
@@ -82,7 +83,7 @@ class TradeAnalysisSheet(AbstractDocument):
         self.end_date = end_date
         self.initial_risk = initial_risk
 
-        self.trades = sorted(trades, key=lambda t: (t.end_time, t.start_time))
+        self.trades = TradesTable.from_trades(trades).sort_by_time()
         self.nr_of_assets_traded = nr_of_assets_traded
 
     def build_document(self):
@@ -95,11 +96,11 @@ class TradeAnalysisSheet(AbstractDocument):
 
     def _add_returns_distribution(self):
         if self.initial_risk is not None:
-            returns = SimpleReturnsSeries(data=[t.percentage_pnl / self.initial_risk for t in self.trades])
+            returns = SimpleReturnsSeries(data=self.trades.percentage_pnl / self.initial_risk)
             title = "Distribution of R multiples, Initial risk = {:.2%}".format(self.initial_risk)
             returns_histogram = self._get_distribution_plot(returns, title)
         else:
-            returns = SimpleReturnsSeries(data=[t.percentage_pnl for t in self.trades])
+            returns = SimpleReturnsSeries(data=self.trades.percentage_pnl)
             title = "Distribution of returns [%]"
             returns_histogram = self._get_distribution_plot(returns, title)
 
@@ -120,10 +121,12 @@ class TradeAnalysisSheet(AbstractDocument):
             statistics.append((measure_description, *(style_format.format(val) for val in returned_values)))
 
         # Prepare trades data frame, used to generate all statistics
-        trades_df = QFDataFrame.from_records(
-            data=[(t.start_time, t.end_time, t.percentage_pnl, t.direction) for t in self.trades],
-            columns=["start time", "end time", "percentage pnl", "direction"]
-        )
+        trades_df = QFDataFrame({
+            "start time": self.trades.start_times,
+            "end time": self.trades.end_times,
+            "percentage pnl": self.trades.percentage_pnl,
+            "direction": self.trades.direction
+        })
 
         # In case if the initial risk is not set all the return statistic will be computed using the percentage pnl,
         # otherwise the r_multiply = percentage pnl / initial risk is used
@@ -240,7 +243,7 @@ class TradeAnalysisSheet(AbstractDocument):
         # Generate scenarios, each of which consists of a certain number of trades, equal to the average number
         # of trades per year
         scenarios_generator = ScenariosGenerator()
-        trade_returns = [trade.percentage_pnl for trade in self.trades]
+        trade_returns = self.trades.percentage_pnl
 
         # Generate the scenarios
         scenarios_df = scenarios_generator.make_scenarios(
@@ -276,7 +279,7 @@ class TradeAnalysisSheet(AbstractDocument):
         legend.add_entry(ensemble_avg_data_element, "Ensemble average")
 
         # Add Expectation (vol adjusted)
-        trade_returns = QFSeries(data=[trade.percentage_pnl for trade in self.trades])
+        trade_returns = QFSeries(data=self.trades.percentage_pnl)
         std = trade_returns.std()
         expectation_adj_series = np.ones(len(ensemble_avg)) * (trade_returns.mean() - 0.5 * std * std)
         expectation_adj_series = SimpleReturnsSeries(data=expectation_adj_series, index=ensemble_avg.index)
@@ -388,7 +391,7 @@ class TradeAnalysisSheet(AbstractDocument):
         mean_return = total_returns.mean()
         rows.append(("Mean Return", "{:.2%}".format(mean_return)))
 
-        trade_returns = QFSeries(data=[trade.percentage_pnl for trade in self.trades])
+        trade_returns = QFSeries(data=self.trades.percentage_pnl)
         sample_len = int(self._average_number_of_trades_per_year())
         std = trade_returns.std()
         expectation_adj_series = np.ones(sample_len) * (trade_returns.mean() - 0.5 * std * std)
@@ -14,9 +14,13 @@
 from math import isclose
 from typing import List, Sequence, Union, Optional
 
+import numpy as np
+import pandas as pd
+
 from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition
 from qf_lib.backtesting.portfolio.position_factory import BacktestPositionFactory
 from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.backtesting.portfolio.trades_table import TradesTable
 from qf_lib.backtesting.portfolio.transaction import Transaction
 from qf_lib.backtesting.portfolio.utils import split_transaction_if_needed
 from qf_lib.common.tickers.tickers import Ticker
@@ -70,6 +74,36 @@ class TradesGenerator:
         else:
             return trades
 
+    def create_trades_table_from_backtest_positions(self, positions: Sequence[BacktestPosition],
+                                                    portfolio_values: Optional[QFSeries] = None) -> TradesTable:
+        """
+        Generates the columnar TradesTable from BacktestPositions, without creating the intermediate Trade objects.
+
+        Parameters
+        ----------
+        positions: Sequence[BacktestPosition]
+            Positions that will be used to generated the trades
+        portfolio_values: Optional[QFSeries]
+            Series containing portfolio values at different point in time. It is optional and if provided, the
+            percentage pnl value is set for all trades.
+
+        Returns
+        --------
+        TradesTable
+            Table containing one trade per position
+        """
+        start_times = pd.DatetimeIndex([p.start_time for p in positions])
+        pnl = np.array([p.total_pnl for p in positions], dtype=float)
+
+        percentage_pnl = None
+        if portfolio_values is not None and len(positions) > 0:
+            percentage_pnl = pnl / portfolio_values.asof(start_times).values
+
+        return TradesTable(start_times=start_times, end_times=[p.end_time for p in positions],
+                           tickers=[p.ticker() for p in positions], pnl=pnl,
+                           commission=[p.total_commission() for p in positions],
+                           direction=[p.direction() for p in positions], percentage_pnl=percentage_pnl)
+
     def create_trades_from_transactions(self, transactions: Sequence, portfolio_values: Optional[QFSeries] = None) \
             -> Sequence[Trade]:
         """
@@ -14,7 +14,9 @@
 
 from abc import abstractmethod, ABCMeta
 from datetime import datetime
+from typing import Sequence, List, Optional
 
+import numpy as np
 from numpy import nan
 
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
@@ -24,6 +26,9 @@ from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.common.utils.miscellaneous.average_true_range import average_true_range
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
 
 
@@ -76,6 +81,35 @@ class AlphaModel(metaclass=ABCMeta):
                         alpha_model=self)
         return signal
 
+    def get_signals(self, tickers: Sequence[Ticker], current_exposures: Sequence[Exposure], current_time: datetime,
+                    frequency: Frequency) -> List[Signal]:
+        """
+        Batch counterpart of get_signal, which calculates the Signals for multiple tickers at once. By default it calls
+        get_signal for every ticker separately. If overridden, it is used by the AlphaModelStrategy instead of calling
+        get_signal for every ticker. Overriding implementations should download the data only once for all the tickers
+        (e.g. a single multi-ticker QFDataArray window, as in calculate_fractions_at_risk) and return the same Signals
+        as get_signal.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            tickers of assets for which the Signals should be generated
+        current_exposures: Sequence[Exposure]
+            the actual exposures of the tickers (in the same order as tickers), based on which the AlphaModel should
+            return its Signals
+        current_time: datetime
+            current time, which is afterwards recorded inside each of the Signals
+        frequency: Frequency
+            frequency of data obtained by the data provider for signals calculation
+
+        Returns
+        -------
+        List[Signal]
+            Signals being the suggestions for the next trading period, in the same order as tickers
+        """
+        return [self.get_signal(ticker, current_exposure, current_time, frequency)
+                for ticker, current_exposure in zip(tickers, current_exposures)]
+
     @abstractmethod
     def calculate_exposure(self, ticker: Ticker, current_exposure: Exposure, current_time: datetime,
                            frequency: Frequency) -> Exposure:
@@ -99,6 +133,30 @@ class AlphaModel(metaclass=ABCMeta):
         """
         pass
 
+    def calculate_exposures_vectorized(self, prices: QFDataArray) -> Optional[QFDataFrame]:
+        """
+        Optional, vectorized counterpart of calculate_exposure, which computes the exposures for all dates and tickers
+        at once. If implemented (the default implementation returns None), it is used by the FastAlphaModelTester
+        instead of calling calculate_exposure for every date and every ticker. It should be implemented only by models,
+        whose suggested exposure depends solely on the prices (and not e.g. on the current exposure), and it should
+        return the same values as calculate_exposure.
+
+        Parameters
+        ----------
+        prices: QFDataArray
+            OHLCV bars of all tickers, for which the exposures should be calculated. The bars include the history
+            preceding the tested period (see the lookback_period of the FastAlphaModelTester)
+
+        Returns
+        -------
+        Optional[QFDataFrame]
+            dataframe indexed by the dates of bars, with tickers as columns. The value for a certain date should be equal
+            to the value of the Exposure suggested when the bar of this date is the latest available bar, i.e. it
+            can be calculated only using the bars up to this date (inclusive). NaN values correspond to Exposure.OUT.
+            None means that the model does not support the vectorized calculation of exposures
+        """
+        return None
+
     def calculate_fraction_at_risk(self, ticker: Ticker, current_time: datetime, frequency: Frequency) -> float:
         """
         Returns the float value which determines the risk factor for an AlphaModel and a specified Ticker,
@@ -127,6 +185,68 @@ class AlphaModel(metaclass=ABCMeta):
         time_period = 20
         return self._atr_fraction_at_risk(ticker, time_period, current_time, frequency)
 
+    def calculate_fractions_at_risk(self, tickers: Sequence[Ticker], current_time: datetime, frequency: Frequency) \
+            -> QFSeries:
+        """
+        Batch counterpart of calculate_fraction_at_risk, which downloads the prices of all the tickers at once and
+        returns the same values as calculate_fraction_at_risk called for each of them. Models, which override
+        calculate_fraction_at_risk, should override this function as well.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            tickers for which the calculation should be made
+        current_time: datetime
+            The time of the fraction at risk calculation
+        frequency: Frequency
+            frequency of data obtained by the data provider for calculation
+
+        Returns
+        -------
+        QFSeries
+            fraction_at_risk values indexed by tickers
+        """
+        time_period = 20
+        return self._atr_fractions_at_risk(tickers, time_period, current_time, frequency)
+
+    def _atr_fractions_at_risk(self, tickers: Sequence[Ticker], time_period: int, current_time: datetime,
+                               frequency: Frequency) -> QFSeries:
+        """
+        Computes the ATR based fractions at risk of all tickers using one multi-ticker window of prices. Tickers,
+        which do not have a complete bar for each date of the window (e.g. due to different trading calendars), fall
+        back to _atr_fraction_at_risk, so that the result does not depend on the other tickers in the window.
+        """
+        tickers = list(tickers)
+        num_of_bars_needed = time_period + 1
+        fields = [PriceField.High, PriceField.Low, PriceField.Close]
+        fractions_at_risk = QFSeries(nan, index=tickers, dtype=float)
+
+        try:
+            prices = self.data_provider.historical_price(tickers, fields, num_of_bars_needed, current_time, frequency)
+        except ValueError:
+            prices = None
+
+        if isinstance(prices, QFDataArray) and prices.shape[0] == num_of_bars_needed:
+            values = prices.loc[:, tickers, fields].values.astype(np.float64)
+            has_all_bars = (~np.isnan(values).all(axis=2)).all(axis=0)
+
+            high, low = values[1:, :, 0], values[1:, :, 1]
+            prev_close = values[:-1, :, 2]
+            true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+            true_range = true_range / prev_close[-1]
+
+            nr_of_values = (~np.isnan(true_range)).sum(axis=0)
+            atr = np.divide(np.nansum(true_range, axis=0), nr_of_values, out=np.full(len(tickers), nan),
+                            where=nr_of_values > 0)
+            fractions_at_risk[has_all_bars] = atr[has_all_bars] * self.risk_estimation_factor
+        else:
+            has_all_bars = np.full(len(tickers), False)
+
+        for ticker in fractions_at_risk.index[~has_all_bars]:
+            fractions_at_risk[ticker] = self._atr_fraction_at_risk(ticker, time_period, current_time, frequency)
+
+        return fractions_at_risk
+
     def _atr_fraction_at_risk(self, ticker, time_period, current_time, frequency):
         """
         Parameters
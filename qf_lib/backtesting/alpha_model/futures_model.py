@@ -14,7 +14,7 @@
 
 import abc
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, Sequence
 
 from joblib import Memory
 from pandas import to_datetime
@@ -164,5 +164,10 @@ class FuturesModel(AlphaModel, metaclass=abc.ABCMeta):
         except NotEnoughDataException:
             return None
 
+    def _atr_fractions_at_risk(self, tickers: Sequence[Ticker], time_period, current_time, frequency) -> QFSeries:
+        # The ATR is computed using the (adjusted) data returned by get_data, separately for each ticker
+        return QFSeries([self._atr_fraction_at_risk(ticker, time_period, current_time, frequency) for ticker in tickers],
+                        index=list(tickers), dtype=float)
+
     def __hash__(self):
         return hash((self.__class__.__name__, self.num_of_bars_needed, self.risk_estimation_factor))
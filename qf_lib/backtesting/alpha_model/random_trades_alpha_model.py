@@ -12,12 +12,13 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 from datetime import datetime
-from typing import Sequence, Optional
+from typing import Sequence, Optional, List
 
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
 from qf_lib.backtesting.alpha_model.futures_model import FuturesModel
 from qf_lib.backtesting.fast_alpha_model_tester.scenarios_generator import ScenariosGenerator
+from qf_lib.backtesting.signals.signal import Signal
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
@@ -77,6 +78,17 @@ class RandomTradesAlphaModel(AlphaModel):
         except KeyError:
             return current_exposure
 
+    def get_signals(self, tickers: Sequence[Ticker], current_exposures: Sequence[Exposure], current_time: datetime,
+                    frequency: Frequency) -> List[Signal]:
+        fractions_at_risk = self.calculate_fractions_at_risk(tickers, current_time, frequency)
+        last_available_prices = self.data_provider.get_last_available_price(tickers, frequency, current_time)
+
+        return [
+            Signal(ticker, self.calculate_exposure(ticker, current_exposure, current_time, frequency),
+                   fractions_at_risk[ticker], last_available_prices[ticker], current_time, alpha_model=self)
+            for ticker, current_exposure in zip(tickers, current_exposures)
+        ]
+
 
 class RandomTradesFuturesAlphaModel(FuturesModel):
     """
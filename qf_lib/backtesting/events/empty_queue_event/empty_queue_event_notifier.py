@@ -28,7 +28,7 @@ class EmptyQueueEventNotifier(EventNotifier[EmptyQueueEvent, EmptyQueueEventList
         self.event_notifier.notify_all(event)
 
         for listener in self.listeners:
-            listener.on_empty_queue_event(event)
+            self._notify_listener(event, listener, listener.on_empty_queue_event)
 
     @classmethod
     def events_type(cls) -> Type[EmptyQueueEvent]:
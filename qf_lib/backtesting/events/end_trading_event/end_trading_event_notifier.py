@@ -28,7 +28,7 @@ class EndTradingEventNotifier(EventNotifier[EndTradingEvent, EndTradingEventList
         self.event_notifier.notify_all(event)
 
         for listener in self.listeners:
-            listener.on_end_trading_event(event)
+            self._notify_listener(event, listener, listener.on_end_trading_event)
 
     @classmethod
     def events_type(cls) -> Type[EndTradingEvent]:
@@ -13,7 +13,7 @@
 #     limitations under the License.
 
 import abc
-from typing import Generic, TypeVar, Set, Type
+from typing import Generic, TypeVar, Set, Type, Callable
 
 
 class Event(object, metaclass=abc.ABCMeta):
@@ -49,6 +49,11 @@ class EventNotifier(Generic[_EventSubclass, _EventListenerSubclass], metaclass=a
     def __init__(self):
         self.listeners = set()  # type: Set[_EventListenerSubclass]
 
+        self.profiler = None
+        """
+        Optional EventProfiler, which records the time of notifying each of the listeners (set by the EventManager).
+        """
+
     def subscribe(self, listener: EventListener):
         """
         Subscribe to events of the EventNotifier.events_type()
@@ -61,6 +66,15 @@ class EventNotifier(Generic[_EventSubclass, _EventListenerSubclass], metaclass=a
         """
         self.listeners.remove(listener)
 
+    def _notify_listener(self, event: _EventSubclass, listener: EventListener, callback: Callable):
+        """
+        Calls the callback of the listener with the given event. If the profiler is set, the call is measured.
+        """
+        if self.profiler is None:
+            callback(event)
+        else:
+            self.profiler.profile(event, listener, callback, event)
+
     @abc.abstractmethod
     def notify_all(self, event: _EventSubclass) -> None:
         """
@@ -87,7 +101,7 @@ class AllEventListener(EventListener[Event], metaclass=abc.ABCMeta):
 class AllEventNotifier(EventNotifier[Event, AllEventListener]):
     def notify_all(self, event: Event):
         for listener in self.listeners:
-            listener.on_event(event)
+            self._notify_listener(event, listener, listener.on_event)
 
     @classmethod
     def events_type(cls) -> Type[Event]:
@@ -13,11 +13,12 @@
 #     limitations under the License.
 
 import queue
-from typing import Dict, Type, Sequence
+from typing import Dict, Type, Sequence, Optional
 
 from qf_lib.backtesting.events.empty_queue_event.empty_queue_event import EmptyQueueEvent
 from qf_lib.backtesting.events.end_trading_event.end_trading_event import EndTradingEvent
 from qf_lib.backtesting.events.event_base import Event, EventNotifier
+from qf_lib.backtesting.events.event_profiler import EventProfiler
 from qf_lib.backtesting.events.time_event.time_event import TimeEvent
 from qf_lib.common.utils.dateutils.timer import Timer
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
@@ -48,6 +49,8 @@ class EventManager:
         Mapping: event type to a corresponding notifier.
         """
 
+        self._profiler = None  # type: Optional[EventProfiler]
+
     def register_notifiers(self, notifiers_list: Sequence[EventNotifier]):
         """
         Registers every notifier from the list of notifiers and associates them with certain types of events (defined
@@ -58,6 +61,20 @@ class EventManager:
         """
         for notifier in notifiers_list:
             self._events_to_notifiers[notifier.events_type()] = notifier
+            notifier.profiler = self._profiler
+
+    @property
+    def profiler(self) -> Optional[EventProfiler]:
+        return self._profiler
+
+    def set_profiler(self, profiler: Optional[EventProfiler]):
+        """
+        Sets the profiler, which records the time of dispatching each event and the time of handling it by each of the
+        listeners. The profiler is passed to all registered notifiers. If None, the profiling is disabled.
+        """
+        self._profiler = profiler
+        for notifier in self._events_to_notifiers.values():
+            notifier.profiler = profiler
 
     def publish(self, event: Event):
         """
@@ -97,4 +114,7 @@ class EventManager:
             self.continue_trading = False
 
         notifier = self._events_to_notifiers[event_type]
-        notifier.notify_all(event)
+        if self._profiler is None:
+            notifier.notify_all(event)
+        else:
+            self._profiler.profile(event, EventProfiler.ALL_LISTENERS, notifier.notify_all, event)
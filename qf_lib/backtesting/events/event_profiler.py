@@ -0,0 +1,134 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import math
+from collections import defaultdict
+from time import perf_counter
+from typing import Dict, Tuple, List, Callable, Any, Union
+
+import numpy as np
+
+from qf_lib.backtesting.events.event_base import Event
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class _DurationsSummary:
+    """
+    Streaming summary of the durations: number of calls, total and maximum time and the histogram of durations with
+    logarithmic bins (BINS_PER_DECADE bins per decade between 10^MIN_EXPONENT s and 10^MAX_EXPONENT s), which is used to
+    estimate the percentiles. The memory used by the summary does not depend on the number of recorded durations and
+    the relative error of the estimated percentiles (within the histogram range) is below 6%.
+    """
+
+    BINS_PER_DECADE = 20
+    MIN_EXPONENT = -7
+    MAX_EXPONENT = 3
+    NR_OF_BINS = (MAX_EXPONENT - MIN_EXPONENT) * BINS_PER_DECADE
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self._histogram = [0] * self.NR_OF_BINS  # type: List[int]
+
+    def add(self, duration: float):
+        self.calls += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+
+        bin_index = int((math.log10(duration) - self.MIN_EXPONENT) * self.BINS_PER_DECADE) if duration > 0 else 0
+        self._histogram[min(max(bin_index, 0), self.NR_OF_BINS - 1)] += 1
+
+    def percentiles(self, percentiles: List[float]) -> List[float]:
+        """ Estimates the percentiles (in seconds) using the geometric centers of the histogram bins. """
+        cumulative_counts = np.cumsum(self._histogram)
+        bins_indices = np.searchsorted(cumulative_counts, np.asarray(percentiles) / 100 * self.calls, side="left")
+        bins_centers = 10.0 ** ((bins_indices + 0.5) / self.BINS_PER_DECADE + self.MIN_EXPONENT)
+        return np.minimum(bins_centers, self.max_time).tolist()
+
+
+class EventProfiler:
+    """
+    Collects the wall time of handling the events in the event loop, separately for each event type and each listener
+    (e.g. the strategy, execution handler, portfolio or monitor). Apart from the listeners, the total time of
+    dispatching the events of each type is recorded under the ALL_LISTENERS name.
+
+    The profiler is attached to the EventManager (see EventManager.set_profiler), which passes it further to all the
+    registered notifiers.
+
+    The durations are not stored - for each event type and listener only the number of calls, the total and maximum
+    time and the histogram of durations (used to estimate the percentiles) are kept, so the memory used by the profiler
+    does not grow with the length of the backtest.
+    """
+
+    ALL_LISTENERS = "(all listeners)"
+
+    def __init__(self):
+        self._durations = defaultdict(_DurationsSummary)  # type: Dict[Tuple[str, str], _DurationsSummary]
+
+    def profile(self, event: Event, listener: Union[Any, str], function: Callable, *args) -> Any:
+        """
+        Calls the function with the given arguments and records its wall time for the event type and the listener.
+
+        Parameters
+        ----------
+        event: Event
+            event, which is being handled
+        listener
+            object handling the event (its class name is used in the statistics) or the name of the listener
+        function: Callable
+            function, which should be called and measured
+        args
+            arguments passed to the function
+
+        Returns
+        -------
+        Any
+            value returned by the function
+        """
+        start_time = perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.record(event, listener, perf_counter() - start_time)
+
+    def record(self, event: Event, listener: Union[Any, str], duration: float):
+        """ Records the duration (in seconds) of handling the event by the listener. """
+        listener_name = listener if isinstance(listener, str) else listener.__class__.__name__
+        self._durations[(event.__class__.__name__, listener_name)].add(duration)
+
+    def reset(self):
+        """ Removes all the recorded durations. """
+        self._durations.clear()
+
+    def stats(self) -> QFDataFrame:
+        """
+        Returns the statistics of all recorded event types and listeners, sorted by the total time (descending).
+
+        Returns
+        -------
+        QFDataFrame
+            dataframe with the following columns: "Event", "Listener", "Calls", "Total time [s]", "Mean time [ms]",
+            "p50 time [ms]", "p99 time [ms]", "Max time [ms]". The percentiles are estimated with the relative error
+            below 6%
+        """
+        rows = []
+        for (event_name, listener_name), summary in self._durations.items():
+            p50, p99 = (percentile * 1000 for percentile in summary.percentiles([50, 99]))
+            rows.append((event_name, listener_name, summary.calls, summary.total_time,
+                         summary.total_time / summary.calls * 1000, p50, p99, summary.max_time * 1000))
+
+        stats_df = QFDataFrame.from_records(rows, columns=["Event", "Listener", "Calls", "Total time [s]",
+                                                           "Mean time [ms]", "p50 time [ms]", "p99 time [ms]",
+                                                           "Max time [ms]"])
+        return stats_df.sort_values("Total time [s]", ascending=False, ignore_index=True)
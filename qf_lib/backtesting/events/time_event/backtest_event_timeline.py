@@ -0,0 +1,156 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import heapq
+from datetime import datetime, timedelta
+from typing import List, Tuple, Optional, Any
+
+import numpy as np
+
+from qf_lib.backtesting.events.time_event.scheduler import Scheduler, ConcreteTimeEvent
+from qf_lib.backtesting.events.time_event.single_time_event.single_time_event import SingleTimeEvent
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+
+
+class BacktestEventTimeline:
+    """
+    Backtest-only replacement of the Scheduler.get_next_time_events, which precomputes the trigger times of all the
+    subscribed TimeEvents up front. For each type of events, all its trigger times between the current time and the
+    end of the backtest are generated once (see TimeEvent.trigger_times) and stored as a sorted numpy datetime64 array.
+    The arrays are merged lazily with a heap, so that finding the next time events costs O(log k) (k being the number
+    of subscribed event types) and does not involve any RelativeDelta arithmetic.
+
+    SingleTimeEvents (e.g. ScheduleOrderExecutionEvent) may be scheduled at any point of the backtest, thus their next
+    trigger times are always computed on the fly. The timeline is recomputed whenever the subscribed TimeEvents or
+    the configuration of their trigger times (e.g. MarketCloseEvent.set_trigger_time, exclude_weekends,
+    PeriodicEvent.set_frequency) change.
+
+    Parameters
+    -----------
+    scheduler: Scheduler
+        scheduler, to which all the listeners subscribe for the TimeEvents
+    end_time: datetime
+        last moment of the backtest - no trigger times after it are generated
+    """
+
+    _EPOCH = datetime(1970, 1, 1)
+
+    def __init__(self, scheduler: Scheduler, end_time: datetime):
+        self.scheduler = scheduler
+        self.end_time = end_time
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        self._time_events = []  # type: List[ConcreteTimeEvent]
+        self._trigger_configuration = None  # type: Optional[List[Tuple[Any, ...]]]
+        self._single_time_events = []  # type: List[Tuple[int, SingleTimeEvent]]
+        self._trigger_times = []  # type: List[np.ndarray]
+        self._positions = []  # type: List[int]
+        self._heap = []  # type: List[Tuple[int, int]]
+
+    def get_next_time_events(self) -> Tuple[List[ConcreteTimeEvent], Optional[datetime]]:
+        """
+        Finds the TimeEvents which should be triggered soonest (in the same order as Scheduler.get_next_time_events).
+        Calling the function does not change the timeline, as long as the time of the Scheduler's timer does not change.
+
+        Returns
+        -------
+        Tuple[List[TimeEvent], Optional[datetime]]
+            list of TimeEvents scheduled for the returned time or an empty list and None if there are no more
+            TimeEvents until the end of the backtest (SingleTimeEvents scheduled after the end of the backtest are
+            still returned)
+        """
+        now = self.scheduler.timer.now()
+        time_events = self.scheduler.get_time_events()
+        trigger_configuration = [self._get_trigger_configuration(time_event) for time_event in time_events]
+        if trigger_configuration != self._trigger_configuration:
+            self._precompute_timeline(now, time_events)
+            self._trigger_configuration = trigger_configuration
+
+        now_us = self._to_microseconds(now)
+        self._skip_trigger_times_until(now_us)
+
+        next_time_us = self._heap[0][0] if self._heap else None
+        single_time_events = []
+        for index, single_time_event in self._single_time_events:
+            trigger_time = single_time_event.next_trigger_time(now)
+            if trigger_time is not None:
+                trigger_time_us = self._to_microseconds(trigger_time)
+                if next_time_us is None or trigger_time_us <= next_time_us:
+                    next_time_us = trigger_time_us
+                    single_time_events.append((trigger_time_us, index))
+
+        if next_time_us is None:
+            return [], None
+
+        indices = [index for time_us, index in single_time_events if time_us == next_time_us]
+        indices.extend(index for time_us, index in self._heap if time_us == next_time_us)
+
+        next_time_events = [self._time_events[index] for index in sorted(indices)]
+        return self.scheduler.sort_by_priority(next_time_events), self._to_datetime(next_time_us)
+
+    def _precompute_timeline(self, now: datetime, time_events: List[ConcreteTimeEvent]):
+        self._time_events = time_events
+        self._single_time_events = []
+        self._trigger_times = []
+        self._positions = []
+        self._heap = []
+
+        for index, time_event in enumerate(self._time_events):
+            if isinstance(time_event, SingleTimeEvent):
+                self._single_time_events.append((index, time_event))
+                trigger_times = np.array([], dtype="datetime64[us]")
+            else:
+                trigger_times = time_event.trigger_times(now, self.end_time)
+
+            self._trigger_times.append(trigger_times.astype("datetime64[us]").view(np.int64))
+            self._positions.append(0)
+            if len(trigger_times) > 0:
+                self._heap.append((int(self._trigger_times[index][0]), index))
+
+        heapq.heapify(self._heap)
+        self.logger.info("Precomputed {} trigger times of {} types of time events".format(
+            sum(len(times) for times in self._trigger_times), len(self._time_events)))
+
+    @staticmethod
+    def _get_trigger_configuration(time_event: ConcreteTimeEvent) -> Tuple[Any, ...]:
+        """
+        Returns the type of the event together with the class attributes, which define its trigger times. The dict
+        attributes are converted to tuples, so that in place modifications of the dicts are detected as well.
+        """
+        event_type = type(time_event)
+        configuration = [event_type]
+        for attribute in ("_trigger_time", "_run_over_weekends", "frequency", "start_time", "end_time"):
+            value = getattr(event_type, attribute, None)
+            configuration.append(tuple(sorted(value.items())) if isinstance(value, dict) else value)
+
+        return tuple(configuration)
+
+    def _skip_trigger_times_until(self, now_us: int):
+        """ Moves forward all event types, whose next trigger time is not after the current time. """
+        while self._heap and self._heap[0][0] <= now_us:
+            _, index = heapq.heappop(self._heap)
+            trigger_times = self._trigger_times[index]
+
+            position = self._positions[index] + 1
+            if position < len(trigger_times) and trigger_times[position] <= now_us:
+                position = int(np.searchsorted(trigger_times, now_us, side="right"))
+
+            self._positions[index] = position
+            if position < len(trigger_times):
+                heapq.heappush(self._heap, (int(trigger_times[position]), index))
+
+    def _to_microseconds(self, time: datetime) -> int:
+        return (time - self._EPOCH) // timedelta(microseconds=1)
+
+    def _to_datetime(self, time_us: int) -> datetime:
+        return self._EPOCH + timedelta(microseconds=time_us)
@@ -14,7 +14,11 @@
 
 from abc import abstractmethod, ABCMeta
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
 
 from qf_lib.backtesting.events.time_event.regular_date_time_rule import RegularDateTimeRule
 from qf_lib.backtesting.events.time_event.regular_time_event.regular_time_event import RegularTimeEvent
@@ -159,6 +163,41 @@ class PeriodicEvent(TimeEvent, metaclass=ABCMeta):
         next_trigger_times = [event.next_trigger_time(now) for event in self._events_list]
         return min(next_trigger_times)
 
+    def trigger_times(self, start_time: datetime, end_time: datetime) -> np.ndarray:
+        """
+        Returns all trigger times of the event, which fall into the (start_time, end_time] range. The trigger times are
+        generated in a vectorized way for all the days in the range at once (in case if the start_time of the event is
+        after its end_time, e.g. for events triggered over midnight, the trigger times are computed one by one).
+        """
+        start_time_of_day = self._time_of_the_day(self.start_time)
+        end_time_of_day = self._time_of_the_day(self.end_time)
+
+        if start_time_of_day is None or end_time_of_day is None or start_time_of_day > end_time_of_day:
+            return super().trigger_times(start_time, end_time)
+
+        step = pd.Timedelta(to_offset(self.frequency.to_pandas_freq())).to_timedelta64()
+        times_of_the_day = np.arange(start_time_of_day, end_time_of_day + np.timedelta64(1, "us"), step)
+
+        days = np.arange(np.datetime64(start_time, "D"), np.datetime64(end_time, "D") + 1)
+        if not self._run_over_weekends:
+            # 1970-01-01 was a Thursday (weekday equal to 3)
+            days = days[(days.astype(np.int64) + 3) % 7 < 5]
+
+        trigger_times = (days.astype("datetime64[us]")[:, np.newaxis] + times_of_the_day[np.newaxis, :]).ravel()
+        return trigger_times[(trigger_times > np.datetime64(start_time, "us")) &
+                             (trigger_times <= np.datetime64(end_time, "us"))]
+
+    @staticmethod
+    def _time_of_the_day(time_dict: Dict[str, int]) -> Optional[np.timedelta64]:
+        """
+        Converts the time dictionary into the time delta from midnight. Returns None if the hour or minute are not
+        specified or if the seconds are used.
+        """
+        if "hour" not in time_dict or "minute" not in time_dict or time_dict.get("second", 0) != 0 or time_dict.get("microsecond", 0) != 0:
+            return None
+
+        return np.timedelta64(time_dict.get("hour", 0) * 60 + time_dict.get("minute", 0), "m").astype("timedelta64[us]")
+
     @abstractmethod
     def notify(self, listener) -> None:
         pass
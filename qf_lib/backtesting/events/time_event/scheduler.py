@@ -44,6 +44,11 @@ class Scheduler:
         self._time_event_type_to_subscribers = {}  # type: Dict[TypeOfEvent, List[Any]]
         self._time_event_type_to_object = {}
 
+        self.profiler = None
+        """
+        Optional EventProfiler, which records the time of notifying each of the listeners (set by the EventManager).
+        """
+
     @classmethod
     def events_type(cls):
         return TimeEvent
@@ -96,6 +101,20 @@ class Scheduler:
         next_time_events = [event for time, event in times_and_events if time == next_trigger_time]
         # type: List[ConcreteTimeEvent]
 
+        return self.sort_by_priority(next_time_events), next_trigger_time
+
+    def get_time_events(self) -> List[ConcreteTimeEvent]:
+        """
+        Returns the list of objects of all the subscribed TimeEvent types (in the order of subscription).
+        """
+        return list(self._time_event_type_to_object.values())
+
+    @staticmethod
+    def sort_by_priority(time_events: List[ConcreteTimeEvent]) -> List[ConcreteTimeEvent]:
+        """
+        Sorts the simultaneously executed TimeEvents in the order described in get_next_time_events (events of the same
+        priority keep their relative order).
+        """
         time_events_priority = {
             ScheduleOrderExecutionEvent: 0,
             IntradayBarEvent: 1,
@@ -103,8 +122,7 @@ class Scheduler:
             MarketCloseEvent: 1
         }
 
-        next_time_events.sort(key=lambda ev: time_events_priority.get(type(ev), float('inf')))
-        return next_time_events, next_trigger_time
+        return sorted(time_events, key=lambda ev: time_events_priority.get(type(ev), float('inf')))
 
     def notify_all(self, time_event: ConcreteTimeEvent):
         """
@@ -118,4 +136,7 @@ class Scheduler:
             self.logger.warning("No listeners for time event of type: {:s}", str(time_event_type))
 
         for listener in listeners:
-            time_event.notify(listener)
+            if self.profiler is None:
+                time_event.notify(listener)
+            else:
+                self.profiler.profile(time_event, listener, time_event.notify, listener)
@@ -18,16 +18,17 @@ from datetime import datetime
 from typing import Dict, List
 
 from qf_lib.backtesting.events.time_event.single_time_event.single_time_event import SingleTimeEvent
-from qf_lib.backtesting.execution_handler.simulated_executor import SimulatedExecutor
+from qf_lib.backtesting.execution_handler.abstract_simulated_executor import AbstractSimulatedExecutor
 from qf_lib.backtesting.order.order import Order
 
 
 class ScheduleOrderExecutionEvent(SingleTimeEvent):
 
-    _datetimes_to_data = defaultdict(lambda: defaultdict(list))  # type: Dict[datetime, Dict[SimulatedExecutor, List[Order]]]
+    _datetimes_to_data = defaultdict(lambda: defaultdict(list))  # type: Dict[datetime, Dict[AbstractSimulatedExecutor, List[Order]]]
 
     @classmethod
-    def schedule_new_event(cls, date_time: datetime, executor_to_orders_dict: Dict[SimulatedExecutor, List[Order]]):
+    def schedule_new_event(cls, date_time: datetime,
+                           executor_to_orders_dict: Dict[AbstractSimulatedExecutor, List[Order]]):
         """
         Schedules new event by adding the (date_time, data) pair to the _datetimes_to_data dictionary.
 
@@ -47,9 +48,9 @@ class ScheduleOrderExecutionEvent(SingleTimeEvent):
         listener.on_orders_accept(self)
 
     @classmethod
-    def get_executors_to_orders_dict(cls, time: datetime) -> Dict[SimulatedExecutor, List[Order]]:
+    def get_executors_to_orders_dict(cls, time: datetime) -> Dict[AbstractSimulatedExecutor, List[Order]]:
         """
         For an initialized object representing a certain single time event, returns the data associated with this event
-        in the form of a dictionary, with SimulatedExecutor as keys and list of Orders as values.
+        in the form of a dictionary, with AbstractSimulatedExecutor as keys and list of Orders as values.
         """
         return cls._datetimes_to_data[time]
@@ -15,6 +15,8 @@
 from abc import abstractmethod, ABCMeta
 from datetime import datetime
 
+import numpy as np
+
 from qf_lib.backtesting.events.event_base import Event
 
 
@@ -31,6 +33,31 @@ class TimeEvent(Event, metaclass=ABCMeta):
     def notify(self, listener) -> None:
         pass
 
+    def trigger_times(self, start_time: datetime, end_time: datetime) -> np.ndarray:
+        """
+        Returns all trigger times of the event, which fall into the (start_time, end_time] range.
+
+        Parameters
+        ----------
+        start_time: datetime
+            beginning of the time range (exclusive)
+        end_time: datetime
+            end of the time range (inclusive)
+
+        Returns
+        -------
+        np.ndarray
+            sorted array of numpy datetime64 values
+        """
+        trigger_times = []
+        trigger_time = self.next_trigger_time(start_time)
+
+        while trigger_time is not None and trigger_time <= end_time:
+            trigger_times.append(trigger_time)
+            trigger_time = self.next_trigger_time(trigger_time)
+
+        return np.array(trigger_times, dtype="datetime64[us]")
+
     def __eq__(self, other):
         if self is other:
             return True
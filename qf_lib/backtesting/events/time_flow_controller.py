@@ -21,6 +21,7 @@ from qf_lib.backtesting.events.empty_queue_event.empty_queue_event_listener impo
 from qf_lib.backtesting.events.empty_queue_event.empty_queue_event_notifier import EmptyQueueEventNotifier
 from qf_lib.backtesting.events.end_trading_event.end_trading_event import EndTradingEvent
 from qf_lib.backtesting.events.event_manager import EventManager
+from qf_lib.backtesting.events.time_event.backtest_event_timeline import BacktestEventTimeline
 from qf_lib.backtesting.events.time_event.scheduler import Scheduler
 from qf_lib.common.utils.dateutils.timer import SettableTimer, RealTimer
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
@@ -50,17 +51,28 @@ class TimeFlowController(EmptyQueueEventListener, metaclass=ABCMeta):
 
 
 class BacktestTimeFlowController(TimeFlowController):
+    """
+    TimeFlowController used in backtests. If precompute_timeline is set to True, the trigger times of all TimeEvents
+    until the end of the backtest are generated up front (see BacktestEventTimeline) instead of being computed by the
+    Scheduler each time the event queue is empty.
+    """
+
     def __init__(self, scheduler: Scheduler, event_manager: EventManager, settable_timer: SettableTimer,
-                 empty_queue_event_notifier: EmptyQueueEventNotifier, backtest_end_date: datetime):
+                 empty_queue_event_notifier: EmptyQueueEventNotifier, backtest_end_date: datetime,
+                 precompute_timeline: bool = False):
         super().__init__(event_manager, empty_queue_event_notifier)
         self.scheduler = scheduler
         self.settable_timer = settable_timer
         self.backtest_end_datetime = self._end_of_the_day(backtest_end_date)
+        self.timeline = BacktestEventTimeline(scheduler, self.backtest_end_datetime) if precompute_timeline else None
 
     def generate_time_event(self):
-        time_events_list, next_time_of_event = self.scheduler.get_next_time_events()
+        if self.timeline is None:
+            time_events_list, next_time_of_event = self.scheduler.get_next_time_events()
+        else:
+            time_events_list, next_time_of_event = self.timeline.get_next_time_events()
 
-        if next_time_of_event > self.backtest_end_datetime:
+        if next_time_of_event is None or next_time_of_event > self.backtest_end_datetime:
             self.event_manager.publish(EndTradingEvent())
         else:
             # because it's a backtest we don't really need to wait until the time of next TimeEvent; we can simply
@@ -0,0 +1,124 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import abc
+from itertools import count, compress
+from typing import List, Sequence, Optional
+
+import numpy as np
+
+from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
+from qf_lib.backtesting.execution_handler.order_book import OrderBook
+from qf_lib.backtesting.execution_handler.slippage.base import Slippage
+from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+
+
+class AbstractSimulatedExecutor(metaclass=abc.ABCMeta):
+    """
+    Base class of the executors used by the SimulatedExecutionHandler. It keeps the book of the open Orders and
+    converts the executed Orders into Transactions, while the subclasses decide when and at which prices the Orders
+    are executed.
+    """
+
+    def __init__(self, data_provider: AbstractPriceDataProvider, monitor: AbstractMonitor, portfolio: Portfolio,
+                 order_id_generator: count, commission_model: CommissionModel, slippage_model: Slippage,
+                 frequency: Frequency):
+
+        self._data_provider = data_provider
+        self._frequency = frequency
+
+        self._monitor = monitor
+        self._portfolio = portfolio
+        self._order_id_generator = order_id_generator
+        self._commission_model = commission_model
+        self._slippage_model = slippage_model
+
+        # open orders, awaiting execution
+        self._order_book = OrderBook()
+
+    @abc.abstractmethod
+    def assign_order_ids(self, orders: Sequence[Order]) -> List[int]:
+        """
+        Assign the orders ids
+        """
+        pass
+
+    def accept_orders(self, orders: Sequence[Order]):
+        for order in orders:
+            self._order_book.add(order)
+
+    def cancel_all_open_orders(self):
+        """
+        Cancels all open orders
+        """
+        self._order_book.clear()
+
+    def cancel_order(self, order_id: int) -> Optional[Order]:
+        """
+        Cancel Order of given id (if it exists). Returns the cancelled Order or None if couldn't find the Order
+        of given id.
+        """
+        cancelled_order = self._order_book.remove(order_id)
+        return cancelled_order
+
+    def get_open_orders(self) -> List[Order]:
+        """
+        Returns all open orders
+        """
+        return self._order_book.orders()
+
+    @abc.abstractmethod
+    def execute_orders(self, market_open=False, market_close=False):
+        """
+        Converts Orders into Transactions. Preserves the unexecuted Orders in the book of open orders
+        """
+        pass
+
+    def _execute_orders(self, orders: Sequence[Order], fill_prices: Sequence[float], fill_volumes: Sequence[float]) \
+            -> List[Order]:
+        """
+        Simulates execution of the Orders by converting them into Transactions. Orders, which have a fill volume equal
+        to 0 or a fill price which is not a finite number, are not executed. The commissions are computed and the
+        transactions are applied to the portfolio for all executed Orders at once. Returns the list of executed Orders.
+        """
+        fill_prices = np.asarray(fill_prices, dtype=np.float64)
+        fill_volumes = np.asarray(fill_volumes)
+
+        is_executed = (fill_volumes != 0) & np.isfinite(fill_prices)
+        if not is_executed.any():
+            return []
+
+        executed_orders = list(compress(orders, is_executed))
+        fill_prices = fill_prices[is_executed]
+        fill_volumes = fill_volumes[is_executed]
+        commissions = self._commission_model.calculate_commissions(fill_volumes, fill_prices).tolist()
+        fill_prices = fill_prices.tolist()
+        fill_volumes = fill_volumes.tolist()
+
+        timestamp = self._data_provider.timer.now()
+        transactions = [
+            Transaction(timestamp, order.ticker, fill_volume, fill_price, commission)
+            for order, fill_volume, fill_price, commission in zip(executed_orders, fill_volumes, fill_prices,
+                                                                  commissions)
+        ]
+
+        for transaction in transactions:
+            self._monitor.record_transaction(transaction)
+        self._portfolio.transact_transactions(transactions)
+
+        return executed_orders
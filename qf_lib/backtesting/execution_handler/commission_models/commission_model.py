@@ -13,9 +13,32 @@
 #     limitations under the License.
 
 from abc import ABCMeta, abstractmethod
+from typing import Sequence
+
+import numpy as np
 
 
 class CommissionModel(object, metaclass=ABCMeta):
     @abstractmethod
     def calculate_commission(self, fill_quantity: float, fill_price: float) -> float:
         pass
+
+    def calculate_commissions(self, fill_quantities: Sequence[float], fill_prices: Sequence[float]) -> np.ndarray:
+        """
+        Calculates commissions for multiple fills at once. The default implementation calls calculate_commission for
+        each fill, commission models should override it with a vectorized version whenever possible.
+
+        Parameters
+        ----------
+        fill_quantities: Sequence[float]
+            quantities of the fills
+        fill_prices: Sequence[float]
+            prices of the fills. Each fill price corresponds to the fill quantity from `fill_quantities`
+
+        Returns
+        -------
+        np.ndarray
+            array of commissions (order corresponds to the order of the fills provided as arguments of the method)
+        """
+        return np.array([self.calculate_commission(fill_quantity, fill_price)
+                         for fill_quantity, fill_price in zip(fill_quantities, fill_prices)], dtype=np.float64)
@@ -12,6 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from typing import Sequence
+
+import numpy as np
+
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 
 
@@ -31,3 +35,6 @@ class FixedCommissionModel(CommissionModel):
 
     def calculate_commission(self, fill_quantity: float, fill_price: float) -> float:
         return self.commission
+
+    def calculate_commissions(self, fill_quantities: Sequence[float], fill_prices: Sequence[float]) -> np.ndarray:
+        return np.full(len(fill_quantities), self.commission, dtype=np.float64)
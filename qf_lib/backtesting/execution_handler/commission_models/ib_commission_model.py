@@ -12,6 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from typing import Sequence
+
+import numpy as np
+
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 
 
@@ -28,3 +32,8 @@ class IBCommissionModel(CommissionModel):
         commission = max(1.0, min(0.005 * fill_quantity, 0.01 * fill_price * fill_quantity))
 
         return commission
+
+    def calculate_commissions(self, fill_quantities: Sequence[float], fill_prices: Sequence[float]) -> np.ndarray:
+        fill_quantities = np.abs(np.asarray(fill_quantities, dtype=np.float64))
+        commissions = np.minimum(0.005 * fill_quantities, 0.01 * np.asarray(fill_prices, dtype=np.float64) * fill_quantities)
+        return np.clip(commissions, 1.0, None)
@@ -12,8 +12,11 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from itertools import compress
 from typing import List, Sequence
 
+import numpy as np
+
 from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
 from qf_lib.backtesting.execution_handler.simulated_executor import SimulatedExecutor
@@ -24,7 +27,6 @@ from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.date_to_datetime import date_to_datetime
-from qf_lib.common.utils.numberutils.is_finite_number import is_finite_number
 from qf_lib.containers.series.qf_series import QFSeries
 
 
@@ -39,32 +41,26 @@ class MarketOrdersExecutor(SimulatedExecutor):
 
         return order_id_list
 
-    def _get_orders_with_fill_prices_without_slippage(self, market_orders_list, tickers, market_open, market_close):
-        unique_tickers = list(set(tickers))
+    def _get_orders_with_fill_prices_without_slippage(self, market_open, market_close):
+        market_orders_list = self._order_book.orders()
+        tickers = [order.ticker for order in market_orders_list]
+        unique_tickers = self._order_book.tickers()
         current_prices_series = self._get_current_prices(unique_tickers)
 
-        expired_orders = []  # type: List[int]
-        to_be_executed_orders = []
-        no_slippage_prices = []
+        # Prices of the securities, corresponding to the orders (NaN for securities without the current price)
+        security_prices = current_prices_series.reindex(tickers).to_numpy(dtype=np.float64, na_value=np.nan)
+        is_price_available = np.isfinite(security_prices)
+
+        to_be_executed_orders = list(compress(market_orders_list, is_price_available))
+        no_slippage_prices = security_prices[is_price_available].tolist()
 
         # Check at first if at this moment of time, expiry checks should be made or not (optimization reasons)
         if market_open or market_close:
             # In case of market open or market close, some of the orders may expire
-            for order, ticker in zip(market_orders_list, tickers):
-                security_price = current_prices_series.loc[ticker]
-
-                if is_finite_number(security_price):
-                    to_be_executed_orders.append(order)
-                    no_slippage_prices.append(security_price)
-                elif self._order_expires(order, market_open, market_close):
-                    expired_orders.append(order.id)
+            expired_orders = [order.id for order in compress(market_orders_list, ~is_price_available)
+                              if self._order_expires(order, market_open, market_close)]  # type: List[int]
         else:
-            for order, ticker in zip(market_orders_list, tickers):
-                security_price = current_prices_series.loc[ticker]
-
-                if is_finite_number(security_price):
-                    to_be_executed_orders.append(order)
-                    no_slippage_prices.append(security_price)
+            expired_orders = []
 
         return no_slippage_prices, to_be_executed_orders, expired_orders
 
@@ -0,0 +1,148 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from itertools import count
+from typing import Dict, List, Optional, Tuple, Sequence
+
+from qf_lib.backtesting.order.execution_style import StopOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.common.tickers.tickers import Ticker
+
+
+class OrderBook:
+    """
+    Book of the open Orders awaiting execution in a SimulatedExecutor. The Orders are indexed by their ids, tickers and
+    time in force. Stop Orders are additionally kept, for each ticker, in two lists sorted by the stop price (one for
+    the Sell Stops and one for the Buy Stops), so that the Stop Orders triggered by a bar can be found with a binary
+    search, without examining any of the remaining Orders.
+
+    All methods return the Orders in the order in which they were added to the book.
+    """
+
+    def __init__(self):
+        self._orders = {}  # type: Dict[int, Order]
+        self._orders_by_ticker = defaultdict(dict)  # type: Dict[Ticker, Dict[int, Order]]
+        self._orders_by_time_in_force = defaultdict(dict)  # type: Dict[TimeInForce, Dict[int, Order]]
+
+        # (stop price, sequence number) pairs sorted in the ascending order
+        self._sell_stops = defaultdict(list)  # type: Dict[Ticker, List[Tuple[float, int]]]
+        self._buy_stops = defaultdict(list)  # type: Dict[Ticker, List[Tuple[float, int]]]
+        self._stop_keys = {}  # type: Dict[int, Tuple[float, int]]
+
+        self._sequence_numbers = {}  # type: Dict[int, int]
+        self._orders_by_sequence_number = {}  # type: Dict[int, Order]
+        self._sequence_number_generator = count()
+
+    def add(self, order: Order):
+        """ Adds the Order to the book (an Order of the same id, which is already in the book, is replaced). """
+        self.remove(order.id)
+
+        sequence_number = next(self._sequence_number_generator)
+        self._sequence_numbers[order.id] = sequence_number
+        self._orders_by_sequence_number[sequence_number] = order
+
+        self._orders[order.id] = order
+        self._orders_by_ticker[order.ticker][order.id] = order
+        self._orders_by_time_in_force[order.time_in_force][order.id] = order
+
+        if isinstance(order.execution_style, StopOrder):
+            stop_key = (order.execution_style.stop_price, sequence_number)
+            self._stop_keys[order.id] = stop_key
+            insort(self._stop_orders_index(order)[order.ticker], stop_key)
+
+    def remove(self, order_id: int) -> Optional[Order]:
+        """ Removes the Order of the given id from the book. Returns the removed Order or None if it was not found. """
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return None
+
+        sequence_number = self._sequence_numbers.pop(order_id)
+        del self._orders_by_sequence_number[sequence_number]
+
+        self._remove_from_index(self._orders_by_ticker, order.ticker, order_id)
+        self._remove_from_index(self._orders_by_time_in_force, order.time_in_force, order_id)
+
+        stop_key = self._stop_keys.pop(order_id, None)
+        if stop_key is not None:
+            stop_orders_index = self._stop_orders_index(order)
+            stop_orders = stop_orders_index[order.ticker]
+            del stop_orders[bisect_left(stop_orders, stop_key)]
+            if not stop_orders:
+                del stop_orders_index[order.ticker]
+
+        return order
+
+    def clear(self):
+        """ Removes all Orders from the book. """
+        for index in (self._orders, self._orders_by_ticker, self._orders_by_time_in_force, self._sell_stops,
+                      self._buy_stops, self._stop_keys, self._sequence_numbers, self._orders_by_sequence_number):
+            index.clear()
+
+    def __len__(self):
+        return len(self._orders)
+
+    def __contains__(self, order_id: int):
+        return order_id in self._orders
+
+    def orders(self) -> List[Order]:
+        """ Returns all Orders in the book. """
+        return list(self._orders.values())
+
+    def tickers(self) -> List[Ticker]:
+        """ Returns the tickers of all Orders in the book. """
+        return list(self._orders_by_ticker.keys())
+
+    def orders_for_ticker(self, ticker: Ticker) -> List[Order]:
+        """ Returns all Orders for the given ticker. """
+        return list(self._orders_by_ticker.get(ticker, {}).values())
+
+    def orders_with_time_in_force(self, time_in_force: TimeInForce) -> List[Order]:
+        """ Returns all Orders with the given time in force. """
+        return list(self._orders_by_time_in_force.get(time_in_force, {}).values())
+
+    def triggered_stop_orders(self, tickers: Sequence[Ticker], low_prices: Sequence[float],
+                              high_prices: Sequence[float]) -> List[Order]:
+        """
+        Returns the Stop Orders triggered by the bars of the given tickers, i.e. for each ticker: the Sell Stops with
+        the stop price greater or equal to the low price and the Buy Stops with the stop price lower or equal to
+        the high price. If the low (high) price is NaN, none of the Sell Stops (Buy Stops) for the ticker is returned.
+        Only the triggered Stop Orders are examined.
+        """
+        sequence_numbers = []
+
+        for ticker, low_price, high_price in zip(tickers, low_prices, high_prices):
+            sell_stops = self._sell_stops.get(ticker)
+            if sell_stops and not math.isnan(low_price):
+                index = bisect_left(sell_stops, (low_price, -1))
+                sequence_numbers.extend(sequence_number for _, sequence_number in sell_stops[index:])
+
+            buy_stops = self._buy_stops.get(ticker)
+            if buy_stops and not math.isnan(high_price):
+                index = bisect_right(buy_stops, (high_price, math.inf))
+                sequence_numbers.extend(sequence_number for _, sequence_number in buy_stops[:index])
+
+        return [self._orders_by_sequence_number[sequence_number] for sequence_number in sorted(sequence_numbers)]
+
+    def _stop_orders_index(self, order: Order) -> Dict[Ticker, List[Tuple[float, int]]]:
+        return self._sell_stops if order.quantity < 0 else self._buy_stops
+
+    @staticmethod
+    def _remove_from_index(index: Dict, key, order_id: int):
+        orders = index[key]
+        del orders[order_id]
+        if not orders:
+            del index[key]
@@ -0,0 +1,299 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import math
+from datetime import datetime
+from itertools import count, compress
+from typing import List, Sequence, Optional, Tuple
+
+import numpy as np
+
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.execution_handler.abstract_simulated_executor import AbstractSimulatedExecutor
+from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
+from qf_lib.backtesting.execution_handler.slippage.base import Slippage
+from qf_lib.backtesting.execution_handler.slippage.rolling_daily_statistics_cache import RollingDailyStatisticsCache
+from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
+from qf_lib.backtesting.order.execution_style import ScheduledOrder, VWAPOrder, POVOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.enums.security_type import SecurityType
+from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+
+
+class ScheduledOrdersExecutor(AbstractSimulatedExecutor):
+    """
+    Executes the Orders with the ScheduledOrder execution styles (TWAPOrder, VWAPOrder, POVOrder) in the intraday
+    trading. At the market open and at every new bar, a child order is computed for each of the active (parent) Orders
+    and filled at the Open price of the current bar. The unfilled remainder of an Order is carried over to the
+    subsequent bars, until the Order is completely filled or expires.
+
+    Each child order is limited by the volume of the current bar (and by the max_participation_rate of the Order).
+    The quantities of the child orders of all Orders are computed at once, using the execution state of the Orders
+    kept in a numpy structured array (one row per Order).
+
+    The schedule of TWAPOrders and VWAPOrders spans the bars from the first bar, at which the Order is active, until
+    the market close (the Order is expected to be filled completely at the last bar of the trading session, as far as
+    the volume allows). At the market close the remainders of the TimeInForce.DAY Orders expire, while the remainders
+    of the TimeInForce.GTC Orders are scheduled again over the next trading session.
+    """
+
+    _STATE_DTYPE = np.dtype([
+        ("id", np.int64),
+        ("quantity", np.float64),
+        ("filled_quantity", np.float64),
+        ("participation_rate", np.float64),  # NaN if the child orders are limited only by the volume of the bars
+        ("is_vwap", bool),
+        ("is_pov", bool),
+        ("is_day", bool),
+        ("is_crypto", bool),
+        ("new_horizon", bool),
+        ("horizon_quantity", np.float64),  # quantity, which remained to be filled at the beginning of the schedule
+        ("horizon_bars", np.float64),
+        ("elapsed_bars", np.float64),
+        ("horizon_volume", np.float64),  # volume expected until the market close (VWAPOrders only)
+        ("elapsed_volume", np.float64),
+    ])
+
+    def __init__(self, data_provider: AbstractPriceDataProvider, monitor: AbstractMonitor, portfolio: Portfolio,
+                 order_id_generator: count, commission_model: CommissionModel, slippage_model: Slippage,
+                 frequency: Frequency):
+        super().__init__(data_provider, monitor, portfolio, order_id_generator, commission_model, slippage_model,
+                         frequency)
+
+        self._daily_statistics_cache = RollingDailyStatisticsCache(data_provider)
+
+        # active Orders and their execution state
+        self._orders = []  # type: List[Order]
+        self._state = np.zeros(0, dtype=self._STATE_DTYPE)
+
+    def assign_order_ids(self, orders: Sequence[Order]) -> List[int]:
+        order_id_list = []
+        for order in orders:
+            self._check_order_validity(order)
+
+            order.id = next(self._order_id_generator)
+            order_id_list.append(order.id)
+
+        return order_id_list
+
+    def accept_orders(self, orders: Sequence[Order]):
+        super().accept_orders(orders)
+
+        # Orders of the same ids are replaced
+        self._keep(~np.isin(self._state["id"], [order.id for order in orders]))
+
+        state = np.zeros(len(orders), dtype=self._STATE_DTYPE)
+        state["id"] = [order.id for order in orders]
+        state["quantity"] = [order.quantity for order in orders]
+        state["participation_rate"] = [
+            np.nan if order.execution_style.max_participation_rate is None
+            else order.execution_style.max_participation_rate for order in orders
+        ]
+        state["is_vwap"] = [isinstance(order.execution_style, VWAPOrder) for order in orders]
+        state["is_pov"] = [isinstance(order.execution_style, POVOrder) for order in orders]
+        state["is_day"] = [order.time_in_force == TimeInForce.DAY for order in orders]
+        state["is_crypto"] = [order.ticker.security_type == SecurityType.CRYPTO for order in orders]
+        state["new_horizon"] = True
+
+        self._orders.extend(orders)
+        self._state = np.concatenate([self._state, state])
+
+    def cancel_all_open_orders(self):
+        super().cancel_all_open_orders()
+        self._orders = []
+        self._state = np.zeros(0, dtype=self._STATE_DTYPE)
+
+    def cancel_order(self, order_id: int) -> Optional[Order]:
+        cancelled_order = super().cancel_order(order_id)
+        if cancelled_order is not None:
+            self._keep(self._state["id"] != order_id)
+
+        return cancelled_order
+
+    def get_filled_quantities(self) -> List[float]:
+        """
+        Returns the quantities (with the sign of the Orders' quantities), which were already filled, for all open
+        Orders (in the order of get_open_orders).
+        """
+        filled_quantities = dict(zip(
+            self._state["id"].tolist(), np.copysign(self._state["filled_quantity"], self._state["quantity"]).tolist()
+        ))
+        return [filled_quantities[order.id] for order in self.get_open_orders()]
+
+    def execute_orders(self, market_open=False, market_close=False):
+        """
+        Fills the child orders of all active Orders at the current bar. At the market close, no child orders are
+        filled, but the remainders of the TimeInForce.DAY Orders expire.
+        """
+        if market_close:
+            self._end_trading_session()
+            return
+
+        if not self._orders:
+            return
+
+        current_time = self._data_provider.timer.now()
+        ticker_indices, open_prices, bar_volumes = self._get_current_bars()
+        self._start_new_horizons(current_time)
+        child_orders_volumes = self._compute_child_orders_volumes(current_time, ticker_indices, bar_volumes)
+
+        is_executed = (child_orders_volumes != 0) & np.isfinite(open_prices)
+        if not is_executed.any():
+            return
+
+        executed_orders = list(compress(self._orders, is_executed))
+        fill_volumes = child_orders_volumes[is_executed]
+        fill_prices = np.asarray(self._slippage_model.calculate_fill_prices(
+            current_time, executed_orders, open_prices[is_executed], fill_volumes), dtype=np.float64)
+        self._execute_orders(executed_orders, fill_prices, fill_volumes)
+
+        is_filled = np.isfinite(fill_prices)
+        self._state["filled_quantity"][np.flatnonzero(is_executed)[is_filled]] += np.abs(fill_volumes[is_filled])
+
+        # Delete the completely filled Orders
+        is_completed = self._state["filled_quantity"] >= np.abs(self._state["quantity"])
+        for order in compress(self._orders, is_completed):
+            self._order_book.remove(order.id)
+        self._keep(~is_completed)
+
+        self._portfolio.update()
+
+    def _get_current_bars(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the indices of the tickers of the active Orders (the same index for all Orders of the same ticker) and
+        the Open prices and Volumes of the bars, which start at the current time (one value per active Order).
+        """
+        ticker_to_index = {}
+        ticker_indices = np.array([ticker_to_index.setdefault(order.ticker, len(ticker_to_index))
+                                   for order in self._orders], dtype=np.intp)
+        tickers = list(ticker_to_index.keys())
+        current_time = self._data_provider.timer.now()
+
+        bars = self._data_provider.get_price(tickers, [PriceField.Open, PriceField.Volume], current_time,
+                                             current_time, self._frequency, look_ahead_bias=True)
+        bars = bars.reindex(index=tickers, columns=[PriceField.Open, PriceField.Volume])
+        open_prices, volumes = bars.to_numpy(dtype=np.float64, na_value=np.nan).T
+        return ticker_indices, open_prices[ticker_indices], volumes[ticker_indices]
+
+    def _start_new_horizons(self, current_time: datetime):
+        """
+        Schedules the remaining quantities of the Orders, which were accepted or carried over to the next trading
+        session, over the bars until the market close.
+        """
+        new_horizon = self._state["new_horizon"]
+        if not new_horizon.any():
+            return
+
+        bars_until_market_close = self._bars_until_market_close(current_time)
+        state = self._state
+        state["horizon_quantity"][new_horizon] = \
+            np.abs(state["quantity"][new_horizon]) - state["filled_quantity"][new_horizon]
+        state["horizon_bars"][new_horizon] = bars_until_market_close
+        state["elapsed_bars"][new_horizon] = 0.0
+        state["elapsed_volume"][new_horizon] = 0.0
+
+        # The volume expected until the market close is estimated using the average daily volume
+        new_vwap_horizon = new_horizon & state["is_vwap"]
+        if new_vwap_horizon.any():
+            tickers = [order.ticker for order in compress(self._orders, new_vwap_horizon)]
+            average_daily_volumes = self._daily_statistics_cache.average_volumes(current_time, tickers)
+            state["horizon_volume"][new_vwap_horizon] = \
+                average_daily_volumes * bars_until_market_close / self._bars_in_trading_session(current_time)
+
+        state["new_horizon"][new_horizon] = False
+
+    def _compute_child_orders_volumes(self, current_time: datetime, ticker_indices: np.ndarray,
+                                      bar_volumes: np.ndarray) -> np.ndarray:
+        """
+        Computes the volumes of the child orders of all active Orders (with the sign of the Orders' quantities).
+        The child order of a TWAPOrder (VWAPOrder) fills the part of the scheduled quantity, which is proportional
+        to the fraction of bars (volume) elapsed since the beginning of the schedule. The child order of a POVOrder
+        fills the participation rate of the volume of the bar. If the child orders of all Orders for a ticker exceed
+        the volume of the bar, they are scaled down proportionally.
+        """
+        state = self._state
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bar_volumes = np.where(bar_volumes > 0, bar_volumes, 0.0)
+
+            state["elapsed_bars"] += 1.0
+            state["elapsed_volume"] += bar_volumes
+
+            # Part of the scheduled quantity, which should be filled until the end of the current bar (the quantity is
+            # multiplied before the division, so that the integer schedules are not affected by the rounding errors)
+            uses_volume_schedule = state["is_vwap"] & (state["horizon_volume"] > 0)
+            elapsed = np.where(uses_volume_schedule, state["elapsed_volume"], state["elapsed_bars"])
+            horizon = np.where(uses_volume_schedule, state["horizon_volume"], state["horizon_bars"])
+            if self._bars_until_market_close(current_time) <= 1:
+                elapsed = horizon
+
+            abs_quantities = np.abs(state["quantity"])
+            remaining_quantities = abs_quantities - state["filled_quantity"]
+            scheduled_quantities = abs_quantities - state["horizon_quantity"] - state["filled_quantity"] + \
+                state["horizon_quantity"] * np.minimum(elapsed, horizon) / horizon
+
+            participation_rates = state["participation_rate"]
+            max_volumes = np.where(np.isnan(participation_rates), bar_volumes,
+                                   np.minimum(participation_rates * bar_volumes, bar_volumes))
+            scheduled_quantities = np.where(state["is_pov"], max_volumes, scheduled_quantities)
+
+        child_orders_volumes = np.clip(np.minimum(scheduled_quantities, max_volumes), 0.0, remaining_quantities)
+
+        # The child orders of all Orders for the same ticker share the volume of the bar
+        tickers_volumes = np.bincount(ticker_indices, weights=child_orders_volumes)[ticker_indices]
+        is_above_bar_volume = tickers_volumes > bar_volumes
+        child_orders_volumes[is_above_bar_volume] *= \
+            bar_volumes[is_above_bar_volume] / tickers_volumes[is_above_bar_volume]
+
+        child_orders_volumes = np.where(state["is_crypto"], child_orders_volumes, np.floor(child_orders_volumes))
+        return np.copysign(child_orders_volumes, state["quantity"])
+
+    def _end_trading_session(self):
+        """ Expires the TimeInForce.DAY Orders and carries the remainders of the other ones over to the next session. """
+        is_expired = self._state["is_day"]
+        for order in compress(self._orders, is_expired):
+            self._order_book.remove(order.id)
+        self._keep(~is_expired)
+
+        self._state["new_horizon"] = True
+
+    def _keep(self, mask: np.ndarray):
+        """ Keeps only the Orders (and their execution state) selected by the mask. """
+        self._orders = list(compress(self._orders, mask))
+        self._state = self._state[mask]
+
+    def _bars_until_market_close(self, current_time: datetime) -> int:
+        """ Number of bars from the bar starting at the current time until the market close. """
+        market_close_time = current_time + MarketCloseEvent.trigger_time()
+        bar_length = current_time + self._frequency.time_delta() - current_time
+        return max(math.ceil((market_close_time - current_time) / bar_length), 1)
+
+    def _bars_in_trading_session(self, current_time: datetime) -> float:
+        market_open_time = current_time + MarketOpenEvent.trigger_time()
+        market_close_time = current_time + MarketCloseEvent.trigger_time()
+        bar_length = current_time + self._frequency.time_delta() - current_time
+        return (market_close_time - market_open_time) / bar_length
+
+    def _check_order_validity(self, order):
+        assert self._frequency == Frequency.MIN_1, \
+            "ScheduledOrder ExecutionStyles are supported only in the intraday trading (Frequency.MIN_1)"
+        assert order.time_in_force == TimeInForce.DAY or order.time_in_force == TimeInForce.GTC, \
+            "Only TimeInForce.DAY or TimeInForce.GTC Time in Force is accepted by ScheduledOrdersExecutor"
+        assert isinstance(order.execution_style, ScheduledOrder), \
+            "Only ScheduledOrder ExecutionStyles are supported by ScheduledOrdersExecutor"
+        assert not isinstance(order.execution_style, POVOrder) or order.execution_style.participation_rate > 0, \
+            "The participation rate of the POVOrder should be positive"
@@ -22,16 +22,17 @@ from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event i
 from qf_lib.backtesting.events.time_event.scheduler import Scheduler
 from qf_lib.backtesting.events.time_event.single_time_event.schedule_order_execution_event import \
     ScheduleOrderExecutionEvent
+from qf_lib.backtesting.execution_handler.abstract_simulated_executor import AbstractSimulatedExecutor
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.execution_handler.execution_handler import ExecutionHandler
 from qf_lib.backtesting.execution_handler.market_on_close_orders_executor import MarketOnCloseOrdersExecutor
 from qf_lib.backtesting.execution_handler.market_on_open_orders_executor import MarketOnOpenOrdersExecutor
 from qf_lib.backtesting.execution_handler.market_orders_executor import MarketOrdersExecutor
-from qf_lib.backtesting.execution_handler.simulated_executor import SimulatedExecutor
+from qf_lib.backtesting.execution_handler.scheduled_orders_executor import ScheduledOrdersExecutor
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
 from qf_lib.backtesting.execution_handler.stop_orders_executor import StopOrdersExecutor
 from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
-from qf_lib.backtesting.order.execution_style import StopOrder, MarketOrder, MarketOnCloseOrder
+from qf_lib.backtesting.order.execution_style import StopOrder, MarketOrder, MarketOnCloseOrder, ScheduledOrder
 from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
@@ -49,6 +50,10 @@ class SimulatedExecutionHandler(ExecutionHandler):
     The simulated execution handler which executes an Order on the open of next bar, unless it is the ExecutionStyle
     is the StopOrder. Then the Order is executed if the Low field for the price is lower then the limit of that Order.
     StopOrders are executed at the MarketClose (if applicable) with the Low price.
+
+    In the intraday trading, Orders with the ScheduledOrder ExecutionStyles (TWAPOrder, VWAPOrder, POVOrder) are
+    partially filled at the market open and at every new bar, limited by the volume of the bars (see
+    ScheduledOrdersExecutor).
     """
 
     def __init__(self, data_provider: AbstractPriceDataProvider, scheduler: Scheduler, monitor: AbstractMonitor,
@@ -91,10 +96,15 @@ class SimulatedExecutionHandler(ExecutionHandler):
                                                                           order_id_generator, commission_model,
                                                                           slippage_model, frequency)
 
+        self._scheduled_orders_executor = ScheduledOrdersExecutor(data_provider, monitor, portfolio,
+                                                                  order_id_generator, commission_model,
+                                                                  slippage_model, frequency)
+
     def on_market_close(self, _: MarketCloseEvent):
         self._stop_orders_executor.execute_orders(market_close=True)
         self._market_orders_executor.execute_orders(market_close=True)
         self._market_on_close_orders_executor.execute_orders(market_close=True)
+        self._scheduled_orders_executor.execute_orders(market_close=True)
 
         # Update the portfolio and record its state, current assets and positions
         # this was in the past done after market close
@@ -105,13 +115,15 @@ class SimulatedExecutionHandler(ExecutionHandler):
     def on_market_open(self, _: MarketOpenEvent):
         self._market_orders_executor.execute_orders(market_open=True)
         self._market_on_open_orders_executor.execute_orders(market_open=True)
+        self._scheduled_orders_executor.execute_orders(market_open=True)
 
     def on_new_bar(self, _: IntradayBarEvent):
         self._market_orders_executor.execute_orders()
         self._stop_orders_executor.execute_orders()
+        self._scheduled_orders_executor.execute_orders()
 
     def on_orders_accept(self, event: ScheduleOrderExecutionEvent):
-        executors_to_orders_dict = event.get_executors_to_orders_dict(self.data_provider.timer.now())  # type: Dict[SimulatedExecutor, List[Order]]
+        executors_to_orders_dict = event.get_executors_to_orders_dict(self.data_provider.timer.now())  # type: Dict[AbstractSimulatedExecutor, List[Order]]
         for executor in executors_to_orders_dict.keys():
             executor.accept_orders(executors_to_orders_dict[executor])
 
@@ -121,7 +133,7 @@ class SimulatedExecutionHandler(ExecutionHandler):
         """
         order_id_list = []
         orders = sorted(orders, key=lambda x: x.execution_style.__class__.__name__)
-        scheduled_event_data = defaultdict(list)  # type: Dict[SimulatedExecutor, List[Order]]
+        scheduled_event_data = defaultdict(list)  # type: Dict[AbstractSimulatedExecutor, List[Order]]
 
         for order_style_type, orders_list in groupby(orders, lambda x: type(x.execution_style)):
             orders_list = list(orders_list)
@@ -143,6 +155,9 @@ class SimulatedExecutionHandler(ExecutionHandler):
             elif order_style_type == MarketOnCloseOrder:
                 partial_order_id_list = self._market_on_close_orders_executor.assign_order_ids(orders_list)
                 scheduled_event_data[self._market_on_close_orders_executor].extend(orders_list)
+            elif issubclass(order_style_type, ScheduledOrder):
+                partial_order_id_list = self._scheduled_orders_executor.assign_order_ids(orders_list)
+                scheduled_event_data[self._scheduled_orders_executor].extend(orders_list)
             else:
                 raise ValueError("Unsupported ExecutionStyle: {}".format(order_style_type))
 
@@ -172,13 +187,18 @@ class SimulatedExecutionHandler(ExecutionHandler):
         if removed_order is not None:
             return
 
+        removed_order = self._scheduled_orders_executor.cancel_order(order_id)
+        if removed_order is not None:
+            return
+
         raise OrderCancellingException("Order of id: {:d} wasn't found in the list of awaiting Orders")
 
     def get_open_orders(self) -> List[Order]:
         orders = self._market_orders_executor.get_open_orders() \
             + self._stop_orders_executor.get_open_orders() \
             + self._market_on_close_orders_executor.get_open_orders() \
-            + self._market_on_open_orders_executor.get_open_orders()
+            + self._market_on_open_orders_executor.get_open_orders() \
+            + self._scheduled_orders_executor.get_open_orders()
         return orders
 
     def cancel_all_open_orders(self):
@@ -186,6 +206,7 @@ class SimulatedExecutionHandler(ExecutionHandler):
         self._stop_orders_executor.cancel_all_open_orders()
         self._market_on_close_orders_executor.cancel_all_open_orders()
         self._market_on_open_orders_executor.cancel_all_open_orders()
+        self._scheduled_orders_executor.cancel_all_open_orders()
 
     def _remove_acquired_or_not_active_positions(self):
         """
@@ -11,8 +11,6 @@
 #     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
-import math
-
 import numpy as np
 
 from abc import ABCMeta, abstractmethod
@@ -85,6 +83,30 @@ class Slippage(metaclass=ABCMeta):
         fill_prices = self._get_fill_prices(date, orders, no_slippage_fill_prices, fill_volumes)
         return fill_prices, fill_volumes
 
+    def calculate_fill_prices(self, date: datetime, orders: Sequence[Order], no_slippage_fill_prices: Sequence[float],
+                              fill_volumes: Sequence[float]) -> Sequence[float]:
+        """
+        Calculates fill prices for the given fill volumes of the Orders (e.g. volumes of partial fills of the Orders).
+        Contrary to process_orders, the fill volumes are not limited.
+
+        Parameters
+        ----------
+        date: datetime
+            time when the slippage is applied
+        orders: Sequence[Order]
+            sequence of Orders for which the fill price should be calculated
+        no_slippage_fill_prices: Sequence[float]
+            fill prices without a slippage applied. Each fill price corresponds to the Order from `orders` list
+        fill_volumes: Sequence[float]
+            fill volumes. Each fill volume corresponds to the Order from `orders` list
+
+        Returns
+        -------
+        Sequence[float]
+            sequence of fill prices (order corresponds to the order of orders provided as an argument of the method)
+        """
+        return self._get_fill_prices(date, orders, no_slippage_fill_prices, fill_volumes)
+
     @abstractmethod
     def _get_fill_prices(self, date: datetime, orders: Sequence[Order], no_slippage_fill_prices: Sequence[float],
                          fill_volumes: Sequence[int]) -> Sequence[float]:
@@ -119,14 +141,14 @@ class Slippage(metaclass=ABCMeta):
         tickers = [order.ticker for order in orders]
         market_volumes = self._volumes_traded_today(date, tickers)
 
-        max_abs_order_volumes = [volume * self.max_volume_share_limit for volume in market_volumes]
+        max_abs_order_volumes = np.multiply(market_volumes, self.max_volume_share_limit)
         abs_order_volumes = np.absolute(order_volumes)
 
         abs_fill_volumes = np.minimum(abs_order_volumes, max_abs_order_volumes)
         fill_volumes = np.copysign(abs_fill_volumes, order_volumes)
 
-        fill_volumes = np.array([volume if order.ticker.security_type == SecurityType.CRYPTO else float(math.floor(volume))
-                                 for volume, order in zip(fill_volumes, orders)])
+        is_crypto = np.array([ticker.security_type == SecurityType.CRYPTO for ticker in tickers], dtype=bool)
+        fill_volumes = np.where(is_crypto, fill_volumes, np.floor(fill_volumes))
 
         return fill_volumes
 
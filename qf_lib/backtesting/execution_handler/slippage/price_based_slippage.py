@@ -12,10 +12,11 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-import math
 from datetime import datetime
 from typing import Sequence, Optional
 
+import numpy as np
+
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
 from qf_lib.backtesting.order.order import Order
 from qf_lib.data_providers.data_provider import DataProvider
@@ -37,22 +38,8 @@ class PriceBasedSlippage(Slippage):
         if self.slippage_rate == 0.0:
             return no_slippage_fill_prices
 
-        fill_prices = []
-        for order, no_slippage_price in zip(orders, no_slippage_fill_prices):
-            fill_price = self._get_single_fill_price(order, no_slippage_price)
-            fill_prices.append(fill_price)
-
-        return fill_prices
-
-    def _get_single_fill_price(self, order, no_slippage_price):
-        if math.isnan(no_slippage_price):
-            fill_price = float('nan')
-        else:
-            if order.quantity > 0:  # BUY Order
-                multiplier = 1 + self.slippage_rate
-            else:  # SELL Order
-                multiplier = 1 - self.slippage_rate
-
-            fill_price = no_slippage_price * multiplier
+        # BUY Orders are filled at a higher price and SELL Orders at a lower price
+        is_buy_order = np.array([order.quantity > 0 for order in orders], dtype=bool)
+        multipliers = np.where(is_buy_order, 1 + self.slippage_rate, 1 - self.slippage_rate)
 
-        return fill_price
+        return np.asarray(no_slippage_fill_prices, dtype=np.float64) * multipliers
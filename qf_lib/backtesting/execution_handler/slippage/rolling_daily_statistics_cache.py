@@ -0,0 +1,168 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Sequence, Dict, Deque, Tuple, List
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+
+
+class RollingDailyStatisticsCache:
+    """
+    Per-ticker cache of the latest daily Close prices and Volumes, used to compute the volatility and the average daily
+    volume of the tickers. For each ticker the cache keeps only the last number_of_samples available (not NaN) values
+    of each field and at each date downloads only the daily bars, which appeared since the previous update of
+    the ticker.
+
+    At the given date the statistics are computed using the values from the last lookback_days days (excluding
+    the date itself), so they are equal to the ones computed from the daily bars returned by the
+    get_price(tickers, [PriceField.Close, PriceField.Volume], date - lookback_days, date - 1 day) request.
+
+    Parameters
+    ----------
+    data_provider: AbstractPriceDataProvider
+        data provider used to download the daily bars
+    number_of_samples: int
+        maximal number of the latest values used to compute the statistics
+    lookback_days: int
+        number of days before the date, from which the values can be used to compute the statistics
+    """
+
+    def __init__(self, data_provider: AbstractPriceDataProvider, number_of_samples: int = 20, lookback_days: int = 60):
+        self._data_provider = data_provider
+        self.number_of_samples = number_of_samples
+        self.lookback_days = lookback_days
+
+        # (date, value) pairs of the last available values of each field
+        self._close_prices = defaultdict(self._new_window)  # type: Dict[Ticker, Deque[Tuple[datetime, float]]]
+        self._volumes = defaultdict(self._new_window)  # type: Dict[Ticker, Deque[Tuple[datetime, float]]]
+        # the last day covered by the cached values of each ticker
+        self._last_update_days = {}  # type: Dict[Ticker, datetime]
+
+    def volatilities(self, date: datetime, tickers: Sequence[Ticker]) -> np.ndarray:
+        """
+        Returns the annualised volatility of the log returns of the last number_of_samples Close prices of each ticker
+        (NaN if less than 3 prices are available).
+        """
+        close_prices = self._get_values(date, tickers, self._close_prices)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_returns = np.log(close_prices[:, 1:] / close_prices[:, :-1])
+            volatilities = self._nan_std(log_returns) * np.sqrt(Frequency.DAILY.occurrences_in_year)
+
+        enough_prices = np.count_nonzero(~np.isnan(close_prices), axis=1) >= 3
+        volatilities[~enough_prices] = np.nan
+        return volatilities
+
+    def average_volumes(self, date: datetime, tickers: Sequence[Ticker]) -> np.ndarray:
+        """
+        Returns the mean of the non-negative values among the last number_of_samples Volumes of each ticker (NaN if
+        there are no such values).
+        """
+        volumes = self._get_values(date, tickers, self._volumes)
+
+        with np.errstate(invalid="ignore"):
+            is_valid = volumes >= 0
+
+        numbers_of_volumes = np.count_nonzero(is_valid, axis=1)
+        volumes_sums = np.where(is_valid, volumes, 0.0).sum(axis=1)
+        average_volumes = np.full(len(volumes), np.nan)
+        np.divide(volumes_sums, numbers_of_volumes, out=average_volumes, where=numbers_of_volumes > 0)
+        return average_volumes
+
+    def _new_window(self) -> Deque[Tuple[datetime, float]]:
+        return deque(maxlen=self.number_of_samples)
+
+    def _get_values(self, date: datetime, tickers: Sequence[Ticker],
+                    windows: Dict[Ticker, Deque[Tuple[datetime, float]]]) -> np.ndarray:
+        """
+        Returns a matrix of the values of the tickers (one row per ticker) from the lookback period. The values are
+        aligned to the right and the missing values are filled with NaNs.
+        """
+        self._update(date, tickers)
+
+        first_day = self._first_day(date)
+        values = np.full((len(tickers), self.number_of_samples), np.nan)
+        for row, ticker in enumerate(tickers):
+            ticker_values = [value for day, value in windows[ticker] if day >= first_day]
+            if ticker_values:
+                values[row, -len(ticker_values):] = ticker_values
+
+        return values
+
+    def _first_day(self, date: datetime) -> datetime:
+        return date - RelativeDelta(days=self.lookback_days, hour=0, minute=0, second=0, microsecond=0)
+
+    def _update(self, date: datetime, tickers: Sequence[Ticker]):
+        """
+        Downloads the daily bars, which appeared since the previous update of the tickers, and adds their values to
+        the cache. The tickers, which were not cached before (or if the date moved backwards), are downloaded for
+        the whole lookback period.
+        """
+        first_day = self._first_day(date)
+        end_date = date - RelativeDelta(days=1)
+        last_day = end_date + RelativeDelta(hour=0, minute=0, second=0, microsecond=0)
+
+        tickers_by_start_date = defaultdict(list)  # type: Dict[datetime, List[Ticker]]
+        for ticker in dict.fromkeys(tickers):
+            last_update_day = self._last_update_days.get(ticker)
+            if last_update_day is None or last_update_day > last_day or last_update_day < first_day:
+                self._close_prices.pop(ticker, None)
+                self._volumes.pop(ticker, None)
+                self._last_update_days.pop(ticker, None)
+                tickers_by_start_date[first_day].append(ticker)
+            elif last_update_day < last_day:
+                # the bars are downloaded since the last update day, so that the request is never a single date one
+                tickers_by_start_date[last_update_day].append(ticker)
+
+        for start_date, tickers_to_update in tickers_by_start_date.items():
+            bars = self._data_provider.get_price(tickers_to_update, [PriceField.Close, PriceField.Volume],
+                                                 start_date, end_date, Frequency.DAILY)
+
+            if isinstance(bars, QFDataArray):
+                dates = pd.DatetimeIndex(bars.dates.values)
+                values = bars.loc[:, tickers_to_update, [PriceField.Close, PriceField.Volume]].values
+                for column, ticker in enumerate(tickers_to_update):
+                    last_update_day = self._last_update_days.get(ticker, first_day - RelativeDelta(days=1))
+                    new_bars = dates > last_update_day
+                    self._add_values(self._close_prices[ticker], dates[new_bars], values[new_bars, column, 0])
+                    self._add_values(self._volumes[ticker], dates[new_bars], values[new_bars, column, 1])
+
+            for ticker in tickers_to_update:
+                self._last_update_days[ticker] = last_day
+
+    @staticmethod
+    def _add_values(window: Deque[Tuple[datetime, float]], dates: pd.DatetimeIndex, values: np.ndarray):
+        values = values.astype(np.float64)
+        is_available = ~np.isnan(values)
+        window.extend(zip(dates[is_available], values[is_available].tolist()))
+
+    @staticmethod
+    def _nan_std(values: np.ndarray) -> np.ndarray:
+        """ Sample standard deviation (ddof=1) of each row, ignoring NaNs (NaN if there are less than 2 values). """
+        is_available = ~np.isnan(values)
+        numbers_of_values = np.count_nonzero(is_available, axis=1)
+        values = np.where(is_available, values, 0.0)
+
+        means = values.sum(axis=1) / numbers_of_values
+        squared_deviations = np.where(is_available, values - means[:, None], 0.0) ** 2
+        return np.sqrt(squared_deviations.sum(axis=1) / (numbers_of_values - 1))
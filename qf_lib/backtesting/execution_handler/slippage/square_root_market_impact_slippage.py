@@ -17,15 +17,10 @@ from typing import Sequence, Optional
 import numpy as np
 
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
+from qf_lib.backtesting.execution_handler.slippage.rolling_daily_statistics_cache import RollingDailyStatisticsCache
 from qf_lib.backtesting.order.order import Order
-from qf_lib.common.enums.frequency import Frequency
-from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
-from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
-from qf_lib.common.utils.volatility.get_volatility import get_volatility
-from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.data_providers.data_provider import DataProvider
-from qf_lib.data_providers.helpers import cast_data_array_to_proper_type
 
 
 class SquareRootMarketImpactSlippage(Slippage):
@@ -55,6 +50,7 @@ class SquareRootMarketImpactSlippage(Slippage):
 
         self.price_impact = price_impact
         self._number_of_samples = 20
+        self._daily_statistics_cache = RollingDailyStatisticsCache(data_provider, self._number_of_samples)
 
     def _get_fill_prices(self, date: datetime, orders: Sequence[Order], no_slippage_fill_prices: Sequence[float],
                          fill_volumes: Sequence[float]) -> Sequence[float]:
@@ -72,37 +68,18 @@ class SquareRootMarketImpactSlippage(Slippage):
         Market Impact is positive for buys and negative for sells.
         MI = +/- price_impact * volatility * sqrt (fill volume / average daily volume)
         """
-        start_date = date - RelativeDelta(days=60)
-        end_date = date - RelativeDelta(days=1)
-
-        # Download close price and volume values
-        data_array = self._data_provider.get_price(tickers, [PriceField.Close, PriceField.Volume],
-                                                   start_date, end_date, Frequency.DAILY)
-
-        close_prices = cast_data_array_to_proper_type(data_array.loc[:, tickers, PriceField.Close])
-        volumes = cast_data_array_to_proper_type(data_array.loc[:, tickers, PriceField.Volume])
-        close_prices_volatility = close_prices.apply(self._compute_volatility).values
-
-        average_volumes = volumes.apply(self._compute_average_volume).values
+        close_prices_volatility = self._compute_volatilities(date, tickers)
+        average_volumes = self._compute_average_volumes(date, tickers)
 
         abs_fill_volumes = np.abs(fill_volumes)
         volatility_volume_ratio = np.divide(abs_fill_volumes, average_volumes)
         sqrt_volatility_volume_ratio = np.sqrt(volatility_volume_ratio) * np.sign(fill_volumes)
         return self.price_impact * close_prices_volatility * sqrt_volatility_volume_ratio
 
-    def _compute_volatility(self, prices_tms) -> float:
-        """Compute the annualised volatility of the last self._number_of_samples days"""
-        prices_tms = prices_tms.dropna().iloc[-self._number_of_samples:]
-        prices_tms = PricesSeries(prices_tms)
-        try:
-            volatility = get_volatility(prices_tms, frequency=Frequency.DAILY, annualise=True)
-        except (AssertionError, AttributeError):
-            volatility = float('nan')
-        return volatility
+    def _compute_volatilities(self, date: datetime, tickers: Sequence[Ticker]) -> np.ndarray:
+        """Compute the annualised volatility of the last self._number_of_samples days for each of the tickers"""
+        return self._daily_statistics_cache.volatilities(date, tickers)
 
-    def _compute_average_volume(self, volume_tms) -> float:
-        """Compute the average volume of the last self._number_of_samples days"""
-        volume_tms = volume_tms.dropna().iloc[-self._number_of_samples:]
-        volume_tms = volume_tms[volume_tms >= 0]
-        adv = volume_tms.mean()
-        return adv
+    def _compute_average_volumes(self, date: datetime, tickers: Sequence[Ticker]) -> np.ndarray:
+        """Compute the average volume of the last self._number_of_samples days for each of the tickers"""
+        return self._daily_statistics_cache.average_volumes(date, tickers)
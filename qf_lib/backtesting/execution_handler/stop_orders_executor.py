@@ -12,8 +12,11 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from itertools import compress
 from typing import List, Sequence
 
+import numpy as np
+
 from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.execution_handler.simulated_executor import SimulatedExecutor
 from qf_lib.backtesting.order.execution_style import StopOrder
@@ -64,36 +67,41 @@ class StopOrdersExecutor(SimulatedExecutor):
 
         return order_id_list
 
-    def _get_orders_with_fill_prices_without_slippage(self, open_orders_list, tickers, market_open, market_close):
-        no_slippage_fill_prices_list = []
-        to_be_executed_orders = []
-        expired_stop_orders = []  # type: List[int]
-
-        unique_tickers = list(set(tickers))
+    def _get_orders_with_fill_prices_without_slippage(self, market_open, market_close):
+        """
+        Only the Stop Orders, which stop price was crossed by the range of the current bar, are examined. They are
+        found in the order book using the Low and High prices of the bars (or the Open price, if it lies outside of
+        the range).
+        """
+        unique_tickers = self._order_book.tickers()
         # index=tickers, columns=fields
         current_bars_df = self._get_latest_available_bars(unique_tickers)  # type: QFDataFrame
 
+        bars = current_bars_df.reindex(index=unique_tickers, columns=[PriceField.Open, PriceField.High, PriceField.Low])
+        open_prices, high_prices, low_prices = bars.to_numpy(dtype=np.float64, na_value=np.nan).T
+        triggered_orders = self._order_book.triggered_stop_orders(
+            unique_tickers, np.fmin(open_prices, low_prices).tolist(), np.fmax(open_prices, high_prices).tolist())
+
+        ticker_to_row = {ticker: row for row, ticker in enumerate(unique_tickers)}
+        rows = np.array([ticker_to_row[order.ticker] for order in triggered_orders], dtype=np.intp)
+        no_slippage_fill_prices = self._calculate_no_slippage_fill_prices(
+            open_prices[rows], high_prices[rows], low_prices[rows], triggered_orders)
+        can_be_executed = np.isfinite(no_slippage_fill_prices)
+
+        to_be_executed_orders = list(compress(triggered_orders, can_be_executed))
+        no_slippage_fill_prices_list = no_slippage_fill_prices[can_be_executed].tolist()
+
         # Check at first if at this moment of time, expiry checks should be made or not (optimization reasons)
         if market_close:
-            for order, ticker in zip(open_orders_list, tickers):
-                current_bar = current_bars_df.loc[ticker, :]
-                no_slippage_fill_price = self._calculate_no_slippage_fill_price(current_bar, order)
-
-                if no_slippage_fill_price is not None:
-                    to_be_executed_orders.append(order)
-                    no_slippage_fill_prices_list.append(no_slippage_fill_price)
-                else:
-                    # the Order cannot be executed
-                    if self._order_expires(order):
-                        expired_stop_orders.append(order.id)
+            # the Orders, which cannot be executed, may expire
+            executed_orders_ids = {order.id for order in to_be_executed_orders}
+            expired_stop_orders = [
+                order.id for time_in_force in TimeInForce if time_in_force != TimeInForce.GTC
+                for order in self._order_book.orders_with_time_in_force(time_in_force)
+                if order.id not in executed_orders_ids and self._order_expires(order)
+            ]  # type: List[int]
         else:
-            for order, ticker in zip(open_orders_list, tickers):
-                current_bar = current_bars_df.loc[ticker, :]
-                no_slippage_fill_price = self._calculate_no_slippage_fill_price(current_bar, order)
-
-                if no_slippage_fill_price is not None:
-                    to_be_executed_orders.append(order)
-                    no_slippage_fill_prices_list.append(no_slippage_fill_price)
+            expired_stop_orders = []
 
         return no_slippage_fill_prices_list, to_be_executed_orders, expired_stop_orders
 
@@ -131,39 +139,25 @@ class StopOrdersExecutor(SimulatedExecutor):
 
         return self._data_provider.get_price(tickers, PriceField.ohlcv(), start_date, start_date, self._frequency)
 
-    def _calculate_no_slippage_fill_price(self, current_bar, order):
+    def _calculate_no_slippage_fill_prices(self, open_prices: np.ndarray, high_prices: np.ndarray,
+                                           low_prices: np.ndarray, orders: Sequence[Order]) -> np.ndarray:
         """
-        Returns the price which should be used for calculating the real fill price later on. It can return either:
-        OPEN or stop price. If the market opens at the price which triggers StopOrders instantly, the OPEN price
-        is returned. Otherwise if the LOW price (for Sell Stop) or HIGH price (for Buy Stop) exceeds the stop price,
-        the stop price is returned. If none of the above conditions is met, None is returned (which means that
-        StopOrder shouldn't be executed at any price).
+        Returns the prices which should be used for calculating the real fill prices of the orders later on (one price
+        per order). Each price can be either: OPEN or stop price. If the market opens at the price which triggers
+        the StopOrder instantly, the OPEN price is returned. Otherwise if the LOW price (for Sell Stop) or HIGH price
+        (for Buy Stop) exceeds the stop price, the stop price is returned. If none of the above conditions is met, NaN
+        is returned (which means that StopOrder shouldn't be executed at any price). The Open, High and Low prices are
+        given per order.
         """
-        # Make sure that at least all values except Volume are available. Volume is not available for currencies.
-        price_bar = tuple(current_bar.loc[[PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close]])
-        if None in price_bar:
-            return None
-
-        open_price, high_price, low_price, close_price = price_bar
+        stop_prices = np.array([order.execution_style.stop_price for order in orders], dtype=np.float64)
+        is_sell_stop = np.array([order.quantity < 0 for order in orders], dtype=bool)
 
-        stop_price = order.execution_style.stop_price
-        is_sell_stop = order.quantity < 0
-        no_slippage_fill_price = None
-
-        if is_sell_stop:
-            if open_price <= stop_price:
-                no_slippage_fill_price = open_price
-            else:
-                if low_price <= stop_price:
-                    no_slippage_fill_price = stop_price
-        else:  # is buy stop
-            if open_price >= stop_price:
-                no_slippage_fill_price = open_price
-            else:
-                if high_price >= stop_price:
-                    no_slippage_fill_price = stop_price
+        # comparisons with NaN prices are always False, so the orders without prices are not executed
+        with np.errstate(invalid="ignore"):
+            opens_beyond_stop = np.where(is_sell_stop, open_prices <= stop_prices, open_prices >= stop_prices)
+            crosses_stop = np.where(is_sell_stop, low_prices <= stop_prices, high_prices >= stop_prices)
 
-        return no_slippage_fill_price
+        return np.where(opens_beyond_stop, open_prices, np.where(crosses_stop, stop_prices, np.nan))
 
     def _check_order_validity(self, order):
         assert order.time_in_force == TimeInForce.DAY or order.time_in_force == TimeInForce.GTC, \
@@ -13,10 +13,11 @@
 #     limitations under the License.
 
 from datetime import datetime
-from typing import Tuple, Sequence, Type, List
+from typing import Tuple, Sequence, Type, List, Union
 
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.backtesting.portfolio.trades_table import TradesTable
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
 
@@ -32,13 +33,13 @@ class BacktestSummaryElement:
         Names of the parameters of the model.
     returns_tms: SimpleReturnsSeries
         SimpleReturnsSeries of the Portfolio.
-    trades: Sequence[Trade]
-        Sequence of Trades (groups of Transactions) performed by the tested strategy.
+    trades: Union[Sequence[Trade], TradesTable]
+        Trades (groups of Transactions) performed by the tested strategy.
     tickers: Sequence[Ticker]
         Sequence of Tickers for which the single backtest was performed.
     """
     def __init__(self, model_parameters: Tuple, model_parameters_names: Tuple[str], returns_tms: SimpleReturnsSeries,
-                 trades: Sequence[Trade], tickers: Sequence[Ticker]):
+                 trades: Union[Sequence[Trade], TradesTable], tickers: Sequence[Ticker]):
         self.model_parameters = model_parameters
         self.model_parameters_names = model_parameters_names
         self.returns_tms = returns_tms
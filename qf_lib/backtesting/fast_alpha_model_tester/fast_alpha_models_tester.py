@@ -11,19 +11,26 @@
 #     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
+import os
+import shutil
+import tempfile
 import traceback
+from copy import copy
 from datetime import datetime
 from itertools import count
-from typing import Sequence, Type, List, Union, Dict, Any
+from typing import Sequence, Type, List, Union, Dict, Any, Optional
 
 import numpy as np
 import pandas as pd
 from joblib import Parallel, delayed
+from pandas.tseries.frequencies import to_offset
 
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.fast_alpha_model_tester.backtest_summary import BacktestSummary, BacktestSummaryElement
 from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.backtesting.portfolio.trades_table import TradesTable
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.exceptions.future_contracts_exceptions import NoValidTickerException
@@ -43,8 +50,11 @@ from qf_lib.containers.futures.futures_chain import FuturesChain
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
+from qf_lib.data_providers.data_bundle_storage import save_data_bundle, load_data_bundle
 from qf_lib.data_providers.data_provider import DataProvider
 from qf_lib.data_providers.helpers import cast_data_array_to_proper_type, tickers_dict_to_data_array
+from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 from qf_lib.portfolio_construction.portfolio_models.portfolio import Portfolio
 
 
@@ -82,13 +92,21 @@ class FastAlphaModelTester:
     ModelTester in which portfolio construction is simulated by always following the suggested Exposures from
     AlphaModels. All Tickers are traded with same weights (weights are constant across time and equal to 1 / N
     where N is number of assets).
+
+    The prices used in the test are stored once in memory-mapped files, so that all parallel workers attach to the same
+    data instead of receiving their own copies. If the data provider is a PresetDataProvider, the workers receive
+    a copy of it, whose data bundle is replaced by the memory-mapped one. Any other data provider is first prefetched
+    into a PrefetchingDataProvider (starting lookback_period before the start date), which is shared in the same way.
+    The pool of workers is created by the first test_alpha_models call and it is reused by both stages (exposures
+    generation and backtest summaries) of all the following calls, until the tester is closed (see close). The tester
+    can also be used as a context manager, which closes it on exit.
     """
 
     def __init__(self, alpha_model_configs: Sequence[FastAlphaModelTesterConfig],
                  tickers: Sequence[Ticker], start_date: datetime, end_date: datetime,
                  data_provider: DataProvider, timer: Timer = None, n_jobs: int = 1,
                  frequency: Frequency = Frequency.DAILY, start_time: Dict = None, end_time: Dict = None,
-                 close_position_at_the_end_of_day: bool = False):
+                 close_position_at_the_end_of_day: bool = False, lookback_period: Optional[RelativeDelta] = None):
         """
         Parameters
         ----------
@@ -124,6 +142,12 @@ class FastAlphaModelTester:
             If True, the last signal of the day will always be set to close the existing position.
             This is to avoid overnight exposure.
             If False (default), position might be carried overnight, and will not be forced to be closed.
+        lookback_period: Optional[RelativeDelta]
+            it is only used if the tested alpha model implements calculate_exposures_vectorized. It defines the period
+            of historical data preceding the start_date, which is passed to the vectorized exposures calculation.
+            If None, only the data from start_date till end_date is passed. If the data_provider is not
+            a PresetDataProvider, it also defines the period of historical data preloaded for the alpha models (if None,
+            the data_provider is passed to the alpha models without preloading).
         """
         self.timer = timer
         self.logger = qf_logger.getChild(self.__class__.__name__)
@@ -135,10 +159,12 @@ class FastAlphaModelTester:
         self._data_provider = data_provider
         self._data_provider.set_timer(SettableTimer(start_date))
         self._n_jobs = n_jobs
+        self._parallel = None  # type: Optional[Parallel]
         self._frequency = frequency
         self._start_time = start_time
         self._end_time = end_time
         self._close_position_at_the_end_of_day = close_position_at_the_end_of_day
+        self._lookback_period = lookback_period
 
         # use 1min data frequency for data if signal generation is intra-day.
         # use Daily frequency for any other time frame
@@ -147,6 +173,8 @@ class FastAlphaModelTester:
         assert len(set(config.model_type for config in alpha_model_configs)) == 1, \
             "All passed FastAlphaModelTesterConfig should have the same alpha model type"
         self._model_type = alpha_model_configs[0].model_type
+        self._use_vectorized_exposures = \
+            self._model_type.calculate_exposures_vectorized is not AlphaModel.calculate_exposures_vectorized
 
         if self._frequency > Frequency.DAILY:
             assert self._start_time is not None, "Start time cannot be none for frequency higher than daily"
@@ -163,14 +191,37 @@ class FastAlphaModelTester:
     def test_alpha_models(self) -> BacktestSummary:
         self.logger.info("{} parameters sets to be tested".format(len(self._alpha_model_configs)))
 
-        prices_data_array = self._get_data_for_backtest()
-        exposure_values_df_list = self._generate_exposures_for_all_params_sets()
-        backtest_summary_elem_list = self._calculate_backtest_summary_elements(exposure_values_df_list,
-                                                                               prices_data_array)
+        shared_data_dir = tempfile.mkdtemp(prefix="fast_alpha_model_tester_")
+        try:
+            parallel = self._get_parallel()
+            prices_data_array = self._share_data_array(self._get_data_for_backtest(), shared_data_dir, "prices")
+            exposure_values_df_list = self._generate_exposures_for_all_params_sets(parallel, shared_data_dir)
+            backtest_summary_elem_list = self._calculate_backtest_summary_elements(
+                parallel, exposure_values_df_list, prices_data_array)
+        finally:
+            shutil.rmtree(shared_data_dir, ignore_errors=True)
+
         backtest_summary = BacktestSummary(self._tickers, self._model_type, backtest_summary_elem_list,
                                            self._start_date, self._end_date)
         return backtest_summary
 
+    def close(self):
+        """ Shuts down the pool of workers. The next test_alpha_models call creates a new one. """
+        if self._parallel is not None:
+            self._parallel.__exit__(None, None, None)
+            self._parallel = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_parallel(self) -> Parallel:
+        if self._parallel is None:
+            self._parallel = Parallel(n_jobs=self._n_jobs).__enter__()
+        return self._parallel
+
     def _get_valid_tickers(self, original_ticker: Sequence[Ticker]) -> List[Ticker]:
         tickers = []
         for ticker in original_ticker:
@@ -184,35 +235,85 @@ class FastAlphaModelTester:
 
         return tickers
 
-    def _get_data_for_backtest(self) -> QFDataArray:
+    def _get_data_for_backtest(self, start_date: Optional[datetime] = None) -> QFDataArray:
         """
-        Creates a QFDataArray containing OHLCV values for all tickers passes to Fast Alpha Models Tester.
+        Creates a QFDataArray containing OHLCV values for all tickers passes to Fast Alpha Models Tester. If the
+        start_date is not given, the start date of the backtest is used.
         """
         self.logger.info("\nLoading all price values of tickers:")
         self._data_provider.timer.set_current_time(self._end_date)
+        start_date = start_date or self._start_date
         tickers_dict = {}
 
         for ticker in self._tickers:
             if isinstance(ticker, FutureTicker):
                 fc = FuturesChain(ticker, self._data_provider)
-                tickers_dict[ticker] = fc.get_price(PriceField.ohlcv(), self._start_date, self._end_date,
+                tickers_dict[ticker] = fc.get_price(PriceField.ohlcv(), start_date, self._end_date,
                                                     self._data_frequency)
             else:
-                tickers_dict[ticker] = self._data_provider.get_price(ticker, PriceField.ohlcv(), self._start_date,
+                tickers_dict[ticker] = self._data_provider.get_price(ticker, PriceField.ohlcv(), start_date,
                                                                      self._end_date, self._data_frequency)
 
         prices_data_array = tickers_dict_to_data_array(tickers_dict, self._tickers, PriceField.ohlcv())
         return prices_data_array
 
-    def _generate_exposures_for_all_params_sets(self) -> List[QFDataFrame]:
+    @staticmethod
+    def _share_data_array(data_array: QFDataArray, shared_data_dir: str, name: str) -> QFDataArray:
+        """
+        Stores the data array in the shared data directory and returns its read-only, memory-mapped version. Passing
+        a memory-mapped array to the parallel workers does not copy the data - workers attach to the same file.
+        """
+        directory = os.path.join(shared_data_dir, name)
+        save_data_bundle(data_array.astype(float), directory)
+        return load_data_bundle(directory, memory_map=True)
+
+    def _share_data_provider(self, shared_data_dir: str) -> DataProvider:
+        """
+        Returns the data provider, which should be passed to the parallel workers. The data bundle of
+        a PresetDataProvider is stored in the shared data directory and the copy of the data provider using the
+        memory-mapped bundle is returned, so that its type (and thus any behaviour of its subclass) is preserved. Any
+        other data provider is preloaded for all tickers, starting lookback_period before the start date. If the
+        lookback_period is not given, the data provider is passed to the workers as it is, since the period of data
+        needed by the alpha models is unknown.
+        """
+        if isinstance(self._data_provider, PresetDataProvider):
+            data_provider = copy(self._data_provider)
+        elif self._lookback_period is not None:
+            self.logger.info("\nPreloading the data for the alpha models:")
+            data_provider = PrefetchingDataProvider(self._data_provider, self._tickers, PriceField.ohlcv(),
+                                                    self._start_date - self._lookback_period, self._end_date,
+                                                    self._data_frequency, timer=self._data_provider.timer)
+        else:
+            self.logger.warning("The lookback_period is not given, thus the data of the {} cannot be preloaded and "
+                                "it will be sent to each of the parallel workers".format(
+                                    self._data_provider.__class__.__name__))
+            return self._data_provider
+
+        directory = os.path.join(shared_data_dir, "data_provider")
+        save_data_bundle(data_provider.data_bundle.astype(float), directory)
+        data_provider.set_data_bundle(load_data_bundle(directory, memory_map=True))
+        return data_provider
+
+    def _generate_exposures_for_all_params_sets(self, parallel: Parallel, shared_data_dir: str) -> List[QFDataFrame]:
         self.logger.info("\nGenerating exposures:")
-        exposure_values_df_list = Parallel(n_jobs=self._n_jobs)(delayed(self._generate_exposure_values)
-                                                                (config, self._data_provider, self._tickers)
-                                                                for config in self._alpha_model_configs)
+        data_provider = self._share_data_provider(shared_data_dir)
+        backtest_dates = self._get_backtest_dates()
+
+        prices_data_array = None
+        if self._use_vectorized_exposures:
+            lookback_start_date = self._start_date - self._lookback_period if self._lookback_period else None
+            prices_data_array = self._share_data_array(self._get_data_for_backtest(lookback_start_date),
+                                                       shared_data_dir, "lookback_prices")
+
+        exposure_values_df_list = parallel(
+            delayed(_generate_exposure_values)(config, data_provider, self._tickers, backtest_dates,
+                                               self._data_frequency, self._close_position_at_the_end_of_day,
+                                               prices_data_array)
+            for config in self._alpha_model_configs)
         print("\nFinished generation of exposures.")
         return exposure_values_df_list
 
-    def _calculate_backtest_summary_elements(self, exposure_values_df_list: List[QFDataFrame],
+    def _calculate_backtest_summary_elements(self, parallel: Parallel, exposure_values_df_list: List[QFDataFrame],
                                              prices_data_array: QFDataArray) -> List[BacktestSummaryElement]:
 
         open_prices_df = self._get_open_prices(prices_data_array)
@@ -228,10 +329,9 @@ class FastAlphaModelTester:
                       for config, exposure_values_df in zip(self._alpha_model_configs, exposure_values_df_list)
                       for tickers in tickers_for_summary]
 
-        backtest_summary_elem_list = Parallel(n_jobs=self._n_jobs)(
-            delayed(self._calculate_backtest_summary)(tickers, config, prices_data_array,
-                                                      open_to_open_returns_df[tickers],
-                                                      exposure_values_df[tickers])
+        backtest_summary_elem_list = parallel(
+            delayed(_calculate_backtest_summary)(tickers, config, prices_data_array, open_to_open_returns_df[tickers],
+                                                 exposure_values_df[tickers], self._frequency, self._start_date)
             for config, exposure_values_df, tickers in all_params
         )
 
@@ -243,247 +343,308 @@ class FastAlphaModelTester:
                                                         use_prices_types=True).dropna(how="all")
         return open_prices_df
 
-    def _calculate_backtest_summary(self, tickers: Union[Ticker, Sequence[Ticker]], config: FastAlphaModelTesterConfig,
-                                    prices_data_array: QFDataArray,
-                                    open_to_open_returns_df: QFDataFrame,
-                                    exposure_values_df: QFDataFrame) -> BacktestSummaryElement:
-
-        portfolio_rets_tms = self._calculate_portfolio_returns_tms(open_to_open_returns_df, exposure_values_df)
-        trades = self._calculate_trades(prices_data_array, exposure_values_df)
-        tickers, _ = convert_to_list(tickers, Ticker)
+    def generate_trades_for_ticker(self, prices_array: QFDataArray, exposures_tms: pd.Series, ticker: Ticker) \
+            -> List[Trade]:
+        """
+        Generates the list of trades for the given ticker (see generate_trades_table_for_ticker).
+        """
+        return self.generate_trades_table_for_ticker(prices_array, exposures_tms, ticker).to_trades()
 
-        element = BacktestSummaryElement(config.model_parameters(), config.tested_parameters_names, portfolio_rets_tms,
-                                         trades, tickers)
-        return element
+    def generate_trades_table_for_ticker(self, prices_array: QFDataArray, exposures_tms: pd.Series, ticker: Ticker) \
+            -> TradesTable:
+        """
+        Generates the trades for the given ticker. A trade is opened whenever the exposure changes to a non-zero value
+        and it is closed on the next exposure change. Trades are entered and exited at the Open prices. Dates with
+        missing Open prices are skipped. The trades are computed in bulk over the arrays of exposure change points.
+        """
+        return _generate_trades_table_for_ticker(prices_array, exposures_tms, ticker, self._start_date)
 
-    def _calculate_portfolio_returns_tms(self, open_to_open_returns_df: QFDataFrame,
-                                         exposure_values_df: QFDataFrame) \
-            -> SimpleReturnsSeries:
+    def _get_backtest_dates(self) -> QFSeries:
         """
-        SimpleReturnsSeries of the portfolio - for each date equal to the portfolio performance over the last
-        open-to-open period, ex. value indexed as 2010-02-15 would refer to the portfolio value change between
-        open at 14th and open at 15th, and would be based on the signal from 2010-02-13;
+        Returns series indexed by all dates that will be used for signal generation.
+        Value of series == 1  it means that we need to close the position at the end of the day
+        """
+        if self._frequency == Frequency.DAILY:
+            backtest_dates = pd.date_range(self._start_date, self._end_date, freq="D")
+            backtest_dates = QFSeries(backtest_dates.to_series())
+            backtest_dates[:] = 0
+        elif self._frequency > Frequency.DAILY:
+            days_dates = pd.date_range(self._start_date, self._end_date, freq="D")
+            signal_time_holder = []
+            for day in days_dates:
+                start_time = day + RelativeDelta(**self._start_time)
+                end_time = day + RelativeDelta(**self._end_time)
+                signal_times_for_a_day = pd.date_range(start_time, end_time, freq=self._frequency.to_pandas_freq())
+                signal_times_for_a_day = QFSeries(signal_times_for_a_day.to_series())
+                signal_times_for_a_day[:] = 0
 
-        the first index of the series is the Day 3 of the backtest, as the first signal calculation occurs
-        after Day 1 (see ORDER OF ACTIONS below)
-        the last index of the series is test_end_date and the portfolio exposure is being set to zero
-        on the opening of the test_end_date
+                if self._close_position_at_the_end_of_day:
+                    # add additional stamp or override existing with info to close the position
+                    signal_times_for_a_day[end_time] = 1
 
-        ORDER OF ACTIONS:
+                signal_time_holder.append(signal_times_for_a_day)
 
-        -- Day 1 --
-        signal is generated, based on the historic data INCLUDING prices from Day 1
-        suggested exposure for Day 2 is calculated
+            backtest_dates = pd.concat(signal_time_holder)
+        return backtest_dates
 
-        -- Day 2 --
-        a trade is entered, held or exited (or nothing happens) regarding the suggested exposure
-        this action is performed on the opening of the day
 
-        -- Day 3 --
-        at the opening the open-to-open return is calculated
-        now it is possible to estimate current portfolio value
-        the simple return of the portfolio (Day 3 to Day 2) is saved and indexed with Day 3 date
-        """
+def _generate_exposure_values(config: FastAlphaModelTesterConfig, data_provider: DataProvider,
+                              tickers: Sequence[Ticker], backtest_dates: QFSeries, data_frequency: Frequency,
+                              close_position_at_the_end_of_day: bool,
+                              prices_data_array: Optional[QFDataArray] = None) -> QFDataFrame:
+    """
+    For the given Alpha model and its parameters, generates the dataframe containing all exposure values, that
+    will be returned by the model through signals. The model is created in the parallel worker with the data provider
+    using the shared data bundle (see FastAlphaModelTester._share_data_provider).
 
-        if self._frequency <= Frequency.DAILY:
-            union_index = open_to_open_returns_df.index.union(exposure_values_df.index)
-            exposure_values_df_expanded = exposure_values_df.reindex(union_index, method="ffill")
-            exposure_values_df_expanded = exposure_values_df_expanded.shift(2, axis=0)
+    If the prices data array is given, the exposures are calculated using the vectorized calculate_exposures_vectorized
+    function of the model. Otherwise, or if the model does not support the vectorized calculation, the exposures are
+    generated date by date.
+    """
+    exposure_values_df = None
+    if prices_data_array is not None:
+        exposure_values_df = _calculate_exposures_vectorized(config.generate_model(data_provider), tickers,
+                                                             prices_data_array, backtest_dates.index, data_frequency)
+    if exposure_values_df is None:
+        exposure_values_df = _calculate_exposures_date_by_date(config.generate_model(data_provider), data_provider,
+                                                               tickers, backtest_dates.index, data_frequency)
 
-            open_to_open_returns_df_expanded = open_to_open_returns_df.reindex(union_index)
-            open_to_open_returns_df_expanded = open_to_open_returns_df_expanded.fillna(0)
+    if close_position_at_the_end_of_day:
+        exposure_out = backtest_dates[backtest_dates == 1]
+        exposure_values_df.loc[exposure_out.index, :] = Exposure.OUT.value
+
+    exposure_values_df = exposure_values_df.dropna(axis=1, how="all")
+    return exposure_values_df
 
-            returns_of_strategies_df = exposure_values_df_expanded * open_to_open_returns_df_expanded
-        else:
-            # Assume that we implement the signal with the lag of 1min. Requires shifting returns  by 2min.
-            lag = pd.Timedelta(minutes=2)
-            shifted_exposure_df = QFDataFrame(data=exposure_values_df.values,
-                                              index=exposure_values_df.index + lag,
-                                              columns=exposure_values_df.columns)
-            union_index = open_to_open_returns_df.index.union(shifted_exposure_df.index)
-            shifted_exposure_df = shifted_exposure_df.reindex(union_index, method="ffill")
 
-            open_to_open_returns_df_expanded = open_to_open_returns_df.reindex(union_index)
-            open_to_open_returns_df_expanded = open_to_open_returns_df_expanded.fillna(0)
-            returns_of_strategies_df = open_to_open_returns_df_expanded * shifted_exposure_df
+def _calculate_exposures_date_by_date(model: AlphaModel, data_provider: DataProvider, tickers: Sequence[Ticker],
+                                      dates: pd.DatetimeIndex, data_frequency: Frequency) -> QFDataFrame:
+    """
+    Calculates the exposures by calling calculate_exposure of the model for each of the dates. In case of an exception
+    or error in the processing Exposure.OUT is returned.
+    """
+    logger = qf_logger.getChild(FastAlphaModelTester.__name__)
 
-        returns_of_strategies_df = returns_of_strategies_df.dropna(axis=0, how='all')
-        returns_of_strategies_df = cast_dataframe(returns_of_strategies_df, SimpleReturnsDataFrame)
+    current_exposures_values = QFSeries(index=pd.Index(tickers, name=TICKERS))
+    current_exposures_values[:] = 0.0
 
-        weights = Portfolio.one_over_n_weights(open_to_open_returns_df.columns)
-        portfolio_rets_tms, _ = Portfolio.constant_weights(returns_of_strategies_df, weights)
+    exposure_values_df = QFDataFrame(
+        index=dates,
+        columns=pd.Index(tickers, name=TICKERS)
+    )
 
-        return portfolio_rets_tms
+    for ticker in tickers:
+        if isinstance(ticker, FutureTicker):
+            # Even if the tickers were already initialized, during pickling process, the data provider and timer
+            # information is lost
+            ticker.initialize_data_provider(data_provider)
 
-    def _calculate_trades(self, prices_array: QFDataArray, exposure_df: QFDataFrame) -> List[Trade]:
+    for i, curr_datetime in enumerate(dates):
+        if i % 1000 == 0:
+            logger.info('{} / {} of Exposure dates processed'.format(i, len(dates)))
 
-        if self._frequency > Frequency.DAILY:
-            lag = pd.Timedelta(minutes=1)
-        else:
-            lag = pd.Timedelta(days=1)
+        new_exposures = QFSeries(index=tickers)
+        data_provider.timer.set_current_time(curr_datetime)
 
-        shifted_exposure_df = QFDataFrame(data=exposure_df.values, index=exposure_df.index + lag,
-                                          columns=exposure_df.columns)
+        for j, ticker, curr_exp_value in zip(count(), tickers, current_exposures_values):
+            curr_exp = Exposure(curr_exp_value) if is_finite_number(curr_exp_value) else Exposure.OUT
+            try:
+                new_exp = model.calculate_exposure(ticker, curr_exp, curr_datetime, data_frequency)
+            except Exception as ex:
+                logger.warning(f"Exception {ex} for exposure calculations {curr_datetime}, {ticker}")
+                logger.warning(traceback.format_exc())
 
-        trade_data_list = []
-        for ticker, exposures_tms in shifted_exposure_df.items():
-            trade_data_partial_list = self.generate_trades_for_ticker(prices_array, exposures_tms, ticker)
-            trade_data_list.extend(trade_data_partial_list)
+                new_exp = Exposure.OUT
+            new_exposures.iloc[j] = new_exp.value if new_exp is not None else Exposure.OUT
 
-        return trade_data_list
+        # assuming that we always follow the new_exposures from strategy, disregarding confidence levels
+        # and expected moves, looking only at the suggested exposure
+        current_exposures_values = new_exposures
+        exposure_values_df.iloc[i, :] = current_exposures_values
 
-    def generate_trades_for_ticker(self, prices_array: QFDataArray, exposures_tms: pd.Series, ticker: Ticker) \
-            -> List[Trade]:
+    return exposure_values_df
 
-        open_prices_tms = cast_data_array_to_proper_type(prices_array.loc[:, ticker, PriceField.Open],
-                                                         use_prices_types=True)
 
-        union_index = open_prices_tms.index.union(exposures_tms.index)
-        open_prices_tms = open_prices_tms.reindex(union_index, method="ffill")
-        open_prices_tms = open_prices_tms[exposures_tms.index]
+def _calculate_exposures_vectorized(model: AlphaModel, tickers: Sequence[Ticker], prices_data_array: QFDataArray,
+                                    dates: pd.DatetimeIndex, data_frequency: Frequency) -> Optional[QFDataFrame]:
+    """
+    Calculates the exposures using the vectorized calculate_exposures_vectorized function of the model. Each date
+    is assigned the exposure computed for the latest bar available at this time (without the look-ahead bias).
+    Returns None if the model does not support the vectorized calculation or if the availability of bars cannot be
+    determined (the MarketCloseEvent trigger time is not set up).
+    """
+    logger = qf_logger.getChild(FastAlphaModelTester.__name__)
+    bars_exposures_df = model.calculate_exposures_vectorized(prices_data_array)
+    if bars_exposures_df is None:
+        logger.info("The vectorized calculation of exposures is not supported by the {}. Falling back to the "
+                    "calculation of exposures date by date".format(model))
+        return None
 
-        # historical data cropped to the time frame of the backtest (from start date till end date)
-        historical_data = pd.concat((exposures_tms, open_prices_tms), axis=1).loc[self._start_date:]
+    bars_exposures_df = bars_exposures_df.reindex(columns=pd.Index(tickers, name=TICKERS)).sort_index()
 
-        prev_exposure = 0.0
-        trades_list = []
+    try:
+        latest_bars_positions = _latest_available_bars_positions(bars_exposures_df.index, dates, data_frequency)
+    except ValueError as ex:
+        logger.warning(f"{ex}. Cannot determine the times at which the bars become available. Falling back "
+                       f"to the calculation of exposures date by date")
+        return None
 
-        trade_start_date = None
-        trade_exposure = None
-        trade_start_price = None
+    exposure_values = bars_exposures_df.values.astype(float)[latest_bars_positions]
+    exposure_values[latest_bars_positions < 0] = np.nan
+    exposure_values[np.isnan(exposure_values)] = Exposure.OUT.value
 
-        # If the first exposure is nan - skip it
-        first_exposure = historical_data.iloc[0, 0]
-        if np.isnan(first_exposure):
-            historical_data = historical_data.iloc[1:]
+    return QFDataFrame(data=exposure_values, index=dates, columns=pd.Index(tickers, name=TICKERS))
 
-        for curr_date, row in historical_data.iterrows():
-            curr_date = curr_date.to_pydatetime()
-            curr_exposure, curr_price = row.values
 
-            # skipping the nan Open prices
-            if np.isnan(curr_price):
-                self.logger.warning("Open price is None, cannot create trade on {} for {}".format(
-                    curr_date, str(ticker)))
-                continue
+def _latest_available_bars_positions(bars_dates: pd.DatetimeIndex, dates: pd.DatetimeIndex,
+                                     data_frequency: Frequency) -> np.ndarray:
+    """
+    For each of the dates returns the position of the latest bar, which would be available at this time in
+    the data provider (-1 if no bar is available). Daily bars become available at the MarketCloseEvent, intraday
+    bars - at the end of the bar.
+    """
+    if data_frequency <= Frequency.DAILY:
+        market_close = MarketCloseEvent.trigger_time()
+        bars_availability_times = pd.DatetimeIndex([date + market_close for date in bars_dates.normalize()])
+    else:
+        bars_availability_times = bars_dates + to_offset(data_frequency.to_pandas_freq())
 
-            out_of_the_market = trade_exposure is None
-            if out_of_the_market:
-                assert prev_exposure == 0.0
+    return bars_availability_times.values.searchsorted(dates.values, side="right") - 1
 
-                if curr_exposure != 0.0:
-                    trade_start_date = curr_date
-                    trade_exposure = curr_exposure
-                    trade_start_price = curr_price
-            else:
-                assert prev_exposure != 0.0
-
-                exposure_change = int(curr_exposure - prev_exposure)
-                should_close_position = exposure_change != 0.0
-
-                if should_close_position:
-                    trades_list.append(Trade(
-                        start_time=trade_start_date,
-                        end_time=curr_date,
-                        ticker=ticker,
-                        pnl=(curr_price / trade_start_price - 1) * trade_exposure,
-                        commission=0.0,
-                        direction=int(trade_exposure)
-                    ))
-                    trade_start_date = None
-                    trade_exposure = None
-                    trade_start_price = None
-
-                    going_into_opposite_direction = curr_exposure != 0.0
-                    if going_into_opposite_direction:
-                        trade_start_date = curr_date
-                        trade_exposure = curr_exposure
-                        trade_start_price = curr_price
-
-            prev_exposure = curr_exposure
-
-        return trades_list
-
-    def _generate_exposure_values(self, config: FastAlphaModelTesterConfig, data_provider: DataProvider,
-                                  tickers: Sequence[Ticker]):
-        """
-        For the given Alpha model and its parameters, generates the dataframe containing all exposure values, that
-        will be returned by the model through signals.
-        In case of an exception or error in the processing Exposure.OUT is returned.
-        """
 
-        model = config.generate_model(data_provider)
+def _calculate_backtest_summary(tickers: Union[Ticker, Sequence[Ticker]], config: FastAlphaModelTesterConfig,
+                                prices_data_array: QFDataArray, open_to_open_returns_df: QFDataFrame,
+                                exposure_values_df: QFDataFrame, frequency: Frequency,
+                                start_date: datetime) -> BacktestSummaryElement:
+    """ Calculates the backtest summary of the given tickers in the parallel worker. """
+    portfolio_rets_tms = _calculate_portfolio_returns_tms(open_to_open_returns_df, exposure_values_df, frequency)
+    trades = _calculate_trades(prices_data_array, exposure_values_df, frequency, start_date)
+    tickers, _ = convert_to_list(tickers, Ticker)
 
-        current_exposures_values = QFSeries(index=pd.Index(tickers, name=TICKERS))
-        current_exposures_values[:] = 0.0
+    element = BacktestSummaryElement(config.model_parameters(), config.tested_parameters_names, portfolio_rets_tms,
+                                     trades, tickers)
+    return element
 
-        backtest_dates = self._get_backtest_dates()
 
-        exposure_values_df = QFDataFrame(
-            index=backtest_dates.index,
-            columns=pd.Index(tickers, name=TICKERS)
-        )
+def _calculate_portfolio_returns_tms(open_to_open_returns_df: QFDataFrame, exposure_values_df: QFDataFrame,
+                                     frequency: Frequency) -> SimpleReturnsSeries:
+    """
+    SimpleReturnsSeries of the portfolio - for each date equal to the portfolio performance over the last
+    open-to-open period, ex. value indexed as 2010-02-15 would refer to the portfolio value change between
+    open at 14th and open at 15th, and would be based on the signal from 2010-02-13;
 
-        for ticker in tickers:
-            if isinstance(ticker, FutureTicker):
-                # Even if the tickers were already initialized, during pickling process, the data provider and timer
-                # information is lost
-                ticker.initialize_data_provider(data_provider)
+    the first index of the series is the Day 3 of the backtest, as the first signal calculation occurs
+    after Day 1 (see ORDER OF ACTIONS below)
+    the last index of the series is test_end_date and the portfolio exposure is being set to zero
+    on the opening of the test_end_date
 
-        for i, curr_datetime in enumerate(backtest_dates.index):
-            if i % 1000 == 0:
-                self.logger.info('{} / {} of Exposure dates processed'.format(i, len(backtest_dates)))
+    ORDER OF ACTIONS:
 
-            new_exposures = QFSeries(index=tickers)
-            self._data_provider.timer.set_current_time(curr_datetime)
+    -- Day 1 --
+    signal is generated, based on the historic data INCLUDING prices from Day 1
+    suggested exposure for Day 2 is calculated
 
-            for j, ticker, curr_exp_value in zip(count(), tickers, current_exposures_values):
-                curr_exp = Exposure(curr_exp_value) if is_finite_number(curr_exp_value) else Exposure.OUT
-                try:
-                    new_exp = model.calculate_exposure(ticker, curr_exp, curr_datetime, self._data_frequency)
-                except Exception as ex:
-                    self.logger.warning(f"Exception {ex} for exposure calculations {curr_datetime}, {ticker}")
-                    self.logger.warning(traceback.format_exc())
+    -- Day 2 --
+    a trade is entered, held or exited (or nothing happens) regarding the suggested exposure
+    this action is performed on the opening of the day
 
-                    new_exp = Exposure.OUT
-                new_exposures.iloc[j] = new_exp.value if new_exp is not None else Exposure.OUT
+    -- Day 3 --
+    at the opening the open-to-open return is calculated
+    now it is possible to estimate current portfolio value
+    the simple return of the portfolio (Day 3 to Day 2) is saved and indexed with Day 3 date
+    """
 
-            # assuming that we always follow the new_exposures from strategy, disregarding confidence levels
-            # and expected moves, looking only at the suggested exposure
-            current_exposures_values = new_exposures
-            exposure_values_df.iloc[i, :] = current_exposures_values
+    if frequency <= Frequency.DAILY:
+        union_index = open_to_open_returns_df.index.union(exposure_values_df.index)
+        exposure_values_df_expanded = exposure_values_df.reindex(union_index, method="ffill")
+        exposure_values_df_expanded = exposure_values_df_expanded.shift(2, axis=0)
 
-        if self._close_position_at_the_end_of_day:
-            exposure_out = backtest_dates[backtest_dates == 1]
-            exposure_values_df.loc[exposure_out.index, :] = Exposure.OUT.value
+        open_to_open_returns_df_expanded = open_to_open_returns_df.reindex(union_index)
+        open_to_open_returns_df_expanded = open_to_open_returns_df_expanded.fillna(0)
 
-        exposure_values_df = exposure_values_df.dropna(axis=1, how="all")
-        return exposure_values_df
+        returns_of_strategies_df = exposure_values_df_expanded * open_to_open_returns_df_expanded
+    else:
+        # Assume that we implement the signal with the lag of 1min. Requires shifting returns  by 2min.
+        lag = pd.Timedelta(minutes=2)
+        shifted_exposure_df = QFDataFrame(data=exposure_values_df.values,
+                                          index=exposure_values_df.index + lag,
+                                          columns=exposure_values_df.columns)
+        union_index = open_to_open_returns_df.index.union(shifted_exposure_df.index)
+        shifted_exposure_df = shifted_exposure_df.reindex(union_index, method="ffill")
 
-    def _get_backtest_dates(self) -> QFSeries:
-        """
-        Returns series indexed by all dates that will be used for signal generation.
-        Value of series == 1  it means that we need to close the position at the end of the day
-        """
-        if self._frequency == Frequency.DAILY:
-            backtest_dates = pd.date_range(self._start_date, self._end_date, freq="D")
-            backtest_dates = QFSeries(backtest_dates.to_series())
-            backtest_dates[:] = 0
-        elif self._frequency > Frequency.DAILY:
-            days_dates = pd.date_range(self._start_date, self._end_date, freq="D")
-            signal_time_holder = []
-            for day in days_dates:
-                start_time = day + RelativeDelta(**self._start_time)
-                end_time = day + RelativeDelta(**self._end_time)
-                signal_times_for_a_day = pd.date_range(start_time, end_time, freq=self._frequency.to_pandas_freq())
-                signal_times_for_a_day = QFSeries(signal_times_for_a_day.to_series())
-                signal_times_for_a_day[:] = 0
+        open_to_open_returns_df_expanded = open_to_open_returns_df.reindex(union_index)
+        open_to_open_returns_df_expanded = open_to_open_returns_df_expanded.fillna(0)
+        returns_of_strategies_df = open_to_open_returns_df_expanded * shifted_exposure_df
 
-                if self._close_position_at_the_end_of_day:
-                    # add additional stamp or override existing with info to close the position
-                    signal_times_for_a_day[end_time] = 1
+    returns_of_strategies_df = returns_of_strategies_df.dropna(axis=0, how='all')
+    returns_of_strategies_df = cast_dataframe(returns_of_strategies_df, SimpleReturnsDataFrame)
 
-                signal_time_holder.append(signal_times_for_a_day)
+    weights = Portfolio.one_over_n_weights(open_to_open_returns_df.columns)
+    portfolio_rets_tms, _ = Portfolio.constant_weights(returns_of_strategies_df, weights)
 
-            backtest_dates = pd.concat(signal_time_holder)
-        return backtest_dates
+    return portfolio_rets_tms
+
+
+def _calculate_trades(prices_array: QFDataArray, exposure_df: QFDataFrame, frequency: Frequency,
+                      start_date: datetime) -> TradesTable:
+
+    if frequency > Frequency.DAILY:
+        lag = pd.Timedelta(minutes=1)
+    else:
+        lag = pd.Timedelta(days=1)
+
+    shifted_exposure_df = QFDataFrame(data=exposure_df.values, index=exposure_df.index + lag,
+                                      columns=exposure_df.columns)
+
+    trades_tables = [_generate_trades_table_for_ticker(prices_array, exposures_tms, ticker, start_date)
+                     for ticker, exposures_tms in shifted_exposure_df.items()]
+    return TradesTable.concatenate(trades_tables)
+
+
+def _generate_trades_table_for_ticker(prices_array: QFDataArray, exposures_tms: pd.Series, ticker: Ticker,
+                                      start_date: datetime) -> TradesTable:
+    """ See FastAlphaModelTester.generate_trades_table_for_ticker. """
+    open_prices_tms = cast_data_array_to_proper_type(prices_array.loc[:, ticker, PriceField.Open],
+                                                     use_prices_types=True)
+
+    union_index = open_prices_tms.index.union(exposures_tms.index)
+    open_prices_tms = open_prices_tms.reindex(union_index, method="ffill")
+    open_prices_tms = open_prices_tms[exposures_tms.index]
+
+    # historical data cropped to the time frame of the backtest (from start date till end date)
+    historical_data = pd.concat((exposures_tms, open_prices_tms), axis=1).loc[start_date:]
+
+    # If the first exposure is nan - skip it
+    first_exposure = historical_data.iloc[0, 0]
+    if np.isnan(first_exposure):
+        historical_data = historical_data.iloc[1:]
+
+    exposures = historical_data.iloc[:, 0].values.astype(float)
+    prices = historical_data.iloc[:, 1].values.astype(float)
+    dates = historical_data.index
+
+    # skipping the nan Open prices
+    missing_prices = np.isnan(prices)
+    if missing_prices.any():
+        logger = qf_logger.getChild(FastAlphaModelTester.__name__)
+        logger.warning("Open price is None, cannot create trade on {} dates ({} - {}) for {}".format(
+            missing_prices.sum(), dates[missing_prices][0], dates[missing_prices][-1], str(ticker)))
+        exposures, prices, dates = exposures[~missing_prices], prices[~missing_prices], dates[~missing_prices]
+
+    # each exposure change closes the currently open trade (if any) and opens a new one (if the new exposure is
+    # different from 0). The position is always flat before the first date
+    previous_exposures = np.concatenate(([0.0], exposures))[:-1]
+    change_points = np.flatnonzero(exposures != previous_exposures)
+    opening_points = change_points[exposures[change_points] != 0.0]
+
+    closing_change_points = np.searchsorted(change_points, opening_points, side="right")
+    is_closed = closing_change_points < len(change_points)
+    start_points = opening_points[is_closed]
+    end_points = change_points[closing_change_points[is_closed]]
+
+    trades_exposures = exposures[start_points]
+    pnls = (prices[end_points] / prices[start_points] - 1) * trades_exposures
+
+    return TradesTable(start_times=dates[start_points], end_times=dates[end_points],
+                       tickers=[ticker] * len(start_points), pnl=pnls, commission=np.zeros(len(start_points)),
+                       direction=trades_exposures.astype(int))
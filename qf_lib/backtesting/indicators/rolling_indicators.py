@@ -0,0 +1,358 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from abc import ABCMeta, abstractmethod
+from collections import deque
+from typing import Sequence, List, Deque, Tuple
+
+import numpy as np
+
+from qf_lib.common.enums.price_field import PriceField
+
+
+class RollingIndicator(metaclass=ABCMeta):
+    """
+    Base class for the indicators, which are updated incrementally (bar by bar) for a number of tickers at once.
+    Each update costs O(1) per ticker, independently of the length of the window of the indicator.
+
+    Before the first update the indicator needs to be reset with the number of tickers. Bars with missing values
+    (NaN in any of the required fields) are ignored for the corresponding tickers.
+    """
+
+    @property
+    @abstractmethod
+    def required_fields(self) -> Sequence[PriceField]:
+        """ Price fields, which need to be passed to the update function (in the given order). """
+        pass
+
+    @property
+    @abstractmethod
+    def required_bars(self) -> int:
+        """ Number of bars needed to compute the first value of the indicator. """
+        pass
+
+    @abstractmethod
+    def reset(self, nr_of_tickers: int):
+        """ Clears the state of the indicator and prepares it for the given number of tickers. """
+        pass
+
+    @abstractmethod
+    def update(self, bars: np.ndarray):
+        """
+        Updates the indicator with the next bar of each ticker.
+
+        Parameters
+        ----------
+        bars: np.ndarray
+            array of shape (nr_of_tickers, len(required_fields)) with the values of the required fields of the bars
+        """
+        pass
+
+    @abstractmethod
+    def values(self) -> np.ndarray:
+        """ Current values of the indicator for all tickers (NaN if there were not enough bars for a ticker). """
+        pass
+
+
+class _RollingWindow:
+    """ Window of the last values of a number of tickers (each ticker has its own position in the window). """
+
+    def __init__(self, window: int, nr_of_tickers: int):
+        self.window = window
+        self.values = np.full((window, nr_of_tickers), np.nan)
+        self.counts = np.zeros(nr_of_tickers, dtype=np.int64)
+
+    def push(self, tickers: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """ Adds the values of the given tickers. Returns the evicted values (NaN if the window was not full). """
+        positions = self.counts[tickers] % self.window
+        evicted_values = self.values[positions, tickers]
+        self.values[positions, tickers] = values
+        self.counts[tickers] += 1
+        return evicted_values
+
+    def is_full(self) -> np.ndarray:
+        return self.counts >= self.window
+
+
+class SimpleMovingAverage(RollingIndicator):
+    """
+    Simple moving average of the last window values of the given field.
+    """
+
+    def __init__(self, window: int, field: PriceField = PriceField.Close):
+        self.window = window
+        self.field = field
+        self.reset(0)
+
+    @property
+    def required_fields(self) -> Sequence[PriceField]:
+        return [self.field]
+
+    @property
+    def required_bars(self) -> int:
+        return self.window
+
+    def reset(self, nr_of_tickers: int):
+        self._window = _RollingWindow(self.window, nr_of_tickers)
+        self._sum = np.zeros(nr_of_tickers)
+
+    def update(self, bars: np.ndarray):
+        values = bars[:, 0]
+        tickers = np.flatnonzero(~np.isnan(values))
+        evicted_values = self._window.push(tickers, values[tickers])
+        self._sum[tickers] += values[tickers] - np.nan_to_num(evicted_values)
+
+    def values(self) -> np.ndarray:
+        return np.where(self._window.is_full(), self._sum / self.window, np.nan)
+
+
+class ExponentialMovingAverage(RollingIndicator):
+    """
+    Exponential moving average of the given field, equal to the pandas ewm(span=span, adjust=False).mean() computed
+    over all the bars passed to the indicator.
+    """
+
+    def __init__(self, span: int, field: PriceField = PriceField.Close):
+        self.span = span
+        self.field = field
+        self.alpha = 2 / (span + 1)
+        self.reset(0)
+
+    @property
+    def required_fields(self) -> Sequence[PriceField]:
+        return [self.field]
+
+    @property
+    def required_bars(self) -> int:
+        return self.span
+
+    def reset(self, nr_of_tickers: int):
+        self._ema = np.full(nr_of_tickers, np.nan)
+
+    def update(self, bars: np.ndarray):
+        values = bars[:, 0]
+        is_valid = ~np.isnan(values)
+        self._ema[is_valid] = np.where(np.isnan(self._ema[is_valid]), values[is_valid],
+                                       self.alpha * values[is_valid] + (1 - self.alpha) * self._ema[is_valid])
+
+    def values(self) -> np.ndarray:
+        return self._ema.copy()
+
+
+class AverageTrueRange(RollingIndicator):
+    """
+    Average true range of the last window bars, consistent with the average_true_range function (computed on
+    window + 1 bars). If normalized is True, the average true range is divided by the Close price of the bar preceding
+    the last bar (NATR).
+    """
+
+    def __init__(self, window: int, normalized: bool = False):
+        self.window = window
+        self.normalized = normalized
+        self.reset(0)
+
+    @property
+    def required_fields(self) -> Sequence[PriceField]:
+        return [PriceField.High, PriceField.Low, PriceField.Close]
+
+    @property
+    def required_bars(self) -> int:
+        return self.window + 1
+
+    def reset(self, nr_of_tickers: int):
+        self._window = _RollingWindow(self.window, nr_of_tickers)
+        self._sum = np.zeros(nr_of_tickers)
+        self._previous_close = np.full(nr_of_tickers, np.nan)
+        self._last_previous_close = np.full(nr_of_tickers, np.nan)
+
+    def update(self, bars: np.ndarray):
+        tickers = np.flatnonzero(~np.isnan(bars).any(axis=1))
+        high, low, close = bars[tickers].T
+        previous_close = self._previous_close[tickers]
+
+        # The true range can be computed starting from the second bar of each ticker
+        has_previous_close = ~np.isnan(previous_close)
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+        tickers_with_range = tickers[has_previous_close]
+
+        evicted_values = self._window.push(tickers_with_range, true_range[has_previous_close])
+        self._sum[tickers_with_range] += true_range[has_previous_close] - np.nan_to_num(evicted_values)
+        self._last_previous_close[tickers_with_range] = previous_close[has_previous_close]
+        self._previous_close[tickers] = close
+
+    def values(self) -> np.ndarray:
+        average_true_range = np.where(self._window.is_full(), self._sum / self.window, np.nan)
+        return average_true_range / self._last_previous_close if self.normalized else average_true_range
+
+
+class RollingStandardDeviation(RollingIndicator):
+    """
+    Standard deviation (with the given delta degrees of freedom) of the last window values of the given field.
+    The values are updated with the numerically stable, windowed version of the Welford's algorithm.
+    """
+
+    def __init__(self, window: int, field: PriceField = PriceField.Close, ddof: int = 1):
+        assert window > ddof, "The window needs to be greater than ddof"
+        self.window = window
+        self.field = field
+        self.ddof = ddof
+        self.reset(0)
+
+    @property
+    def required_fields(self) -> Sequence[PriceField]:
+        return [self.field]
+
+    @property
+    def required_bars(self) -> int:
+        return self.window
+
+    def reset(self, nr_of_tickers: int):
+        self._window = _RollingWindow(self.window, nr_of_tickers)
+        self._mean = np.zeros(nr_of_tickers)
+        self._sum_of_squared_deviations = np.zeros(nr_of_tickers)
+
+    def update(self, bars: np.ndarray):
+        values = bars[:, 0]
+        tickers = np.flatnonzero(~np.isnan(values))
+        new_values = values[tickers]
+        old_values = self._window.push(tickers, new_values)
+        old_mean = self._mean[tickers]
+
+        # Windows which are not full yet are only extended, otherwise the oldest value is replaced by the new one
+        is_extended = np.isnan(old_values)
+        counts = np.minimum(self._window.counts[tickers], self.window)
+        old_values = np.where(is_extended, old_mean, old_values)
+
+        new_mean = old_mean + (new_values - old_values) / counts
+        self._sum_of_squared_deviations[tickers] += np.where(
+            is_extended, (new_values - old_mean) * (new_values - new_mean),
+            (new_values - old_values) * (new_values - new_mean + old_values - old_mean))
+        self._mean[tickers] = new_mean
+
+    def values(self) -> np.ndarray:
+        variance = np.maximum(self._sum_of_squared_deviations, 0.0) / (self.window - self.ddof)
+        return np.where(self._window.is_full(), np.sqrt(variance), np.nan)
+
+
+class _RollingExtremum(RollingIndicator, metaclass=ABCMeta):
+    """ Minimum or maximum of the last window values, based on monotonic queues (amortized O(1) per update). """
+
+    def __init__(self, window: int, field: PriceField):
+        self.window = window
+        self.field = field
+        self.reset(0)
+
+    @property
+    def required_fields(self) -> Sequence[PriceField]:
+        return [self.field]
+
+    @property
+    def required_bars(self) -> int:
+        return self.window
+
+    def reset(self, nr_of_tickers: int):
+        self._queues = [deque() for _ in range(nr_of_tickers)]  # type: List[Deque[Tuple[int, float]]]
+        self._counts = np.zeros(nr_of_tickers, dtype=np.int64)
+
+    @abstractmethod
+    def _is_dominated(self, queued_value: float, new_value: float) -> bool:
+        """ True if the queued value can never be the extremum after adding the new value. """
+        pass
+
+    def update(self, bars: np.ndarray):
+        values = bars[:, 0]
+        for ticker_index in np.flatnonzero(~np.isnan(values)):
+            value = float(values[ticker_index])
+            bar_number = int(self._counts[ticker_index])
+            queue = self._queues[ticker_index]
+
+            while queue and self._is_dominated(queue[-1][1], value):
+                queue.pop()
+            queue.append((bar_number, value))
+            if queue[0][0] <= bar_number - self.window:
+                queue.popleft()
+
+            self._counts[ticker_index] = bar_number + 1
+
+    def values(self) -> np.ndarray:
+        extrema = np.array([queue[0][1] if queue else np.nan for queue in self._queues], dtype=np.float64)
+        return np.where(self._counts >= self.window, extrema, np.nan)
+
+
+class RollingMin(_RollingExtremum):
+    """
+    Minimum of the last window values of the given field.
+    """
+
+    def __init__(self, window: int, field: PriceField = PriceField.Low):
+        super().__init__(window, field)
+
+    def _is_dominated(self, queued_value: float, new_value: float) -> bool:
+        return queued_value >= new_value
+
+
+class RollingMax(_RollingExtremum):
+    """
+    Maximum of the last window values of the given field.
+    """
+
+    def __init__(self, window: int, field: PriceField = PriceField.High):
+        super().__init__(window, field)
+
+    def _is_dominated(self, queued_value: float, new_value: float) -> bool:
+        return queued_value <= new_value
+
+
+class VolumeWeightedAveragePrice(RollingIndicator):
+    """
+    Volume weighted average of the prices of the given field over the last window bars. Similarly to
+    the volume_weighted_average_price function, if no volume was traded within the window, the prices are averaged
+    with equal weights.
+    """
+
+    def __init__(self, window: int, field: PriceField = PriceField.Close):
+        self.window = window
+        self.field = field
+        self.reset(0)
+
+    @property
+    def required_fields(self) -> Sequence[PriceField]:
+        return [self.field, PriceField.Volume]
+
+    @property
+    def required_bars(self) -> int:
+        return self.window
+
+    def reset(self, nr_of_tickers: int):
+        self._prices_window = _RollingWindow(self.window, nr_of_tickers)
+        self._volumes_window = _RollingWindow(self.window, nr_of_tickers)
+        self._prices_sum = np.zeros(nr_of_tickers)
+        self._volumes_sum = np.zeros(nr_of_tickers)
+        self._weighted_prices_sum = np.zeros(nr_of_tickers)
+
+    def update(self, bars: np.ndarray):
+        tickers = np.flatnonzero(~np.isnan(bars).any(axis=1))
+        prices, volumes = bars[tickers].T
+
+        evicted_prices = np.nan_to_num(self._prices_window.push(tickers, prices))
+        evicted_volumes = np.nan_to_num(self._volumes_window.push(tickers, volumes))
+
+        self._prices_sum[tickers] += prices - evicted_prices
+        self._volumes_sum[tickers] += volumes - evicted_volumes
+        self._weighted_prices_sum[tickers] += prices * volumes - evicted_prices * evicted_volumes
+
+    def values(self) -> np.ndarray:
+        has_volume = self._volumes_sum > 0
+        vwap = np.where(has_volume, self._weighted_prices_sum / np.where(has_volume, self._volumes_sum, 1.0),
+                        self._prices_sum / self.window)
+        return np.where(self._prices_window.is_full(), vwap, np.nan)
@@ -0,0 +1,135 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Sequence, Dict, Optional, List
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.events.time_event.periodic_event.intraday_bar_event import IntradayBarEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.indicators.rolling_indicators import RollingIndicator
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+
+
+class RollingIndicatorsEngine:
+    """
+    Computes a set of RollingIndicators for a number of tickers in a streaming manner. Instead of downloading the
+    whole history and recomputing the indicators from scratch at every bar, only the bars, which appeared since the
+    previous update, are downloaded and passed to the indicators, which update their values in O(1) per bar and ticker.
+
+    At the first update the engine downloads the number of bars needed by the indicators (or warm_up_bars if given).
+    The engine never uses bars after DataProvider.get_end_date_without_look_ahead, so the values of the indicators
+    at any time are computed using the same bars as a historical_price request issued at this time.
+
+    The engine can be updated explicitly (update), subscribed to the MarketCloseEvent or IntradayBarEvent with the
+    Scheduler, or it updates itself whenever the values of the indicators are requested.
+
+    Parameters
+    ----------
+    data_provider: AbstractPriceDataProvider
+        data provider used to download the bars
+    tickers: Sequence[Ticker]
+        tickers, for which the indicators should be computed. In case of FutureTickers the bars of consecutive
+        contracts are passed to the indicators without any adjustment
+    frequency: Frequency
+        frequency of the bars
+    warm_up_bars: Optional[int]
+        number of bars downloaded at the first update. By default, the maximum number of bars required by the indicators
+    """
+
+    def __init__(self, data_provider: AbstractPriceDataProvider, tickers: Sequence[Ticker],
+                 frequency: Frequency = Frequency.DAILY, warm_up_bars: Optional[int] = None):
+        self.data_provider = data_provider
+        self.tickers = list(tickers)
+        self.frequency = frequency
+        self.warm_up_bars = warm_up_bars
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        self._indicators = {}  # type: Dict[str, RollingIndicator]
+        self._fields = []  # type: List[PriceField]
+        self._last_bar_time = None  # type: Optional[datetime]
+
+    def add_indicator(self, name: str, indicator: RollingIndicator):
+        """
+        Adds the indicator under the given name. All indicators need to be added before the first update.
+        """
+        if self._last_bar_time is not None:
+            raise ValueError("Indicators cannot be added after the engine was updated")
+
+        indicator.reset(len(self.tickers))
+        self._indicators[name] = indicator
+        self._fields.extend(field for field in indicator.required_fields if field not in self._fields)
+
+    @property
+    def last_bar_time(self) -> Optional[datetime]:
+        """ Time of the latest bar passed to the indicators (None if the engine was not updated yet). """
+        return self._last_bar_time
+
+    def get_values(self, name: str) -> QFSeries:
+        """
+        Returns the values of the indicator with the given name for all tickers, up to date with the current time.
+        """
+        self.update()
+        return QFSeries(self._indicators[name].values(), index=self.tickers, name=name)
+
+    def on_market_close(self, _: MarketCloseEvent):
+        self.update()
+
+    def on_new_bar(self, _: IntradayBarEvent):
+        self.update()
+
+    def update(self):
+        """
+        Passes all the bars, which became available since the previous update, to the indicators.
+        """
+        if not self._indicators:
+            return
+
+        end_date = self.data_provider.get_end_date_without_look_ahead(None, self.frequency)
+        if self._last_bar_time is not None and end_date <= self._last_bar_time:
+            return
+
+        if self._last_bar_time is None:
+            nr_of_bars = self.warm_up_bars or max(indicator.required_bars for indicator in self._indicators.values())
+            bars = self.data_provider.historical_price(self.tickers, self._fields, max(nr_of_bars, 2),
+                                                       frequency=self.frequency)
+        else:
+            bars = self.data_provider.get_price(self.tickers, self._fields, self._last_bar_time,
+                                                frequency=self.frequency)
+
+        if not isinstance(bars, QFDataArray):  # only the bar of the previous update is available
+            return
+
+        dates = pd.DatetimeIndex(bars.dates.values)
+        new_bars = dates > self._last_bar_time if self._last_bar_time is not None else np.full(len(dates), True)
+        if not new_bars.any():
+            return
+
+        values = bars.loc[:, self.tickers, self._fields].values[new_bars].astype(np.float64)
+        fields_positions = {
+            name: [self._fields.index(field) for field in indicator.required_fields]
+            for name, indicator in self._indicators.items()
+        }
+        for bar_values in values:
+            for name, indicator in self._indicators.items():
+                indicator.update(bar_values[:, fields_positions[name]])
+
+        self._last_bar_time = dates[new_bars][-1].to_pydatetime()
@@ -20,7 +20,6 @@ from typing import Optional, Tuple
 
 import matplotlib.pyplot as plt
 
-from qf_lib.analysis.exposure_analysis.exposure_settings import ExposureSettings
 from qf_lib.analysis.exposure_analysis.exposure_generator import ExposureGenerator
 from qf_lib.analysis.exposure_analysis.exposure_sheet import ExposureSheet
 from qf_lib.analysis.tearsheets.portfolio_analysis_sheet import PortfolioAnalysisSheet
@@ -33,6 +32,7 @@ from qf_lib.analysis.trade_analysis.trade_analysis_sheet import TradeAnalysisShe
 from qf_lib.analysis.trade_analysis.trades_generator import TradesGenerator
 from qf_lib.backtesting.signals.signal import Signal
 from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
+from qf_lib.backtesting.monitoring.backtest_monitor_settings import BacktestMonitorSettings
 from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
 from qf_lib.backtesting.portfolio.transaction import Transaction
 from qf_lib.common.enums.frequency import Frequency
@@ -44,34 +44,6 @@ from qf_lib.settings import Settings
 from qf_lib.starting_dir import get_starting_dir_abs_path
 
 
-class BacktestMonitorSettings:
-    def __init__(self, issue_tearsheet=True, issue_portfolio_analysis_sheet=True, issue_trade_analysis_sheet=True,
-                 issue_transaction_log=True, issue_signal_log=True, issue_config_log=True,
-                 issue_daily_portfolio_values_file=True, print_stats_to_console=True,
-                 generate_pnl_chart_per_ticker_in_portfolio_analysis=True,
-                 display_live_backtest_progress=True, live_backtest_chart_refresh_frequency=20,
-                 exposure_settings: ExposureSettings = None):
-        self.issue_tearsheet = issue_tearsheet
-        self.issue_portfolio_analysis_sheet = issue_portfolio_analysis_sheet
-        self.issue_trade_analysis_sheet = issue_trade_analysis_sheet
-        self.issue_transaction_log = issue_transaction_log
-        self.issue_signal_log = issue_signal_log
-        self.issue_config_log = issue_config_log
-        self.issue_daily_portfolio_value_file = issue_daily_portfolio_values_file
-        self.print_stats_to_console = print_stats_to_console
-        self.generate_pnl_chart_per_ticker_in_portfolio_analysis = generate_pnl_chart_per_ticker_in_portfolio_analysis
-        self.display_live_backtest_progress = display_live_backtest_progress
-        self.live_backtest_chart_refresh_frequency = int(live_backtest_chart_refresh_frequency)
-        self.exposure_settings = exposure_settings
-
-    @staticmethod
-    def no_stats() -> "BacktestMonitorSettings":
-        """"
-        Creates Settings that will generate no monitor output
-        """
-        return BacktestMonitorSettings(False, False, False, False, False, False, False, False, False, False, 20, None)
-
-
 class BacktestMonitor(AbstractMonitor):
     """
     This Monitor will be used to monitor backtest run from the script.
@@ -116,6 +88,7 @@ class BacktestMonitor(AbstractMonitor):
         self._issue_signal_log()
         self._issue_config_log()
         self._print_stats_to_console(portfolio_tms)
+        self._issue_event_profiling_stats()
 
         self._close_files()
 
@@ -255,6 +228,22 @@ class BacktestMonitor(AbstractMonitor):
                 ta_benchmark = TimeseriesAnalysis(self.benchmark_tms, frequency=Frequency.DAILY)
                 print(TimeseriesAnalysis.values_in_table([ta_portfolio, ta_benchmark]))
 
+    @ErrorHandling.error_logging
+    def _issue_event_profiling_stats(self):
+        """
+        Exports the event loop profiling statistics into an Excel file (and prints them to the console if the stats
+        should be printed), provided that the backtest was profiled.
+        """
+        stats_df = self.backtest_result.event_profiling_stats()
+        if stats_df is not None:
+            xlsx_filename = "%Y_%m_%d-%H%M Event profiling.xlsx"
+            xlsx_filename = datetime.now().strftime(xlsx_filename)
+            file_path = path.join(self._report_dir, xlsx_filename)
+            self._excel_exporter.export_container(stats_df, file_path, starting_cell='A1', include_column_names=True)
+
+            if self._monitor_settings.print_stats_to_console:
+                print(stats_df.to_string(index=False))
+
     @ErrorHandling.error_logging
     def _issue_trade_analysis_sheet(self):
         """
@@ -265,16 +254,17 @@ class BacktestMonitor(AbstractMonitor):
             trades_generator = TradesGenerator()
             portfolio_eod_series = self.backtest_result.portfolio.portfolio_eod_series()
             closed_positions = self.backtest_result.portfolio.closed_positions()
-            trades_list = trades_generator.create_trades_from_backtest_positions(closed_positions, portfolio_eod_series)
+            trades_table = trades_generator.create_trades_table_from_backtest_positions(closed_positions,
+                                                                                        portfolio_eod_series)
 
-            if len(trades_list) > 0:
-                nr_of_assets_traded = len(set(t.ticker.name for t in trades_list))
+            if len(trades_table) > 0:
+                nr_of_assets_traded = len(set(ticker.name for ticker in trades_table.unique_tickers))
                 start_date = self.backtest_result.start_date or portfolio_eod_series.index[0]
                 end_date = self.backtest_result.end_date or datetime.now()
 
                 trades_analysis_sheet = TradeAnalysisSheet(self._settings, self._pdf_exporter,
                                                            nr_of_assets_traded=nr_of_assets_traded,
-                                                           trades=trades_list,
+                                                           trades=trades_table,
                                                            start_date=start_date,
                                                            end_date=end_date,
                                                            initial_risk=self.backtest_result.initial_risk,
@@ -290,7 +280,7 @@ class BacktestMonitor(AbstractMonitor):
             exposure_generator = ExposureGenerator(self._settings, self._monitor_settings.exposure_settings.data_provider)
 
             # setting ExposureGenerator parameters
-            exposure_generator.set_positions_history(self.backtest_result.portfolio.positions_history())
+            exposure_generator.set_positions_history(self.backtest_result.portfolio.positions_history_table())
             exposure_generator.set_portfolio_nav_history(self.backtest_result.portfolio.portfolio_eod_series())
             exposure_generator.set_sector_exposure_tickers(self._monitor_settings.exposure_settings.sector_exposure_tickers)
             exposure_generator.set_factor_exposure_tickers(self._monitor_settings.exposure_settings.factor_exposure_tickers)
@@ -0,0 +1,42 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from qf_lib.analysis.exposure_analysis.exposure_settings import ExposureSettings
+
+
+class BacktestMonitorSettings:
+    def __init__(self, issue_tearsheet=True, issue_portfolio_analysis_sheet=True, issue_trade_analysis_sheet=True,
+                 issue_transaction_log=True, issue_signal_log=True, issue_config_log=True,
+                 issue_daily_portfolio_values_file=True, print_stats_to_console=True,
+                 generate_pnl_chart_per_ticker_in_portfolio_analysis=True,
+                 display_live_backtest_progress=True, live_backtest_chart_refresh_frequency=20,
+                 exposure_settings: ExposureSettings = None):
+        self.issue_tearsheet = issue_tearsheet
+        self.issue_portfolio_analysis_sheet = issue_portfolio_analysis_sheet
+        self.issue_trade_analysis_sheet = issue_trade_analysis_sheet
+        self.issue_transaction_log = issue_transaction_log
+        self.issue_signal_log = issue_signal_log
+        self.issue_config_log = issue_config_log
+        self.issue_daily_portfolio_value_file = issue_daily_portfolio_values_file
+        self.print_stats_to_console = print_stats_to_console
+        self.generate_pnl_chart_per_ticker_in_portfolio_analysis = generate_pnl_chart_per_ticker_in_portfolio_analysis
+        self.display_live_backtest_progress = display_live_backtest_progress
+        self.live_backtest_chart_refresh_frequency = int(live_backtest_chart_refresh_frequency)
+        self.exposure_settings = exposure_settings
+
+    @staticmethod
+    def no_stats() -> "BacktestMonitorSettings":
+        """"
+        Creates Settings that will generate no monitor output
+        """
+        return BacktestMonitorSettings(False, False, False, False, False, False, False, False, False, False, 20, None)
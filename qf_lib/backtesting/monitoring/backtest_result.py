@@ -13,11 +13,14 @@
 #     limitations under the License.
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
+from qf_lib.backtesting.events.event_profiler import EventProfiler
+from qf_lib.backtesting.monitoring.transactions_table import TransactionsTable
 from qf_lib.backtesting.signals.signals_register import SignalsRegister
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
 from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 
 
 class BacktestResult:
@@ -34,4 +37,33 @@ class BacktestResult:
         self.start_date = start_date
         self.end_date = end_date
         self.initial_risk = initial_risk
-        self.transactions = []  # type: List[Transaction]
+        self.transactions_table = None  # type: Optional[TransactionsTable]
+        self.event_profiler = None  # type: Optional[EventProfiler]
+        self._transactions = []  # type: List[Transaction]
+        self._nr_of_converted_transactions = 0  # number of transactions from the transactions_table in _transactions
+
+    @property
+    def transactions(self) -> List[Transaction]:
+        """
+        Transactions of the backtest. If the transactions were recorded in the columnar transactions_table (e.g. by the
+        HeadlessBacktestMonitor), they are converted into the list of Transaction objects. The list is cached and only
+        the transactions recorded since the previous access are converted and appended to it. To count the
+        transactions without converting them, use len(transactions_table).
+        """
+        if self.transactions_table is not None and len(self.transactions_table) > self._nr_of_converted_transactions:
+            self._transactions.extend(self.transactions_table.to_transactions(self._nr_of_converted_transactions))
+            self._nr_of_converted_transactions = len(self.transactions_table)
+
+        return self._transactions
+
+    @transactions.setter
+    def transactions(self, transactions: List[Transaction]):
+        self._transactions = transactions
+        self._nr_of_converted_transactions = len(self.transactions_table) if self.transactions_table is not None else 0
+
+    def event_profiling_stats(self) -> Optional[QFDataFrame]:
+        """
+        Returns the statistics of the event loop (per event type and per listener: number of calls, total, mean,
+        maximum and estimated median and 99th percentile of the wall time) or None if the backtest was not profiled.
+        """
+        return self.event_profiler.stats() if self.event_profiler is not None else None
@@ -0,0 +1,55 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+
+from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
+from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
+from qf_lib.backtesting.monitoring.transactions_table import TransactionsTable
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+
+
+class HeadlessBacktestMonitor(AbstractMonitor):
+    """
+    Lightweight monitor of a backtest, meant for running many backtests (e.g. parameter sweeps), which only keeps
+    the results in memory. It does not display any charts, does not write any files and does not import any plotting
+    or document generation libraries.
+
+    The transactions are recorded in the columnar TransactionsTable of the BacktestResult (BacktestResult.transactions
+    still returns the list of Transaction objects), while the portfolio value series and the signals are stored by the
+    Portfolio and the SignalsRegister of the BacktestResult.
+
+    Parameters
+    ----------
+    backtest_result: BacktestResult
+        result of the backtest, in which the transactions should be recorded
+    """
+
+    def __init__(self, backtest_result: BacktestResult):
+        self.backtest_result = backtest_result
+        self.backtest_result.transactions_table = TransactionsTable()
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+    def real_time_update(self, _: datetime = None):
+        pass
+
+    def end_of_day_update(self, _: datetime = None):
+        pass
+
+    def end_of_trading_update(self, _: datetime = None):
+        self.logger.info(f"Backtest {self.backtest_result.backtest_name} finished: "
+                         f"{len(self.backtest_result.transactions_table)} transactions")
+
+    def record_transaction(self, transaction: Transaction):
+        self.backtest_result.transactions_table.record(transaction)
@@ -0,0 +1,110 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class TransactionsTable:
+    """
+    Columnar store of transactions. For each recorded transaction the fill time, the id of the ticker, the currency and
+    the numeric fields (quantity, price and commission) are appended to preallocated numpy arrays, which grow
+    geometrically whenever their capacity is exceeded.
+
+    The transactions can be converted on demand into a frame (one row per transaction) or back into the list of
+    Transaction objects. The trade_id, account, strategy and broker of the transactions (not used by the backtests)
+    are not stored.
+
+    Parameters
+    -----------
+    initial_capacity: int
+        number of transactions for which the memory is allocated up front
+    """
+
+    FIELDS = ("quantity", "price", "commission")
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._times = []  # type: List[datetime]
+        self._currencies = []  # type: List[Optional[str]]
+        self._unique_tickers = []  # type: List[Ticker]
+        self._tickers_ids = {}  # type: Dict[Ticker, int]
+
+        self._size = 0
+        self._ticker_indices = np.empty(initial_capacity, dtype=np.intp)
+        self._values = np.empty((initial_capacity, len(self.FIELDS)), dtype=np.float64)
+
+    def record(self, transaction: Transaction):
+        """ Appends the transaction to the table. """
+        if self._size == len(self._ticker_indices):
+            new_capacity = max(1, 2 * self._size)
+            self._ticker_indices = np.resize(self._ticker_indices, new_capacity)
+            self._values = np.resize(self._values, (new_capacity, len(self.FIELDS)))
+
+        self._times.append(transaction.transaction_fill_time)
+        self._currencies.append(transaction.currency)
+        self._ticker_indices[self._size] = self._ticker_id(transaction.ticker)
+        self._values[self._size] = (transaction.quantity, transaction.price, transaction.commission)
+        self._size += 1
+
+    @property
+    def tickers(self) -> List[Ticker]:
+        """ Tickers of all recorded transactions (in the order of appearance). """
+        return self._unique_tickers
+
+    def __len__(self):
+        """ Number of recorded transactions. """
+        return self._size
+
+    def to_frame(self) -> QFDataFrame:
+        """
+        Returns the transactions as a frame with one row per transaction, containing the following columns:
+        "time", "ticker", "quantity", "price", "commission" and "net amount".
+        """
+        tickers = np.empty(len(self._unique_tickers), dtype=object)
+        tickers[:] = self._unique_tickers
+
+        quantities, prices, commissions = self._values[:self._size].T
+        return QFDataFrame({
+            "time": np.asarray(self._times, dtype="datetime64[us]"),
+            "ticker": tickers[self._ticker_indices[:self._size]],
+            "quantity": quantities,
+            "price": prices,
+            "commission": commissions,
+            "net amount": quantities * prices - commissions
+        }, columns=["time", "ticker", *self.FIELDS, "net amount"])
+
+    def to_transactions(self, start: int = 0) -> List[Transaction]:
+        """
+        Returns the list of the recorded transactions (in the order in which they were recorded), starting from the
+        transaction with the given position (all transactions by default).
+        """
+        return [
+            Transaction(time, self._unique_tickers[ticker_index], float(quantity), float(price), float(commission),
+                        currency=currency)
+            for time, ticker_index, (quantity, price, commission), currency in zip(
+                self._times[start:], self._ticker_indices[start:self._size], self._values[start:self._size],
+                self._currencies[start:])
+        ]
+
+    def _ticker_id(self, ticker: Ticker) -> int:
+        ticker_id = self._tickers_ids.get(ticker)
+        if ticker_id is None:
+            ticker_id = self._tickers_ids[ticker] = len(self._unique_tickers)
+            self._unique_tickers.append(ticker)
+        return ticker_id
@@ -11,6 +11,7 @@
 #     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
+from typing import Optional
 
 
 class ExecutionStyle:
@@ -53,3 +54,71 @@ class StopOrder(ExecutionStyle):
 
     def __hash__(self):
         return hash((self.__class__.__name__, self.stop_price))
+
+
+class ScheduledOrder(ExecutionStyle):
+    """
+    Base class of the execution styles, which split the Order into child orders executed over the subsequent bars of
+    the trading session (available only in the intraday trading). The remainder of the Order, which was not filled
+    until the market close, expires (TimeInForce.DAY) or is scheduled again over the next trading session
+    (TimeInForce.GTC).
+
+    Parameters
+    ----------
+    max_participation_rate: Optional[float]
+        maximal fraction of the volume of a bar, which may be filled by a child order. If not provided, a child order
+        is limited only by the volume of the bar
+    """
+
+    def __init__(self, max_participation_rate: Optional[float] = None):
+        self.max_participation_rate = max_participation_rate
+
+    def __str__(self):
+        return "{} - max participation rate: {}".format(self.__class__.__name__, self.max_participation_rate)
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+
+        if type(other) is not type(self):
+            return False
+
+        return self.max_participation_rate == other.max_participation_rate
+
+    def __hash__(self):
+        return hash((self.__class__.__name__, self.max_participation_rate))
+
+
+class TWAPOrder(ScheduledOrder):
+    """
+    Order executed evenly over all bars until the market close (Time Weighted Average Price).
+    """
+    pass
+
+
+class VWAPOrder(ScheduledOrder):
+    """
+    Order executed over the bars until the market close proportionally to the volume of the bars (Volume Weighted
+    Average Price). The volume expected until the market close is estimated using the average daily volume of the last
+    20 days. If it is not available, the Order is executed as the TWAPOrder.
+    """
+    pass
+
+
+class POVOrder(ScheduledOrder):
+    """
+    Order executed with the child orders, which fill the given fraction of the volume of each bar (Percentage of
+    Volume), until the whole quantity is filled.
+
+    Parameters
+    ----------
+    participation_rate: float
+        fraction of the volume of each bar filled by the child orders
+    """
+
+    def __init__(self, participation_rate: float):
+        super().__init__(participation_rate)
+
+    @property
+    def participation_rate(self) -> float:
+        return self.max_participation_rate
@@ -0,0 +1,113 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from typing import Sequence, List, Optional
+
+import numpy as np
+
+from qf_lib.backtesting.portfolio.backtest_future_position import BacktestFuturePosition
+from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition
+from qf_lib.common.tickers.tickers import Ticker
+
+
+class OpenPositionsArrays:
+    """
+    Columnar representation of the open positions of the Portfolio. Quantities, average prices, point values, current
+    prices and currencies of all positions are stored in numpy arrays, which makes it possible to update the prices,
+    market values and exposures of all positions at once.
+
+    The BacktestPosition objects remain the owners of the positions state (they are the ones handling transactions).
+    After each transaction the corresponding row needs to be refreshed (see refresh_position) and the arrays need to be
+    recreated whenever any position is opened or closed. After each prices update the current prices are written back
+    to the positions, so that the positions can be still used directly.
+
+    Parameters
+    -----------
+    positions: Sequence[BacktestPosition]
+        open positions
+    """
+
+    def __init__(self, positions: Sequence[BacktestPosition]):
+        self.positions = list(positions)  # type: List[BacktestPosition]
+        self.tickers = [position.ticker() for position in self.positions]  # type: List[Ticker]
+        self._tickers_indices = {ticker: index for index, ticker in enumerate(self.tickers)}
+
+        self.quantities = np.array([position.quantity() for position in self.positions], dtype=np.float64)
+        self.avg_prices = np.array([position._avg_price_per_unit for position in self.positions], dtype=np.float64)
+        self.directions = np.array([position.direction() for position in self.positions], dtype=np.float64)
+        self.realised_pnl = np.array([position._realised_pnl_without_commissions for position in self.positions],
+                                     dtype=np.float64)
+        self.commissions = np.array([position.total_commission() for position in self.positions], dtype=np.float64)
+        self.current_prices = np.array([np.nan if position._current_price is None else position._current_price
+                                        for position in self.positions], dtype=np.float64)
+
+        self.is_margin_position = np.array([isinstance(position, BacktestFuturePosition)
+                                            for position in self.positions], dtype=bool)
+        """ True for positions, which market value is equal to their pnl (futures). """
+        self.point_values = np.array([ticker.point_value if is_margin_position else 1.0 for ticker, is_margin_position
+                                      in zip(self.tickers, self.is_margin_position)], dtype=np.float64)
+
+        currencies_positions = {}
+        self.currency_indices = np.fromiter(
+            (currencies_positions.setdefault(ticker.currency, len(currencies_positions)) for ticker in self.tickers),
+            dtype=np.intp, count=len(self.tickers))
+        self.currencies = list(currencies_positions.keys())  # type: List[Optional[str]]
+        """ Unique currencies of the positions. Currency of each position is given by the currency_indices. """
+
+    def __len__(self):
+        return len(self.positions)
+
+    def refresh_position(self, position: BacktestPosition) -> bool:
+        """
+        Refreshes the quantity, the average price, the realised pnl and the commissions of the position after
+        a transaction. Returns False if the position
+        is not a part of the arrays (e.g. it is a newly opened position), in which case the arrays need to be recreated.
+        """
+        index = self._tickers_indices.get(position.ticker())
+        if index is None or self.positions[index] is not position:
+            return False
+
+        self.quantities[index] = position.quantity()
+        self.avg_prices[index] = position._avg_price_per_unit
+        self.realised_pnl[index] = position._realised_pnl_without_commissions
+        self.commissions[index] = position.total_commission()
+        return True
+
+    def update_prices(self, prices: np.ndarray):
+        """
+        Sets the current prices of all positions (equivalent of calling BacktestPosition.update_price with bid and ask
+        prices equal to the given price). Prices which are not finite are ignored.
+        """
+        is_valid_price = np.isfinite(prices) & (self.quantities != 0)
+        self.current_prices = np.where(is_valid_price, prices, self.current_prices)
+
+        for index in np.flatnonzero(is_valid_price):
+            self.positions[index]._current_price = float(self.current_prices[index])
+
+    def unrealised_pnl(self) -> np.ndarray:
+        """ Unrealised pnl of all positions (see BacktestPosition.unrealised_pnl) expressed in their currencies. """
+        return np.where(np.isnan(self.current_prices), 0.0,
+                        (self.current_prices - self.avg_prices) * (self.quantities * self.point_values))
+
+    def total_pnl(self) -> np.ndarray:
+        """ Total pnl of all positions (see BacktestPosition.total_pnl) expressed in their currencies. """
+        return self.realised_pnl + self.unrealised_pnl() - self.commissions
+
+    def market_values(self) -> np.ndarray:
+        """ Market values of all positions (see BacktestPosition.market_value) expressed in their currencies. """
+        return np.where(self.is_margin_position, self.unrealised_pnl(),
+                        self.quantities * np.nan_to_num(self.current_prices, nan=0.0))
+
+    def total_exposures(self) -> np.ndarray:
+        """ Total exposures of all positions (see BacktestPosition.total_exposure) expressed in their currencies. """
+        return self.quantities * self.point_values * np.nan_to_num(self.current_prices, nan=0.0)
@@ -12,13 +12,18 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence, Iterable
 
-from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition, BacktestPositionSummary
+import numpy as np
+
+from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition
+from qf_lib.backtesting.portfolio.open_positions_arrays import OpenPositionsArrays
 from qf_lib.backtesting.portfolio.position_factory import BacktestPositionFactory
+from qf_lib.backtesting.portfolio.positions_history_table import PositionsHistoryTable
 from qf_lib.backtesting.portfolio.transaction import Transaction
 from qf_lib.backtesting.portfolio.utils import split_transaction_if_needed
 from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.timer import SettableTimer
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.series.prices_series import PricesSeries
@@ -49,15 +54,23 @@ class Portfolio:
         self.open_positions_dict = {}  # type: Dict[Ticker, BacktestPosition]
         """ Represents all open positions at a certain moment. """
 
+        self._open_positions_arrays = None  # type: Optional[OpenPositionsArrays]
+        """ Columnar representation of the open positions used to update all of them at once. It is recreated
+        whenever a position is opened or closed. """
+
+        self._exchange_rates_cache = {}  # type: Dict[str, float]
+        self._exchange_rates_cache_time = None  # type: Optional[datetime]
+        """ Exchange rates already looked up at the current time (the cache is cleared whenever the time changes). """
+
         # dates and portfolio values are kept separately because it is inefficient to append to the QFSeries
         # use get_portfolio_timeseries() to get them as a series.
         self._dates = []  # type: List[datetime]
         self._portfolio_values = []  # type: List[float]
         self._leverage_list = []  # type: List[float]
 
-        self._positions_history = []  # type: List[Dict[Ticker, BacktestPositionSummary]]
-        """ A list containing dictionaries with summarized assets information in form of BacktestPositionSummary
-        objects, which provide information about open positions at a certain point of time. """
+        self._positions_history = PositionsHistoryTable()
+        """ Columnar store containing the quantities, market values, exposures, pnl and directions of all positions
+        open at each of the recorded points of time. """
 
         self._closed_positions = []  # type: List[BacktestPosition]
         """ List of all closed positions created throughout the backtest. """
@@ -69,13 +82,25 @@ class Portfolio:
         if currency == self.currency:
             return 1.
 
-        if isinstance(self.data_provider, ExchangeRateProvider):
-            return self.data_provider.get_last_available_exchange_rate(currency, self.currency,
-                                                                       frequency=self.data_provider.frequency)
-        else:
+        if not isinstance(self.data_provider, ExchangeRateProvider):
             raise NotImplementedError(f"Portfolio currency is set to {self.currency} but {type(self.data_provider)} "
                                       "does not extend ExchangeRateProvider.")
 
+        # Rates are cached only in backtests, where the time changes only when the SettableTimer is moved
+        timer = getattr(self.data_provider, "timer", None)
+        current_time = timer.now() if isinstance(timer, SettableTimer) else None
+        if current_time is None or current_time != self._exchange_rates_cache_time:
+            self._exchange_rates_cache = {}
+            self._exchange_rates_cache_time = current_time
+
+        exchange_rate = self._exchange_rates_cache.get(currency)
+        if exchange_rate is None:
+            exchange_rate = self.data_provider.get_last_available_exchange_rate(
+                currency, self.currency, frequency=self.data_provider.frequency)
+            if current_time is not None:
+                self._exchange_rates_cache[currency] = exchange_rate
+        return exchange_rate
+
     def net_liquidation_in_currency(self, currency: str = None) -> float:
         """Converts the current net liquidation from the portfolio currency into the specified currency"""
         if currency == self.currency:
@@ -90,31 +115,34 @@ class Portfolio:
         Adjusts positions to account for a transaction.
         Handles any new position or modification to a current position
         """
-        transaction_cost = 0.0
+        transaction_cost = self._transact_on_positions(transaction)
 
-        existing_position = self.open_positions_dict.get(transaction.ticker, None)
+        if self.currency is not None:
+            self.current_cash += transaction_cost*self._current_exchange_rate(transaction.ticker.currency)
+        else:
+            self.current_cash += transaction_cost
 
-        if existing_position is None:  # open new, empty position
-            new_position = self._create_new_position(transaction)
-            transaction_cost += new_position.transact_transaction(transaction)
-        else:  # there is already an existing position
-            results_in_opposite_direction, basic_transaction, remaining_transaction \
-                = split_transaction_if_needed(existing_position.quantity(), transaction)
+        self._refresh_open_positions_arrays([transaction.ticker])
 
-            transaction_cost += existing_position.transact_transaction(basic_transaction)
-            if existing_position.is_closed():
-                ticker = transaction.ticker
-                self.open_positions_dict.pop(ticker)
-                self._closed_positions.append(existing_position)
+    def transact_transactions(self, transactions: Sequence[Transaction]):
+        """
+        Adjusts positions to account for all given transactions (in the given order). It is an equivalent of calling
+        transact_transaction for each of the transactions, but the cash is updated (using the array of cash moves of
+        all transactions) and the columnar representation of the open positions is refreshed only once.
+        """
+        if not transactions:
+            return
 
-            if results_in_opposite_direction:  # means we were going from Long to Short in one transaction
-                new_position = self._create_new_position(remaining_transaction)
-                transaction_cost += new_position.transact_transaction(remaining_transaction)
+        transaction_costs = np.fromiter((self._transact_on_positions(transaction) for transaction in transactions),
+                                        dtype=np.float64, count=len(transactions))
 
         if self.currency is not None:
-            self.current_cash += transaction_cost*self._current_exchange_rate(transaction.ticker.currency)
-        else:
-            self.current_cash += transaction_cost
+            exchange_rates = np.array([self._current_exchange_rate(transaction.ticker.currency)
+                                       for transaction in transactions], dtype=np.float64)
+            transaction_costs *= exchange_rates
+
+        self.current_cash += float(np.sum(transaction_costs))
+        self._refresh_open_positions_arrays({transaction.ticker for transaction in transactions})
 
     def update(self, record=False):
         """
@@ -123,31 +151,33 @@ class Portfolio:
         If the flag record is set to True, it records the current assets values and the portfolio value (this is
         performed once per day, after the market close).
         """
+        positions_arrays = self._get_open_positions_arrays()
+        current_prices_series = self.data_provider.get_last_available_price(tickers=positions_arrays.tickers)
+
         self.net_liquidation = self.current_cash
         self.gross_exposure_of_positions = 0
 
-        tickers = list(self.open_positions_dict.keys())
-        current_prices_series = self.data_provider.get_last_available_price(tickers=tickers)
-
-        current_positions = {}
-        for ticker, position in self.open_positions_dict.items():
-            security_price = current_prices_series[ticker]
-            position.update_price(bid_price=security_price, ask_price=security_price)
-            position_value = position.market_value()
-            position_exposure = position.total_exposure()
+        if len(positions_arrays) > 0:
+            positions_arrays.update_prices(current_prices_series.reindex(positions_arrays.tickers).to_numpy(float))
 
-            current_exchange_rate = self._current_exchange_rate(ticker.currency) if self.currency is not None else 1.
-            self.net_liquidation += position_value*current_exchange_rate
-            self.gross_exposure_of_positions += abs(position_exposure)*current_exchange_rate
+            if self.currency is not None:
+                exchange_rates = np.array([self._current_exchange_rate(currency)
+                                           for currency in positions_arrays.currencies], dtype=np.float64)
+                current_exchange_rates = exchange_rates[positions_arrays.currency_indices]
+            else:
+                current_exchange_rates = 1.
 
-            if record:
-                current_positions[ticker] = BacktestPositionSummary(position)
+            self.net_liquidation += float(np.sum(positions_arrays.market_values() * current_exchange_rates))
+            self.gross_exposure_of_positions += float(np.sum(
+                np.abs(positions_arrays.total_exposures()) * current_exchange_rates))
 
         if record:
             self._dates.append(self.data_provider.timer.now())
             self._portfolio_values.append(self.net_liquidation)
             self._leverage_list.append(self.gross_exposure_of_positions / self.net_liquidation)
-            self._positions_history.append(current_positions)
+            self._positions_history.record(self._dates[-1], positions_arrays.tickers, positions_arrays.quantities,
+                                           positions_arrays.market_values(), positions_arrays.total_exposures(),
+                                           positions_arrays.total_pnl(), positions_arrays.directions)
 
     def portfolio_eod_series(self) -> PricesSeries:
         """
@@ -165,13 +195,65 @@ class Portfolio:
 
     def positions_history(self) -> QFDataFrame:
         """
-        Returns a QFDataFrame containing summary of the positions in the portfolio for each day.
+        Returns a QFDataFrame containing summary of the positions in the portfolio for each day (in form of
+        BacktestPositionSummary objects). In order to avoid creating the objects, use positions_history_table instead.
+        """
+        return self._positions_history.to_summaries_frame()
+
+    def positions_history_table(self) -> PositionsHistoryTable:
+        """
+        Returns the columnar history of the positions in the portfolio, which can be converted into a numeric frame
+        (e.g. positions_history_table().to_wide_frame("total exposure")).
         """
-        return QFDataFrame(data=self._positions_history, index=self._dates)
+        return self._positions_history
 
     def closed_positions(self) -> List[BacktestPosition]:
         return self._closed_positions
 
+    def _get_open_positions_arrays(self) -> OpenPositionsArrays:
+        if self._open_positions_arrays is None or len(self._open_positions_arrays) != len(self.open_positions_dict):
+            self._open_positions_arrays = OpenPositionsArrays(self.open_positions_dict.values())
+        return self._open_positions_arrays
+
+    def _transact_on_positions(self, transaction: Transaction) -> float:
+        """
+        Applies the transaction to the corresponding position (opening, closing or reversing it if necessary) and
+        returns the transaction cost expressed in the currency of the ticker.
+        """
+        transaction_cost = 0.0
+
+        existing_position = self.open_positions_dict.get(transaction.ticker, None)
+
+        if existing_position is None:  # open new, empty position
+            new_position = self._create_new_position(transaction)
+            transaction_cost += new_position.transact_transaction(transaction)
+        else:  # there is already an existing position
+            results_in_opposite_direction, basic_transaction, remaining_transaction \
+                = split_transaction_if_needed(existing_position.quantity(), transaction)
+
+            transaction_cost += existing_position.transact_transaction(basic_transaction)
+            if existing_position.is_closed():
+                ticker = transaction.ticker
+                self.open_positions_dict.pop(ticker)
+                self._closed_positions.append(existing_position)
+
+            if results_in_opposite_direction:  # means we were going from Long to Short in one transaction
+                new_position = self._create_new_position(remaining_transaction)
+                transaction_cost += new_position.transact_transaction(remaining_transaction)
+
+        return transaction_cost
+
+    def _refresh_open_positions_arrays(self, tickers: Iterable[Ticker]):
+        """ Refreshes the rows of the given tickers or drops the arrays if any of the positions was opened or closed. """
+        if self._open_positions_arrays is None:
+            return
+
+        for ticker in tickers:
+            position = self.open_positions_dict.get(ticker, None)
+            if position is None or not self._open_positions_arrays.refresh_position(position):
+                self._open_positions_arrays = None
+                return
+
     def _create_new_position(self, transaction: Transaction):
         new_position = BacktestPositionFactory.create_position(transaction.ticker)
         self.open_positions_dict[transaction.ticker] = new_position
@@ -0,0 +1,143 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Sequence, List, Dict
+
+import numpy as np
+
+from qf_lib.backtesting.portfolio.backtest_position import BacktestPositionSummary
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class PositionsHistoryTable:
+    """
+    Columnar store of the history of open positions in the portfolio. Each time the positions are recorded, one row
+    per open position is appended, containing the index of the recording date, the id of the ticker and the numeric
+    fields describing the position (quantity, market value, total exposure, total pnl and direction). The rows are
+    kept in preallocated numpy arrays, which grow geometrically whenever their capacity is exceeded.
+
+    The history can be converted on demand into a tidy frame (one row per date and open position), a wide frame of
+    a single field (dates x tickers) or the frame of BacktestPositionSummary objects.
+
+    Parameters
+    -----------
+    initial_capacity: int
+        number of rows (positions) for which the memory is allocated up front
+    """
+
+    FIELDS = ("quantity", "market value", "total exposure", "total pnl", "direction")
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._dates = []  # type: List[datetime]
+        self._unique_tickers = []  # type: List[Ticker]
+        self._tickers_ids = {}  # type: Dict[Ticker, int]
+
+        self._size = 0
+        self._date_indices = np.empty(initial_capacity, dtype=np.intp)
+        self._ticker_indices = np.empty(initial_capacity, dtype=np.intp)
+        self._values = np.empty((initial_capacity, len(self.FIELDS)), dtype=np.float64)
+
+    def record(self, date: datetime, tickers: Sequence[Ticker], quantities: Sequence[float],
+               market_values: Sequence[float], total_exposures: Sequence[float], total_pnl: Sequence[float],
+               directions: Sequence[int]):
+        """
+        Records the state of all positions open at the given date (all sequences need to have the same length as the
+        tickers sequence). The values should be expressed in the currencies of the positions.
+        """
+        self._dates.append(date)
+        number_of_positions = len(tickers)
+        self._reserve(self._size + number_of_positions)
+
+        rows = slice(self._size, self._size + number_of_positions)
+        self._date_indices[rows] = len(self._dates) - 1
+        self._ticker_indices[rows] = [self._ticker_id(ticker) for ticker in tickers]
+        self._values[rows] = np.column_stack((quantities, market_values, total_exposures, total_pnl, directions)) \
+            if number_of_positions > 0 else np.empty((0, len(self.FIELDS)))
+        self._size += number_of_positions
+
+    @property
+    def dates(self) -> List[datetime]:
+        """ All dates, at which the positions were recorded. """
+        return self._dates
+
+    @property
+    def tickers(self) -> List[Ticker]:
+        """ Tickers of all positions, which were ever recorded (in the order of appearance). """
+        return self._unique_tickers
+
+    def __len__(self):
+        """ Number of recorded positions (summed over all dates). """
+        return self._size
+
+    def to_tidy_frame(self) -> QFDataFrame:
+        """
+        Returns the history as a frame with one row per date and open position, containing the following columns:
+        "date", "ticker", "quantity", "market value", "total exposure", "total pnl" and "direction".
+        """
+        tickers = np.empty(len(self._unique_tickers), dtype=object)
+        tickers[:] = self._unique_tickers
+
+        data = {
+            "date": np.asarray(self._dates, dtype="datetime64[us]")[self._date_indices[:self._size]]
+            if self._dates else np.array([], dtype="datetime64[us]"),
+            "ticker": tickers[self._ticker_indices[:self._size]]
+        }
+        data.update({field: self._values[:self._size, i] for i, field in enumerate(self.FIELDS)})
+        return QFDataFrame(data, columns=["date", "ticker", *self.FIELDS])
+
+    def to_wide_frame(self, field: str = "total exposure") -> QFDataFrame:
+        """
+        Returns the values of the given field as a frame indexed by dates, with one column per ticker. If there was
+        no open position for a ticker at a certain date, the value is NaN.
+
+        Parameters
+        ----------
+        field: str
+            one of the PositionsHistoryTable.FIELDS, by default "total exposure"
+        """
+        values = np.full((len(self._dates), len(self._unique_tickers)), np.nan)
+        values[self._date_indices[:self._size], self._ticker_indices[:self._size]] = \
+            self._values[:self._size, self.FIELDS.index(field)]
+        return QFDataFrame(values, index=self._dates, columns=self._unique_tickers)
+
+    def to_summaries_frame(self) -> QFDataFrame:
+        """
+        Returns the history in the form of a frame of BacktestPositionSummary objects (indexed by dates, with one
+        column per ticker).
+        """
+        summaries = np.full((len(self._dates), len(self._unique_tickers)), np.nan, dtype=object)
+        for date_index, ticker_index, (_, market_value, total_exposure, total_pnl, direction) in zip(
+                self._date_indices[:self._size], self._ticker_indices[:self._size], self._values[:self._size]):
+            summaries[date_index, ticker_index] = BacktestPositionSummary.from_values(
+                self._unique_tickers[ticker_index], float(total_exposure), float(market_value), float(total_pnl),
+                int(direction))
+
+        return QFDataFrame(summaries, index=self._dates, columns=self._unique_tickers)
+
+    def _ticker_id(self, ticker: Ticker) -> int:
+        ticker_id = self._tickers_ids.get(ticker)
+        if ticker_id is None:
+            ticker_id = self._tickers_ids[ticker] = len(self._unique_tickers)
+            self._unique_tickers.append(ticker)
+        return ticker_id
+
+    def _reserve(self, capacity: int):
+        if capacity <= len(self._date_indices):
+            return
+
+        new_capacity = max(capacity, 2 * len(self._date_indices))
+        self._date_indices = np.resize(self._date_indices, new_capacity)
+        self._ticker_indices = np.resize(self._ticker_indices, new_capacity)
+        self._values = np.resize(self._values, (new_capacity, len(self.FIELDS)))
@@ -0,0 +1,241 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from typing import Sequence, List, Iterator, Union, Optional
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class TradesTable:
+    """
+    Columnar container of trades. Instead of keeping a list of Trade objects, the trades are stored as a structure
+    of numpy arrays (start times, end times, tickers ids, pnl, commissions, directions and percentage pnl), which makes
+    it possible to compute trades statistics in a vectorized way and significantly reduces the memory usage.
+
+    For compatibility with the code consuming sequences of Trades, the table may be iterated over (Trade objects
+    are created on the fly), indexed with an integer (returns a Trade) or with a slice / boolean mask / array of
+    positions (returns a TradesTable).
+
+    Parameters
+    -----------
+    start_times: Sequence
+        moments when the positions corresponding to the trades were opened
+    end_times: Sequence
+        moments when the trades were closed
+    tickers: Sequence[Ticker]
+        tickers of all trades (one per trade)
+    pnl: Sequence[float]
+        profit or loss associated with each trade expressed in currency units including transaction costs and
+        commissions
+    commission: Sequence[float]
+        all the transaction costs related to each trade, expressed in currency units
+    direction: Sequence[int]
+        direction of each position: Long = 1, Short = -1
+    percentage_pnl: Optional[Sequence[float]]
+        total pnl of each trade divided by the most recent value of the portfolio. If not provided, it is set to NaN
+    """
+
+    def __init__(self, start_times: Sequence, end_times: Sequence, tickers: Sequence[Ticker], pnl: Sequence[float],
+                 commission: Sequence[float], direction: Sequence[int],
+                 percentage_pnl: Optional[Sequence[float]] = None):
+        unique_tickers, tickers_ids = self._factorize_tickers(tickers)
+        self._init_columns(pd.DatetimeIndex(start_times).values, pd.DatetimeIndex(end_times).values, unique_tickers,
+                           tickers_ids, pnl, commission, direction, percentage_pnl)
+
+    def _init_columns(self, start_times: np.ndarray, end_times: np.ndarray, unique_tickers: np.ndarray,
+                      tickers_ids: np.ndarray, pnl, commission, direction, percentage_pnl):
+        self._start_times = start_times
+        self._end_times = end_times
+        self._unique_tickers = unique_tickers
+        self._tickers_ids = np.asarray(tickers_ids, dtype=np.intp)
+        self._pnl = np.asarray(pnl, dtype=np.float64)
+        self._commission = np.asarray(commission, dtype=np.float64)
+        self._direction = np.asarray(direction, dtype=np.int64)
+        self._percentage_pnl = np.full(len(self._pnl), np.nan) if percentage_pnl is None else \
+            np.asarray([np.nan if value is None else value for value in percentage_pnl], dtype=np.float64)
+
+        lengths = {len(column) for column in (self._start_times, self._end_times, self._tickers_ids, self._pnl,
+                                              self._commission, self._direction, self._percentage_pnl)}
+        if len(lengths) > 1:
+            raise ValueError("All columns of the TradesTable need to have the same length")
+
+    @classmethod
+    def _from_columns(cls, start_times: np.ndarray, end_times: np.ndarray, unique_tickers: np.ndarray,
+                      tickers_ids: np.ndarray, pnl: np.ndarray, commission: np.ndarray, direction: np.ndarray,
+                      percentage_pnl: np.ndarray) -> "TradesTable":
+        trades_table = cls.__new__(cls)
+        trades_table._init_columns(start_times, end_times, unique_tickers, tickers_ids, pnl, commission, direction,
+                                   percentage_pnl)
+        return trades_table
+
+    @classmethod
+    def empty(cls) -> "TradesTable":
+        return cls([], [], [], [], [], [])
+
+    @classmethod
+    def from_trades(cls, trades: Sequence[Trade]) -> "TradesTable":
+        """ Creates the TradesTable containing all the given Trades. """
+        if isinstance(trades, TradesTable):
+            return trades
+
+        return cls(
+            start_times=[t.start_time for t in trades],
+            end_times=[t.end_time for t in trades],
+            tickers=[t.ticker for t in trades],
+            pnl=[t.pnl for t in trades],
+            commission=[t.commission for t in trades],
+            direction=[t.direction for t in trades],
+            percentage_pnl=[t.percentage_pnl for t in trades]
+        )
+
+    @classmethod
+    def concatenate(cls, trades_tables: Sequence["TradesTable"]) -> "TradesTable":
+        """ Concatenates all the given tables into one TradesTable (the order of trades is preserved). """
+        if len(trades_tables) == 0:
+            return cls.empty()
+
+        unique_tickers, ids_mappings = cls._factorize_tickers(
+            [ticker for table in trades_tables for ticker in table._unique_tickers])
+        offsets = np.cumsum([0] + [len(table._unique_tickers) for table in trades_tables])
+        tickers_ids = [ids_mappings[offset:offset + len(table._unique_tickers)][table._tickers_ids]
+                       for offset, table in zip(offsets, trades_tables)]
+
+        def concat(column_name: str):
+            return np.concatenate([getattr(table, column_name) for table in trades_tables])
+
+        return cls._from_columns(concat("_start_times"), concat("_end_times"), unique_tickers,
+                                 np.concatenate(tickers_ids), concat("_pnl"), concat("_commission"),
+                                 concat("_direction"), concat("_percentage_pnl"))
+
+    def to_trades(self) -> List[Trade]:
+        """ Converts the table into a list of Trade objects. """
+        return list(self)
+
+    def to_dataframe(self) -> QFDataFrame:
+        """
+        Returns a dataframe containing all the trades (one trade per row), with the following columns: "start time",
+        "end time", "ticker", "pnl", "commission", "direction", "percentage pnl".
+        """
+        return QFDataFrame({
+            "start time": self._start_times,
+            "end time": self._end_times,
+            "ticker": self.tickers,
+            "pnl": self._pnl,
+            "commission": self._commission,
+            "direction": self._direction,
+            "percentage pnl": self._percentage_pnl
+        })
+
+    def sort_by_time(self) -> "TradesTable":
+        """ Returns the table sorted by the end time and the start time of trades. """
+        return self[np.lexsort((self._start_times, self._end_times))]
+
+    @property
+    def start_times(self) -> np.ndarray:
+        return self._start_times
+
+    @property
+    def end_times(self) -> np.ndarray:
+        return self._end_times
+
+    @property
+    def tickers(self) -> np.ndarray:
+        """ Array containing the ticker of each trade. """
+        return self._unique_tickers[self._tickers_ids]
+
+    @property
+    def tickers_ids(self) -> np.ndarray:
+        """ Array containing, for each trade, the position of its ticker in the unique_tickers array. """
+        return self._tickers_ids
+
+    @property
+    def unique_tickers(self) -> np.ndarray:
+        return self._unique_tickers
+
+    @property
+    def pnl(self) -> np.ndarray:
+        return self._pnl
+
+    @property
+    def commission(self) -> np.ndarray:
+        return self._commission
+
+    @property
+    def direction(self) -> np.ndarray:
+        return self._direction
+
+    @property
+    def percentage_pnl(self) -> np.ndarray:
+        return self._percentage_pnl
+
+    def __len__(self):
+        return len(self._pnl)
+
+    def __iter__(self) -> Iterator[Trade]:
+        for i in range(len(self)):
+            yield self._trade(i)
+
+    def __getitem__(self, item: Union[int, slice, np.ndarray, Sequence]) -> Union[Trade, "TradesTable"]:
+        if isinstance(item, (int, np.integer)):
+            return self._trade(range(len(self))[item])
+
+        return self._from_columns(self._start_times[item], self._end_times[item], self._unique_tickers,
+                                  self._tickers_ids[item], self._pnl[item], self._commission[item],
+                                  self._direction[item], self._percentage_pnl[item])
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+
+        if not isinstance(other, TradesTable):
+            return False
+
+        return len(self) == len(other) and \
+            np.array_equal(self._start_times, other._start_times) and \
+            np.array_equal(self._end_times, other._end_times) and \
+            np.array_equal(self.tickers, other.tickers) and \
+            np.array_equal(self._pnl, other._pnl, equal_nan=True) and \
+            np.array_equal(self._commission, other._commission, equal_nan=True) and \
+            np.array_equal(self._direction, other._direction) and \
+            np.array_equal(self._percentage_pnl, other._percentage_pnl, equal_nan=True)
+
+    def __str__(self):
+        return "\n".join(str(trade) for trade in self)
+
+    def _trade(self, i: int) -> Trade:
+        # The missing percentage pnl is not passed, so that the Trade gets its default value
+        percentage_pnl = self._percentage_pnl[i]
+        optional_kwargs = {} if np.isnan(percentage_pnl) else {"percentage_pnl": float(percentage_pnl)}
+
+        return Trade(start_time=pd.Timestamp(self._start_times[i]).to_pydatetime(),
+                     end_time=pd.Timestamp(self._end_times[i]).to_pydatetime(),
+                     ticker=self._unique_tickers[self._tickers_ids[i]],
+                     pnl=float(self._pnl[i]),
+                     commission=float(self._commission[i]),
+                     direction=int(self._direction[i]),
+                     **optional_kwargs)
+
+    @staticmethod
+    def _factorize_tickers(tickers: Sequence[Ticker]):
+        """ Returns the array of unique tickers (in the order of appearance) and the ids of all tickers. """
+        tickers_positions = {}
+        tickers_ids = np.fromiter((tickers_positions.setdefault(ticker, len(tickers_positions)) for ticker in tickers),
+                                  dtype=np.intp, count=len(tickers))
+        unique_tickers = np.empty(len(tickers_positions), dtype=object)
+        unique_tickers[:] = list(tickers_positions.keys())
+        return unique_tickers, tickers_ids
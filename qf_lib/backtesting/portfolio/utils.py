@@ -46,12 +46,12 @@ def split_transaction_if_needed(existing_quantity: float, transaction: Transacti
 
     if sign_before * sign_after == -1:
         closing_quantity = -existing_quantity
-        closing_transaction = copy.deepcopy(transaction)
+        closing_transaction = copy.copy(transaction)
         closing_transaction.quantity = closing_quantity
         closing_transaction.commission = transaction.commission * (closing_quantity / transaction.quantity)
 
         remaining_quantity = transaction.quantity - closing_quantity
-        remaining_transaction = copy.deepcopy(transaction)
+        remaining_transaction = copy.copy(transaction)
         remaining_transaction.quantity = remaining_quantity
         remaining_transaction.commission = transaction.commission * (remaining_quantity / transaction.quantity)
         return True, closing_transaction, remaining_transaction
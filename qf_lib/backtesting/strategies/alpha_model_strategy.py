@@ -163,6 +163,10 @@ class AlphaModelStrategy(AbstractStrategy):
         signals = []
 
         for model, tickers in self._model_tickers_dict.items():
+            if self._supports_batch_signals(model):
+                signals.extend(self._calculate_signals_in_batch(model, tickers, current_positions))
+                continue
+
             for ticker in set(tickers):
                 try:
                     current_exposure = self._get_current_exposure(ticker, current_positions)
@@ -173,6 +177,31 @@ class AlphaModelStrategy(AbstractStrategy):
 
         return signals
 
+    @staticmethod
+    def _supports_batch_signals(model: AlphaModel) -> bool:
+        return getattr(type(model), "get_signals", AlphaModel.get_signals) is not AlphaModel.get_signals
+
+    def _calculate_signals_in_batch(self, model: AlphaModel, tickers: Sequence[Ticker],
+                                    current_positions: List[Position]) -> List[Signal]:
+        """
+        Calculates the signals for all tickers of the model with a single call to AlphaModel.get_signals. Tickers, for
+        which no valid ticker exists at the moment (e.g. FutureTickers without a valid contract), are skipped.
+        """
+        valid_tickers = []
+        current_exposures = []
+
+        for ticker in set(tickers):
+            try:
+                current_exposures.append(self._get_current_exposure(ticker, current_positions))
+                valid_tickers.append(ticker)
+            except NoValidTickerException:
+                pass
+
+        if not valid_tickers:
+            return []
+
+        return model.get_signals(valid_tickers, current_exposures, self.timer.now(), self._frequency)
+
     def _place_orders(self, signals):
         self.logger.info("Converting Signals to Orders using: {}".format(self._position_sizer.__class__.__name__))
         orders = self._position_sizer.size_signals(signals, self._use_stop_losses, self._time_in_force, self._frequency)
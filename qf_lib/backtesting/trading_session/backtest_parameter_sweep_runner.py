@@ -0,0 +1,258 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Sequence, Union, Optional, Type
+
+from joblib import Parallel, delayed
+
+from qf_lib.analysis.timeseries_analysis.timeseries_analysis import TimeseriesAnalysis
+from qf_lib.backtesting.events.time_event.periodic_event.periodic_event import PeriodicEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.regular_time_event import RegularTimeEvent
+from qf_lib.backtesting.events.time_event.time_event import TimeEvent
+from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
+from qf_lib.backtesting.trading_session.backtest_trading_session import BacktestTradingSession
+from qf_lib.backtesting.trading_session.backtest_trading_session_builder import BacktestTradingSessionBuilder
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+from qf_lib.data_providers.data_bundle_storage import save_data_bundle, load_data_bundle
+from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+EVENTS_CONFIGURATION_ATTRIBUTES = ("_trigger_time", "_trigger_time_rule", "_run_over_weekends", "frequency", "start_time",
+                                   "end_time")
+""" Class attributes of the time events, which define their trigger times. """
+
+SUMMARY_STATS = ("total_return", "cagr", "annualised_vol", "sharpe_ratio", "sortino_ratio", "calmar_ratio",
+                 "max_drawdown", "nr_of_transactions", "final_portfolio_value")
+
+
+class BacktestParameterSweepRunner:
+    """
+    Runs full, event-driven backtests for many sets of parameters in parallel. As opposed to looping over a script
+    building a new session for every set of parameters, the data of all tickers is preloaded only once, in the main
+    process, and stored in a memory-mapped data bundle. The worker processes attach to the same file, so the preloaded
+    data is shared between them instead of being downloaded or copied for every backtest.
+
+    Each worker creates a PresetDataProvider over the shared data bundle, builds its own session with the
+    BacktestTradingSessionBuilder returned by session_builder_factory, creates the strategy and runs the backtest.
+    The data provider does not provide exchange rates, so the sessions should not use portfolio currency conversion.
+    The class-level configuration of all the regular and periodic time events (e.g. the trigger times set with
+    set_trigger_time, exclude_weekends or the start time, end time and frequency of the PeriodicEvents), set in the main
+    process at the time of calling run, is passed to the worker processes.
+
+    Parameters
+    ----------
+    session_builder_factory: Callable[[Dict[str, Any]], BacktestTradingSessionBuilder]
+        function, which returns a configured BacktestTradingSessionBuilder for the given set of parameters (e.g. with
+        the frequency, commission and slippage models set). The data provider of the builder is always replaced with
+        the one using the preloaded data
+    strategy_factory: Callable[[BacktestTradingSession, Dict[str, Any]], Any]
+        function, which creates the strategy for the given trading session and set of parameters and subscribes it
+        to the events (e.g. to the CalculateAndPlaceOrdersRegularEvent)
+    data_provider: AbstractPriceDataProvider
+        data provider used to preload the data
+    tickers: Ticker, Sequence[Ticker]
+        tickers, which data should be preloaded
+    start_date: datetime
+        start date of the backtests
+    end_date: datetime
+        end date of the backtests
+    frequency: Frequency
+        frequency of the preloaded data
+    time_delta: Optional[RelativeDelta]
+        time delta, which is subtracted from the start date to preload the additional history (1 year by default)
+    n_jobs: int
+        number of worker processes running the backtests (see joblib.Parallel)
+    generate_reports: bool
+        if False (default), the HeadlessBacktestMonitor is used, so no PDF documents, Excel or csv files are written
+        and no live charts are displayed. If True, the monitor configured by the session_builder_factory is used
+    """
+
+    def __init__(self, session_builder_factory: Callable[[Dict[str, Any]], BacktestTradingSessionBuilder],
+                 strategy_factory: Callable[[BacktestTradingSession, Dict[str, Any]], Any],
+                 data_provider: AbstractPriceDataProvider, tickers: Union[Ticker, Sequence[Ticker]],
+                 start_date: datetime, end_date: datetime, frequency: Frequency = Frequency.DAILY,
+                 time_delta: Optional[RelativeDelta] = None, n_jobs: int = 1, generate_reports: bool = False):
+        self.session_builder_factory = session_builder_factory
+        self.strategy_factory = strategy_factory
+        self.data_provider = data_provider
+        self.tickers, _ = convert_to_list(tickers, Ticker)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.frequency = frequency
+        self.time_delta = time_delta if time_delta is not None else RelativeDelta(years=1)
+        self.n_jobs = n_jobs
+        self.generate_reports = generate_reports
+
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+    def run(self, parameters_sets: Sequence[Dict[str, Any]]) -> QFDataFrame:
+        """
+        Runs one backtest for each set of parameters.
+
+        Parameters
+        ----------
+        parameters_sets: Sequence[Dict[str, Any]]
+            sets of parameters, each of which is passed to the session_builder_factory and strategy_factory
+
+        Returns
+        -------
+        QFDataFrame
+            table with one row per set of parameters (in the same order), containing the parameters and the summary
+            statistics of the backtest (total return, CAGR, annualised volatility, Sharpe, Sortino and Calmar ratios,
+            max drawdown, number of transactions and the final portfolio value). If any of the backtests fails, its
+            exception is raised
+        """
+        self.logger.info(f"{len(parameters_sets)} parameters sets to be backtested")
+
+        # The configuration of events is stored in class attributes, which are not shared with the worker processes
+        events_configuration = _get_events_configuration()
+
+        shared_data_dir = tempfile.mkdtemp(prefix="backtest_parameter_sweep_")
+        try:
+            data_provider_kwargs = self._preload_data(os.path.join(shared_data_dir, "prices"))
+
+            with Parallel(n_jobs=self.n_jobs, return_as="generator") as parallel:
+                results = parallel(
+                    delayed(_run_backtest)(self.session_builder_factory, self.strategy_factory, parameters,
+                                           self.start_date, self.end_date, data_provider_kwargs,
+                                           events_configuration, self.generate_reports)
+                    for parameters in parameters_sets
+                )
+                summary_stats = self._collect_results(results, len(parameters_sets))
+        finally:
+            shutil.rmtree(shared_data_dir, ignore_errors=True)
+
+        return QFDataFrame([{**parameters, **stats} for parameters, stats in zip(parameters_sets, summary_stats)])
+
+    def _preload_data(self, directory: str) -> Dict[str, Any]:
+        """
+        Preloads the data of all tickers and stores it in the given directory. Returns the arguments, which are
+        necessary to create the PresetDataProvider using the stored data bundle.
+        """
+        self.logger.info("Preloading the data")
+        prefetching_data_provider = PrefetchingDataProvider(
+            self.data_provider, sorted(self.tickers), sorted(PriceField.ohlcv()), self.start_date - self.time_delta,
+            self.end_date, self.frequency, timer=self.data_provider.timer)
+
+        save_data_bundle(prefetching_data_provider.data_bundle.astype(float), directory)
+        return {
+            "directory": directory,
+            "start_date": prefetching_data_provider.start_date,
+            "end_date": prefetching_data_provider.end_date,
+            "frequency": self.frequency,
+            "exp_dates": prefetching_data_provider.exp_dates
+        }
+
+    def _collect_results(self, results, nr_of_backtests: int):
+        summary_stats = []
+        start_time = time.monotonic()
+
+        for stats in results:
+            summary_stats.append(stats)
+
+            nr_of_finished_backtests = len(summary_stats)
+            elapsed_time = time.monotonic() - start_time
+            remaining_time = elapsed_time / nr_of_finished_backtests * (nr_of_backtests - nr_of_finished_backtests)
+            self.logger.info(f"{nr_of_finished_backtests} / {nr_of_backtests} backtests finished. "
+                             f"Elapsed time: {timedelta(seconds=round(elapsed_time))}, "
+                             f"ETA: {timedelta(seconds=round(remaining_time))}")
+
+        return summary_stats
+
+
+def _run_backtest(session_builder_factory: Callable[[Dict[str, Any]], BacktestTradingSessionBuilder],
+                  strategy_factory: Callable[[BacktestTradingSession, Dict[str, Any]], Any],
+                  parameters: Dict[str, Any], start_date: datetime, end_date: datetime,
+                  data_provider_kwargs: Dict[str, Any], events_configuration: Dict[Type[TimeEvent], Dict[str, Any]],
+                  generate_reports: bool) -> Dict[str, float]:
+    """ Runs a single backtest in the worker process and returns its summary statistics. """
+    logger = qf_logger.getChild(BacktestParameterSweepRunner.__name__)
+    try:
+        data_provider_kwargs = dict(data_provider_kwargs)
+        data_bundle = load_data_bundle(data_provider_kwargs.pop("directory"), memory_map=True)
+        data_provider = PresetDataProvider(data_bundle, **data_provider_kwargs)
+
+        _set_events_configuration(events_configuration)
+
+        session_builder = session_builder_factory(parameters)
+        session_builder.set_data_provider(data_provider)
+        if not generate_reports:
+            session_builder.set_headless_monitor(True)
+
+        ts = session_builder.build(start_date, end_date)
+        strategy_factory(ts, parameters)
+        ts.start_trading()
+
+        return _summary_stats(ts.backtest_result)
+    except Exception:
+        logger.error(f"Backtest for parameters {parameters} failed", exc_info=True)
+        raise
+
+
+def _get_events_configuration() -> Dict[Type[TimeEvent], Dict[str, Any]]:
+    """
+    Returns the class-level configuration of all the regular and periodic time events (including the subclasses
+    defined outside of qf_lib). Only the attributes set directly on each of the classes are returned, so that
+    the inheritance of the attributes is preserved once the configuration is set in the worker process.
+    """
+    events_configuration = {}
+    event_types = [RegularTimeEvent, PeriodicEvent]
+    while event_types:
+        event_type = event_types.pop()
+        event_types.extend(event_type.__subclasses__())
+
+        configuration = {attribute: vars(event_type)[attribute] for attribute in EVENTS_CONFIGURATION_ATTRIBUTES
+                         if attribute in vars(event_type)}
+        if configuration:
+            events_configuration[event_type] = configuration
+
+    return events_configuration
+
+
+def _set_events_configuration(events_configuration: Dict[Type[TimeEvent], Dict[str, Any]]):
+    for event_type, configuration in events_configuration.items():
+        for attribute, value in configuration.items():
+            setattr(event_type, attribute, value)
+
+
+def _summary_stats(backtest_result: BacktestResult) -> Dict[str, float]:
+    portfolio_tms = backtest_result.portfolio.portfolio_eod_series()
+    analysis = TimeseriesAnalysis(portfolio_tms, Frequency.DAILY)
+
+    # Count the transactions recorded by the HeadlessBacktestMonitor without converting them into Transactions
+    transactions_table = backtest_result.transactions_table
+    nr_of_transactions = len(transactions_table) if transactions_table is not None else len(backtest_result.transactions)
+
+    return {
+        "total_return": analysis.total_return,
+        "cagr": analysis.cagr,
+        "annualised_vol": analysis.annualised_vol,
+        "sharpe_ratio": analysis.sharpe_ratio,
+        "sortino_ratio": analysis.sortino_ratio,
+        "calmar_ratio": analysis.calmar_ratio,
+        "max_drawdown": analysis.max_drawdown,
+        "nr_of_transactions": nr_of_transactions,
+        "final_portfolio_value": portfolio_tms.iloc[-1]
+    }
@@ -11,13 +11,13 @@
 #     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
-from typing import Union, Sequence
+from typing import Union, Sequence, Optional
 
 from qf_lib.backtesting.broker.backtest_broker import BacktestBroker
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.events.event_manager import EventManager
 from qf_lib.backtesting.events.notifiers import Notifiers
-from qf_lib.backtesting.monitoring.backtest_monitor import BacktestMonitor
+from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
 from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
 from qf_lib.backtesting.order.order_factory import OrderFactory
 from qf_lib.backtesting.orders_filter.orders_filter import OrdersFilter
@@ -32,7 +32,9 @@ from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
 from qf_lib.containers.helpers import compute_container_hash
 from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+from qf_lib.data_providers.data_bundle_cache import DataBundleCache
 from qf_lib.data_providers.exchange_rate_provider import ExchangeRateProvider
+from qf_lib.data_providers.memoizing_data_provider import MemoizingDataProvider, create_memoizing_data_provider
 from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
 
 
@@ -44,7 +46,7 @@ class BacktestTradingSession(TradingSession):
     def __init__(self, contract_ticker_mapper: ContractTickerMapper, start_date, end_date,
                  position_sizer: PositionSizer, orders_filters: Sequence[OrdersFilter],
                  data_provider: AbstractPriceDataProvider, notifiers: Notifiers,
-                 portfolio: Portfolio, events_manager: EventManager, monitor: BacktestMonitor, broker: BacktestBroker,
+                 portfolio: Portfolio, events_manager: EventManager, monitor: AbstractMonitor, broker: BacktestBroker,
                  order_factory: OrderFactory, frequency: Frequency, backtest_result: BacktestResult):
         """
         Set up the backtest variables according to what has been passed in.
@@ -72,7 +74,23 @@ class BacktestTradingSession(TradingSession):
 
         self._hash_of_data_bundle = None
 
-    def use_data_preloading(self, tickers: Union[Ticker, Sequence[Ticker]], time_delta: RelativeDelta = None):
+    def use_data_preloading(self, tickers: Union[Ticker, Sequence[Ticker]], time_delta: RelativeDelta = None,
+                            data_bundle_cache: Optional[DataBundleCache] = None):
+        """
+        Preloads the data for the given tickers (from start_date - time_delta until the end_date of the backtest)
+        and replaces the data provider with the PrefetchingDataProvider. If the data provider is memoized (see
+        MemoizingDataProvider), the PrefetchingDataProvider is memoized as well, so that the queries answered using
+        the preloaded data are still memoized.
+
+        Parameters
+        -----------
+        tickers: Ticker, Sequence[Ticker]
+            tickers, which data should be preloaded
+        time_delta: RelativeDelta
+            time delta, which is subtracted from the start date to preload the additional history (1 year by default)
+        data_bundle_cache: Optional[DataBundleCache]
+            optional on-disk cache, used to store the preloaded data and reuse it across runs
+        """
         if time_delta is None:
             time_delta = RelativeDelta(years=1)
         data_start = self.start_date - time_delta
@@ -89,11 +107,17 @@ class BacktestTradingSession(TradingSession):
                     self.data_provider.create_exchange_rate_ticker(currency, self.portfolio.currency) for currency in currencies
                 ]
 
-        self.data_provider = PrefetchingDataProvider(self.data_provider, sorted(tickers), sorted(PriceField.ohlcv()),
-                                                     data_start, self.end_date, self.frequency,
-                                                     timer=self.data_provider.timer)
+        memoize_data_provider = isinstance(self.data_provider, MemoizingDataProvider)
+        data_provider = self.data_provider.data_provider if memoize_data_provider else self.data_provider
+
+        prefetching_data_provider = PrefetchingDataProvider(data_provider, sorted(tickers), sorted(PriceField.ohlcv()),
+                                                            data_start, self.end_date, self.frequency,
+                                                            timer=data_provider.timer,
+                                                            data_bundle_cache=data_bundle_cache)
+        self.data_provider = create_memoizing_data_provider(prefetching_data_provider) if memoize_data_provider \
+            else prefetching_data_provider
 
-        self._hash_of_data_bundle = compute_container_hash(self.data_provider.data_bundle)
+        self._hash_of_data_bundle = compute_container_hash(prefetching_data_provider.data_bundle)
         self.logger.info("Preloaded data hash value {}".format(self._hash_of_data_bundle))
 
     def get_preloaded_data_checksum(self) -> str:
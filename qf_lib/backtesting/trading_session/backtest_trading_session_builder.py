@@ -19,6 +19,7 @@ from qf_lib.backtesting.broker.backtest_broker import BacktestBroker
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.simulated_contract_ticker_mapper import \
     SimulatedContractTickerMapper
 from qf_lib.backtesting.events.event_manager import EventManager
+from qf_lib.backtesting.events.event_profiler import EventProfiler
 from qf_lib.backtesting.events.notifiers import Notifiers
 from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
@@ -28,8 +29,10 @@ from qf_lib.backtesting.execution_handler.commission_models.fixed_commission_mod
 from qf_lib.backtesting.execution_handler.simulated_execution_handler import SimulatedExecutionHandler
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
 from qf_lib.backtesting.execution_handler.slippage.price_based_slippage import PriceBasedSlippage
-from qf_lib.backtesting.monitoring.backtest_monitor import BacktestMonitorSettings, BacktestMonitor
+from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
+from qf_lib.backtesting.monitoring.backtest_monitor_settings import BacktestMonitorSettings
 from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
+from qf_lib.backtesting.monitoring.headless_backtest_monitor import HeadlessBacktestMonitor
 from qf_lib.backtesting.order.order_factory import OrderFactory
 from qf_lib.backtesting.order.order_rounder import OrderRounder
 from qf_lib.backtesting.orders_filter.orders_filter import OrdersFilter
@@ -46,6 +49,7 @@ from qf_lib.common.utils.dateutils.timer import SettableTimer
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.data_providers.data_provider import DataProvider
+from qf_lib.data_providers.memoizing_data_provider import MemoizingDataProvider, create_memoizing_data_provider
 from qf_lib.documents_utils.document_exporting.pdf_exporter import PDFExporter
 from qf_lib.documents_utils.excel.excel_exporter import ExcelExporter
 from qf_lib.settings import Settings
@@ -105,6 +109,10 @@ class BacktestTradingSessionBuilder:
 
         self._frequency = None
         self._scheduling_time_delay = RelativeDelta(minutes=1)
+        self._event_profiling = False
+        self._precompute_timeline = False
+        self._memoize_data_provider = False
+        self._headless_monitor = False
 
         self._default_daily_market_open_time = {"hour": 13, "minute": 30, "second": 0, "microsecond": 0}
         self._default_daily_market_close_time = {"hour": 20, "minute": 0, "second": 0, "microsecond": 0}
@@ -217,6 +225,46 @@ class BacktestTradingSessionBuilder:
         """
         self._initial_risk = initial_risk
 
+    @ConfigExporter.update_config
+    def set_event_profiling(self, enabled: bool):
+        """Enables or disables the profiling of the event loop. If enabled, the wall time of handling each type of
+        events by each of the listeners (strategy, execution handler, portfolio, monitor etc.) is recorded. The
+        statistics are available in the BacktestResult (event_profiling_stats) and are exported by the BacktestMonitor.
+
+        Parameters
+        -----------
+        enabled: bool
+            True if the event loop should be profiled, False otherwise (default)
+        """
+        self._event_profiling = enabled
+
+    @ConfigExporter.update_config
+    def set_precomputed_event_timeline(self, enabled: bool):
+        """Enables or disables precomputing the event timeline. If enabled, the trigger times of all the time events
+        (market open, market close, intraday bars etc.) between the start and end date of the backtest are generated
+        up front, instead of being computed by the Scheduler whenever the events queue becomes empty. This speeds up
+        the event loop of long intraday backtests.
+
+        Parameters
+        -----------
+        enabled: bool
+            True if the event timeline should be precomputed, False otherwise (default)
+        """
+        self._precompute_timeline = enabled
+
+    @ConfigExporter.update_config
+    def set_data_provider_memoization(self, enabled: bool):
+        """Enables or disables memoization of the data provider queries. If enabled, the data provider is wrapped
+        with the MemoizingDataProvider, so that identical queries issued by different components (alpha models,
+        position sizer, slippage model etc.) at the same time of the backtest are computed only once.
+
+        Parameters
+        -----------
+        enabled: bool
+            True if the data provider queries should be memoized, False otherwise (default)
+        """
+        self._memoize_data_provider = enabled
+
     @ConfigExporter.update_config
     def set_data_provider(self, data_provider: DataProvider):
         """Sets the data provider.
@@ -254,6 +302,19 @@ class BacktestTradingSessionBuilder:
         else:
             self._monitor_settings = monitor_settings
 
+    @ConfigExporter.update_config
+    def set_headless_monitor(self, enabled: bool):
+        """Enables or disables the headless mode of monitoring. If enabled, the HeadlessBacktestMonitor is used instead
+        of the BacktestMonitor: the transactions, signals and the portfolio value series are only kept in memory
+        (in the BacktestResult), no files are written and no charts are displayed. The monitor settings are ignored.
+
+        Parameters
+        -----------
+        enabled: bool
+            True if the headless monitor should be used, False otherwise (default)
+        """
+        self._headless_monitor = enabled
+
     def set_benchmark_tms(self, benchmark_tms: QFSeries):
         """Sets the benchmark timeseries. If set, the TearsheetWithBenchamrk will be generated.
 
@@ -399,6 +460,8 @@ class BacktestTradingSessionBuilder:
         self._timer = SettableTimer(start_date)
         self._data_provider.set_timer(self._timer)
         self._data_provider.frequency = self._frequency
+        if self._memoize_data_provider and not isinstance(self._data_provider, MemoizingDataProvider):
+            self._data_provider = create_memoizing_data_provider(self._data_provider)
         self._notifiers = Notifiers(self._timer)
         self._events_manager = self._create_event_manager(self._timer, self._notifiers)
 
@@ -408,6 +471,9 @@ class BacktestTradingSessionBuilder:
 
         self._backtest_result = BacktestResult(self._portfolio, signals_register, self._backtest_name, start_date,
                                                end_date, self._initial_risk)
+        if self._event_profiling:
+            self._backtest_result.event_profiler = EventProfiler()
+            self._events_manager.set_profiler(self._backtest_result.event_profiler)
         self._monitor = self._monitor_setup()
 
         self._slippage_model = self._slippage_model_setup()
@@ -419,7 +485,7 @@ class BacktestTradingSessionBuilder:
 
         self._time_flow_controller = BacktestTimeFlowController(
             self._notifiers.scheduler, self._events_manager, self._timer,
-            self._notifiers.empty_queue_event_notifier, end_date)
+            self._notifiers.empty_queue_event_notifier, end_date, self._precompute_timeline)
 
         self._broker = BacktestBroker(self._contract_ticker_mapper, self._portfolio, self._execution_handler)
         self._order_factory = OrderFactory(self._broker, self._data_provider)
@@ -480,7 +546,12 @@ class BacktestTradingSessionBuilder:
 
         return ts
 
-    def _monitor_setup(self) -> BacktestMonitor:
+    def _monitor_setup(self) -> AbstractMonitor:
+        if self._headless_monitor:
+            return HeadlessBacktestMonitor(self._backtest_result)
+
+        # the reporting stack (matplotlib, tearsheets, document exporters) is imported only if it is going to be used
+        from qf_lib.backtesting.monitoring.backtest_monitor import BacktestMonitor
         monitor = BacktestMonitor(self._backtest_result, self._settings, self._pdf_exporter,
                                   self._excel_exporter, self._monitor_settings, self._benchmark_tms)
         return monitor
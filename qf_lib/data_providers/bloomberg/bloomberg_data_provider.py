@@ -245,9 +245,13 @@ class BloombergDataProvider(AbstractPriceDataProvider, TickersUniverseProvider,
             last available exchange rate
         """
         currency_ticker = self.create_exchange_rate_ticker(base_currency, quote_currency)
-        quote_factor = self.get_current_values(currency_ticker, fields="QUOTE_FACTOR")
+        quote_factor = self.get_exchange_rate_quote_factor(base_currency, quote_currency)
         return self.get_last_available_price(currency_ticker, frequency=frequency) / quote_factor
 
+    def get_exchange_rate_quote_factor(self, base_currency: str, quote_currency: str) -> float:
+        currency_ticker = self.create_exchange_rate_ticker(base_currency, quote_currency)
+        return self.get_current_values(currency_ticker, fields="QUOTE_FACTOR")
+
     def get_history(self, tickers: Union[BloombergTicker, Sequence[BloombergTicker]], fields: Union[str, Sequence[str]],
                     start_date: datetime, end_date: datetime = None, frequency: Frequency = None,
                     currency: str = None, overrides: Optional[Dict] = None, look_ahead_bias: bool = False, **kwargs) \
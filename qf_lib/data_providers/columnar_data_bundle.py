@@ -0,0 +1,130 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Sequence, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+
+
+class ColumnarDataBundle:
+    """
+    Columnar, numpy-backed storage of a QFDataArray. The data is kept as a contiguous 3-D numpy array (dates, tickers,
+    fields) together with the sorted dates index and the ticker → position and field → position mappings. All slices
+    are computed using integer indexing (dates are located with numpy.searchsorted), which avoids the cost of the
+    label-based xarray lookups.
+
+    Parameters
+    ----------
+    data: QFDataArray
+        data to be stored, indexed by dates, tickers and fields. If the dates are not sorted, the data will be sorted
+        by dates before being stored.
+    """
+
+    def __init__(self, data: QFDataArray):
+        if not pd.DatetimeIndex(data.dates.values).is_monotonic_increasing:
+            data = data.sortby(DATES)
+
+        self._name = data.name
+        self._dates = pd.DatetimeIndex(data.dates.values).values
+        self._tickers = data.tickers.values
+        self._fields = data.fields.values
+        self._values = np.ascontiguousarray(data.values)
+
+        self._tickers_index = {ticker: i for i, ticker in enumerate(self._tickers)}
+        self._fields_index = {field: i for i, field in enumerate(self._fields)}
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._dates
+
+    @property
+    def tickers(self) -> np.ndarray:
+        return self._tickers
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    def dates_slice(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> slice:
+        """
+        Returns the slice of positions of all dates within [start_date, end_date] (both ends included). None
+        corresponds to an open end of the range.
+        """
+        start_idx = 0 if start_date is None else \
+            self._dates.searchsorted(pd.Timestamp(start_date).to_datetime64(), side="left")
+        end_idx = len(self._dates) if end_date is None else \
+            self._dates.searchsorted(pd.Timestamp(end_date).to_datetime64(), side="right")
+        return slice(start_idx, max(start_idx, end_idx))
+
+    def tickers_positions(self, tickers: Sequence[Ticker]) -> np.ndarray:
+        """ Returns positions of the given tickers. Raises KeyError if any of the tickers is not stored. """
+        return np.fromiter((self._tickers_index[ticker] for ticker in tickers), dtype=np.intp, count=len(tickers))
+
+    def fields_positions(self, fields: Sequence[Any]) -> np.ndarray:
+        """ Returns positions of the given fields. Raises KeyError if any of the fields is not stored. """
+        return np.fromiter((self._fields_index[field] for field in fields), dtype=np.intp, count=len(fields))
+
+    def get_values(self, start_date: Optional[datetime], end_date: Optional[datetime], tickers: Sequence[Ticker],
+                   fields: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the dates and the 3-D array of values for the given tickers and fields within [start_date, end_date].
+        The order of tickers and fields in the result corresponds to the order of the passed tickers and fields.
+        """
+        dates_slice = self.dates_slice(start_date, end_date)
+        values = self._values[dates_slice][:, self.tickers_positions(tickers)][:, :, self.fields_positions(fields)]
+        return self._dates[dates_slice], values
+
+    def get_data_array(self, start_date: Optional[datetime], end_date: Optional[datetime], tickers: Sequence[Ticker],
+                       fields: Sequence[Any], drop_empty_dates: bool = False) -> QFDataArray:
+        """
+        Returns a QFDataArray with the data for the given tickers and fields within [start_date, end_date].
+
+        Parameters
+        ----------
+        start_date: Optional[datetime]
+            first date of the range (included)
+        end_date: Optional[datetime]
+            last date of the range (included)
+        tickers: Sequence[Ticker]
+            tickers which should be returned (in the given order)
+        fields: Sequence[Any]
+            fields which should be returned (in the given order)
+        drop_empty_dates: bool
+            if True, dates for which all values are missing are removed from the result
+
+        Returns
+        -------
+        QFDataArray
+        """
+        dates_slice = self.dates_slice(start_date, end_date)
+        tickers_positions = self.tickers_positions(tickers)
+        fields_positions = self.fields_positions(fields)
+
+        dates = self._dates[dates_slice]
+        values = self._values[dates_slice][:, tickers_positions][:, :, fields_positions]
+
+        if drop_empty_dates and values.size > 0:
+            non_empty_dates = ~pd.isnull(values).all(axis=(1, 2))
+            dates, values = dates[non_empty_dates], values[non_empty_dates]
+        elif drop_empty_dates:
+            dates, values = dates[:0], values[:0]
+
+        # Reuse the stored labels arrays to avoid the conversion of lists of tickers and fields into xarray indices
+        return QFDataArray.create(dates=pd.DatetimeIndex(dates, name=DATES), tickers=self._tickers[tickers_positions],
+                                  fields=self._fields[fields_positions], data=values, name=self._name)
@@ -0,0 +1,334 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import hashlib
+import os
+import pickle
+import shutil
+import uuid
+from datetime import datetime
+from typing import Sequence, Dict, Optional, Tuple, List, Any
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
+from qf_lib.containers.helpers import compute_container_hash
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.data_bundle_storage import save_data_bundle, load_data_bundle
+from qf_lib.data_providers.helpers import chain_tickers_within_range
+
+
+class DataBundleCache:
+    """
+    Persistent, on-disk cache of the data bundles downloaded by the PrefetchingDataProvider. Each bundle is identified
+    by the class of the data provider used to download it, the requested tickers, fields, frequency and date range.
+
+    Every bundle is stored using the save_data_bundle function (values in the binary numpy format), next to the
+    futures expiration dates. The checksum of the bundle (compute_container_hash) is saved together with the data and
+    verified on every load - corrupted entries are removed from the cache.
+
+    A cached bundle is also reused if it covers a superset of the requested tickers, fields and date range - in that
+    case only the requested part of the bundle is returned. If the total size of the cache exceeds max_size, the least
+    recently used bundles are evicted.
+
+    Parameters
+    -----------
+    cache_dir: str
+        path to the directory, where the bundles should be stored (created if it does not exist)
+    max_size: Optional[int]
+        maximum total size of the cache in bytes. If None, the size of the cache is not bounded
+    memory_map: bool
+        if True, the cached bundles are loaded as memory-mapped arrays (see load_data_bundle), which are paged in
+        lazily. In that case the checksum is not verified on load, as it would require reading the whole bundle
+    """
+
+    EXP_DATES_FILE = "exp_dates.pkl"
+    METADATA_FILE = "metadata.pkl"
+
+    def __init__(self, cache_dir: str, max_size: Optional[int] = None, memory_map: bool = False):
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.memory_map = memory_map
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, data_provider_type: type, tickers: Sequence[Ticker], fields: Sequence[Any], start_date: datetime,
+            end_date: datetime, frequency: Frequency) \
+            -> Optional[Tuple[QFDataArray, Optional[Dict[FutureTicker, QFDataFrame]]]]:
+        """
+        Returns the data bundle and the futures expiration dates for the given request or None if no cached bundle
+        covers the request.
+
+        Parameters
+        -----------
+        data_provider_type: type
+            class of the data provider, which would be used to download the data
+        tickers: Sequence[Ticker]
+            requested tickers (Tickers and FutureTickers)
+        fields: Sequence[Any]
+            requested fields
+        start_date: datetime
+            first date of the requested period
+        end_date: datetime
+            last date of the requested period
+        frequency: Frequency
+            frequency of the data
+
+        Returns
+        --------
+        None, Tuple[QFDataArray, Optional[Dict[FutureTicker, QFDataFrame]]]
+            data bundle and the dictionary mapping FutureTickers onto their expiration dates (None if no FutureTickers
+            were requested)
+        """
+        request = self._create_request(data_provider_type, tickers, fields, start_date, end_date, frequency)
+
+        matching_entries = [
+            (entry_dir, metadata) for entry_dir, metadata in self._entries_metadata()
+            if self._covers_request(metadata["request"], request)
+        ]
+        if not matching_entries:
+            return None
+
+        # Prefer the exact match and otherwise the smallest bundle, which covers the request
+        entry_dir, metadata = min(matching_entries, key=lambda entry: (entry[1]["request"] != request,
+                                                                       self._entry_size(entry[0])))
+        loaded_bundle = self._load_entry(entry_dir, metadata["checksum"])
+        if loaded_bundle is None:
+            return None
+
+        data_array, exp_dates_by_key = loaded_bundle
+        self._touch(entry_dir)
+        self.logger.info(f"Data bundle loaded from the cache: {entry_dir}")
+
+        future_tickers = [ticker for ticker in tickers if isinstance(ticker, FutureTicker)]
+        exp_dates = {ticker: exp_dates_by_key[self._ticker_key(ticker)] for ticker in future_tickers} \
+            if future_tickers else None
+
+        if metadata["request"] != request:
+            data_array = self._select_request(data_array, tickers, fields, start_date, end_date, exp_dates)
+
+        return data_array, exp_dates
+
+    def get_overlapping(self, data_provider_type: type, tickers: Sequence[Ticker], fields: Sequence[Any],
+                        start_date: datetime, end_date: datetime, frequency: Frequency) \
+            -> Optional[Tuple[QFDataArray, Optional[Dict[FutureTicker, QFDataFrame]], List[Ticker], datetime, datetime]]:
+        """
+        Returns the part of a cached data bundle, which overlaps with the request (contains some of the requested
+        tickers for a part of the requested date range). If many cached bundles overlap with the request, the one with
+        the biggest overlap is used. Parameters correspond to the parameters of the get function.
+
+        Returns
+        --------
+        None, Tuple[QFDataArray, Optional[Dict[FutureTicker, QFDataFrame]], List[Ticker], datetime, datetime]
+            data bundle, the futures expiration dates, the requested tickers covered by the bundle and the beginning
+            and end of the covered date range
+        """
+        request = self._create_request(data_provider_type, tickers, fields, start_date, end_date, frequency)
+
+        def overlap_size(cached_request: Dict[str, Any]) -> float:
+            if cached_request["data_provider"] != request["data_provider"] or \
+                    cached_request["frequency"] != request["frequency"] or \
+                    not set(request["fields"]).issubset(cached_request["fields"]):
+                return 0.0
+
+            common_tickers = set(request["tickers"]).intersection(cached_request["tickers"])
+            overlap_start = max(start_date, cached_request["start_date"])
+            overlap_end = min(end_date, cached_request["end_date"])
+            return len(common_tickers) * max((overlap_end - overlap_start).total_seconds(), 0.0)
+
+        overlapping_entries = [
+            (overlap_size(metadata["request"]), entry_dir, metadata) for entry_dir, metadata in self._entries_metadata()
+        ]
+        overlapping_entries = [entry for entry in overlapping_entries if entry[0] > 0]
+        if not overlapping_entries:
+            return None
+
+        _, entry_dir, metadata = max(overlapping_entries, key=lambda entry: entry[0])
+        loaded_bundle = self._load_entry(entry_dir, metadata["checksum"])
+        if loaded_bundle is None:
+            return None
+
+        data_array, exp_dates_by_key = loaded_bundle
+        self._touch(entry_dir)
+        self.logger.info(f"Part of the data bundle loaded from the cache: {entry_dir}")
+
+        cached_request = metadata["request"]
+        covered_tickers = [ticker for ticker in tickers if self._ticker_key(ticker) in cached_request["tickers"]]
+        covered_start_date = max(start_date, cached_request["start_date"])
+        covered_end_date = min(end_date, cached_request["end_date"])
+
+        future_tickers = [ticker for ticker in covered_tickers if isinstance(ticker, FutureTicker)]
+        exp_dates = {ticker: exp_dates_by_key[self._ticker_key(ticker)] for ticker in future_tickers} \
+            if future_tickers else None
+
+        data_array = self._select_request(data_array, covered_tickers, fields, covered_start_date, covered_end_date,
+                                          exp_dates)
+        return data_array, exp_dates, covered_tickers, covered_start_date, covered_end_date
+
+    def put(self, data_provider_type: type, tickers: Sequence[Ticker], fields: Sequence[Any], start_date: datetime,
+            end_date: datetime, frequency: Frequency, data_array: QFDataArray,
+            exp_dates: Optional[Dict[FutureTicker, QFDataFrame]] = None):
+        """
+        Stores the data bundle downloaded for the given request in the cache. Parameters correspond to the parameters
+        of the get function. Afterwards the least recently used bundles are evicted if the size of the cache exceeds
+        the limit.
+        """
+        request = self._create_request(data_provider_type, tickers, fields, start_date, end_date, frequency)
+        metadata = {"request": request, "checksum": compute_container_hash(data_array)}
+
+        exp_dates_by_key = {self._ticker_key(ticker): dates for ticker, dates in exp_dates.items()} \
+            if exp_dates is not None else {}
+
+        entry_dir = os.path.join(self.cache_dir, self._entry_name(request))
+        tmp_dir = os.path.join(self.cache_dir, f".tmp_{uuid.uuid4().hex}")
+        try:
+            save_data_bundle(data_array, tmp_dir)
+            with open(os.path.join(tmp_dir, self.EXP_DATES_FILE), "wb") as file:
+                pickle.dump(exp_dates_by_key, file)
+            with open(os.path.join(tmp_dir, self.METADATA_FILE), "wb") as file:
+                pickle.dump(metadata, file)
+
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except (OSError, ValueError, pickle.PicklingError) as e:
+            self.logger.warning(f"The data bundle could not be stored in the cache: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        self._evict(keep=entry_dir)
+
+    def clear(self):
+        """ Removes all the bundles from the cache. """
+        for entry_dir in self._entries_dirs():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def size(self) -> int:
+        """ Returns the total size of all the cached bundles in bytes. """
+        return sum(self._entry_size(entry_dir) for entry_dir in self._entries_dirs())
+
+    def _create_request(self, data_provider_type: type, tickers: Sequence[Ticker], fields: Sequence[Any],
+                        start_date: datetime, end_date: datetime, frequency: Frequency) -> Dict[str, Any]:
+        return {
+            "data_provider": f"{data_provider_type.__module__}.{data_provider_type.__qualname__}",
+            "tickers": tuple(self._ticker_key(ticker) for ticker in tickers),
+            "fields": tuple(str(field) for field in fields),
+            "start_date": start_date,
+            "end_date": end_date,
+            "frequency": str(frequency)
+        }
+
+    @staticmethod
+    def _ticker_key(ticker: Ticker) -> str:
+        """ String identifying the ticker in the same way as the Ticker / FutureTicker equality does. """
+        if isinstance(ticker, FutureTicker):
+            return f"{ticker.__class__.__name__}|{ticker.name}|{ticker.family_id}|{ticker.get_N()}|" \
+                   f"{ticker.get_days_before_exp_date()}"
+        return f"{ticker.__class__.__name__}|{ticker.ticker}"
+
+    @staticmethod
+    def _entry_name(request: Dict[str, Any]) -> str:
+        return hashlib.sha1(repr(sorted(request.items())).encode()).hexdigest()
+
+    @staticmethod
+    def _covers_request(cached_request: Dict[str, Any], request: Dict[str, Any]) -> bool:
+        return cached_request["data_provider"] == request["data_provider"] and \
+            cached_request["frequency"] == request["frequency"] and \
+            set(request["tickers"]).issubset(cached_request["tickers"]) and \
+            set(request["fields"]).issubset(cached_request["fields"]) and \
+            cached_request["start_date"] <= request["start_date"] and cached_request["end_date"] >= request["end_date"]
+
+    @staticmethod
+    def _select_request(data_array: QFDataArray, tickers: Sequence[Ticker], fields: Sequence[Any],
+                        start_date: datetime, end_date: datetime,
+                        exp_dates: Optional[Dict[FutureTicker, QFDataFrame]]) -> QFDataArray:
+        """ Selects the part of a cached bundle, which corresponds to the request. """
+        specific_tickers = [ticker for ticker in tickers if not isinstance(ticker, FutureTicker)]
+        for future_ticker in (exp_dates or {}):
+            specific_tickers.extend(chain_tickers_within_range(future_ticker, exp_dates[future_ticker], start_date,
+                                                               end_date))
+
+        data_array = data_array.loc[start_date:end_date, specific_tickers, list(fields)].dropna(DATES, how='all')
+        return QFDataArray.from_xr_data_array(data_array)
+
+    def _load_entry(self, entry_dir: str, checksum: str) \
+            -> Optional[Tuple[QFDataArray, Dict[str, QFDataFrame]]]:
+        try:
+            data_array = load_data_bundle(entry_dir, self.memory_map)
+            with open(os.path.join(entry_dir, self.EXP_DATES_FILE), "rb") as file:
+                exp_dates_by_key = pickle.load(file)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, KeyError) as e:
+            self.logger.warning(f"Cached data bundle {entry_dir} could not be loaded and will be removed: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        if not self.memory_map and compute_container_hash(data_array) != checksum:
+            self.logger.warning(f"Checksum of the cached data bundle {entry_dir} does not match. The entry will be "
+                                f"removed from the cache.")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        return data_array, exp_dates_by_key
+
+    def _entries_dirs(self) -> List[str]:
+        return [
+            entry.path for entry in os.scandir(self.cache_dir)
+            if entry.is_dir() and not entry.name.startswith(".tmp_")
+        ]
+
+    def _entries_metadata(self) -> List[Tuple[str, Dict[str, Any]]]:
+        entries_metadata = []
+        for entry_dir in self._entries_dirs():
+            try:
+                with open(os.path.join(entry_dir, self.METADATA_FILE), "rb") as file:
+                    metadata = pickle.load(file)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                continue
+            entries_metadata.append((entry_dir, metadata))
+
+        return entries_metadata
+
+    @staticmethod
+    def _entry_size(entry_dir: str) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+
+    def _touch(self, entry_dir: str):
+        try:
+            os.utime(os.path.join(entry_dir, self.METADATA_FILE))
+        except OSError:
+            pass
+
+    def _last_used(self, entry_dir: str) -> float:
+        try:
+            return os.path.getmtime(os.path.join(entry_dir, self.METADATA_FILE))
+        except OSError:
+            return 0.0
+
+    def _evict(self, keep: Optional[str] = None):
+        """ Removes the least recently used bundles until the size of the cache does not exceed max_size. The bundle
+        located in the keep directory is never removed. """
+        if self.max_size is None:
+            return
+
+        entries = sorted(self._entries_dirs(), key=self._last_used)
+        total_size = sum(self._entry_size(entry_dir) for entry_dir in entries)
+        for entry_dir in entries:
+            if total_size <= self.max_size:
+                break
+            if entry_dir == keep:
+                continue
+            total_size -= self._entry_size(entry_dir)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            self.logger.info(f"Data bundle {entry_dir} evicted from the cache")
@@ -0,0 +1,113 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import os
+import pickle
+from datetime import datetime
+from typing import Sequence, Any, Union
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+
+VALUES_FILE = "values.npy"
+DATES_FILE = "dates.npy"
+LABELS_FILE = "labels.pkl"
+
+
+def save_data_bundle(data_array: QFDataArray, directory: str):
+    """
+    Saves the data bundle in the given directory (created if it does not exist). The values are stored in a single
+    binary numpy file (dates x tickers x fields), next to the dates and the pickled tickers and fields labels.
+
+    Parameters
+    ----------
+    data_array: QFDataArray
+        data bundle indexed by dates, tickers and fields. Values should have a numeric type.
+    directory: str
+        path to the directory, in which the bundle should be stored
+    """
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, VALUES_FILE), np.ascontiguousarray(data_array.values), allow_pickle=False)
+    _save_labels(directory, data_array.dates.values, data_array.tickers.values, data_array.fields.values)
+
+
+def create_memory_mapped_data_bundle(directory: str, dates: Union[Sequence[datetime], pd.DatetimeIndex],
+                                     tickers: Sequence[Ticker], fields: Sequence[Any],
+                                     dtype=np.float64) -> QFDataArray:
+    """
+    Creates a new data bundle in the given directory, filled with NaN values and backed by a writable memory-mapped
+    file. It makes it possible to store data, which does not fit in memory, e.g. by writing it ticker by ticker:
+    data_array.loc[:, ticker, :] = ticker_values. The values assigned to the array are written to the file, the data
+    is synchronised with the disk at the latest when the array is garbage collected.
+
+    Parameters
+    ----------
+    directory: str
+        path to the directory, in which the bundle should be stored (created if it does not exist)
+    dates: Sequence[datetime], pd.DatetimeIndex
+        sorted dates of the bundle
+    tickers: Sequence[Ticker]
+        tickers of the bundle
+    fields: Sequence[Any]
+        fields of the bundle
+    dtype
+        numeric type of the values
+
+    Returns
+    -------
+    QFDataArray
+        data bundle backed by the memory-mapped file
+    """
+    os.makedirs(directory, exist_ok=True)
+    dates = pd.DatetimeIndex(dates)
+    values = np.lib.format.open_memmap(os.path.join(directory, VALUES_FILE), mode="w+", dtype=dtype,
+                                       shape=(len(dates), len(tickers), len(fields)))
+    values[:] = np.nan
+    _save_labels(directory, dates.values, tickers, fields)
+
+    return QFDataArray.create(pd.DatetimeIndex(dates, name=DATES), list(tickers), list(fields), values)
+
+
+def load_data_bundle(directory: str, memory_map: bool = False) -> QFDataArray:
+    """
+    Loads the data bundle saved in the given directory.
+
+    Parameters
+    ----------
+    directory: str
+        path to the directory, in which the bundle is stored
+    memory_map: bool
+        if True, the values are not read into memory, but instead are backed by a read-only memory-mapped file and
+        loaded lazily, only when they are accessed. As the dates are the leading dimension, slicing a date window
+        (e.g. by the PresetDataProvider) pages in only the data of this window
+
+    Returns
+    -------
+    QFDataArray
+    """
+    values = np.load(os.path.join(directory, VALUES_FILE), mmap_mode="r" if memory_map else None, allow_pickle=False)
+    dates = np.load(os.path.join(directory, DATES_FILE), allow_pickle=False)
+    with open(os.path.join(directory, LABELS_FILE), "rb") as file:
+        labels = pickle.load(file)
+
+    return QFDataArray.create(pd.DatetimeIndex(dates, name=DATES), labels["tickers"], labels["fields"], values)
+
+
+def _save_labels(directory: str, dates: np.ndarray, tickers: Sequence[Ticker], fields: Sequence[Any]):
+    np.save(os.path.join(directory, DATES_FILE), pd.DatetimeIndex(dates).values, allow_pickle=False)
+    with open(os.path.join(directory, LABELS_FILE), "wb") as file:
+        pickle.dump({"tickers": list(tickers), "fields": list(fields)}, file)
@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from typing import Optional
 
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.tickers.tickers import Ticker
@@ -34,3 +35,24 @@ class ExchangeRateProvider(object, metaclass=ABCMeta):
             last available exchange rate
         """
         pass
+
+    def get_exchange_rate_quote_factor(self, base_currency: str, quote_currency: str) -> Optional[float]:
+        """
+        Returns the factor, by which the prices of the exchange rate ticker (see create_exchange_rate_ticker) need to be
+        divided in order to obtain the exchange rate (e.g. in case if the rate is quoted per 100 units of the base
+        currency). Providers, which do not declare the quote factor, return None - their exchange rates can be obtained
+        only using get_last_available_exchange_rate (e.g. they may scale or invert the prices of the ticker).
+
+        Parameters
+        -----------
+        base_currency: str
+            ISO code of the base currency (ex. 'USD' for US Dollar)
+        quote_currency: str
+            ISO code of the quote currency (ex. 'EUR' for Euro)
+
+        Returns
+        -------
+        Optional[float]
+            quote factor of the exchange rate ticker or None if the quote factor is not declared by the provider
+        """
+        return None
@@ -14,6 +14,8 @@
 import warnings
 from datetime import datetime
 from typing import Union, Dict, Sequence, Any
+
+import numpy as np
 import pandas as pd
 from pandas import DatetimeIndex
 from xarray import DataArray
@@ -223,6 +225,43 @@ def tickers_dict_to_data_array(tickers_data_dict: Dict[Ticker, QFDataFrame],
     return result
 
 
+def merge_data_arrays(data_array: QFDataArray, other: QFDataArray) -> QFDataArray:
+    """
+    Merges two QFDataArrays into one, indexed by the union of their dates, tickers and fields. The dates of the result
+    are sorted, tickers and fields of the data_array come first, followed by the new labels of the other array.
+    If both arrays contain a value for the same (date, ticker, field), the non-missing value of the other array
+    takes precedence.
+
+    Parameters
+    ----------
+    data_array: QFDataArray
+        base array
+    other: QFDataArray
+        array, which should be merged into the data_array
+
+    Returns
+    -------
+    QFDataArray
+    """
+    dates = pd.DatetimeIndex(data_array.dates.values).union(pd.DatetimeIndex(other.dates.values))
+    tickers = list(dict.fromkeys(list(data_array.tickers.values) + list(other.tickers.values)))
+    fields = list(dict.fromkeys(list(data_array.fields.values) + list(other.fields.values)))
+
+    values = np.full((len(dates), len(tickers), len(fields)), np.nan,
+                     dtype=np.result_type(data_array.dtype, other.dtype, np.float64))
+
+    for array in (data_array, other):
+        dates_idx = dates.get_indexer(pd.DatetimeIndex(array.dates.values))
+        tickers_idx = pd.Index(tickers).get_indexer(array.tickers.values)
+        fields_idx = pd.Index(fields).get_indexer(array.fields.values)
+        positions = np.ix_(dates_idx, tickers_idx, fields_idx)
+
+        array_values = array.values
+        values[positions] = np.where(pd.isnull(array_values), values[positions], array_values)
+
+    return QFDataArray.create(pd.DatetimeIndex(dates, name=DATES), tickers, fields, values, name=data_array.name)
+
+
 def get_fields_from_tickers_data_dict(tickers_data_dict):
     fields = set()
     for dates_fields_df in tickers_data_dict.values():
@@ -0,0 +1,89 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.data_providers.columnar_data_bundle import ColumnarDataBundle
+
+
+class LastAvailablePricesIndex:
+    """
+    Precomputed index of the last available prices of all tickers of a data bundle. The Open and Close prices of each
+    bar are treated as a single sequence of prices (Open before Close) and for each bar and ticker the index contains
+    the position of the latest valid price within this sequence. Thanks to that, the last available prices of any
+    tickers at any point of time can be obtained with a single binary search of the dates, without slicing the data.
+
+    The prices themselves are not copied - they are read from the data bundle (which may be memory-mapped), so that
+    the index requires only 4 bytes per bar and ticker.
+
+    The prices are consistent with the PresetDataProvider.get_last_available_price, i.e. the prices of bars older than
+    7 days are not considered to be available.
+
+    Parameters
+    ----------
+    data_bundle: ColumnarDataBundle
+        data bundle containing the Open and Close prices
+    """
+
+    def __init__(self, data_bundle: ColumnarDataBundle):
+        self._dates = data_bundle.dates
+
+        open_field, close_field = data_bundle.fields_positions([PriceField.Open, PriceField.Close])
+        self._open_prices = np.asarray(data_bundle.values[:, :, open_field], dtype=np.float64)
+        self._close_prices = np.asarray(data_bundle.values[:, :, close_field], dtype=np.float64)
+
+        # Position of the latest valid price in the sequence of prices (2 * date position for the Open price and
+        # 2 * date position + 1 for the Close price) for each bar and ticker (-1 if there is none)
+        bars_positions = 2 * np.arange(len(self._dates), dtype=np.int32)[:, np.newaxis]
+        latest_positions = np.where(np.isnan(self._open_prices), np.int32(-1), bars_positions)
+        latest_positions = np.where(np.isnan(self._close_prices), latest_positions, bars_positions + 1)
+        self._last_valid_positions = np.ascontiguousarray(np.maximum.accumulate(latest_positions, axis=0),
+                                                          dtype=np.int32)
+
+    def get_last_prices(self, tickers_positions: np.ndarray, end_time: datetime) -> np.ndarray:
+        """
+        Returns the last prices available at the end_time (including the bar with the end_time date) for the tickers
+        with the given positions in the data bundle (see ColumnarDataBundle.tickers_positions). Prices of tickers, for
+        which no valid price was available within the last 7 days, are equal to NaN.
+        """
+        end_time = pd.Timestamp(end_time).to_datetime64()
+        date_position = self._dates.searchsorted(end_time, side="right") - 1
+        if date_position < 0:
+            return np.full(len(tickers_positions), np.nan)
+
+        prices_positions = self._last_valid_positions[date_position, tickers_positions]
+        has_price = prices_positions >= 0
+        prices_positions = prices_positions.clip(min=0)
+
+        dates_positions = prices_positions // 2
+        prices = np.where(prices_positions % 2 == 1, self._close_prices[dates_positions, tickers_positions],
+                          self._open_prices[dates_positions, tickers_positions])
+
+        is_available = has_price & (self._dates[dates_positions] >= end_time - np.timedelta64(7, "D"))
+        return np.where(is_available, prices, np.nan)
+
+    def get_open_prices(self, tickers_positions: np.ndarray, start_time: datetime, end_time: datetime) -> np.ndarray:
+        """
+        Returns the Open prices of the latest bar within [start_time, end_time] (both ends included) for the tickers
+        with the given positions in the data bundle or NaNs if there is no such bar.
+        """
+        start_position = self._dates.searchsorted(pd.Timestamp(start_time).to_datetime64(), side="left")
+        end_position = self._dates.searchsorted(pd.Timestamp(end_time).to_datetime64(), side="right") - 1
+        if end_position < start_position:
+            return np.full(len(tickers_positions), np.nan)
+
+        return self._open_prices[end_position, tickers_positions]
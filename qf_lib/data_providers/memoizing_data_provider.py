@@ -0,0 +1,218 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Set, Type, Tuple
+
+from qf_lib.common.enums.expiration_date_field import ExpirationDateField
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.timer import Timer, SettableTimer
+from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+from qf_lib.data_providers.data_provider import DataProvider
+from qf_lib.data_providers.exchange_rate_provider import ExchangeRateProvider
+from qf_lib.data_providers.futures_data_provider import FuturesDataProvider
+
+
+class MemoizingDataProvider(AbstractPriceDataProvider):
+    """
+    Wrapper of a data provider, which memoizes the results of the data queries (get_price, historical_price,
+    get_history and get_last_available_price) within a single timestamp of a backtest. Thanks to that, if the same
+    query is issued by several components at the same time (e.g. by the alpha model, the position sizer and the
+    slippage model), the underlying data provider is used only once.
+
+    The results are cached only if the data provider uses the SettableTimer. The cache is keyed by the name of the
+    method and its arguments and it is cleared automatically whenever the time of the timer changes. The number of
+    queries answered from the cache and by the underlying data provider is available in the hits and misses attributes.
+
+    The memoized containers are shared between all the callers, so they should not be modified in place. All the other
+    attributes and methods are delegated to the underlying data provider.
+
+    The MemoizingDataProvider does not extend the FuturesDataProvider nor the ExchangeRateProvider. In order to wrap
+    a data provider implementing any of these interfaces, use create_memoizing_data_provider, which returns the wrapper
+    implementing the same interfaces as the wrapped data provider.
+
+    Parameters
+    -----------
+    data_provider: DataProvider
+        data provider, which queries should be memoized
+    """
+
+    def __init__(self, data_provider: DataProvider):
+        self.data_provider = data_provider
+        super().__init__(data_provider.timer)
+
+        self.hits = 0
+        """ Number of queries, which were answered using the cached results. """
+        self.misses = 0
+        """ Number of queries, which were passed to the underlying data provider. """
+
+        self._cache = {}  # type: Dict[Tuple, Any]
+        self._cache_time = None  # type: Optional[datetime]
+
+    @property
+    def timer(self) -> Timer:
+        return self.data_provider.timer
+
+    @timer.setter
+    def timer(self, timer: Timer):
+        self.data_provider.set_timer(timer)
+
+    def set_timer(self, timer: Timer):
+        self.data_provider.set_timer(timer)
+
+    @property
+    def frequency(self):
+        return self.data_provider.frequency
+
+    @frequency.setter
+    def frequency(self, frequency):
+        self.data_provider.frequency = frequency
+
+    def set_frequency(self, frequency):
+        self.data_provider.set_frequency(frequency)
+
+    def clear_cache(self):
+        """ Removes all the memoized results (without resetting the hits and misses counters). """
+        self._cache = {}
+        self._cache_time = None
+
+    def get_price(self, *args, **kwargs):
+        return self._memoized_call("get_price", args, kwargs)
+
+    def historical_price(self, *args, **kwargs):
+        return self._memoized_call("historical_price", args, kwargs)
+
+    def get_history(self, *args, **kwargs):
+        return self._memoized_call("get_history", args, kwargs)
+
+    def get_last_available_price(self, *args, **kwargs):
+        return self._memoized_call("get_last_available_price", args, kwargs)
+
+    def price_field_to_str_map(self, *args) -> Dict[PriceField, str]:
+        return self.data_provider.price_field_to_str_map(*args)
+
+    def supported_ticker_types(self) -> Set[Type[Ticker]]:
+        return self.data_provider.supported_ticker_types()
+
+    def __getattr__(self, name: str):
+        # Called only if the attribute was not found in the MemoizingDataProvider itself
+        if name == "data_provider":
+            raise AttributeError(name)
+        return getattr(self.data_provider, name)
+
+    def __str__(self):
+        return f"{self.__class__.__name__}({self.data_provider})"
+
+    def _memoized_call(self, method_name: str, args: Tuple, kwargs: Dict[str, Any]):
+        method = getattr(self.data_provider, method_name)
+        if not isinstance(self.timer, SettableTimer):
+            return method(*args, **kwargs)
+
+        current_time = self.timer.now()
+        if current_time != self._cache_time:
+            self._cache = {}
+            self._cache_time = current_time
+
+        try:
+            key = (method_name, self._hashable(args), self._hashable(kwargs))
+        except TypeError:  # some of the arguments are not hashable
+            self.misses += 1
+            return method(*args, **kwargs)
+
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+
+        self.misses += 1
+        result = self._cache[key] = method(*args, **kwargs)
+        return result
+
+    @classmethod
+    def _hashable(cls, value: Any) -> Hashable:
+        """ Converts sequences and dictionaries into hashable tuples. Raises TypeError for unhashable values. """
+        if isinstance(value, (list, tuple)):
+            return tuple(cls._hashable(item) for item in value)
+        if isinstance(value, dict):
+            return frozenset((key, cls._hashable(item)) for key, item in value.items())
+        if isinstance(value, set):
+            return frozenset(value)
+        hash(value)
+        return value
+
+
+class MemoizingFuturesDataProvider(MemoizingDataProvider, FuturesDataProvider):
+    """
+    MemoizingDataProvider of a FuturesDataProvider, which additionally memoizes the get_futures_chain_tickers queries.
+    """
+
+    def get_futures_chain_tickers(self, *args, **kwargs):
+        return self._memoized_call("get_futures_chain_tickers", args, kwargs)
+
+    def expiration_date_field_str_map(self, ticker: Ticker = None) -> Dict[ExpirationDateField, str]:
+        return self.data_provider.expiration_date_field_str_map(ticker)
+
+    def _get_futures_chain_dict(self, tickers, expiration_date_fields):
+        return self.data_provider._get_futures_chain_dict(tickers, expiration_date_fields)
+
+
+class MemoizingExchangeRateDataProvider(MemoizingDataProvider, ExchangeRateProvider):
+    """
+    MemoizingDataProvider of an ExchangeRateProvider, which additionally memoizes the get_last_available_exchange_rate
+    queries.
+    """
+
+    def get_last_available_exchange_rate(self, *args, **kwargs):
+        return self._memoized_call("get_last_available_exchange_rate", args, kwargs)
+
+    def create_exchange_rate_ticker(self, base_currency: str, quote_currency: str) -> Ticker:
+        return self.data_provider.create_exchange_rate_ticker(base_currency, quote_currency)
+
+    def get_exchange_rate_quote_factor(self, base_currency: str, quote_currency: str) -> Optional[float]:
+        return self.data_provider.get_exchange_rate_quote_factor(base_currency, quote_currency)
+
+
+class MemoizingFuturesExchangeRateDataProvider(MemoizingFuturesDataProvider, MemoizingExchangeRateDataProvider):
+    """
+    MemoizingDataProvider of a data provider, which extends both the FuturesDataProvider and the ExchangeRateProvider.
+    """
+    pass
+
+
+def create_memoizing_data_provider(data_provider: DataProvider) -> MemoizingDataProvider:
+    """
+    Wraps the data provider with the MemoizingDataProvider, which implements the same interfaces (FuturesDataProvider,
+    ExchangeRateProvider) as the wrapped data provider, so that e.g. the isinstance checks of the ExchangeRateProvider
+    give the same results for the wrapper and for the wrapped data provider.
+
+    Parameters
+    -----------
+    data_provider: DataProvider
+        data provider, which queries should be memoized
+
+    Returns
+    --------
+    MemoizingDataProvider
+        wrapper of the data provider
+    """
+    is_futures_data_provider = isinstance(data_provider, FuturesDataProvider)
+    is_exchange_rate_provider = isinstance(data_provider, ExchangeRateProvider)
+
+    if is_futures_data_provider and is_exchange_rate_provider:
+        return MemoizingFuturesExchangeRateDataProvider(data_provider)
+    elif is_futures_data_provider:
+        return MemoizingFuturesDataProvider(data_provider)
+    elif is_exchange_rate_provider:
+        return MemoizingExchangeRateDataProvider(data_provider)
+    else:
+        return MemoizingDataProvider(data_provider)
@@ -12,7 +12,7 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 from datetime import datetime
-from typing import Sequence, Union, Optional
+from typing import Sequence, Union, Optional, Dict, Tuple
 
 from qf_lib.common.enums.expiration_date_field import ExpirationDateField
 
@@ -25,8 +25,9 @@ from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
 from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
 from qf_lib.data_providers.exchange_rate_provider import ExchangeRateProvider
 from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+from qf_lib.data_providers.data_bundle_cache import DataBundleCache
 from qf_lib.data_providers.futures_data_provider import FuturesDataProvider
-from qf_lib.data_providers.helpers import chain_tickers_within_range
+from qf_lib.data_providers.helpers import chain_tickers_within_range, merge_data_arrays
 from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 
 
@@ -39,7 +40,8 @@ class PrefetchingDataProvider(PresetDataProvider):
     Parameters
     -----------
     data_provider: AbstractPriceDataProvider
-        data provider used to download the data
+        data provider used to download the data. If it is an ExchangeRateProvider and the exchange rate tickers are
+        among the prefetched tickers, the exchange rates are computed from the prefetched data
     tickers: Ticker, Sequence[Ticker]
         one or a list of tickers, used further to download the futures contracts related data.
         The list can contain either Tickers or FutureTickers. In case of the Tickers, simply the given fields
@@ -53,16 +55,24 @@ class PrefetchingDataProvider(PresetDataProvider):
         last date to be downloaded
     frequency: Frequency
         frequency of the data
+    timer: Optional[Timer]
+        timer used by the data provider
+    data_bundle_cache: Optional[DataBundleCache]
+        optional on-disk cache of the data bundles. If provided, the data is loaded from the cache whenever a cached
+        bundle covers the request (without using the data_provider at all). Otherwise, the downloaded data is stored
+        in the cache
     """
 
     def __init__(self, data_provider: AbstractPriceDataProvider,
                  tickers: Union[Ticker, Sequence[Ticker]],
                  fields: Union[PriceField, Sequence[PriceField]],
                  start_date: datetime, end_date: datetime,
-                 frequency: Frequency, timer: Optional[Timer] = None):
+                 frequency: Frequency, timer: Optional[Timer] = None,
+                 data_bundle_cache: Optional[DataBundleCache] = None):
 
         self.data_provider = data_provider
         self.logger = qf_logger.getChild(self.__class__.__name__)
+        self._exchange_rates_quote_factors = {}  # type: Dict[Tuple[str, str], Optional[float]]
 
         # Convert fields into list in order to return a QFDataArray as the result of get_price function
         fields, _ = convert_to_list(fields, PriceField)
@@ -71,6 +81,103 @@ class PrefetchingDataProvider(PresetDataProvider):
         tickers, _ = convert_to_list(tickers, Ticker)
         tickers = list(dict.fromkeys(tickers))
 
+        if not isinstance(data_provider, FuturesDataProvider) and any(isinstance(t, FutureTicker) for t in tickers):
+            self.logger.error("The passed data provider does not support future tickers. All future tickers will "
+                              "be ignored in the process.")
+            tickers = [ticker for ticker in tickers if not isinstance(ticker, FutureTicker)]
+
+        cached_bundle = data_bundle_cache.get(type(data_provider), tickers, fields, start_date, end_date, frequency) \
+            if data_bundle_cache is not None else None
+        overlapping_bundle = data_bundle_cache.get_overlapping(
+            type(data_provider), tickers, fields, start_date, end_date, frequency
+        ) if data_bundle_cache is not None and cached_bundle is None else None
+
+        if cached_bundle is not None:
+            data_array, exp_dates = cached_bundle
+            bundle_tickers, bundle_start_date, bundle_end_date = tickers, start_date, end_date
+        elif overlapping_bundle is not None:
+            data_array, exp_dates, bundle_tickers, bundle_start_date, bundle_end_date = overlapping_bundle
+        else:
+            data_array, exp_dates = self._download_data_bundle(tickers, fields, start_date, end_date, frequency, timer)
+            bundle_tickers, bundle_start_date, bundle_end_date = tickers, start_date, end_date
+
+        self._prefetched_fields = fields
+        self._prefetched_tickers = bundle_tickers
+
+        super().__init__(data=data_array,
+                         exp_dates=exp_dates,
+                         start_date=bundle_start_date,
+                         end_date=bundle_end_date,
+                         frequency=frequency,
+                         timer=timer)
+
+        if overlapping_bundle is not None:
+            # Download only the data missing in the cached bundle
+            self.extend(tickers, start_date, end_date)
+
+        if data_bundle_cache is not None and cached_bundle is None:
+            data_bundle_cache.put(type(data_provider), tickers, fields, start_date, end_date, frequency,
+                                  self.data_bundle, self.exp_dates)
+
+    def extend(self, tickers: Union[Ticker, Sequence[Ticker], None] = None, start_date: Optional[datetime] = None,
+               end_date: Optional[datetime] = None):
+        """
+        Extends the prefetched data by new tickers and / or a longer date range. Only the missing data is downloaded
+        using the underlying data provider: the whole [start_date, end_date] range for the new tickers and only the
+        missing date ranges for the already prefetched tickers. The downloaded data is merged into the data bundle.
+
+        Parameters
+        -----------
+        tickers: Ticker, Sequence[Ticker], None
+            tickers, which should be added to the prefetched tickers. Tickers which are already prefetched are ignored
+        start_date: Optional[datetime]
+            new first date of the prefetched data. It is only used if it is before the current start date
+        end_date: Optional[datetime]
+            new last date of the prefetched data. It is only used if it is after the current end date
+        """
+        tickers, _ = convert_to_list(tickers, Ticker) if tickers is not None else ([], False)
+        if not isinstance(self.data_provider, FuturesDataProvider):
+            tickers = [ticker for ticker in tickers if not isinstance(ticker, FutureTicker)]
+
+        all_tickers = list(dict.fromkeys(self._prefetched_tickers + tickers))
+        start_date = min(start_date, self.start_date) if start_date is not None else self.start_date
+        end_date = max(end_date, self.end_date) if end_date is not None else self.end_date
+
+        future_tickers = [ticker for ticker in all_tickers if isinstance(ticker, FutureTicker)]
+        specific_tickers = [ticker for ticker in all_tickers if not isinstance(ticker, FutureTicker)]
+        exp_dates = None
+        if future_tickers:
+            exp_dates = self.data_provider.get_futures_chain_tickers(future_tickers, ExpirationDateField.all_dates())
+            for ft in future_tickers:
+                specific_tickers.extend(chain_tickers_within_range(ft, exp_dates[ft], start_date, end_date))
+            specific_tickers = list(dict.fromkeys(specific_tickers))
+
+        new_tickers = [ticker for ticker in specific_tickers if ticker not in self.cached_tickers]
+        prefetched_tickers = [ticker for ticker in specific_tickers if ticker in self.cached_tickers]
+
+        # Each of the missing ranges overlaps with the prefetched data by one bar to make sure the downloaded data
+        # is never squeezed into a container without dates dimension
+        missing_data_requests = []
+        if new_tickers:
+            missing_data_requests.append((new_tickers, start_date, end_date))
+        if prefetched_tickers and start_date < self.start_date:
+            missing_data_requests.append((prefetched_tickers, start_date, self.start_date))
+        if prefetched_tickers and end_date > self.end_date:
+            missing_data_requests.append(
+                (prefetched_tickers, self.end_date - self.frequency.time_delta(), end_date))
+
+        missing_data = None
+        for request_tickers, request_start_date, request_end_date in missing_data_requests:
+            # The data is prefetched for the whole range, independently of the current time of the timer
+            data_array = self.data_provider.get_price(request_tickers, self._prefetched_fields, request_start_date,
+                                                      request_end_date, self.frequency, look_ahead_bias=True)
+            missing_data = data_array if missing_data is None else merge_data_arrays(missing_data, data_array)
+
+        self._prefetched_tickers = all_tickers
+        self.merge_data_bundle(missing_data, start_date, end_date, exp_dates)
+
+    def _download_data_bundle(self, tickers: Sequence[Ticker], fields: Sequence[PriceField], start_date: datetime,
+                              end_date: datetime, frequency: Frequency, timer: Optional[Timer]):
         future_tickers = [ticker for ticker in tickers if isinstance(ticker, FutureTicker)]
         non_future_tickers = [ticker for ticker in tickers if not isinstance(ticker, FutureTicker)]
 
@@ -78,27 +185,35 @@ class PrefetchingDataProvider(PresetDataProvider):
         all_tickers = non_future_tickers
 
         if future_tickers:
-            if not isinstance(data_provider, FuturesDataProvider):
-                self.logger.error("The passed data provider does not support future tickers. All future tickers will "
-                                  "be ignored in the process.")
-            else:
-                exp_dates = data_provider.get_futures_chain_tickers(future_tickers, ExpirationDateField.all_dates())
+            exp_dates = self.data_provider.get_futures_chain_tickers(future_tickers, ExpirationDateField.all_dates())
 
-                # Filter out all these specific future contracts, which expired before start_date
-                for ft in future_tickers:
-                    all_tickers.extend(chain_tickers_within_range(ft, exp_dates[ft], start_date, end_date))
+            # Filter out all these specific future contracts, which expired before start_date
+            for ft in future_tickers:
+                all_tickers.extend(chain_tickers_within_range(ft, exp_dates[ft], start_date, end_date))
 
-        data_array = data_provider.get_price(all_tickers, fields, start_date, end_date, frequency, timer)
-
-        super().__init__(data=data_array,
-                         exp_dates=exp_dates,
-                         start_date=start_date,
-                         end_date=end_date,
-                         frequency=frequency,
-                         timer=timer)
+        data_array = self.data_provider.get_price(all_tickers, fields, start_date, end_date, frequency, timer)
+        return data_array, exp_dates
 
     def get_last_available_exchange_rate(self, base_currency, quote_currency, frequency):
-        if isinstance(self.data_provider, ExchangeRateProvider):
-            return self.data_provider.get_last_available_exchange_rate(base_currency, quote_currency, frequency)
-        else:
+        """
+        Returns the last available exchange rate. If the prices of the exchange rate ticker were prefetched and the
+        underlying data provider declares the quote factor of the ticker (see get_exchange_rate_quote_factor), the rate
+        is computed from the prefetched data. Otherwise, the underlying data provider is used.
+        """
+        if not isinstance(self.data_provider, ExchangeRateProvider):
             raise NotImplementedError(f"{type(self.data_provider)} does not extend ExchangeRateProvider.")
+
+        currency_ticker = self.data_provider.create_exchange_rate_ticker(base_currency, quote_currency)
+        if currency_ticker not in self.cached_tickers or \
+                not {PriceField.Open, PriceField.Close}.issubset(self.cached_fields):
+            return self.data_provider.get_last_available_exchange_rate(base_currency, quote_currency, frequency)
+
+        if (base_currency, quote_currency) not in self._exchange_rates_quote_factors:
+            self._exchange_rates_quote_factors[(base_currency, quote_currency)] = \
+                self.data_provider.get_exchange_rate_quote_factor(base_currency, quote_currency)
+
+        quote_factor = self._exchange_rates_quote_factors[(base_currency, quote_currency)]
+        if quote_factor is None:
+            return self.data_provider.get_last_available_exchange_rate(base_currency, quote_currency, frequency)
+
+        return self.get_last_available_price(currency_ticker, frequency) / quote_factor
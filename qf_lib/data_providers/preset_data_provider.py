@@ -15,9 +15,11 @@
 from datetime import datetime
 from typing import Union, Sequence, Any, Set, Type, Dict, FrozenSet, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from numpy import nan
 
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
 from qf_lib.common.enums.expiration_date_field import ExpirationDateField
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
@@ -33,14 +35,20 @@ from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+from qf_lib.data_providers.columnar_data_bundle import ColumnarDataBundle
 from qf_lib.data_providers.futures_data_provider import FuturesDataProvider
-from qf_lib.data_providers.helpers import normalize_data_array
+from qf_lib.data_providers.helpers import normalize_data_array, merge_data_arrays
+from qf_lib.data_providers.last_available_prices_index import LastAvailablePricesIndex
 
 
 class PresetDataProvider(AbstractPriceDataProvider, FuturesDataProvider):
     """
     Wrapper on QFDataArray which makes it a DataProvider.
 
+    Internally the data is stored in a columnar, numpy-backed form (ColumnarDataBundle), so that all the data requests
+    are answered using integer indexing instead of label-based xarray lookups. The data may also be backed by
+    a memory-mapped file (see load_data_bundle), in which case only the requested date windows are paged in.
+
     Parameters
     ----------
     data
@@ -59,18 +67,64 @@ class PresetDataProvider(AbstractPriceDataProvider, FuturesDataProvider):
     def __init__(self, data: QFDataArray, start_date: datetime, end_date: datetime, frequency: Frequency,
                  exp_dates: Dict[FutureTicker, QFDataFrame] = None, timer: Optional[Timer] = None):
         super().__init__(timer)
-        self._data_bundle = data
         self.frequency = frequency
+        self._start_date = start_date
+        self._end_date = end_date
+        self._set_data_bundle(data, exp_dates)
+
+    def _set_data_bundle(self, data: QFDataArray, exp_dates: Optional[Dict[FutureTicker, QFDataFrame]]):
+        self._data_bundle = data
+        self._columnar_bundle = ColumnarDataBundle(data)
+        self._last_prices_index = None  # type: Optional[LastAvailablePricesIndex]
         self._exp_dates = exp_dates
 
         self._tickers_cached_set = frozenset(data.tickers.values)
         self._future_tickers_cached_set = frozenset(exp_dates.keys()) if exp_dates is not None else None
         self._fields_cached_set = frozenset(data.fields.values)
-        self._start_date = start_date
-        self._end_date = end_date
 
         self._ticker_types = {type(ticker) for ticker in data.tickers.values}
 
+    def merge_data_bundle(self, data: Optional[QFDataArray], start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None, exp_dates: Dict[FutureTicker, QFDataFrame] = None):
+        """
+        Merges new data (e.g. new dates or new tickers) into the data bundle. If both, the data bundle and the new data,
+        contain a value for the same date, ticker and field, the non-missing new value takes precedence.
+
+        Parameters
+        ----------
+        data: Optional[QFDataArray]
+            data to be merged, indexed by date, (specific) tickers and fields. If None, only the cached period and the
+            expiration dates are updated
+        start_date: Optional[datetime]
+            new beginning of the cached period. The cached period can only be extended, thus the start date is
+            changed only if it is before the current start date
+        end_date: Optional[datetime]
+            new end of the cached period. The cached period can only be extended, thus the end date is changed only if
+            it is after the current end date
+        exp_dates: Dict[FutureTicker, QFDataFrame]
+            expiration dates of the future tickers, which should be added to (or replace) the cached expiration dates
+        """
+        merged_data = merge_data_arrays(self._data_bundle, data) if data is not None else self._data_bundle
+        merged_exp_dates = self._exp_dates
+        if exp_dates is not None:
+            merged_exp_dates = {**(self._exp_dates or {}), **exp_dates}
+
+        self._start_date = min(self._start_date, start_date) if start_date is not None else self._start_date
+        self._end_date = max(self._end_date, end_date) if end_date is not None else self._end_date
+        self._set_data_bundle(merged_data, merged_exp_dates)
+
+    def set_data_bundle(self, data: QFDataArray):
+        """
+        Replaces the data bundle with the given data (e.g. with its memory-mapped copy, see load_data_bundle). The
+        cached period and the expiration dates remain unchanged.
+
+        Parameters
+        ----------
+        data: QFDataArray
+            data to be wrapped, indexed by date, (specific) tickers and fields
+        """
+        self._set_data_bundle(data, self._exp_dates)
+
     @property
     def data_bundle(self) -> QFDataArray:
         return self._data_bundle
@@ -126,7 +180,7 @@ class PresetDataProvider(AbstractPriceDataProvider, FuturesDataProvider):
         fields, got_single_field = convert_to_list(fields, PriceField)
 
         self._check_if_cached_data_available(specific_tickers, fields, start_date, end_date)
-        data_array = self._data_bundle.loc[start_date:end_date, specific_tickers, fields]
+        data_array = self._columnar_bundle.get_data_array(start_date, end_date, specific_tickers, fields)
 
         # Data aggregation
         if frequency < self.frequency and data_array.shape[0] > 0:
@@ -154,7 +208,8 @@ class PresetDataProvider(AbstractPriceDataProvider, FuturesDataProvider):
         got_single_date = nr_of_bars == 1
 
         start_date = self._compute_start_date(nr_of_bars, end_date, frequency)
-        data_bundle = self._data_bundle.loc[start_date:end_date, specific_tickers, fields].dropna(DATES, how='all')
+        data_bundle = self._columnar_bundle.get_data_array(start_date, end_date, specific_tickers, fields,
+                                                           drop_empty_dates=True)
 
         if frequency < self.frequency and data_bundle.shape[0] > 0:  # Aggregate bars to desired frequency
             data_bundle = self._aggregate_bars(data_bundle, fields, frequency)
@@ -172,43 +227,72 @@ class PresetDataProvider(AbstractPriceDataProvider, FuturesDataProvider):
 
     def _last_available_price(self, tickers: Union[Ticker, Sequence[Ticker]], frequency: Optional[Frequency] = None,
                               end_time: Optional[datetime] = None) -> Union[float, PricesSeries]:
+        return self._last_available_price_from_index(tickers, frequency, end_time)
+
+    def _last_available_price_settable_timer_daily(self, tickers: Union[Ticker, Sequence[Ticker]],
+                                                   frequency: Frequency = None,
+                                                   end_time: Optional[datetime] = None) -> Union[float, QFSeries]:
+        frequency = frequency or Frequency.DAILY
+        if frequency != self.frequency:  # the Open prices of the aggregated bars are not precomputed
+            return super()._last_available_price_settable_timer_daily(tickers, frequency, end_time)
+
+        end_time = end_time or self.timer.now()
+        end_date_without_look_ahead = self.get_end_date_without_look_ahead(end_time, frequency)
+        latest_market_open = self._get_last_available_market_event(end_time, MarketOpenEvent)
+        current_bar_time = latest_market_open if end_date_without_look_ahead < latest_market_open else None
+
+        return self._last_available_price_from_index(tickers, frequency, end_date_without_look_ahead, current_bar_time)
+
+    def _last_available_price_settable_timer_intraday(self, tickers: Union[Ticker, Sequence[Ticker]],
+                                                      frequency: Frequency = None,
+                                                      end_time: Optional[datetime] = None) -> Union[float, QFSeries]:
+        frequency = frequency or Frequency.MIN_1
+        if frequency != self.frequency:
+            return super()._last_available_price_settable_timer_intraday(tickers, frequency, end_time)
+
+        current_time = self.timer.now() + RelativeDelta(second=0, microsecond=0)
+        end_time = end_time or current_time
+        end_date_without_look_ahead = self.get_end_date_without_look_ahead(end_time, frequency)
+
+        if current_time <= end_time:
+            last_bar_time = end_date_without_look_ahead
+            current_bar_time = end_date_without_look_ahead + frequency.time_delta()
+        else:
+            last_bar_time = end_date_without_look_ahead - frequency.time_delta()
+            current_bar_time = end_date_without_look_ahead
+
+        return self._last_available_price_from_index(tickers, frequency, last_bar_time, current_bar_time)
+
+    def _last_available_price_from_index(self, tickers: Union[Ticker, Sequence[Ticker]],
+                                         frequency: Optional[Frequency], end_time: Optional[datetime],
+                                         current_bar_time: Optional[datetime] = None) -> Union[float, PricesSeries]:
+        """
+        Returns the last prices available at the end_time using the LastAvailablePricesIndex. If the current_bar_time
+        is given, the Open prices of the bar starting at this time (if available) take precedence over the last prices.
+        """
         frequency = frequency or self.frequency or Frequency.DAILY
         end_time = self.get_end_date_without_look_ahead(end_time, frequency)
         assert frequency >= Frequency.DAILY, "Frequency lower then daily is not supported by the " \
                                              "get_last_available_price function"
 
         tickers, specific_tickers, tickers_mapping, got_single_ticker = self._tickers_mapping(tickers)
-
         if not tickers:
             return nan if got_single_ticker else PricesSeries()
 
-        start_time = end_time - RelativeDelta(days=7)  # 7 days to know if an asset disappears
-        data_array = self._data_bundle.loc[start_time:end_time, specific_tickers, [PriceField.Open, PriceField.Close]]
-
-        # Get the Close price of latest bar if available for all the tickers
-        last_close = data_array.isel(dates=slice(-1, None)).loc[:, :, [PriceField.Close]]
-        if not last_close.isnull().any():
-            normalized_result = normalize_data_array(last_close, specific_tickers, [PriceField.Close],
-                                                     got_single_date=True, got_single_ticker=got_single_ticker,
-                                                     got_single_field=True, use_prices_types=True)
-            normalized_result = self._map_normalized_result(normalized_result, tickers_mapping, tickers)
-            return normalized_result
-
-        open_prices = data_array.loc[:, :, [PriceField.Open]].squeeze(axis=2).to_pandas()
-        close_prices = data_array.loc[:, :, [PriceField.Close]].squeeze(axis=2).to_pandas()
+        if self._last_prices_index is None:
+            self._last_prices_index = LastAvailablePricesIndex(self._columnar_bundle)
 
-        first_indices = [df.first_valid_index().to_pydatetime() for df in [open_prices, close_prices] if
-                         df.first_valid_index() is not None]
-        if not first_indices:
-            return nan if got_single_ticker else PricesSeries(index=tickers)
+        tickers_positions = self._columnar_bundle.tickers_positions(specific_tickers)
+        last_prices = self._last_prices_index.get_last_prices(tickers_positions, end_time)
 
-        start_date = min(first_indices)
-        latest_available_prices_series = self._get_valid_latest_available_prices(start_date, specific_tickers,
-                                                                                 open_prices, close_prices)
+        if current_bar_time is not None:
+            start_time = self._adjust_start_date(current_bar_time, frequency)
+            self._check_if_cached_data_available(specific_tickers, [PriceField.Open], start_time, current_bar_time)
+            open_prices = self._last_prices_index.get_open_prices(tickers_positions, start_time, current_bar_time)
+            last_prices = np.where(np.isnan(open_prices), last_prices, open_prices)
 
-        latest_available_prices_series = self._map_normalized_result(latest_available_prices_series, tickers_mapping,
-                                                                     tickers)
-        return latest_available_prices_series.iloc[0] if got_single_ticker else latest_available_prices_series
+        return last_prices[0] if got_single_ticker else \
+            PricesSeries(data=last_prices, index=[tickers_mapping[ticker] for ticker in specific_tickers])
 
     def _tickers_mapping(self, tickers: Union[Ticker, Sequence[Ticker]]) -> \
             Tuple[Sequence[Ticker], Sequence[Ticker], Dict, bool]:
@@ -273,7 +357,7 @@ class PresetDataProvider(AbstractPriceDataProvider, FuturesDataProvider):
         fields, got_single_field = convert_to_list(fields, tuple(fields_type))
 
         self._check_if_cached_data_available(specific_tickers, fields, start_date, end_date)
-        data_array = self._data_bundle.loc[start_date:end_date, specific_tickers, fields]
+        data_array = self._columnar_bundle.get_data_array(start_date, end_date, specific_tickers, fields)
 
         normalized_result = normalize_data_array(data_array, specific_tickers, fields, got_single_date,
                                                  got_single_ticker,
@@ -302,6 +386,10 @@ class PresetDataProvider(AbstractPriceDataProvider, FuturesDataProvider):
 
     def _map_normalized_result(self, normalized_result, tickers_mapping, tickers):
         # Map the specific tickers onto the tickers given by the tickers_mapping array
+        identity_mapping = all(specific_ticker is ticker for specific_ticker, ticker in tickers_mapping.items())
+        if identity_mapping and not (isinstance(normalized_result, PricesSeries) and len(tickers) == 1):
+            return normalized_result
+
         if isinstance(normalized_result, QFDataArray):
             normalized_result = normalized_result.assign_coords(
                 tickers=[tickers_mapping[t] for t in normalized_result.tickers.values])
@@ -16,8 +16,6 @@ import os
 from os.path import join, abspath, dirname
 from typing import List
 
-from weasyprint import HTML, CSS
-
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.documents_utils.document_exporting.document import Document
 from qf_lib.documents_utils.document_exporting.document_exporter import DocumentExporter
@@ -81,6 +79,9 @@ class PDFExporter(DocumentExporter):
         -------
         the absolute path to the output PDF file that was saved
         """
+        # weasyprint (and the system libraries it loads) is imported only when a PDF is rendered
+        from weasyprint import HTML, CSS
+
         css_file_paths = []
         document = self._merge_documents(documents, filename)
 
@@ -15,12 +15,9 @@
 from datetime import datetime
 from os import makedirs, path, remove
 from os.path import exists, isfile, join, dirname
-from typing import Any, Union, Optional
+from typing import Any, Union, Optional, TYPE_CHECKING
 
 import numpy
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font
-from openpyxl.worksheet.worksheet import Worksheet
 from pandas import Series, DataFrame
 
 from qf_lib.common.tickers.tickers import Ticker
@@ -32,6 +29,10 @@ from qf_lib.documents_utils.excel.write_mode import WriteMode
 from qf_lib.settings import Settings
 from qf_lib.starting_dir import get_starting_dir_abs_path
 
+if TYPE_CHECKING:
+    from openpyxl import Workbook
+    from openpyxl.worksheet.worksheet import Worksheet
+
 
 class ExcelExporter:
 
@@ -107,6 +108,7 @@ class ExcelExporter:
         work_book = self.get_workbook(file_path, write_mode)
         work_sheet = self.get_worksheet(work_book, sheet_name)
 
+        from openpyxl.styles import Font
         for cell in work_sheet[specified_area][0]:
             cell.font = Font(**font_setting)
 
@@ -139,10 +141,11 @@ class ExcelExporter:
         self.write_to_worksheet(value, work_sheet, row, column, include_index=False, include_column_names=False)
         work_book.save(file_path)
 
-    def get_workbook(self, file_path: str, write_mode: WriteMode) -> Workbook:
+    def get_workbook(self, file_path: str, write_mode: WriteMode) -> "Workbook":
         """
         Takes a path to the file (creates it if necessary), opens the file and retrieves a Workbook object from it.
         """
+        from openpyxl import Workbook, load_workbook
         work_book = None
 
         if write_mode == WriteMode.CREATE_IF_DOESNT_EXIST:
@@ -163,7 +166,7 @@ class ExcelExporter:
 
         return work_book
 
-    def get_worksheet(self, work_book: Workbook, sheet_name: str = None) -> Worksheet:
+    def get_worksheet(self, work_book: "Workbook", sheet_name: str = None) -> "Worksheet":
         """
         Gets a worksheet of given name from a provided workbook. If :sheet_name is None, then the active sheet
         from the workbook is returned.
@@ -175,7 +178,7 @@ class ExcelExporter:
 
         return work_sheet
 
-    def write_to_worksheet(self, exported_value: Any, work_sheet: Worksheet, starting_row: int, starting_column: int,
+    def write_to_worksheet(self, exported_value: Any, work_sheet: "Worksheet", starting_row: int, starting_column: int,
                            include_index: bool, include_column_names: bool):
         """
         Exports a given value to Excel worksheet. If the :exported_value is a series or dataframe, then the
@@ -12,9 +12,6 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from openpyxl.utils import column_index_from_string
-from openpyxl.utils.cell import coordinate_from_string
-
 
 class BoundingBox:
     def __init__(self, starting_row: int, starting_column: int, ending_row: int, ending_column: int):
@@ -29,6 +26,8 @@ def row_and_column(cells_address: str) -> (int, int):
     Converts the string address of the cell (e.g. A1) into the row's number (starting from 1) and column's number
     (starting from 1).
     """
+    from openpyxl.utils import column_index_from_string
+    from openpyxl.utils.cell import coordinate_from_string
 
     column_as_letter, row_number = coordinate_from_string(cells_address)
     column_number = column_index_from_string(column_as_letter)
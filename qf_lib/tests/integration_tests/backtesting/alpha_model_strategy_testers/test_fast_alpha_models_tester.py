@@ -12,9 +12,11 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import tempfile
 import unittest
 from datetime import datetime
 from itertools import cycle, islice
+from typing import Optional
 from unittest import TestCase
 
 import numpy as np
@@ -30,12 +32,15 @@ from qf_lib.backtesting.fast_alpha_model_tester.fast_alpha_models_tester import
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import QuandlTicker, Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
 from qf_lib.common.utils.dateutils.string_to_date import str_to_date
 from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
 from qf_lib.data_providers.data_provider import DataProvider
+from qf_lib.data_providers.helpers import cast_data_array_to_proper_type
 from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_series_equal
 
@@ -170,6 +175,31 @@ class TestFastAlphaModelsTester(TestCase):
         ])
         assert_series_equal(expected_returns, second_elem.returns_tms)
 
+    def test_generate_trades_for_ticker(self):
+        config = FastAlphaModelTesterConfig(self.alpha_model_type, {"period_length": 5, "risk_estimation_factor": None,
+                                                                    "first_suggested_exposure": Exposure.LONG},
+                                            "period_length")
+        tester = FastAlphaModelTester([config], [self.apple_ticker], self.test_start_date, self.test_end_date,
+                                      self.data_provider, self.timer)
+        dates = pd.bdate_range(start=self.test_start_date, periods=8)
+        open_prices = self._mocked_prices_arr.loc[:, self.apple_ticker, PriceField.Open].copy()
+        open_prices.loc[dates[5]] = np.nan
+        prices_array = self._mocked_prices_arr.copy()
+        prices_array.loc[:, self.apple_ticker, PriceField.Open] = open_prices
+
+        exposures_tms = pd.Series([np.nan, 1.0, 1.0, -1.0, 0.0, 1.0, 1.0, 0.0], index=dates)
+        trades = tester.generate_trades_for_ticker(prices_array, exposures_tms, self.apple_ticker)
+
+        expected_trades_data = [
+            [dates[1], dates[3], open_prices.loc[dates[3]] / open_prices.loc[dates[1]] - 1, 1],
+            [dates[3], dates[4], 1 - open_prices.loc[dates[4]] / open_prices.loc[dates[3]], -1],
+            [dates[6], dates[7], open_prices.loc[dates[7]] / open_prices.loc[dates[6]] - 1, 1],
+        ]
+        self.assertEqual(len(expected_trades_data), len(trades))
+        for (start_time, end_time, pnl, direction), trade in zip(expected_trades_data, trades):
+            self.assertEqual((start_time, end_time, direction), (trade.start_time, trade.end_time, trade.direction))
+            self.assertAlmostEqual(pnl, trade.pnl)
+
 
 class DummyAlphaModel(AlphaModel):
     def __init__(self, period_length: int, first_suggested_exposure: Exposure,
@@ -204,5 +234,161 @@ class DummyAlphaModel(AlphaModel):
         return exposure
 
 
+class TestFastAlphaModelsTesterVectorized(TestCase):
+    tickers = [QuandlTicker("AAPL", "WIKI"), QuandlTicker("IBM", "WIKI")]
+
+    data_start_date = str_to_date("2014-10-01")
+    test_start_date = str_to_date("2015-01-01")
+    test_end_date = str_to_date("2015-03-31")
+
+    MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+    MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+
+    def setUp(self):
+        dates = pd.bdate_range(self.data_start_date, self.test_end_date)
+        rng = np.random.default_rng(2015)
+        close_prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(dates), len(self.tickers))), axis=0))
+        values = np.repeat(close_prices[:, :, np.newaxis], len(PriceField.ohlcv()), axis=2)
+        values[5, 1, :] = np.nan
+
+        self.timer = SettableTimer()
+        prices = QFDataArray.create(dates, self.tickers, PriceField.ohlcv(), values)
+        self.data_provider = PresetDataProvider(prices, self.data_start_date, self.test_end_date, Frequency.DAILY,
+                                                timer=self.timer)
+
+    def _create_tester(self, model_type, n_jobs=1):
+        configs = [FastAlphaModelTesterConfig(model_type, {"fast_time_period": fast, "slow_time_period": slow,
+                                                           "risk_estimation_factor": None},
+                                              ("fast_time_period", "slow_time_period"))
+                   for fast, slow in ((3, 10), (5, 20))]
+        return FastAlphaModelTester(configs, self.tickers, self.test_start_date, self.test_end_date,
+                                    self.data_provider, self.timer, n_jobs=n_jobs,
+                                    lookback_period=RelativeDelta(months=3))
+
+    def _test_alpha_models(self, model_type, n_jobs=1):
+        with self._create_tester(model_type, n_jobs) as tester:
+            return tester.test_alpha_models()
+
+    def assert_backtest_summaries_equal(self, expected_summary, actual_summary):
+        self.assertEqual(len(expected_summary.elements_list), len(actual_summary.elements_list))
+        for expected_elem, actual_elem in zip(expected_summary.elements_list, actual_summary.elements_list):
+            assert_series_equal(expected_elem.returns_tms, actual_elem.returns_tms)
+            self.assertEqual([(t.ticker, t.start_time, t.end_time, t.pnl, t.direction) for t in expected_elem.trades],
+                             [(t.ticker, t.start_time, t.end_time, t.pnl, t.direction) for t in actual_elem.trades])
+
+    def test_vectorized_exposures_equal_exposures_calculated_date_by_date(self):
+        expected_summary = self._test_alpha_models(MovingAverageAlphaModel)
+        actual_summary = self._test_alpha_models(VectorizedMovingAverageAlphaModel)
+
+        self.assert_backtest_summaries_equal(expected_summary, actual_summary)
+        self.assertTrue(any(len(elem.trades) > 1 for elem in actual_summary.elements_list))
+
+    def test_parallel_workers_results_equal_sequential_results(self):
+        for model_type in (MovingAverageAlphaModel, VectorizedMovingAverageAlphaModel):
+            expected_summary = self._test_alpha_models(model_type)
+            with self._create_tester(model_type, n_jobs=2) as tester:
+                self.assert_backtest_summaries_equal(expected_summary, tester.test_alpha_models())
+                parallel = tester._parallel
+                self.assert_backtest_summaries_equal(expected_summary, tester.test_alpha_models())
+                self.assertIs(parallel, tester._parallel)
+            self.assertIsNone(tester._parallel)
+
+    def test_exposures_are_calculated_date_by_date_if_vectorized_calculation_is_not_supported(self):
+        expected_summary = self._test_alpha_models(MovingAverageAlphaModel)
+        actual_summary = self._test_alpha_models(PartiallyVectorizedMovingAverageAlphaModel)
+
+        self.assert_backtest_summaries_equal(expected_summary, actual_summary)
+        self.assertTrue(any(len(elem.trades) > 1 for elem in actual_summary.elements_list))
+
+    def test_workers_data_provider_uses_memory_mapped_data_bundle(self):
+        self.data_provider = EndOfDayPresetDataProvider(self.data_provider.data_bundle, self.data_start_date,
+                                                        self.test_end_date, Frequency.DAILY, timer=self.timer)
+        configs = [FastAlphaModelTesterConfig(MovingAverageAlphaModel, {"fast_time_period": 3, "slow_time_period": 10,
+                                                                        "risk_estimation_factor": None},
+                                              ("fast_time_period", "slow_time_period"))]
+        tester = FastAlphaModelTester(configs, self.tickers, self.test_start_date, self.test_end_date,
+                                      self.data_provider, self.timer)
+
+        with tempfile.TemporaryDirectory() as shared_data_dir:
+            data_provider = tester._share_data_provider(shared_data_dir)
+
+            self.assertIsInstance(data_provider, EndOfDayPresetDataProvider)
+            self.assertIsNot(data_provider, self.data_provider)
+            self.assertIsInstance(data_provider.data_bundle.data, np.memmap)
+            self.assertNotIsInstance(self.data_provider.data_bundle.data, np.memmap)
+            self.assertEqual((data_provider.start_date, data_provider.end_date),
+                             (self.data_provider.start_date, self.data_provider.end_date))
+            del data_provider
+
+    def test_exposures_are_calculated_date_by_date_if_market_close_is_not_set_up(self):
+        trigger_time = MarketCloseEvent._trigger_time, MarketCloseEvent._trigger_time_rule
+        MarketCloseEvent._trigger_time, MarketCloseEvent._trigger_time_rule = None, None
+        try:
+            self.data_provider = EndOfDayPresetDataProvider(self.data_provider.data_bundle, self.data_start_date,
+                                                            self.test_end_date, Frequency.DAILY, timer=self.timer)
+            expected_summary = self._test_alpha_models(MovingAverageAlphaModel)
+            actual_summary = self._test_alpha_models(VectorizedMovingAverageAlphaModel)
+        finally:
+            MarketCloseEvent._trigger_time, MarketCloseEvent._trigger_time_rule = trigger_time
+
+        self.assert_backtest_summaries_equal(expected_summary, actual_summary)
+        self.assertTrue(any(len(elem.trades) > 1 for elem in actual_summary.elements_list))
+
+
+class EndOfDayPresetDataProvider(PresetDataProvider):
+    """ Makes the daily bars available at the end of the day, independently of the MarketCloseEvent. """
+
+    def get_end_date_without_look_ahead(self, end_date: Optional[datetime], frequency: Frequency):
+        end_date = end_date or self.timer.now()
+        return end_date + RelativeDelta(hour=0, minute=0, second=0, microsecond=0, microseconds=-1)
+
+
+class MovingAverageAlphaModel(AlphaModel):
+    def __init__(self, fast_time_period: int, slow_time_period: int, risk_estimation_factor: float,
+                 data_provider: DataProvider = None):
+        super().__init__(risk_estimation_factor, data_provider)
+        self.fast_time_period = fast_time_period
+        self.slow_time_period = slow_time_period
+
+    def calculate_exposure(self, ticker: Ticker, current_exposure: Exposure, current_time: datetime,
+                           frequency: Frequency) -> Exposure:
+        close_tms = self.data_provider.historical_price(ticker, PriceField.Close, self.slow_time_period,
+                                                        current_time, frequency)
+        fast_ma = close_tms.ewm(span=self.fast_time_period, adjust=False).mean()
+        slow_ma = close_tms.ewm(span=self.slow_time_period, adjust=False).mean()
+        return Exposure.LONG if fast_ma.iloc[-1] > slow_ma.iloc[-1] else Exposure.SHORT
+
+
+class VectorizedMovingAverageAlphaModel(MovingAverageAlphaModel):
+    def calculate_exposures_vectorized(self, prices: QFDataArray) -> QFDataFrame:
+        close_prices_df = cast_data_array_to_proper_type(prices.loc[:, :, PriceField.Close])
+
+        exposures = {}
+        for ticker, close_tms in close_prices_df.items():
+            close_tms = close_tms.dropna()
+            windows = np.lib.stride_tricks.sliding_window_view(close_tms.values, self.slow_time_period)
+            fast_ma = windows @ self._ema_weights(self.fast_time_period)
+            slow_ma = windows @ self._ema_weights(self.slow_time_period)
+
+            ticker_exposures = np.where(fast_ma > slow_ma, Exposure.LONG.value, Exposure.SHORT.value)
+            exposures[ticker] = QFSeries(ticker_exposures, index=close_tms.index[self.slow_time_period - 1:])
+
+        return QFDataFrame(exposures).ffill()
+
+    def _ema_weights(self, span: int) -> np.ndarray:
+        """ Weights of the window values in the last value of the exponential moving average (adjust=False). """
+        alpha = 2 / (span + 1)
+        weights = alpha * (1 - alpha) ** np.arange(self.slow_time_period - 1, -1, -1)
+        weights[0] = (1 - alpha) ** (self.slow_time_period - 1)
+        return weights
+
+
+class PartiallyVectorizedMovingAverageAlphaModel(VectorizedMovingAverageAlphaModel):
+    """ Supports the vectorized calculation of exposures only for the fast time period shorter than 5. """
+
+    def calculate_exposures_vectorized(self, prices: QFDataArray) -> Optional[QFDataFrame]:
+        return super().calculate_exposures_vectorized(prices) if self.fast_time_period < 5 else None
+
+
 if __name__ == '__main__':
     unittest.main()
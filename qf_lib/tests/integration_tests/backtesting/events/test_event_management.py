@@ -21,6 +21,7 @@ from qf_lib.backtesting.events.end_trading_event.end_trading_event import EndTra
 from qf_lib.backtesting.events.end_trading_event.end_trading_event_listener import EndTradingEventListener
 from qf_lib.backtesting.events.event_base import AllEventListener, Event
 from qf_lib.backtesting.events.event_manager import EventManager
+from qf_lib.backtesting.events.event_profiler import EventProfiler
 from qf_lib.backtesting.events.notifiers import Notifiers
 from qf_lib.backtesting.events.time_event.periodic_event.periodic_event import PeriodicEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.after_market_close_event import AfterMarketCloseEvent
@@ -161,6 +162,63 @@ class TestEventManagement(TestCase):
         for key in expected_single_time_events_data:
             self.assertEqual(expected_single_time_events_data[key], listener.registered_single_time_events[key])
 
+    def test_event_management_with_precomputed_timeline(self):
+        registered_events = []
+        for precompute_timeline in (False, True):
+            timer = SettableTimer(initial_time=str_to_date("2018-04-10 00:00:00.000000", DateFormat.FULL_ISO))
+            end_date = str_to_date("2018-04-12")
+
+            notifiers = Notifiers(timer)
+            event_manager = self._create_event_manager(timer, notifiers)
+            BacktestTimeFlowController(
+                notifiers.scheduler, event_manager, timer, notifiers.empty_queue_event_notifier, end_date,
+                precompute_timeline
+            )
+
+            listener = DummyListener(notifiers, event_manager, timer)
+            while event_manager.continue_trading:
+                event_manager.dispatch_next_event()
+
+            # the order of notifying the EmptyQueueEvent listeners is not deterministic, so their times are skipped
+            registered_events.append([(type(event), time) for event, time in listener.registered_events
+                                      if not isinstance(event, EmptyQueueEvent)])
+
+        expected_events, actual_events = registered_events
+        self.assertEqual(22, len(expected_events))
+        self.assertEqual(expected_events, actual_events)
+
+    def test_event_management_with_profiler(self):
+        timer = SettableTimer(initial_time=str_to_date("2018-04-10 00:00:00.000000", DateFormat.FULL_ISO))
+        end_date = str_to_date("2018-04-10")
+
+        notifiers = Notifiers(timer)
+        event_manager = self._create_event_manager(timer, notifiers)
+        profiler = EventProfiler()
+        event_manager.set_profiler(profiler)
+        BacktestTimeFlowController(
+            notifiers.scheduler, event_manager, timer, notifiers.empty_queue_event_notifier, end_date
+        )
+
+        listener = DummyListener(notifiers, event_manager, timer)
+        while event_manager.continue_trading:
+            event_manager.dispatch_next_event()
+
+        stats_df = profiler.stats()
+        calls = {(event, listener): calls for event, listener, calls in
+                 stats_df[["Event", "Listener", "Calls"]].itertuples(index=False)}
+
+        self.assertEqual(calls[("EmptyQueueEvent", "DummyListener")], 8)
+        self.assertEqual(calls[("EmptyQueueEvent", "BacktestTimeFlowController")], 8)
+        self.assertEqual(calls[("EmptyQueueEvent", EventProfiler.ALL_LISTENERS)], 8)
+        self.assertEqual(calls[("MarketOpenEvent", "DummyListener")], 1)
+        self.assertEqual(calls[("PeriodicEvent1Hour", "DummyListener")], 2)
+        self.assertEqual(calls[("SingleTimeEvent", "DummyListener")], 2)
+        self.assertEqual(calls[("EndTradingEvent", "DummyListener")], 1)
+        self.assertEqual(len(listener.registered_events), 16)
+
+        self.assertTrue((stats_df["Total time [s]"] >= 0).all())
+        self.assertTrue((stats_df["p99 time [ms]"] >= stats_df["p50 time [ms]"]).all())
+
     def _create_event_manager(self, timer, notifiers):
         event_manager = EventManager(timer)
 
@@ -0,0 +1,170 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from typing import Dict, Any
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.events.time_event.periodic_event.calculate_and_place_orders_event import \
+    CalculateAndPlaceOrdersPeriodicEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.after_market_close_event import AfterMarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.calculate_and_place_orders_event import \
+    CalculateAndPlaceOrdersRegularEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.monitoring.backtest_monitor import BacktestMonitorSettings
+from qf_lib.backtesting.order.execution_style import MarketOrder
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.backtesting.strategies.abstract_strategy import AbstractStrategy
+from qf_lib.backtesting.trading_session.backtest_parameter_sweep_runner import BacktestParameterSweepRunner, \
+    SUMMARY_STATS, EVENTS_CONFIGURATION_ATTRIBUTES, _summary_stats, _get_events_configuration, \
+    _set_events_configuration
+from qf_lib.backtesting.trading_session.backtest_trading_session import BacktestTradingSession
+from qf_lib.backtesting.trading_session.backtest_trading_session_builder import BacktestTradingSessionBuilder
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+TICKER = BloombergTicker("Example Equity")
+
+
+class MovingAverageStrategy(AbstractStrategy):
+    def __init__(self, ts: BacktestTradingSession, window: int):
+        super().__init__(ts)
+        self.broker = ts.broker
+        self.order_factory = ts.order_factory
+        self.data_provider = ts.data_provider
+        self.window = window
+
+    def calculate_and_place_orders(self):
+        close_prices = self.data_provider.historical_price(TICKER, PriceField.Close, self.window)
+        target_percentage = 1.0 if close_prices.iloc[-1] >= close_prices.mean() else 0.0
+        orders = self.order_factory.target_percent_orders({TICKER: target_percentage}, MarketOrder(), TimeInForce.DAY)
+        self.broker.cancel_all_open_orders()
+        self.broker.place_orders(orders)
+
+
+def create_session_builder(parameters: Dict[str, Any]) -> BacktestTradingSessionBuilder:
+    session_builder = BacktestTradingSessionBuilder(None, None, None)
+    session_builder.set_frequency(Frequency.DAILY)
+    session_builder.set_backtest_name(f"Moving Average {parameters['window']}")
+    session_builder.set_monitor_settings(BacktestMonitorSettings.no_stats())
+    return session_builder
+
+
+def create_strategy(ts: BacktestTradingSession, parameters: Dict[str, Any]):
+    strategy = MovingAverageStrategy(ts, parameters["window"])
+    CalculateAndPlaceOrdersRegularEvent.set_daily_default_trigger_time()
+    CalculateAndPlaceOrdersRegularEvent.exclude_weekends()
+    strategy.subscribe(CalculateAndPlaceOrdersRegularEvent)
+
+
+class TestBacktestParameterSweepRunner(TestCase):
+    EVENT_TYPES = (MarketOpenEvent, MarketCloseEvent, CalculateAndPlaceOrdersRegularEvent)
+
+    def setUp(self):
+        self.previous_trigger_times = {
+            event_type: (event_type._trigger_time, event_type._trigger_time_rule) for event_type in self.EVENT_TYPES
+        }
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+
+        dates = pd.bdate_range(datetime(2020, 1, 1), datetime(2021, 6, 30), name=DATES)
+        close_prices = 100 * np.exp(np.cumsum(np.random.default_rng(18).normal(0, 0.01, len(dates))))
+        values = np.repeat(close_prices[:, np.newaxis, np.newaxis], len(PriceField.ohlcv()), axis=2)
+        values[:, :, PriceField.ohlcv().index(PriceField.Volume)] = 1e6
+        self.prices = QFDataArray.create(dates, [TICKER], PriceField.ohlcv(), values)
+
+        self.start_date = datetime(2021, 1, 4)
+        self.end_date = datetime(2021, 6, 30)
+        self.data_provider = PresetDataProvider(self.prices, dates[0], dates[-1], Frequency.DAILY)
+
+    def tearDown(self):
+        for event_type, (trigger_time, trigger_time_rule) in self.previous_trigger_times.items():
+            event_type._trigger_time = trigger_time
+            event_type._trigger_time_rule = trigger_time_rule
+
+    def test_sweep_results_equal_separate_backtests(self):
+        parameters_sets = [{"window": window} for window in (5, 10, 20)]
+
+        runner = BacktestParameterSweepRunner(create_session_builder, create_strategy, self.data_provider, TICKER,
+                                              self.start_date, self.end_date, time_delta=RelativeDelta(months=6),
+                                              n_jobs=2)
+        summary = runner.run(parameters_sets)
+
+        self.assertEqual([5, 10, 20], summary["window"].tolist())
+        self.assertEqual(["window"] + list(SUMMARY_STATS), summary.columns.tolist())
+
+        for parameters, (_, row) in zip(parameters_sets, summary.iterrows()):
+            session_builder = create_session_builder(parameters)
+            session_builder.set_data_provider(self.data_provider)
+            ts = session_builder.build(self.start_date, self.end_date)
+            create_strategy(ts, parameters)
+            ts.start_trading()
+
+            expected_stats = _summary_stats(ts.backtest_result)
+            self.assertGreater(expected_stats["nr_of_transactions"], 0)
+            for stat in SUMMARY_STATS:
+                self.assertAlmostEqual(expected_stats[stat], row[stat], places=8)
+
+    def test_failed_backtest_raises_exception(self):
+        runner = BacktestParameterSweepRunner(create_session_builder, create_strategy, self.data_provider, TICKER,
+                                              self.start_date, self.end_date, time_delta=RelativeDelta(months=6))
+        with self.assertRaises(ValueError):
+            runner.run([{"window": 10}, {"window": 1000}])  # not enough data for the window of 1000 bars
+
+    def test_events_configuration_is_passed_to_workers(self):
+        def reset_configuration():
+            """ Restores the default configuration of the events, as in a newly started worker process. """
+            for event_type in (AfterMarketCloseEvent, CalculateAndPlaceOrdersPeriodicEvent):
+                for attribute in set(vars(event_type)).intersection(EVENTS_CONFIGURATION_ATTRIBUTES):
+                    delattr(event_type, attribute)
+
+        previous_configuration = _get_events_configuration()
+        try:
+            AfterMarketCloseEvent.set_trigger_time({"hour": 21, "minute": 0, "second": 0, "microsecond": 0})
+            AfterMarketCloseEvent.exclude_weekends()
+            CalculateAndPlaceOrdersPeriodicEvent.set_frequency(Frequency.MIN_30)
+            CalculateAndPlaceOrdersPeriodicEvent.set_start_and_end_time({"hour": 14, "minute": 0},
+                                                                        {"hour": 19, "minute": 0})
+            events_configuration = _get_events_configuration()
+
+            reset_configuration()
+            self.assertFalse(set(vars(AfterMarketCloseEvent)).intersection(EVENTS_CONFIGURATION_ATTRIBUTES))
+            self.assertFalse(set(vars(CalculateAndPlaceOrdersPeriodicEvent)).intersection(
+                EVENTS_CONFIGURATION_ATTRIBUTES))
+
+            _set_events_configuration(events_configuration)
+            self.assertEqual({"hour": 21, "minute": 0, "second": 0, "microsecond": 0},
+                             AfterMarketCloseEvent._trigger_time)
+            self.assertFalse(AfterMarketCloseEvent._run_over_weekends)
+            self.assertEqual(Frequency.MIN_30, CalculateAndPlaceOrdersPeriodicEvent.frequency)
+            self.assertEqual({"hour": 14, "minute": 0, "second": 0, "microsecond": 0},
+                             CalculateAndPlaceOrdersPeriodicEvent.start_time)
+            self.assertEqual({"hour": 19, "minute": 0, "second": 0, "microsecond": 0},
+                             CalculateAndPlaceOrdersPeriodicEvent.end_time)
+        finally:
+            reset_configuration()
+            _set_events_configuration(previous_configuration)
+
+
+if __name__ == '__main__':
+    unittest.main()
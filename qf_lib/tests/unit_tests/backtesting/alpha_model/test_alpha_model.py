@@ -12,19 +12,27 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 import unittest
+from datetime import datetime
 from unittest.mock import patch, MagicMock, Mock
 
-from pandas import date_range
+import numpy as np
+from pandas import date_range, bdate_range
 
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
 from qf_lib.backtesting.signals.signal import Signal
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import BloombergTicker
 from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
 from qf_lib.common.utils.miscellaneous.average_true_range import average_true_range
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 
 
 @patch.multiple(AlphaModel, __abstractmethods__=set())
@@ -60,3 +68,42 @@ class TestAlphaModel(unittest.TestCase):
 
         expected_signal = Signal(self.ticker, Exposure.LONG, 3, Mock(), Mock(), alpha_model=alpha_model)
         self.assertEqual(signal, expected_signal)
+
+    @patch.object(AlphaModel, 'calculate_exposure')
+    @patch.object(AlphaModel, 'calculate_fraction_at_risk')
+    def test_alpha_model__get_signals(self, calculate_fraction_at_risk, calculate_exposure_mock):
+        calculate_exposure_mock.side_effect = lambda ticker, current_exposure, current_time, frequency: \
+            Exposure.LONG if current_exposure == Exposure.OUT else Exposure.OUT
+        calculate_fraction_at_risk.return_value = 3
+
+        alpha_model = AlphaModel(risk_estimation_factor=4, data_provider=MagicMock())
+        other_ticker = BloombergTicker("Other Ticker")
+        signals = alpha_model.get_signals([self.ticker, other_ticker], [Exposure.OUT, Exposure.SHORT], self.end_time,
+                                          self.frequency)
+
+        expected_signals = [Signal(self.ticker, Exposure.LONG, 3, Mock(), Mock(), alpha_model=alpha_model),
+                            Signal(other_ticker, Exposure.OUT, 3, Mock(), Mock(), alpha_model=alpha_model)]
+        self.assertEqual(signals, expected_signals)
+
+    def test_alpha_model__calculate_fractions_at_risk(self):
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 0, "second": 0, "microsecond": 0})
+
+        tickers = [BloombergTicker(f"Example{i} Equity") for i in range(4)]
+        dates = bdate_range(datetime(2021, 1, 1), datetime(2021, 3, 31), name=DATES)
+        close = 100 + np.random.default_rng(17).normal(0, 1, (len(dates), len(tickers))).cumsum(axis=0)
+        data = np.stack([close, close + 1, close - 1, close, np.full(close.shape, 100.0)], axis=-1)
+        prices = QFDataArray.create(dates, tickers, PriceField.ohlcv(), data)
+        prices.loc[datetime(2021, 3, 1):datetime(2021, 3, 3), tickers[1], :] = np.nan  # gap in the window
+        prices.loc[datetime(2021, 3, 10), tickers[2], PriceField.High] = np.nan  # incomplete bar
+        prices.loc[datetime(2021, 2, 15):, tickers[3], :] = np.nan  # not enough recent data
+
+        timer = SettableTimer(datetime(2021, 3, 15, 21))
+        data_provider = PresetDataProvider(prices, dates[0], dates[-1], Frequency.DAILY, timer=timer)
+        alpha_model = AlphaModel(risk_estimation_factor=3, data_provider=data_provider)
+
+        fractions_at_risk = alpha_model.calculate_fractions_at_risk(tickers, timer.now(), self.frequency)
+        expected_fractions_at_risk = [alpha_model.calculate_fraction_at_risk(ticker, timer.now(), self.frequency)
+                                      for ticker in tickers]
+        np.testing.assert_allclose(expected_fractions_at_risk, fractions_at_risk.values, rtol=1e-12)
+        self.assertEqual(tickers, fractions_at_risk.index.tolist())
@@ -15,6 +15,7 @@ import unittest
 from typing import List
 from unittest.mock import patch, MagicMock, Mock
 
+from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.backtesting.strategies.alpha_model_strategy import AlphaModelStrategy
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
@@ -23,6 +24,7 @@ from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition
 from qf_lib.backtesting.portfolio.position_factory import BacktestPositionFactory
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.security_type import SecurityType
+from qf_lib.common.exceptions.future_contracts_exceptions import NoValidTickerException
 from qf_lib.common.tickers.tickers import BloombergTicker
 from qf_lib.common.utils.dateutils.date_format import DateFormat
 from qf_lib.common.utils.dateutils.string_to_date import str_to_date
@@ -420,3 +422,45 @@ class TestAlphaModelStrategy(unittest.TestCase):
         expected_signals = [Signal(self.future_ticker, Exposure.OUT, 1, Mock(), Mock()),
                             Signal(BloombergTicker("Example Ticker"), Exposure.OUT, 1, Mock(), Mock())]
         self.assertCountEqual(signals, expected_signals)
+
+    @patch.object(FuturesRollingOrdersGenerator, 'generate_close_orders')
+    def test__calculate_signals__batch_alpha_model(self, generate_close_orders):
+        """
+        Test if the signals of models implementing get_signals are calculated with a single call to get_signals
+        (with tickers without any valid contract skipped) instead of calling get_signal for every ticker.
+        """
+        generate_close_orders.return_value = []
+
+        class BatchAlphaModel(AlphaModel):
+            def calculate_exposure(self, ticker, current_exposure, current_time, frequency):
+                return Exposure.LONG
+
+            def get_signals(self, tickers, current_exposures, current_time, frequency):
+                return [Signal(ticker, Exposure.LONG, 1, Mock(), current_time, alpha_model=self) for ticker in tickers]
+
+        batch_alpha_model = BatchAlphaModel(risk_estimation_factor=1, data_provider=MagicMock())
+        batch_alpha_model.get_signal = MagicMock()
+        batch_alpha_model.get_signals = MagicMock(side_effect=batch_alpha_model.get_signals)
+
+        other_ticker = BloombergTicker("Other Ticker")
+        self.future_ticker.get_current_specific_ticker.side_effect = NoValidTickerException()
+        self.positions_in_portfolio = [Mock(spec=BacktestPosition, **{
+            'ticker.return_value': other_ticker,
+            'quantity.return_value': -10,
+            'start_time': str_to_date("2000-01-01")
+        })]
+
+        alpha_model_strategy = AlphaModelStrategy(self.ts, {
+            batch_alpha_model: [self.ticker, other_ticker, self.future_ticker]
+        }, use_stop_losses=False)
+        alpha_model_strategy.calculate_and_place_orders()
+
+        batch_alpha_model.get_signal.assert_not_called()
+        batch_alpha_model.get_signals.assert_called_once()
+        tickers, current_exposures, current_time, frequency = batch_alpha_model.get_signals.call_args[0]
+        self.assertCountEqual([(self.ticker, Exposure.OUT), (other_ticker, Exposure.SHORT)],
+                              list(zip(tickers, current_exposures)))
+        self.assertEqual((self.ts.data_provider.timer.now(), Frequency.DAILY), (current_time, frequency))
+
+        signals = self.ts.position_sizer.size_signals.call_args[0][0]
+        self.assertCountEqual([self.ticker, other_ticker], [signal.ticker for signal in signals])
@@ -0,0 +1,76 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+
+from qf_lib.backtesting.events.empty_queue_event.empty_queue_event import EmptyQueueEvent
+from qf_lib.backtesting.events.end_trading_event.end_trading_event import EndTradingEvent
+from qf_lib.backtesting.events.event_profiler import EventProfiler
+
+
+class DummyListener:
+    pass
+
+
+class TestEventProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = EventProfiler()
+
+    def test_stats(self):
+        listener = DummyListener()
+        for duration in range(1, 101):
+            self.profiler.record(EmptyQueueEvent(), listener, duration / 1000)
+        self.profiler.record(EndTradingEvent(), "Monitor", 1.0)
+
+        stats_df = self.profiler.stats()
+        self.assertEqual(list(stats_df["Event"]), ["EmptyQueueEvent", "EndTradingEvent"])
+        self.assertEqual(list(stats_df["Listener"]), ["DummyListener", "Monitor"])
+        self.assertEqual(list(stats_df["Calls"]), [100, 1])
+
+        empty_queue_stats = stats_df.iloc[0]
+        self.assertAlmostEqual(empty_queue_stats["Total time [s]"], 5.05)
+        self.assertAlmostEqual(empty_queue_stats["Mean time [ms]"], 50.5)
+        self.assertAlmostEqual(empty_queue_stats["p50 time [ms]"], 50.0, delta=50.0 * 0.06)
+        self.assertAlmostEqual(empty_queue_stats["p99 time [ms]"], 99.0, delta=99.0 * 0.06)
+        self.assertAlmostEqual(empty_queue_stats["Max time [ms]"], 100.0)
+
+    def test_stats_of_durations_outside_of_the_histogram_range(self):
+        for duration in (0.0, 1e-9, 1e4):
+            self.profiler.record(EmptyQueueEvent(), "Listener", duration)
+
+        stats = self.profiler.stats().iloc[0]
+        self.assertEqual(stats["Calls"], 3)
+        self.assertAlmostEqual(stats["Max time [ms]"], 1e7)
+        self.assertLessEqual(stats["p50 time [ms]"], stats["p99 time [ms]"])
+        self.assertLessEqual(stats["p99 time [ms]"], stats["Max time [ms]"])
+
+    def test_profile_returns_the_result_and_records_exceptions(self):
+        event = EmptyQueueEvent()
+        self.assertEqual(self.profiler.profile(event, "Listener", lambda x: 2 * x, 3), 6)
+
+        def failing_function():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            self.profiler.profile(event, "Listener", failing_function)
+
+        self.assertEqual(self.profiler.stats()["Calls"].iloc[0], 2)
+
+    def test_reset(self):
+        self.profiler.record(EmptyQueueEvent(), "Listener", 1.0)
+        self.profiler.reset()
+        self.assertTrue(self.profiler.stats().empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
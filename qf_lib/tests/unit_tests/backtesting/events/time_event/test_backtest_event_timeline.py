@@ -0,0 +1,154 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+import numpy as np
+
+from qf_lib.backtesting.events.time_event.backtest_event_timeline import BacktestEventTimeline
+from qf_lib.backtesting.events.time_event.periodic_event.intraday_bar_event import IntradayBarEvent
+from qf_lib.backtesting.events.time_event.periodic_event.periodic_event import PeriodicEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.scheduler import Scheduler
+from qf_lib.backtesting.events.time_event.single_time_event.schedule_order_execution_event import \
+    ScheduleOrderExecutionEvent
+from qf_lib.backtesting.events.time_event.time_event import TimeEvent
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.dateutils.date_format import DateFormat
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class TestBacktestEventTimeline(TestCase):
+    class PeriodicEvent15Minutes(PeriodicEvent):
+        frequency = Frequency.MIN_15
+        start_time = {"hour": 9, "minute": 50, "second": 0}
+        end_time = {"hour": 13, "minute": 0, "second": 0}
+
+        def notify(self, _) -> None:
+            pass
+
+    class PeriodicEvent1HourNoWeekends(PeriodicEvent):
+        frequency = Frequency.MIN_60
+        start_time = {"hour": 10, "minute": 5, "second": 0}
+        end_time = {"hour": 20, "minute": 0, "second": 0}
+        _run_over_weekends = False
+
+        def notify(self, _) -> None:
+            pass
+
+    def setUp(self):
+        self.previous_configuration = {
+            event_type: (event_type._trigger_time, event_type._trigger_time_rule, event_type._run_over_weekends)
+            for event_type in (MarketOpenEvent, MarketCloseEvent)
+        }
+        MarketOpenEvent.set_trigger_time({"hour": 10, "minute": 0, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 16, "minute": 0, "second": 0, "microsecond": 0})
+        ScheduleOrderExecutionEvent.clear()
+
+        self.start_time = str_to_date("2021-03-04 08:00:00.000000", DateFormat.FULL_ISO)
+        self.end_time = str_to_date("2021-03-09 23:59:59.999999", DateFormat.FULL_ISO)
+
+    def tearDown(self):
+        ScheduleOrderExecutionEvent.clear()
+        for event_type, (trigger_time, trigger_time_rule, run_over_weekends) in self.previous_configuration.items():
+            event_type._trigger_time = trigger_time
+            event_type._trigger_time_rule = trigger_time_rule
+            event_type._run_over_weekends = run_over_weekends
+
+    def test_periodic_event_trigger_times(self):
+        for event_type in (self.PeriodicEvent15Minutes, self.PeriodicEvent1HourNoWeekends, IntradayBarEvent):
+            time_event = event_type()
+            expected_trigger_times = TimeEvent.trigger_times(time_event, self.start_time, self.end_time)
+            actual_trigger_times = time_event.trigger_times(self.start_time, self.end_time)
+
+            self.assertGreater(len(actual_trigger_times), 0)
+            self.assertTrue(np.array_equal(expected_trigger_times, actual_trigger_times))
+
+    def test_timeline_events_equal_scheduler_events(self):
+        expected_events = self._run_time_flow(use_timeline=False)
+        actual_events = self._run_time_flow(use_timeline=True)
+
+        self.assertGreater(len(expected_events), 0)
+        self.assertEqual(expected_events, actual_events)
+
+    def test_get_next_time_events_is_not_changing_state_of_timeline(self):
+        timer = SettableTimer(self.start_time)
+        scheduler = Scheduler(timer)
+        scheduler.subscribe(MarketOpenEvent, Mock())
+        scheduler.subscribe(MarketCloseEvent, Mock())
+        timeline = BacktestEventTimeline(scheduler, self.end_time)
+
+        timeline.get_next_time_events()
+        time_events, time = timeline.get_next_time_events()
+        self.assertEqual([MarketOpenEvent()], time_events)
+        self.assertEqual(str_to_date("2021-03-04 10:00:00.000000", DateFormat.FULL_ISO), time)
+
+        timer.set_current_time(str_to_date("2021-03-09 17:00:00.000000", DateFormat.FULL_ISO))
+        self.assertEqual(([], None), timeline.get_next_time_events())
+
+    def test_timeline_is_recomputed_when_trigger_times_change(self):
+        timer = SettableTimer(self.start_time)
+        scheduler = Scheduler(timer)
+        scheduler.subscribe(MarketOpenEvent, Mock())
+        scheduler.subscribe(MarketCloseEvent, Mock())
+        timeline = BacktestEventTimeline(scheduler, self.end_time)
+
+        self.assertEqual(([MarketOpenEvent()], str_to_date("2021-03-04 10:00:00.000000", DateFormat.FULL_ISO)),
+                         timeline.get_next_time_events())
+
+        MarketCloseEvent.set_trigger_time({"hour": 9, "minute": 0, "second": 0, "microsecond": 0})
+        self.assertEqual(([MarketCloseEvent()], str_to_date("2021-03-04 09:00:00.000000", DateFormat.FULL_ISO)),
+                         timeline.get_next_time_events())
+
+        timer.set_current_time(str_to_date("2021-03-05 17:00:00.000000", DateFormat.FULL_ISO))
+        MarketOpenEvent.exclude_weekends()
+        MarketCloseEvent.exclude_weekends()
+        self.assertEqual(scheduler.get_next_time_events(), timeline.get_next_time_events())
+        self.assertEqual(([MarketCloseEvent()], str_to_date("2021-03-08 09:00:00.000000", DateFormat.FULL_ISO)),
+                         timeline.get_next_time_events())
+
+    def _run_time_flow(self, use_timeline: bool):
+        timer = SettableTimer(self.start_time)
+        scheduler = Scheduler(timer)
+        for event_type in (self.PeriodicEvent15Minutes, MarketCloseEvent, ScheduleOrderExecutionEvent,
+                           self.PeriodicEvent1HourNoWeekends, IntradayBarEvent, MarketOpenEvent):
+            scheduler.subscribe(event_type, Mock())
+
+        timeline = BacktestEventTimeline(scheduler, self.end_time)
+        registered_events = []
+
+        while True:
+            if use_timeline:
+                time_events, time = timeline.get_next_time_events()
+            else:
+                time_events, time = scheduler.get_next_time_events()
+
+            if time is None or time > self.end_time:
+                break
+
+            timer.set_current_time(time)
+            registered_events.append((time, [type(event) for event in time_events]))
+
+            if MarketOpenEvent() in time_events or self.PeriodicEvent1HourNoWeekends() in time_events:
+                ScheduleOrderExecutionEvent.schedule_new_event(time + RelativeDelta(minutes=1), {})
+
+        return registered_events
+
+
+if __name__ == '__main__':
+    unittest.main()
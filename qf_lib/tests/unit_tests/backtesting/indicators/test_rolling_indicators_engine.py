@@ -0,0 +1,123 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.indicators.rolling_indicators import SimpleMovingAverage, ExponentialMovingAverage, \
+    AverageTrueRange, RollingStandardDeviation, RollingMin, RollingMax, VolumeWeightedAveragePrice
+from qf_lib.backtesting.indicators.rolling_indicators_engine import RollingIndicatorsEngine
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.common.utils.miscellaneous.average_true_range import average_true_range
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class TestRollingIndicatorsEngine(TestCase):
+    def setUp(self):
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 0, "second": 0, "microsecond": 0})
+
+        self.tickers = [BloombergTicker("Example1 Equity"), BloombergTicker("Example2 Equity")]
+        dates = pd.bdate_range(datetime(2021, 1, 1), datetime(2021, 6, 30), name=DATES)
+
+        rng = np.random.default_rng(16)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), len(self.tickers))), axis=0))
+        open = close * (1 + rng.normal(0, 0.005, close.shape))
+        high = np.maximum(open, close) * (1 + rng.random(close.shape) * 0.01)
+        low = np.minimum(open, close) * (1 - rng.random(close.shape) * 0.01)
+        volume = rng.integers(0, 1000, close.shape).astype(float)
+        data = np.stack([open, high, low, close, volume], axis=-1)
+        self.data_array = QFDataArray.create(dates, self.tickers, PriceField.ohlcv(), data)
+
+        self.timer = SettableTimer(datetime(2021, 3, 1, 21))
+        self.data_provider = PresetDataProvider(self.data_array, dates[0], dates[-1], Frequency.DAILY,
+                                                timer=self.timer)
+
+        self.engine = RollingIndicatorsEngine(self.data_provider, self.tickers)
+        self.engine.add_indicator("sma", SimpleMovingAverage(10))
+        self.engine.add_indicator("ema", ExponentialMovingAverage(5))
+        self.engine.add_indicator("atr", AverageTrueRange(14, normalized=True))
+        self.engine.add_indicator("std", RollingStandardDeviation(20))
+        self.engine.add_indicator("min", RollingMin(15))
+        self.engine.add_indicator("max", RollingMax(15))
+        self.engine.add_indicator("vwap", VolumeWeightedAveragePrice(5))
+
+    def test_indicators_equal_values_computed_from_scratch(self):
+        dates = self.data_array.dates.to_index()
+        first_bar_time = dates[dates.get_loc(datetime(2021, 3, 1)) - 19]
+
+        for time in pd.date_range(datetime(2021, 3, 1, 21), datetime(2021, 6, 25), freq="31h"):
+            self.timer.set_current_time(time)
+
+            close = self.data_provider.historical_price(self.tickers, PriceField.Close, 20)
+            close_since_start = self.data_provider.get_price(self.tickers, PriceField.Close, first_bar_time)
+            self._assert_values_equal(close.iloc[-10:].mean(), "sma")
+            self._assert_values_equal(close.std(), "std")
+            self._assert_values_equal(close_since_start.ewm(span=5, adjust=False).mean().iloc[-1], "ema")
+
+            self._assert_values_equal(
+                self.data_provider.historical_price(self.tickers, PriceField.Low, 15).min(), "min")
+            self._assert_values_equal(
+                self.data_provider.historical_price(self.tickers, PriceField.High, 15).max(), "max")
+
+            expected_atr = [average_true_range(self.data_provider.historical_price(
+                ticker, [PriceField.High, PriceField.Low, PriceField.Close], 15), normalized=True)
+                for ticker in self.tickers]
+            self._assert_values_equal(expected_atr, "atr")
+
+            bars = self.data_provider.historical_price(self.tickers, [PriceField.Close, PriceField.Volume], 5)
+            prices, volumes = bars.loc[:, :, PriceField.Close], bars.loc[:, :, PriceField.Volume]
+            self._assert_values_equal((prices * volumes).sum(DATES) / volumes.sum(DATES), "vwap")
+
+    def test_engine_does_not_look_ahead(self):
+        self.timer.set_current_time(datetime(2021, 3, 2, 15))  # market is open, the bar of 2nd March is not complete
+        self.engine.update()
+        self.assertEqual(datetime(2021, 3, 1), self.engine.last_bar_time)
+
+        self.timer.set_current_time(datetime(2021, 3, 2, 20))
+        self.engine.on_market_close(MarketCloseEvent())
+        self.assertEqual(datetime(2021, 3, 2), self.engine.last_bar_time)
+
+        expected_max = self.data_provider.historical_price(self.tickers, PriceField.High, 15).max()
+        self._assert_values_equal(expected_max, "max")
+
+    def test_missing_bars_are_skipped(self):
+        self.data_array.loc[datetime(2021, 2, 1):datetime(2021, 2, 5), self.tickers[0], :] = np.nan
+        dates = self.data_array.dates.to_index()
+        self.data_provider = PresetDataProvider(self.data_array, dates[0], dates[-1], Frequency.DAILY, timer=self.timer)
+        engine = RollingIndicatorsEngine(self.data_provider, self.tickers)
+        engine.add_indicator("sma", SimpleMovingAverage(10))
+
+        for time in pd.date_range(datetime(2021, 1, 25, 21), datetime(2021, 2, 25, 21), freq="D"):
+            self.timer.set_current_time(time)
+            close = self.data_provider.get_price(self.tickers[0], PriceField.Close, datetime(2021, 1, 1)).dropna()
+            self.assertAlmostEqual(close.iloc[-10:].mean(), engine.get_values("sma")[self.tickers[0]], places=10)
+
+    def _assert_values_equal(self, expected_values, indicator_name: str):
+        actual_values = self.engine.get_values(indicator_name)
+        np.testing.assert_allclose(np.asarray(expected_values, dtype=float), actual_values.values, rtol=1e-10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import subprocess
+import sys
+import unittest
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import Mock
+
+import numpy as np
+
+from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
+from qf_lib.backtesting.monitoring.headless_backtest_monitor import HeadlessBacktestMonitor
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.backtesting.signals.backtest_signals_register import BacktestSignalsRegister
+from qf_lib.common.tickers.tickers import BloombergTicker
+
+
+class TestHeadlessBacktestMonitor(TestCase):
+    def setUp(self):
+        self.backtest_result = BacktestResult(Mock(spec=Portfolio), BacktestSignalsRegister(), "Test")
+        self.monitor = HeadlessBacktestMonitor(self.backtest_result)
+
+        ticker_1, ticker_2 = BloombergTicker("Example1 Equity"), BloombergTicker("Example2 Equity", currency="EUR")
+        self.transactions = [
+            Transaction(datetime(2021, 1, 4) + timedelta(hours=i), ticker, quantity, price, commission,
+                        currency=ticker.currency)
+            for i, (ticker, quantity, price, commission) in enumerate([
+                (ticker_1, 10, 100.0, 1.0),
+                (ticker_2, -5, 20.5, 0.5),
+                (ticker_1, -10, 110.0, 1.0),
+            ] * 700)  # more transactions than the initial capacity of the table
+        ]
+
+    def test_transactions_are_recorded(self):
+        for transaction in self.transactions:
+            self.monitor.record_transaction(transaction)
+        self.monitor.end_of_day_update(datetime(2021, 1, 5))
+        self.monitor.end_of_trading_update()
+
+        self.assertEqual(len(self.transactions), len(self.backtest_result.transactions_table))
+        self.assertEqual(self.transactions, self.backtest_result.transactions)
+        self.assertEqual([t.currency for t in self.transactions],
+                         [t.currency for t in self.backtest_result.transactions])
+
+        transactions_df = self.backtest_result.transactions_table.to_frame()
+        self.assertEqual([t.ticker for t in self.transactions], transactions_df["ticker"].tolist())
+        np.testing.assert_array_equal([t.net_amount for t in self.transactions], transactions_df["net amount"])
+        self.assertEqual(datetime(2021, 1, 4), transactions_df["time"].iloc[0])
+
+    def test_transactions_list_is_cached(self):
+        for transaction in self.transactions[:10]:
+            self.monitor.record_transaction(transaction)
+
+        transactions = self.backtest_result.transactions
+        self.assertIs(transactions, self.backtest_result.transactions)
+
+        # transactions appended to the list are preserved, while the newly recorded ones are appended after them
+        transactions.append(self.transactions[-1])
+        for transaction in self.transactions[10:20]:
+            self.monitor.record_transaction(transaction)
+
+        self.assertEqual(self.transactions[:10] + [self.transactions[-1]] + self.transactions[10:20],
+                         self.backtest_result.transactions)
+
+    def test_reporting_libraries_are_not_imported(self):
+        code = "import sys\n" \
+               "import qf_lib.backtesting.monitoring.headless_backtest_monitor\n" \
+               "print([m for m in ('matplotlib', 'weasyprint') if m in sys.modules])"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual("[]", output.strip())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -304,6 +304,41 @@ class TestPortfolio(unittest.TestCase):
         # All positions should be closed at this moment
         self.assertEqual(len(portfolio.open_positions_dict), 0)
 
+    def test_transact_transactions(self):
+        self.data_provider_prices = self.prices_series
+        portfolio, _ = self.get_portfolio_and_data_provider()
+        bulk_portfolio, _ = self.get_portfolio_and_data_provider()
+        portfolio.update()
+        bulk_portfolio.update()
+
+        transactions_batches = [
+            [Transaction(self.random_time, self.ticker, 100, 120, 5),
+             Transaction(self.random_time, self.fut_ticker, 50, 250, 10)],
+            [Transaction(self.random_time, self.ticker, -250, 130, 8),  # reverses the position
+             Transaction(self.random_time, self.fut_ticker, -20, 270, 3),
+             Transaction(self.random_time, self.fut_ticker, -30, 265, 4)],  # closes the position
+            [Transaction(self.random_time, self.fut_ticker, 10, 210, 1),
+             Transaction(self.random_time, self.ticker, 150, 100, 2)]  # closes the position
+        ]
+
+        for transactions in transactions_batches:
+            for transaction in transactions:
+                portfolio.transact_transaction(transaction)
+            bulk_portfolio.transact_transactions(transactions)
+
+            portfolio.update()
+            bulk_portfolio.update()
+
+            self.assertAlmostEqual(portfolio.current_cash, bulk_portfolio.current_cash, places=6)
+            self.assertAlmostEqual(portfolio.net_liquidation, bulk_portfolio.net_liquidation, places=6)
+            self.assertEqual({t: p.quantity() for t, p in portfolio.open_positions_dict.items()},
+                             {t: p.quantity() for t, p in bulk_portfolio.open_positions_dict.items()})
+            self.assertEqual([p.total_pnl for p in portfolio.closed_positions()],
+                             [p.total_pnl for p in bulk_portfolio.closed_positions()])
+
+        self.assertEqual({self.fut_ticker}, set(bulk_portfolio.open_positions_dict.keys()))
+        self.assertEqual(3, len(bulk_portfolio.closed_positions()))
+
     def test_portfolio_eod_series(self):
         expected_portfolio_eod_series = PricesSeries()
 
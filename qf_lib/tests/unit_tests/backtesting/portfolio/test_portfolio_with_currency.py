@@ -181,6 +181,58 @@ class TestPortfolioWithCurrency(unittest.TestCase):
         tms = portfolio.portfolio_eod_series()
         assert_series_equal(expected_portfolio_eod_series, tms)
 
+    def test_update_equals_sum_of_positions_values(self):
+        portfolio, data_provider, timer = self.get_portfolio_and_data_provider()
+        eur_ticker = BloombergTicker('SAP GY Equity', SecurityType.STOCK, currency="EUR")
+        eur_chf_ticker = BloombergTicker('EURCHF', SecurityType.FX)
+        tickers = [self.usd_ticker, self.chf_ticker, self.fut_ticker, eur_ticker]
+
+        prices = [[120, 56, 250, 80], [130, float("nan"), 270, 82], [100, 49, 210, float("nan")]]
+        quantities = [[50, -30, 10, 20], [-20, 10, -15, 20], [-30, 30, 0, -10]]
+
+        for day_prices, day_quantities in zip(prices, quantities):
+            self._shift_timer_to_next_day(timer)
+            self.data_provider_prices = QFSeries(data=day_prices + [0.95, 1.05],
+                                                 index=tickers + [self.currency_ticker, eur_chf_ticker])
+
+            for ticker, price, quantity in zip(tickers, day_prices, day_quantities):
+                if quantity != 0:
+                    portfolio.transact_transaction(Transaction(timer.time, ticker, quantity, 100, 1.0))
+            portfolio.update(record=True)
+
+            net_liquidation = portfolio.current_cash
+            gross_exposure = 0.0
+            for ticker, position in portfolio.open_positions_dict.items():
+                exchange_rate = 1.0 if ticker.currency == self.currency else \
+                    data_provider.get_last_available_exchange_rate(ticker.currency, self.currency, Frequency.DAILY)
+                net_liquidation += position.market_value() * exchange_rate
+                gross_exposure += abs(position.total_exposure()) * exchange_rate
+
+            self.assertAlmostEqual(net_liquidation, portfolio.net_liquidation, places=6)
+            self.assertAlmostEqual(gross_exposure, portfolio.gross_exposure_of_positions, places=6)
+
+        # the last available valid price is used in case of missing prices
+        self.assertEqual(82, portfolio.open_positions_dict[eur_ticker].current_price)
+        self.assertEqual(49, portfolio.open_positions_dict[self.chf_ticker].current_price)
+
+    def test_exchange_rates_are_cached_per_timestamp(self):
+        portfolio, data_provider, timer = self.get_portfolio_and_data_provider()
+        self.data_provider_prices = self.prices_series
+
+        for quantity in (10, 20, -5):
+            portfolio.transact_transaction(Transaction(timer.time, self.usd_ticker, quantity, 100, 1.0))
+            portfolio.transact_transaction(Transaction(timer.time, self.fut_ticker, quantity, 250, 1.0))
+            portfolio.update()
+        self.assertEqual(1, data_provider.get_last_available_exchange_rate.call_count)
+
+        self._shift_timer_to_next_day(timer)
+        self.data_provider_prices = self.prices_up
+        portfolio.update()
+
+        self.assertEqual(2, data_provider.get_last_available_exchange_rate.call_count)
+        positions_value = sum(position.market_value() for position in portfolio.open_positions_dict.values())
+        self.assertAlmostEqual(portfolio.current_cash + positions_value * 0.98, portfolio.net_liquidation)
+
     def test_assert_data_provider_without_currency_raises_error(self):
         data_provider = Mock(spec=AbstractPriceDataProvider)
         portfolio = Portfolio(data_provider, self.initial_cash, currency=self.currency)
@@ -0,0 +1,76 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+from numpy import nan
+
+from qf_lib.analysis.exposure_analysis.exposure_generator import ExposureGenerator
+from qf_lib.backtesting.portfolio.positions_history_table import PositionsHistoryTable
+from qf_lib.common.enums.security_type import SecurityType
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_dataframes_equal
+from qf_lib.tests.unit_tests.backtesting.portfolio.dummy_ticker import DummyTicker
+
+
+class TestPositionsHistoryTable(TestCase):
+    def setUp(self):
+        self.ticker_1 = DummyTicker("AAPL US Equity", SecurityType.STOCK)
+        self.ticker_2 = DummyTicker("CTZ9 Comdty", SecurityType.FUTURE, 50)
+        self.dates = [str_to_date("2020-01-30"), str_to_date("2020-01-31"), str_to_date("2020-02-03")]
+
+        # use a small capacity to make the arrays grow
+        self.table = PositionsHistoryTable(initial_capacity=1)
+        self.table.record(self.dates[0], [self.ticker_1], [10], [1000.0], [1000.0], [-5.0], [1])
+        self.table.record(self.dates[1], [self.ticker_1, self.ticker_2], [10, -2], [1100.0, 300.0], [1100.0, -5000.0],
+                          [95.0, 290.0], [1, -1])
+        self.table.record(self.dates[2], [], [], [], [], [], [])
+
+    def test_tidy_frame(self):
+        tidy_frame = self.table.to_tidy_frame()
+
+        self.assertEqual(3, len(self.table))
+        self.assertEqual(["date", "ticker", *PositionsHistoryTable.FIELDS], tidy_frame.columns.tolist())
+        self.assertEqual([self.ticker_1, self.ticker_1, self.ticker_2], tidy_frame["ticker"].tolist())
+        self.assertEqual([self.dates[0], self.dates[1], self.dates[1]], tidy_frame["date"].tolist())
+        self.assertEqual([1000.0, 1100.0, -5000.0], tidy_frame["total exposure"].tolist())
+
+    def test_wide_frame(self):
+        expected_frame = QFDataFrame({self.ticker_1: [10.0, 10.0, nan], self.ticker_2: [nan, -2.0, nan]},
+                                     index=self.dates)
+        assert_dataframes_equal(expected_frame, self.table.to_wide_frame("quantity"))
+
+    def test_summaries_frame(self):
+        summaries_frame = self.table.to_summaries_frame()
+
+        self.assertEqual((3, 2), summaries_frame.shape)
+        self.assertEqual(-5000.0, summaries_frame.loc[self.dates[1], self.ticker_2].total_exposure)
+        self.assertEqual(290.0, summaries_frame.loc[self.dates[1], self.ticker_2].total_pnl)
+        self.assertEqual(-1, summaries_frame.loc[self.dates[1], self.ticker_2].direction)
+        self.assertTrue(summaries_frame.iloc[2].isna().all())
+
+    def test_exposure_generator_consumes_the_table(self):
+        expected_history = QFDataFrame({self.ticker_1: [1100.0, nan], self.ticker_2: [-5000.0, nan]},
+                                       index=[str_to_date("2020-01-31"), str_to_date("2020-02-29")])
+
+        for positions_history in (self.table, self.table.to_summaries_frame()):
+            exposure_generator = ExposureGenerator(Mock(), Mock())
+            exposure_generator.set_positions_history(positions_history)
+            assert_dataframes_equal(expected_history, exposure_generator.positions_history, check_index_type=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
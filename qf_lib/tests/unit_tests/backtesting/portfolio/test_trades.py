@@ -20,6 +20,7 @@ from qf_lib.backtesting.portfolio.portfolio import Portfolio
 from qf_lib.backtesting.portfolio.transaction import Transaction
 from qf_lib.common.enums.security_type import SecurityType
 from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.tests.unit_tests.backtesting.portfolio.dummy_ticker import DummyTicker
 
 
@@ -100,3 +101,22 @@ class TestTrades(unittest.TestCase):
         self.assertEqual(trade_1.direction, -1.0)
         self.assertEqual(trade_1.start_time, self.start_time)
         self.assertEqual(trade_1.end_time, self.time)
+
+    def test_trades_table_from_backtest_positions(self):
+        transactions = [
+            Transaction(self.start_time, self.ticker, 5, 10.0, 3.0),
+            Transaction(self.time, self.ticker, -5, 11.0, 4.0),
+            Transaction(self.time, self.ticker, -2, 11.0, 1.0),
+            Transaction(str_to_date('2020-02-01'), self.ticker, 2, 9.0, 1.0),
+        ]
+        for t in transactions:
+            self.portfolio.transact_transaction(t)
+
+        positions = self.portfolio.closed_positions()
+        portfolio_values = QFSeries([100000.0, 110000.0], index=[self.start_time, self.time])
+
+        expected_trades = self.trades_generator.create_trades_from_backtest_positions(positions, portfolio_values)
+        trades_table = self.trades_generator.create_trades_table_from_backtest_positions(positions, portfolio_values)
+
+        self.assertEqual(len(trades_table), 2)
+        self.assertEqual(expected_trades, trades_table.to_trades())
@@ -0,0 +1,98 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.backtesting.portfolio.trades_table import TradesTable
+from qf_lib.common.tickers.tickers import BloombergTicker
+
+
+class TestTradesTable(unittest.TestCase):
+    def setUp(self):
+        self.ticker_1 = BloombergTicker("AAPL US Equity")
+        self.ticker_2 = BloombergTicker("MSFT US Equity")
+        self.trades = [
+            Trade(datetime(2020, 1, 2), datetime(2020, 1, 10), self.ticker_1, 100.0, 2.0, 1, 0.01),
+            Trade(datetime(2020, 1, 3), datetime(2020, 1, 6), self.ticker_2, -50.0, 1.0, -1, -0.005),
+            Trade(datetime(2020, 1, 10), datetime(2020, 1, 20), self.ticker_1, 25.0, 2.0, -1, 0.0025),
+        ]
+
+    def test_conversion_from_and_to_trades(self):
+        trades_table = TradesTable.from_trades(self.trades)
+
+        self.assertEqual(len(trades_table), 3)
+        self.assertEqual(trades_table.to_trades(), self.trades)
+        self.assertEqual(trades_table[1], self.trades[1])
+        self.assertEqual(trades_table[-1], self.trades[-1])
+        self.assertEqual(len(trades_table.unique_tickers), 2)
+        np.testing.assert_array_equal(trades_table.tickers, [self.ticker_1, self.ticker_2, self.ticker_1])
+        np.testing.assert_array_equal(trades_table.pnl, [100.0, -50.0, 25.0])
+
+    def test_missing_percentage_pnl(self):
+        trades_table = TradesTable([datetime(2020, 1, 2)], [datetime(2020, 1, 10)], [self.ticker_1], [100.0], [2.0],
+                                   [1])
+        self.assertTrue(np.isnan(trades_table.percentage_pnl[0]))
+        self.assertTrue(np.isnan(trades_table[0].percentage_pnl))
+
+        trade = Trade(datetime(2020, 1, 2), datetime(2020, 1, 10), self.ticker_1, 100.0, 2.0, 1)
+        self.assertEqual(trade, TradesTable.from_trades([trade])[0])
+
+    def test_equality(self):
+        trades = self.trades + [Trade(datetime(2020, 1, 2), datetime(2020, 1, 10), self.ticker_2, 100.0, 2.0, 1)]
+        trades_table = TradesTable.from_trades(trades)
+
+        self.assertEqual(trades_table, TradesTable.from_trades(trades))
+        self.assertEqual(trades_table[1:], TradesTable.from_trades(trades[1:]))
+        self.assertNotEqual(trades_table, TradesTable.from_trades(trades[:-1]))
+        self.assertNotEqual(trades_table, TradesTable.from_trades(trades[::-1]))
+
+    def test_selection(self):
+        trades_table = TradesTable.from_trades(self.trades)
+
+        long_trades = trades_table[trades_table.direction > 0]
+        self.assertIsInstance(long_trades, TradesTable)
+        self.assertEqual(long_trades.to_trades(), self.trades[:1])
+        self.assertEqual(trades_table[1:].to_trades(), self.trades[1:])
+
+    def test_sort_by_time(self):
+        trades_table = TradesTable.from_trades(self.trades).sort_by_time()
+        expected_trades = sorted(self.trades, key=lambda t: (t.end_time, t.start_time))
+        self.assertEqual(trades_table.to_trades(), expected_trades)
+
+    def test_concatenate(self):
+        first_table = TradesTable.from_trades(self.trades[:1])
+        second_table = TradesTable.from_trades(self.trades[1:])
+
+        trades_table = TradesTable.concatenate([first_table, TradesTable.empty(), second_table])
+        self.assertEqual(trades_table.to_trades(), self.trades)
+        self.assertEqual(len(trades_table.unique_tickers), 2)
+        self.assertEqual(len(TradesTable.concatenate([])), 0)
+
+    def test_to_dataframe(self):
+        trades_df = TradesTable.from_trades(self.trades).to_dataframe()
+
+        self.assertEqual(trades_df.shape, (3, 7))
+        self.assertEqual(list(trades_df["ticker"]), [self.ticker_1, self.ticker_2, self.ticker_1])
+        self.assertEqual(list(trades_df["percentage pnl"]), [0.01, -0.005, 0.0025])
+
+    def test_columns_of_different_lengths(self):
+        with self.assertRaises(ValueError):
+            TradesTable([datetime(2020, 1, 2)], [datetime(2020, 1, 10)], [self.ticker_1], [100.0, 2.0], [2.0], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from qf_lib.backtesting.execution_handler.commission_models.bps_trade_value_commission_model import \
+    BpsTradeValueCommissionModel
+from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
+from qf_lib.backtesting.execution_handler.commission_models.fixed_commission_model import FixedCommissionModel
+from qf_lib.backtesting.execution_handler.commission_models.ib_commission_model import IBCommissionModel
+
+
+class TestCommissionModels(TestCase):
+    def setUp(self):
+        # the quantities cover the minimum commission, the per share commission and the trade value cap of IB
+        self.fill_quantities = [0, 1, -10, 150, -150, 1000, -100000, 2.5]
+        self.fill_prices = [10.0, 5.0, 0.2, 30.0, 0.4, 200.0, 1.5, 60000.0]
+
+    def _assert_commissions_equal_scalar_commissions(self, commission_model: CommissionModel):
+        expected_commissions = [commission_model.calculate_commission(fill_quantity, fill_price)
+                                for fill_quantity, fill_price in zip(self.fill_quantities, self.fill_prices)]
+        commissions = commission_model.calculate_commissions(self.fill_quantities, self.fill_prices)
+
+        self.assertIsInstance(commissions, np.ndarray)
+        np.testing.assert_almost_equal(commissions, expected_commissions, decimal=12)
+
+    def test_fixed_commission_model(self):
+        self._assert_commissions_equal_scalar_commissions(FixedCommissionModel(1.5))
+
+    def test_bps_trade_value_commission_model(self):
+        self._assert_commissions_equal_scalar_commissions(BpsTradeValueCommissionModel(2.0))
+
+    def test_ib_commission_model(self):
+        self._assert_commissions_equal_scalar_commissions(IBCommissionModel())
+
+    def test_default_implementation_uses_calculate_commission(self):
+        class PerShareCommissionModel(CommissionModel):
+            def calculate_commission(self, fill_quantity: float, fill_price: float) -> float:
+                return 0.01 * abs(fill_quantity)
+
+        commissions = PerShareCommissionModel().calculate_commissions(self.fill_quantities, self.fill_prices)
+        np.testing.assert_almost_equal(commissions, 0.01 * np.abs(self.fill_quantities))
+
+    def test_no_fills(self):
+        for commission_model in (FixedCommissionModel(1.5), BpsTradeValueCommissionModel(2.0), IBCommissionModel()):
+            self.assertEqual((0,), commission_model.calculate_commissions([], []).shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -79,6 +79,10 @@ class TestMarketOnOpenExecutionStyle(TestCase):
         self.order_4 = Order(self.msft_ticker, quantity=4, execution_style=MarketOnCloseOrder(),
                              time_in_force=TimeInForce.DAY)
 
+    def _transacted_transactions(self):
+        """ Returns all transactions passed to the portfolio (in all calls of transact_transactions). """
+        return [transaction for args, _ in self.portfolio.transact_transactions.call_args_list for transaction in args[0]]
+
     def _trigger_single_time_event(self):
         self.timer.set_current_time(self.timer.now() + RelativeDelta(minutes=self.scheduling_time_delay))
         event = ScheduleOrderExecutionEvent()
@@ -91,7 +95,7 @@ class TestMarketOnOpenExecutionStyle(TestCase):
         self.exec_handler.on_market_open(...)
 
         self.monitor.record_transaction.assert_called_once()
-        self.portfolio.transact_transaction.assert_called_once()
+        self.assertEqual(1, len(self._transacted_transactions()))
 
         actual_orders = self.exec_handler.get_open_orders()
         expected_orders = []
@@ -104,7 +108,7 @@ class TestMarketOnOpenExecutionStyle(TestCase):
         self.exec_handler.on_market_open(...)
 
         self.assertEqual(self.monitor.record_transaction.call_count, 3)
-        self.assertEqual(self.portfolio.transact_transaction.call_count, 3)
+        self.assertEqual(len(self._transacted_transactions()), 3)
 
         actual_orders = self.exec_handler.get_open_orders()
         expected_orders = []
@@ -116,7 +120,7 @@ class TestMarketOnOpenExecutionStyle(TestCase):
         self._trigger_single_time_event()
         self.exec_handler.on_market_close(...)
 
-        self.portfolio.transact_transaction.assert_not_called()
+        self.portfolio.transact_transactions.assert_not_called()
         self.monitor.record_transaction.assert_not_called()
 
         actual_orders = self.exec_handler.get_open_orders()
@@ -134,7 +138,7 @@ class TestMarketOnOpenExecutionStyle(TestCase):
         self.exec_handler.on_market_open(...)
 
         self.assertEqual(self.monitor.record_transaction.call_count, 3)
-        self.assertEqual(self.portfolio.transact_transaction.call_count, 3)
+        self.assertEqual(len(self._transacted_transactions()), 3)
 
         actual_orders = self.exec_handler.get_open_orders()
         expected_orders = [self.order_4]
@@ -143,7 +147,7 @@ class TestMarketOnOpenExecutionStyle(TestCase):
         self.exec_handler.on_market_close(...)
 
         self.assertEqual(self.monitor.record_transaction.call_count, 4)
-        self.assertEqual(self.portfolio.transact_transaction.call_count, 4)
+        self.assertEqual(len(self._transacted_transactions()), 4)
 
         actual_orders = self.exec_handler.get_open_orders()
         expected_orders = []
@@ -162,7 +166,7 @@ class TestMarketOnOpenExecutionStyle(TestCase):
 
         # Transaction related to order 4 will be executed only once, as only one Order object was passed
         self.monitor.record_transaction.assert_called_once()
-        self.portfolio.transact_transaction.assert_called_once()
+        self.assertEqual(1, len(self._transacted_transactions()))
 
         actual_orders = self.exec_handler.get_open_orders()
         expected_orders = [self.order_1, self.order_2, self.order_3]
@@ -171,7 +175,7 @@ class TestMarketOnOpenExecutionStyle(TestCase):
         self.exec_handler.on_market_open(...)
 
         self.assertEqual(self.monitor.record_transaction.call_count, 4)
-        self.assertEqual(self.portfolio.transact_transaction.call_count, 4)
+        self.assertEqual(len(self._transacted_transactions()), 4)
 
         actual_orders = self.exec_handler.get_open_orders()
         expected_orders = []
@@ -216,7 +220,7 @@ class TestMarketOnOpenExecutionStyle(TestCase):
         self._trigger_single_time_event()
         self.exec_handler.on_market_close(...)
 
-        self.portfolio.transact_transaction.assert_not_called()
+        self.portfolio.transact_transactions.assert_not_called()
         self.monitor.record_transaction.assert_not_called()
 
     def test_market_open_does_not_trade(self):
@@ -226,7 +230,7 @@ class TestMarketOnOpenExecutionStyle(TestCase):
         self._trigger_single_time_event()
         self.exec_handler.on_market_open(...)
 
-        self.portfolio.transact_transaction.assert_not_called()
+        self.portfolio.transact_transactions.assert_not_called()
         self.monitor.record_transaction.assert_not_called()
 
     def _set_last_available_price(self, price):
@@ -0,0 +1,93 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from itertools import count
+from unittest import TestCase
+
+from qf_lib.backtesting.execution_handler.order_book import OrderBook
+from qf_lib.backtesting.order.execution_style import StopOrder, MarketOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.common.tickers.tickers import BloombergTicker
+
+
+class TestOrderBook(TestCase):
+    def setUp(self):
+        self.ticker_1 = BloombergTicker("Example1 Equity")
+        self.ticker_2 = BloombergTicker("Example2 Equity")
+        self.ids = count(1)
+        self.order_book = OrderBook()
+
+    def _order(self, ticker, quantity, execution_style=MarketOrder(), time_in_force=TimeInForce.GTC) -> Order:
+        order = Order(ticker, quantity, execution_style, time_in_force)
+        order.id = next(self.ids)
+        self.order_book.add(order)
+        return order
+
+    def test_orders_are_indexed(self):
+        market_order = self._order(self.ticker_1, 10, time_in_force=TimeInForce.OPG)
+        stop_order_1 = self._order(self.ticker_2, -10, StopOrder(90.0), TimeInForce.DAY)
+        stop_order_2 = self._order(self.ticker_1, -5, StopOrder(80.0), TimeInForce.DAY)
+
+        self.assertEqual(3, len(self.order_book))
+        self.assertIn(stop_order_1.id, self.order_book)
+        self.assertEqual([market_order, stop_order_1, stop_order_2], self.order_book.orders())
+        self.assertEqual([self.ticker_1, self.ticker_2], self.order_book.tickers())
+        self.assertEqual([market_order, stop_order_2], self.order_book.orders_for_ticker(self.ticker_1))
+        self.assertEqual([stop_order_1, stop_order_2], self.order_book.orders_with_time_in_force(TimeInForce.DAY))
+        self.assertEqual([], self.order_book.orders_with_time_in_force(TimeInForce.GTC))
+
+        self.assertEqual(stop_order_2, self.order_book.remove(stop_order_2.id))
+        self.assertIsNone(self.order_book.remove(stop_order_2.id))
+        self.assertEqual([market_order], self.order_book.orders_for_ticker(self.ticker_1))
+        self.assertEqual([stop_order_1], self.order_book.orders_with_time_in_force(TimeInForce.DAY))
+        self.assertEqual([], self.order_book.triggered_stop_orders([self.ticker_1], [0.0], [1000.0]))
+
+        self.order_book.clear()
+        self.assertEqual(0, len(self.order_book))
+        self.assertEqual([], self.order_book.tickers())
+        self.assertEqual([], self.order_book.triggered_stop_orders([self.ticker_2], [0.0], [1000.0]))
+
+    def test_adding_order_of_the_same_id_replaces_it(self):
+        order = self._order(self.ticker_1, -10, StopOrder(90.0))
+        self.order_book.add(order)
+
+        self.assertEqual([order], self.order_book.orders())
+        self.assertEqual([order], self.order_book.triggered_stop_orders([self.ticker_1], [85.0], [95.0]))
+
+    def test_triggered_stop_orders(self):
+        sell_stop_90 = self._order(self.ticker_1, -10, StopOrder(90.0))
+        sell_stop_95 = self._order(self.ticker_1, -10, StopOrder(95.0))
+        buy_stop_110 = self._order(self.ticker_1, 10, StopOrder(110.0))
+        buy_stop_105 = self._order(self.ticker_1, 10, StopOrder(105.0))
+        sell_stop_50 = self._order(self.ticker_2, -10, StopOrder(50.0))
+        self._order(self.ticker_2, 10, MarketOrder())
+
+        # no stop price was crossed
+        self.assertEqual([], self.order_book.triggered_stop_orders([self.ticker_1, self.ticker_2],
+                                                                   [96.0, 51.0], [104.0, 60.0]))
+        # stop prices equal to the low and high prices are crossed
+        self.assertEqual([sell_stop_95, buy_stop_105],
+                         self.order_book.triggered_stop_orders([self.ticker_1], [95.0], [105.0]))
+        # orders are returned in the order in which they were added to the book
+        self.assertEqual([sell_stop_90, sell_stop_95, buy_stop_110, buy_stop_105, sell_stop_50],
+                         self.order_book.triggered_stop_orders([self.ticker_2, self.ticker_1],
+                                                               [40.0, 80.0], [55.0, 120.0]))
+        # no orders are triggered on the side of the missing price
+        self.assertEqual([buy_stop_110, buy_stop_105],
+                         self.order_book.triggered_stop_orders([self.ticker_1], [float("nan")], [120.0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
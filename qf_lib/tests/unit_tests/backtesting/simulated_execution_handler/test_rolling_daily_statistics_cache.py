@@ -0,0 +1,128 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.execution_handler.slippage.rolling_daily_statistics_cache import RollingDailyStatisticsCache
+from qf_lib.backtesting.execution_handler.slippage.square_root_market_impact_slippage import \
+    SquareRootMarketImpactSlippage
+from qf_lib.backtesting.order.execution_style import MarketOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.data_providers.helpers import cast_data_array_to_proper_type
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class TestRollingDailyStatisticsCache(TestCase):
+    def setUp(self):
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 0, "second": 0, "microsecond": 0})
+
+        self.tickers = [BloombergTicker(f"Example{i} Equity") for i in range(4)]
+        dates = pd.bdate_range(datetime(2021, 1, 1), datetime(2021, 12, 31), name=DATES)
+
+        rng = np.random.default_rng(23)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(dates), len(self.tickers))), axis=0))
+        volume = rng.integers(-100, 1000, close.shape).astype(float)
+        close[rng.random(close.shape) < 0.2] = np.nan
+        volume[rng.random(close.shape) < 0.2] = np.nan
+        # the last ticker is not quoted for a few months
+        close[(dates > datetime(2021, 4, 1)) & (dates < datetime(2021, 8, 1)), 3] = np.nan
+        volume[(dates > datetime(2021, 4, 1)) & (dates < datetime(2021, 8, 1)), 3] = np.nan
+
+        data = np.stack([close, close, close, close, volume], axis=-1)
+        data_array = QFDataArray.create(dates, self.tickers, PriceField.ohlcv(), data)
+        self.data_provider = PresetDataProvider(data_array, datetime(2020, 1, 1), dates[-1], Frequency.DAILY,
+                                                timer=SettableTimer(datetime(2022, 1, 1)))
+
+    def _expected_statistics(self, date, tickers):
+        """ Statistics computed from scratch, using the daily bars from the last 60 days. """
+        data_array = self.data_provider.get_price(tickers, [PriceField.Close, PriceField.Volume],
+                                                  date - RelativeDelta(days=60), date - RelativeDelta(days=1),
+                                                  Frequency.DAILY)
+
+        def volatility(prices_tms):
+            prices_tms = PricesSeries(prices_tms.dropna().iloc[-20:])
+            try:
+                return get_volatility(prices_tms, frequency=Frequency.DAILY, annualise=True)
+            except (AssertionError, AttributeError):
+                return float('nan')
+
+        def average_volume(volume_tms):
+            volume_tms = volume_tms.dropna().iloc[-20:]
+            return volume_tms[volume_tms >= 0].mean()
+
+        close_prices = cast_data_array_to_proper_type(data_array.loc[:, tickers, PriceField.Close])
+        volumes = cast_data_array_to_proper_type(data_array.loc[:, tickers, PriceField.Volume])
+        return close_prices.apply(volatility).values, volumes.apply(average_volume).values
+
+    def test_statistics_equal_statistics_computed_from_scratch(self):
+        cache = RollingDailyStatisticsCache(self.data_provider)
+
+        for i, date in enumerate(pd.date_range(datetime(2021, 2, 1, 13, 30), datetime(2021, 9, 15), freq="37h")):
+            # the tickers change from day to day and may repeat
+            tickers = [self.tickers[j] for j in (0, 1, 3, 0)] if i % 5 else self.tickers[:2]
+
+            expected_volatilities, expected_average_volumes = self._expected_statistics(date, tickers)
+            np.testing.assert_almost_equal(cache.volatilities(date, tickers), expected_volatilities, decimal=12)
+            np.testing.assert_almost_equal(cache.average_volumes(date, tickers), expected_average_volumes,
+                                           decimal=9)
+
+    def test_only_new_bars_are_downloaded(self):
+        cache = RollingDailyStatisticsCache(self.data_provider)
+        cache.volatilities(datetime(2021, 3, 1, 13, 30), self.tickers)
+
+        with patch.object(self.data_provider, "get_price", wraps=self.data_provider.get_price) as get_price:
+            cache.average_volumes(datetime(2021, 3, 1, 20), self.tickers)
+            get_price.assert_not_called()
+
+            cache.volatilities(datetime(2021, 3, 3, 13, 30), self.tickers)
+            get_price.assert_called_once()
+            _, _, start_date, end_date, _ = get_price.call_args[0]
+            self.assertEqual(datetime(2021, 2, 28), start_date)
+            self.assertEqual(datetime(2021, 3, 2, 13, 30), end_date)
+
+    def test_square_root_market_impact_slippage_fill_prices(self):
+        slippage_model = SquareRootMarketImpactSlippage(0.1, self.data_provider)
+        orders = [Order(ticker, quantity, MarketOrder(), TimeInForce.GTC)
+                  for ticker, quantity in zip(self.tickers, [1000, -200, 50, 10])]
+        no_slippage_fill_prices = [100.0, 50.0, 20.0, 10.0]
+
+        for date in pd.date_range(datetime(2021, 3, 1, 13, 30), datetime(2021, 9, 1), freq="7D"):
+            volatilities, average_volumes = self._expected_statistics(date, self.tickers)
+            market_impact = 0.1 * volatilities * np.sqrt(np.abs([1000, 200, 50, 10]) / average_volumes)
+            expected_fill_prices = no_slippage_fill_prices * (1 + np.sign([1000, -200, 50, 10]) * market_impact)
+
+            fill_prices, _ = slippage_model.process_orders(date, orders, no_slippage_fill_prices)
+            np.testing.assert_almost_equal(fill_prices, expected_fill_prices, decimal=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import Mock
+
+import numpy as np
+
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.scheduler import Scheduler
+from qf_lib.backtesting.events.time_event.single_time_event.schedule_order_execution_event import \
+    ScheduleOrderExecutionEvent
+from qf_lib.backtesting.execution_handler.commission_models.fixed_commission_model import FixedCommissionModel
+from qf_lib.backtesting.execution_handler.simulated_execution_handler import SimulatedExecutionHandler
+from qf_lib.backtesting.execution_handler.slippage.price_based_slippage import PriceBasedSlippage
+from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
+from qf_lib.backtesting.order.execution_style import TWAPOrder, VWAPOrder, POVOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+
+
+class TestScheduledOrdersExecutionStyle(TestCase):
+    def setUp(self):
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+
+        self.timer = SettableTimer(initial_time=datetime(2021, 3, 1, 13, 0))
+        self.ticker_1 = BloombergTicker("Example1 Equity")
+        self.ticker_2 = BloombergTicker("Example2 Equity")
+
+        # Open price and volume of the bars of each ticker (the volume may depend on the time of the bar)
+        self.open_prices = {self.ticker_1: 100.0, self.ticker_2: 50.0}
+        self.volumes = {self.ticker_1: lambda time: 500.0, self.ticker_2: lambda time: 500.0}
+
+        self.data_provider = Mock(spec=AbstractPriceDataProvider, timer=self.timer)
+        self.data_provider.get_price.side_effect = self._get_price
+
+        self.portfolio = Mock(spec=Portfolio)
+        self.portfolio.open_positions_dict = {}
+
+        self.exec_handler = SimulatedExecutionHandler(self.data_provider, Mock(spec=Scheduler),
+                                                      Mock(spec=AbstractMonitor), FixedCommissionModel(0.0),
+                                                      self.portfolio, PriceBasedSlippage(0.0, self.data_provider),
+                                                      RelativeDelta(minutes=1), Frequency.MIN_1)
+
+    def _get_price(self, tickers, fields, start_date, end_date, frequency, look_ahead_bias=False):
+        self.assertEqual([PriceField.Open, PriceField.Volume], fields)
+        self.assertEqual(self.timer.now(), start_date)
+        return PricesDataFrame(
+            [[self.open_prices[ticker], self.volumes[ticker](start_date)] for ticker in tickers],
+            index=tickers, columns=fields)
+
+    def _place_orders(self, *orders):
+        self.exec_handler.assign_order_ids(orders)
+        self.timer.set_current_time(self.timer.now() + RelativeDelta(minutes=1))
+        self.exec_handler.on_orders_accept(ScheduleOrderExecutionEvent())
+
+    def _run_trading_session(self):
+        """ Triggers the market open, all intraday bars and the market close of the day of the current time. """
+        market_open = self.timer.now() + MarketOpenEvent.trigger_time()
+        market_close = self.timer.now() + MarketCloseEvent.trigger_time()
+
+        self.timer.set_current_time(market_open)
+        self.exec_handler.on_market_open(MarketOpenEvent())
+        while self.timer.now() + RelativeDelta(minutes=1) < market_close:
+            self.timer.set_current_time(self.timer.now() + RelativeDelta(minutes=1))
+            self.exec_handler.on_new_bar(...)
+
+        self.timer.set_current_time(market_close)
+        self.exec_handler.on_market_close(MarketCloseEvent())
+
+    def _filled_quantities(self, ticker):
+        """ Returns the quantities of all transactions of the ticker passed to the portfolio. """
+        return [transaction.quantity for args, _ in self.portfolio.transact_transactions.call_args_list
+                for transaction in args[0] if transaction.ticker == ticker]
+
+    def test_pov_order_fills_the_participation_rate_of_bar_volumes(self):
+        order = Order(self.ticker_1, -1025, POVOrder(0.1), TimeInForce.DAY)
+        self.volumes[self.ticker_1] = lambda time: np.nan if time.minute == 40 else 500.0
+        self._place_orders(order)
+        self.assertEqual([order], self.exec_handler.get_open_orders())
+
+        self._run_trading_session()
+
+        # no child order is filled at the bar without the volume
+        self.assertEqual([-50] * 20 + [-25], self._filled_quantities(self.ticker_1))
+        self.assertEqual([], self.exec_handler.get_open_orders())
+
+    def test_twap_order_is_filled_evenly_until_the_market_close(self):
+        order = Order(self.ticker_1, 3 * 390, TWAPOrder(), TimeInForce.DAY)
+        self._place_orders(order)
+        self._run_trading_session()
+
+        self.assertEqual([3] * 390, self._filled_quantities(self.ticker_1))
+        self.assertEqual([], self.exec_handler.get_open_orders())
+
+    def test_remainder_of_day_order_expires(self):
+        order = Order(self.ticker_1, 1000 * 390, TWAPOrder(max_participation_rate=0.5), TimeInForce.DAY)
+        self._place_orders(order)
+        self._run_trading_session()
+
+        self.assertEqual([250] * 390, self._filled_quantities(self.ticker_1))
+        self.assertEqual([], self.exec_handler.get_open_orders())
+
+    def test_remainder_of_gtc_order_is_carried_over_to_the_next_session(self):
+        order = Order(self.ticker_2, -1000 * 390, TWAPOrder(max_participation_rate=0.5), TimeInForce.GTC)
+        self._place_orders(order)
+        self._run_trading_session()
+
+        self.assertEqual([order], self.exec_handler.get_open_orders())
+        self.assertEqual([-250 * 390], self.exec_handler._scheduled_orders_executor.get_filled_quantities())
+
+        # the remainder is scheduled evenly over the next session
+        self.volumes[self.ticker_2] = lambda time: 10000.0
+        self.timer.set_current_time(datetime(2021, 3, 2, 12))
+        self._run_trading_session()
+
+        self.assertEqual([-250] * 390 + [-750] * 390, self._filled_quantities(self.ticker_2))
+        self.assertEqual([], self.exec_handler.get_open_orders())
+
+    def test_orders_for_the_same_ticker_share_the_bar_volume(self):
+        capped_order = Order(self.ticker_1, 1000 * 390, TWAPOrder(max_participation_rate=0.2), TimeInForce.DAY)
+        uncapped_order = Order(self.ticker_1, 1000 * 390, TWAPOrder(), TimeInForce.DAY)
+        self._place_orders(capped_order, uncapped_order)
+        self._run_trading_session()
+
+        # the child orders of 100 and 500 shares exceed the bar volume of 500 shares, so they are scaled down by 5/6
+        self.assertEqual([83, 416] * 390, self._filled_quantities(self.ticker_1))
+
+    def test_vwap_order_is_filled_proportionally_to_bar_volumes(self):
+        executor = self.exec_handler._scheduled_orders_executor
+        executor._daily_statistics_cache.average_volumes = Mock(return_value=np.array([100.0 * 390]))
+        self.volumes[self.ticker_1] = lambda time: 50.0 if time.minute % 2 else 150.0
+
+        order = Order(self.ticker_1, 10 * 390, VWAPOrder(), TimeInForce.DAY)
+        self._place_orders(order)
+        self._run_trading_session()
+
+        # the expected volume of the session is equal to the average daily volume, so the order fills 10% of each bar
+        self.assertEqual([15, 5] * 195, self._filled_quantities(self.ticker_1))
+        self.assertEqual([], self.exec_handler.get_open_orders())
+
+    def test_child_orders_of_all_orders_are_computed_at_once(self):
+        twap_order = Order(self.ticker_1, 390, TWAPOrder(), TimeInForce.DAY)
+        pov_order = Order(self.ticker_2, 500, POVOrder(0.1), TimeInForce.GTC)
+        self._place_orders(twap_order, pov_order)
+
+        self.timer.set_current_time(datetime(2021, 3, 1, 13, 30))
+        self.exec_handler.on_market_open(MarketOpenEvent())
+        self.timer.set_current_time(datetime(2021, 3, 1, 13, 31))
+        self.exec_handler.on_new_bar(...)
+
+        self.assertEqual(2, self.data_provider.get_price.call_count)
+        self.assertEqual(2, self.portfolio.transact_transactions.call_count)
+        self.assertEqual([1, 1], self._filled_quantities(self.ticker_1))
+        self.assertEqual([50, 50], self._filled_quantities(self.ticker_2))
+
+        self.exec_handler.cancel_order(pov_order.id)
+        self.assertEqual([twap_order], self.exec_handler.get_open_orders())
+        self.assertEqual([2], self.exec_handler._scheduled_orders_executor.get_filled_quantities())
+
+
+if __name__ == '__main__':
+    unittest.main()
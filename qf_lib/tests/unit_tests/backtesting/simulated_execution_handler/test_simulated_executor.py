@@ -15,6 +15,8 @@ import unittest
 from itertools import count
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.execution_handler.market_orders_executor import MarketOrdersExecutor
 from qf_lib.backtesting.execution_handler.simulated_executor import SimulatedExecutor
@@ -48,15 +50,16 @@ class TestSimulatedExecutor(unittest.TestCase):
         cls.backtest_date = str_to_date("2020-01-01")
 
     def setUp(self) -> None:
-        def set_all_orders_to_be_executed(open_orders_list, tickers, market_open, market_close):
+        def set_all_orders_to_be_executed(executor, market_open, market_close):
             """Assign to each open order price equal to mocked_price. Set all orders to be executed."""
+            open_orders_list = executor.get_open_orders()
             no_slippage_fill_prices_list = [100.00 for _ in open_orders_list]
             to_be_executed_orders = open_orders_list
             expired_orders_list = []
             return no_slippage_fill_prices_list, to_be_executed_orders, expired_orders_list
 
         self.patcher = patch.object(MarketOrdersExecutor, '_get_orders_with_fill_prices_without_slippage',
-                                    side_effect=set_all_orders_to_be_executed)
+                                    autospec=True, side_effect=set_all_orders_to_be_executed)
         self.patcher.start()
 
         # List of transactions performed during a test
@@ -138,11 +141,11 @@ class TestSimulatedExecutor(unittest.TestCase):
         slippage_model = MagicMock()
         slippage_model.process_orders.side_effect = mock_apply_slippage
 
-        def mock_calculate_commission(fill_quantity, fill_price):
-            return 0.0
+        def mock_calculate_commissions(fill_quantities, fill_prices):
+            return np.zeros(len(fill_quantities))
 
         commission_model: CommissionModel = MagicMock()
-        commission_model.calculate_commission.side_effect = mock_calculate_commission
+        commission_model.calculate_commissions.side_effect = mock_calculate_commissions
 
         def mock_record_transaction(transaction: Transaction):
             self.recorded_transactions.append(transaction)
@@ -209,8 +209,8 @@ class TestSlippage(TestCase):
         slippage_model = SquareRootMarketImpactSlippage(price_impact=price_impact,
                                                         data_provider=self.data_provider)
 
-        slippage_model._compute_volatility = Mock()
-        slippage_model._compute_volatility.return_value = close_prices_volatility
+        slippage_model._compute_volatilities = Mock()
+        slippage_model._compute_volatilities.return_value = close_prices_volatility
 
         actual_fill_prices, actual_fill_volumes = slippage_model.process_orders(str_to_date('2020-01-01'),
                                                                                 self.orders,
@@ -257,8 +257,8 @@ class TestSlippage(TestCase):
         slippage_model = SquareRootMarketImpactSlippage(price_impact=price_impact,
                                                         data_provider=self.data_provider,
                                                         max_volume_share_limit=max_volume_share_limit)
-        slippage_model._compute_volatility = Mock()
-        slippage_model._compute_volatility.return_value = close_prices_volatility
+        slippage_model._compute_volatilities = Mock()
+        slippage_model._compute_volatilities.return_value = close_prices_volatility
 
         actual_fill_prices, actual_fill_volumes = slippage_model.process_orders(str_to_date('2020-01-01'),
                                                                                 self.orders,
@@ -283,8 +283,8 @@ class TestSlippage(TestCase):
         slippage_model = SquareRootMarketImpactSlippage(price_impact=price_impact,
                                                         data_provider=self.data_provider)
 
-        slippage_model._compute_volatility = Mock()
-        slippage_model._compute_volatility.return_value = close_prices_volatility
+        slippage_model._compute_volatilities = Mock()
+        slippage_model._compute_volatilities.return_value = close_prices_volatility
 
         actual_fill_prices, actual_fill_volumes = slippage_model.process_orders(str_to_date("2020-01-01"),
                                                                                 self.orders,
@@ -313,8 +313,8 @@ class TestSlippage(TestCase):
 
         slippage_model = SquareRootMarketImpactSlippage(price_impact=price_impact,
                                                         data_provider=self.data_provider)
-        slippage_model._compute_average_volume = Mock()
-        slippage_model._compute_average_volume.return_value = avg_daily_volume
+        slippage_model._compute_average_volumes = Mock()
+        slippage_model._compute_average_volumes.return_value = avg_daily_volume
         actual_fill_prices, actual_fill_volumes = slippage_model.process_orders(str_to_date("2020-01-01"),
                                                                                 self.orders,
                                                                                 prices_without_slippage)
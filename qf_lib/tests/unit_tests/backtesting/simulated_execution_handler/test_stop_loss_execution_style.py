@@ -85,6 +85,10 @@ class TestStopLossExecutionStyle(TestCase):
 
         self.exec_handler.assign_order_ids([self.stop_loss_order_1, self.stop_loss_order_2, self.stop_loss_order_3])
 
+    def _transacted_transactions(self):
+        """ Returns all transactions passed to the portfolio (in all calls of transact_transactions). """
+        return [transaction for args, _ in self.portfolio.transact_transactions.call_args_list for transaction in args[0]]
+
     def _trigger_single_time_event(self):
         self.timer.set_current_time(self.timer.now() + RelativeDelta(minutes=self.number_of_minutes))
         event = ScheduleOrderExecutionEvent()
@@ -101,7 +105,7 @@ class TestStopLossExecutionStyle(TestCase):
 
         self.exec_handler.on_market_close(...)
 
-        self.portfolio.transact_transaction.assert_not_called()
+        self.portfolio.transact_transactions.assert_not_called()
         self.monitor.record_transaction.assert_not_called()
 
         actual_orders = self.exec_handler.get_open_orders()
@@ -119,7 +123,7 @@ class TestStopLossExecutionStyle(TestCase):
         self._trigger_single_time_event()
         self.exec_handler.on_market_open(...)
 
-        self.portfolio.transact_transaction.assert_not_called()
+        self.portfolio.transact_transactions.assert_not_called()
         self.monitor.record_transaction.assert_not_called()
 
         actual_orders = self.exec_handler.get_open_orders()
@@ -132,7 +136,7 @@ class TestStopLossExecutionStyle(TestCase):
         self._trigger_single_time_event()
         self.exec_handler.on_market_close(...)
 
-        self.portfolio.transact_transaction.assert_not_called()
+        self.portfolio.transact_transactions.assert_not_called()
         self.monitor.record_transaction.assert_not_called()
 
         actual_orders = self.exec_handler.get_open_orders()
@@ -145,7 +149,7 @@ class TestStopLossExecutionStyle(TestCase):
         self._trigger_single_time_event()
         self.exec_handler.on_market_close(...)
 
-        self.portfolio.transact_transaction.assert_not_called()
+        self.portfolio.transact_transactions.assert_not_called()
         self.monitor.record_transaction.assert_not_called()
 
         actual_orders = self.exec_handler.get_open_orders()
@@ -163,7 +167,7 @@ class TestStopLossExecutionStyle(TestCase):
         expected_transaction = Transaction(self.timer.now(), self.msft_ticker, -1,
                                            self.stop_loss_order_1.execution_style.stop_price, 0.0)
         self.monitor.record_transaction.assert_called_once_with(expected_transaction)
-        self.portfolio.transact_transaction.assert_called_once_with(expected_transaction)
+        self.portfolio.transact_transactions.assert_called_once_with([expected_transaction])
 
     def test_both_orders_executed_when_both_stop_prices_hit(self):
         self._set_bar_for_today(open_price=100.0, high_price=110.0, low_price=90.0, close_price=105.0,
@@ -178,10 +182,10 @@ class TestStopLossExecutionStyle(TestCase):
             Transaction(self.timer.now(), self.msft_ticker, -1, self.stop_loss_order_2.execution_style.stop_price, 0),
         ]
         self.monitor.record_transaction.assert_has_calls(call(t) for t in expected_transactions)
-        self.portfolio.transact_transaction.assert_has_calls(call(t) for t in expected_transactions)
+        self.assertEqual(expected_transactions, self._transacted_transactions())
 
         self.assertEqual(self.monitor.record_transaction.call_count, 2)
-        self.assertEqual(self.portfolio.transact_transaction.call_count, 2)
+        self.assertEqual(len(self._transacted_transactions()), 2)
 
     def test_market_opens_at_much_lower_price_than_it_closed_at_yesterday(self):
         self._set_bar_for_today(open_price=70.0, high_price=100.0, low_price=68.0, close_price=90.0, volume=100000000.0)
@@ -194,10 +198,10 @@ class TestStopLossExecutionStyle(TestCase):
             Transaction(self.timer.now(), self.msft_ticker, -1, 70.0, 0),
         ]
         self.monitor.record_transaction.assert_has_calls(call(t) for t in expected_transactions)
-        self.portfolio.transact_transaction.assert_has_calls(call(t) for t in expected_transactions)
+        self.assertEqual(expected_transactions, self._transacted_transactions())
 
         self.assertEqual(self.monitor.record_transaction.call_count, 2)
-        self.assertEqual(self.portfolio.transact_transaction.call_count, 2)
+        self.assertEqual(len(self._transacted_transactions()), 2)
 
     def test_market_opens_at_much_higher_price_than_it_closed_at_yesterday(self):
         self.buy_stop_loss_order = Order(self.msft_ticker, quantity=1, execution_style=StopOrder(120.0),
@@ -219,10 +223,10 @@ class TestStopLossExecutionStyle(TestCase):
 
         ]
         self.monitor.record_transaction.assert_has_calls(call(t) for t in expected_transactions)
-        self.portfolio.transact_transaction.assert_has_calls(call(t) for t in expected_transactions)
+        self.assertEqual(expected_transactions, self._transacted_transactions())
 
         self.assertEqual(self.monitor.record_transaction.call_count, 3)
-        self.assertEqual(self.portfolio.transact_transaction.call_count, 3)
+        self.assertEqual(len(self._transacted_transactions()), 3)
 
     def _set_last_available_price(self, price):
         def result(tickers):
@@ -0,0 +1,62 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import subprocess
+import sys
+import unittest
+from typing import Dict
+from unittest import TestCase
+
+
+REPORTING_PACKAGES = ("matplotlib", "weasyprint", "openpyxl", "seaborn", "sklearn", "qf_lib.plotting",
+                      "qf_lib.analysis.tearsheets")
+
+
+def measure_import_time(module_name: str) -> Dict[str, int]:
+    """
+    Imports the module in a new interpreter (with the -X importtime option) and returns the cumulative import time
+    (in microseconds) of every module, which was imported as a result.
+    """
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                            capture_output=True, text=True, check=True).stderr
+
+    import_times = {}
+    for line in output.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative_time, name = line[len("import time:"):].split("|")
+            if cumulative_time.strip().isdigit():
+                import_times[name.strip()] = int(cumulative_time)
+
+    return import_times
+
+
+class TestImportTime(TestCase):
+    def test_backtest_trading_session_builder_does_not_import_reporting_stack(self):
+        module_name = "qf_lib.backtesting.trading_session.backtest_trading_session_builder"
+        import_times = measure_import_time(module_name)
+
+        self.assertIn(module_name, import_times)
+        reporting_modules = [name for name in import_times if name.startswith(REPORTING_PACKAGES)]
+        self.assertEqual([], reporting_modules, f"Importing {module_name} took {import_times[module_name] / 1e6:.2f}s")
+
+    def test_headless_parameter_sweep_runner_does_not_import_reporting_stack(self):
+        module_name = "qf_lib.backtesting.trading_session.backtest_parameter_sweep_runner"
+        import_times = measure_import_time(module_name)
+
+        self.assertIn(module_name, import_times)
+        reporting_modules = [name for name in import_times if name.startswith(REPORTING_PACKAGES)]
+        self.assertEqual([], reporting_modules, f"Importing {module_name} took {import_times[module_name] / 1e6:.2f}s")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.columnar_data_bundle import ColumnarDataBundle
+
+
+class TestColumnarDataBundle(unittest.TestCase):
+    tickers = [BloombergTicker("A US Equity"), BloombergTicker("B US Equity"), BloombergTicker("C US Equity")]
+    dates = pd.date_range(datetime(2021, 1, 4), periods=10, freq="B")
+
+    def setUp(self):
+        rng = np.random.default_rng(2021)
+        data = rng.random((len(self.dates), len(self.tickers), len(PriceField.ohlcv())))
+        data[3, :, :] = np.nan
+        self.data_array = QFDataArray.create(self.dates, self.tickers, PriceField.ohlcv(), data)
+        self.bundle = ColumnarDataBundle(self.data_array)
+
+    def test_get_data_array_equals_label_based_slicing(self):
+        start_date, end_date = datetime(2021, 1, 5), datetime(2021, 1, 12)
+        tickers = [self.tickers[2], self.tickers[0]]
+        fields = [PriceField.Close, PriceField.Open]
+
+        expected = self.data_array.loc[start_date:end_date, tickers, fields]
+        actual = self.bundle.get_data_array(start_date, end_date, tickers, fields)
+
+        self.assertEqual(type(actual), QFDataArray)
+        self.assertTrue(expected.identical(actual))
+
+    def test_get_data_array_dates_between_bars(self):
+        actual = self.bundle.get_data_array(datetime(2021, 1, 5, 12), datetime(2021, 1, 7, 12), self.tickers,
+                                            [PriceField.Close])
+        self.assertListEqual(list(actual.dates.to_index()), [datetime(2021, 1, 6), datetime(2021, 1, 7)])
+
+    def test_get_data_array_empty_range(self):
+        actual = self.bundle.get_data_array(datetime(2021, 1, 9), datetime(2021, 1, 10), self.tickers,
+                                            PriceField.ohlcv())
+        self.assertEqual(actual.shape, (0, 3, 5))
+
+        actual = self.bundle.get_data_array(datetime(2021, 1, 12), datetime(2021, 1, 5), self.tickers,
+                                            PriceField.ohlcv())
+        self.assertEqual(actual.shape, (0, 3, 5))
+
+    def test_get_data_array_drop_empty_dates(self):
+        expected = self.data_array.loc[:, self.tickers, [PriceField.Volume]].dropna(DATES, how='all')
+        actual = self.bundle.get_data_array(None, None, self.tickers, [PriceField.Volume], drop_empty_dates=True)
+
+        self.assertEqual(actual.shape[0], len(self.dates) - 1)
+        self.assertTrue(expected.identical(actual))
+
+    def test_unsorted_dates(self):
+        shuffled_data_array = self.data_array.isel(dates=[5, 1, 0, 9, 2, 3, 4, 8, 7, 6])
+        bundle = ColumnarDataBundle(shuffled_data_array)
+
+        actual = bundle.get_data_array(None, None, self.tickers, PriceField.ohlcv())
+        self.assertTrue(self.data_array.identical(actual))
+
+    def test_missing_ticker(self):
+        with self.assertRaises(KeyError):
+            self.bundle.get_data_array(None, None, [BloombergTicker("Missing Equity")], [PriceField.Close])
+
+
+if __name__ == '__main__':
+    unittest.main()
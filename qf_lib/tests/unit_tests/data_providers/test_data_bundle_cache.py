@@ -0,0 +1,156 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+from qf_lib.data_providers.data_bundle_cache import DataBundleCache
+from qf_lib.data_providers.data_bundle_storage import VALUES_FILE
+from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class TestDataBundleCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = DataBundleCache(self.cache_dir)
+
+        self.tickers = [BloombergTicker("MSFT US Equity"), BloombergTicker("GOOGL US Equity")]
+        self.fields = [PriceField.Open, PriceField.Close, PriceField.Volume]
+        self.start_date = datetime(2018, 2, 1)
+        self.end_date = datetime(2018, 2, 28)
+        self.frequency = Frequency.DAILY
+
+        dates = pd.bdate_range(self.start_date, self.end_date, name=DATES)
+        rng = np.random.default_rng(2021)
+        self.data_array = QFDataArray.create(dates, self.tickers, self.fields,
+                                             rng.random((len(dates), len(self.tickers), len(self.fields))))
+
+        self.data_provider = Mock(spec=AbstractPriceDataProvider)
+        self.data_provider.get_price.return_value = self.data_array
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _put(self, data_array=None, start_date=None, end_date=None):
+        self.cache.put(type(self.data_provider), self.tickers, self.fields, start_date or self.start_date,
+                       end_date or self.end_date, self.frequency,
+                       data_array if data_array is not None else self.data_array)
+
+    def test_get_from_empty_cache(self):
+        self.assertIsNone(self.cache.get(type(self.data_provider), self.tickers, self.fields, self.start_date,
+                                         self.end_date, self.frequency))
+
+    def test_put_and_get_exact_request(self):
+        self._put()
+        data_array, exp_dates = self.cache.get(type(self.data_provider), self.tickers, self.fields, self.start_date,
+                                               self.end_date, self.frequency)
+
+        self.assertIsNone(exp_dates)
+        self.assertTrue(self.data_array.identical(data_array))
+
+    def test_get_subset_of_cached_bundle(self):
+        self._put()
+        start_date, end_date = datetime(2018, 2, 5), datetime(2018, 2, 14)
+        data_array, _ = self.cache.get(type(self.data_provider), self.tickers[1:], [PriceField.Close], start_date,
+                                       end_date, self.frequency)
+
+        expected = self.data_array.loc[start_date:end_date, self.tickers[1:], [PriceField.Close]]
+        self.assertTrue(expected.identical(data_array))
+
+    def test_get_not_covered_request(self):
+        self._put()
+        self.assertIsNone(self.cache.get(type(self.data_provider), self.tickers, self.fields, self.start_date,
+                                         datetime(2018, 3, 5), self.frequency))
+        self.assertIsNone(self.cache.get(type(self.data_provider), self.tickers + [BloombergTicker("AAPL US Equity")],
+                                         self.fields, self.start_date, self.end_date, self.frequency))
+        self.assertIsNone(self.cache.get(type(self.data_provider), self.tickers, PriceField.ohlcv(), self.start_date,
+                                         self.end_date, self.frequency))
+        self.assertIsNone(self.cache.get(type(self.data_provider), self.tickers, self.fields, self.start_date,
+                                         self.end_date, Frequency.MIN_1))
+        self.assertIsNone(self.cache.get(int, self.tickers, self.fields, self.start_date, self.end_date,
+                                         self.frequency))
+
+    def test_corrupted_entry_is_removed(self):
+        self._put()
+        entry_dir = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        corrupted_values = np.zeros(self.data_array.shape)
+        np.save(os.path.join(entry_dir, VALUES_FILE), corrupted_values)
+
+        self.assertIsNone(self.cache.get(type(self.data_provider), self.tickers, self.fields, self.start_date,
+                                         self.end_date, self.frequency))
+        self.assertFalse(os.path.exists(entry_dir))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self._put()
+        bundle_size = self.cache.size()
+        self.cache.max_size = 2 * bundle_size
+
+        first_entry_dir = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        os.utime(os.path.join(first_entry_dir, DataBundleCache.METADATA_FILE), (0, 0))
+
+        self._put(start_date=datetime(2018, 1, 1))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+        self._put(start_date=datetime(2017, 1, 1))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        self.assertFalse(os.path.exists(first_entry_dir))
+
+    def test_prefetching_data_provider_uses_cache(self):
+        PrefetchingDataProvider(self.data_provider, self.tickers, self.fields, self.start_date, self.end_date,
+                                self.frequency, data_bundle_cache=self.cache)
+        self.assertEqual(self.data_provider.get_price.call_count, 1)
+
+        data_provider = PrefetchingDataProvider(self.data_provider, self.tickers, self.fields, self.start_date,
+                                                self.end_date, self.frequency, data_bundle_cache=self.cache)
+        self.assertEqual(self.data_provider.get_price.call_count, 1)
+        self.assertTrue(self.data_array.identical(data_provider.data_bundle))
+
+    def test_prefetching_data_provider_downloads_only_missing_data(self):
+        underlying_data_provider = PresetDataProvider(self.data_array, self.start_date, self.end_date, self.frequency)
+        data_provider = Mock(spec=AbstractPriceDataProvider, wraps=underlying_data_provider)
+
+        PrefetchingDataProvider(data_provider, self.tickers[:1], self.fields, self.start_date, datetime(2018, 2, 15),
+                                self.frequency, data_bundle_cache=self.cache)
+        data_provider.get_price.reset_mock()
+
+        prefetching_data_provider = PrefetchingDataProvider(data_provider, self.tickers, self.fields,
+                                                            datetime(2018, 2, 5), self.end_date, self.frequency,
+                                                            data_bundle_cache=self.cache)
+
+        requested_ranges = [(call[1][0], call[1][2], call[1][3]) for call in data_provider.get_price.mock_calls]
+        self.assertCountEqual(requested_ranges, [
+            (self.tickers[1:], datetime(2018, 2, 5), self.end_date),
+            (self.tickers[:1], datetime(2018, 2, 14), self.end_date)
+        ])
+
+        expected = self.data_array.loc[datetime(2018, 2, 5):self.end_date, :, :]
+        self.assertTrue(expected.equals(prefetching_data_provider.data_bundle))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
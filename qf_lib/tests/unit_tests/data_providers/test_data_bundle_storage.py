@@ -0,0 +1,84 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import qf_lib.tests.helpers.testing_tools.containers_comparison as tt
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.data_bundle_storage import save_data_bundle, load_data_bundle, \
+    create_memory_mapped_data_bundle
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class TestDataBundleStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        self.tickers = [BloombergTicker("MSFT US Equity"), BloombergTicker("GOOGL US Equity")]
+        self.fields = PriceField.ohlcv()
+        self.dates = pd.date_range(datetime(2021, 5, 3, 13, 30), datetime(2021, 5, 3, 20), freq="1min", name=DATES)
+
+        rng = np.random.default_rng(2021)
+        self.data_array = QFDataArray.create(self.dates, self.tickers, self.fields,
+                                             rng.random((len(self.dates), len(self.tickers), len(self.fields))))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_save_and_load(self):
+        save_data_bundle(self.data_array, self.directory)
+        loaded_data_array = load_data_bundle(self.directory)
+
+        self.assertTrue(self.data_array.identical(loaded_data_array))
+
+    def test_load_memory_mapped(self):
+        save_data_bundle(self.data_array, self.directory)
+        loaded_data_array = load_data_bundle(self.directory, memory_map=True)
+
+        self.assertIsInstance(loaded_data_array.data, np.memmap)
+        self.assertTrue(self.data_array.identical(loaded_data_array))
+
+    def test_create_memory_mapped_data_bundle(self):
+        data_array = create_memory_mapped_data_bundle(self.directory, self.dates, self.tickers, self.fields)
+        self.assertTrue(data_array.isnull().all())
+
+        for ticker in self.tickers:
+            data_array.loc[:, ticker, :] = self.data_array.loc[:, ticker, :]
+        del data_array
+
+        self.assertTrue(self.data_array.identical(load_data_bundle(self.directory)))
+
+    def test_preset_data_provider_with_memory_mapped_bundle(self):
+        save_data_bundle(self.data_array, self.directory)
+        data_provider = PresetDataProvider(load_data_bundle(self.directory, memory_map=True), self.dates[0],
+                                           self.dates[-1], Frequency.MIN_1)
+        in_memory_data_provider = PresetDataProvider(self.data_array, self.dates[0], self.dates[-1], Frequency.MIN_1)
+
+        start_date, end_date = datetime(2021, 5, 3, 14, 0), datetime(2021, 5, 3, 14, 30)
+        expected = in_memory_data_provider.get_price(self.tickers[0], self.fields, start_date, end_date)
+        actual = data_provider.get_price(self.tickers[0], self.fields, start_date, end_date)
+        tt.assert_dataframes_equal(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
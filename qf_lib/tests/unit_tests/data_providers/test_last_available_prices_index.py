@@ -0,0 +1,99 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.columnar_data_bundle import ColumnarDataBundle
+from qf_lib.data_providers.last_available_prices_index import LastAvailablePricesIndex
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class TestLastAvailablePricesIndex(TestCase):
+    def setUp(self):
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 0, "second": 0, "microsecond": 0})
+
+        self.tickers = [BloombergTicker(f"Example{i} Equity") for i in range(4)]
+        self.fields = [PriceField.Open, PriceField.Close]
+        self.dates = pd.bdate_range(datetime(2021, 1, 1), datetime(2021, 3, 31), name=DATES)
+
+        rng = np.random.default_rng(14)
+        values = rng.random((len(self.dates), len(self.tickers), len(self.fields)))
+        values[rng.random(values.shape) < 0.3] = np.nan
+        values[10:20, 2, :] = np.nan  # no prices for more than 7 days
+        values[:, 3, 1] = np.nan  # only the Open prices are available
+        self.data_array = QFDataArray.create(self.dates, self.tickers, self.fields, values)
+
+    def test_last_prices(self):
+        index = LastAvailablePricesIndex(ColumnarDataBundle(self.data_array))
+        tickers_positions = np.arange(len(self.tickers))
+
+        for end_time in pd.date_range(datetime(2020, 12, 31), datetime(2021, 4, 15), freq="19h"):
+            expected_prices = [self._last_available_price(ticker, end_time) for ticker in self.tickers]
+            actual_prices = index.get_last_prices(tickers_positions, end_time)
+            np.testing.assert_array_equal(expected_prices, actual_prices)
+
+    def test_open_prices(self):
+        index = LastAvailablePricesIndex(ColumnarDataBundle(self.data_array))
+        tickers_positions = np.array([3, 0])
+
+        open_prices = index.get_open_prices(tickers_positions, datetime(2021, 2, 1), datetime(2021, 2, 1, 13))
+        expected_open_prices = self.data_array.loc[datetime(2021, 2, 1), [self.tickers[3], self.tickers[0]],
+                                                   PriceField.Open].values
+        np.testing.assert_array_equal(expected_open_prices, open_prices)
+
+        open_prices = index.get_open_prices(tickers_positions, datetime(2021, 1, 30), datetime(2021, 1, 31, 13))
+        self.assertTrue(np.isnan(open_prices).all())
+
+    def test_prices_are_not_copied(self):
+        data_bundle = ColumnarDataBundle(self.data_array)
+        index = LastAvailablePricesIndex(data_bundle)
+
+        self.assertTrue(np.shares_memory(index._open_prices, data_bundle.values))
+        self.assertTrue(np.shares_memory(index._close_prices, data_bundle.values))
+        self.assertEqual(np.int32, index._last_valid_positions.dtype)
+        self.assertTrue(index._last_valid_positions.flags.c_contiguous)
+
+    def test_data_provider_last_prices_do_not_depend_on_other_tickers(self):
+        timer = SettableTimer(self.dates[0])
+        data_provider = PresetDataProvider(self.data_array, self.dates[0], self.dates[-1], Frequency.DAILY, timer=timer)
+
+        for time in pd.date_range(datetime(2021, 1, 4, 10), datetime(2021, 3, 30, 10), freq="17h"):
+            timer.set_current_time(time)
+            prices = data_provider.get_last_available_price(self.tickers, Frequency.DAILY)
+            for ticker in self.tickers:
+                np.testing.assert_equal(prices[ticker], data_provider.get_last_available_price(ticker))
+
+    def _last_available_price(self, ticker: BloombergTicker, end_time: datetime) -> float:
+        """ Reference implementation, scanning the prices of the last 7 days. """
+        prices = self.data_array.loc[end_time - RelativeDelta(days=7):end_time, ticker, :].values.flatten()
+        valid_prices = prices[~np.isnan(prices)]
+        return valid_prices[-1] if len(valid_prices) > 0 else np.nan
+
+
+if __name__ == '__main__':
+    unittest.main()
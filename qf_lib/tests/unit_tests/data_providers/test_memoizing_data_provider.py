@@ -0,0 +1,115 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.timer import SettableTimer, RealTimer
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+from qf_lib.data_providers.bloomberg.bloomberg_data_provider import BloombergDataProvider
+from qf_lib.data_providers.exchange_rate_provider import ExchangeRateProvider
+from qf_lib.data_providers.futures_data_provider import FuturesDataProvider
+from qf_lib.data_providers.memoizing_data_provider import MemoizingDataProvider, create_memoizing_data_provider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class TestMemoizingDataProvider(TestCase):
+    def setUp(self):
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 0, "second": 0, "microsecond": 0})
+
+        self.tickers = [BloombergTicker("Example1 Equity"), BloombergTicker("Example2 Equity")]
+        dates = pd.bdate_range(datetime(2021, 1, 1), datetime(2021, 3, 31), name=DATES)
+        values = np.random.default_rng(15).random((len(dates), len(self.tickers), len(PriceField.ohlcv())))
+        data_array = QFDataArray.create(dates, self.tickers, PriceField.ohlcv(), values)
+
+        self.timer = SettableTimer(datetime(2021, 2, 1, 21))
+        preset_data_provider = PresetDataProvider(data_array, dates[0], dates[-1], Frequency.DAILY, timer=self.timer)
+        self.underlying_data_provider = Mock(spec=AbstractPriceDataProvider, wraps=preset_data_provider)
+        self.underlying_data_provider.timer = self.timer
+        self.underlying_data_provider.frequency = Frequency.DAILY
+
+        self.data_provider = MemoizingDataProvider(self.underlying_data_provider)
+
+    def test_identical_queries_are_memoized_within_timestamp(self):
+        prices = self.data_provider.historical_price(self.tickers, PriceField.Close, 10)
+        same_prices = self.data_provider.historical_price(list(self.tickers), PriceField.Close, 10)
+        other_prices = self.data_provider.historical_price(self.tickers, PriceField.Close, 5)
+
+        self.assertIs(prices, same_prices)
+        self.assertEqual((5, 2), other_prices.shape)
+        self.assertEqual(2, self.underlying_data_provider.historical_price.call_count)
+        self.assertEqual((1, 2), (self.data_provider.hits, self.data_provider.misses))
+
+    def test_cache_is_invalidated_when_timer_moves(self):
+        last_prices = self.data_provider.get_last_available_price(self.tickers)
+        self.data_provider.get_last_available_price(self.tickers)
+
+        self.timer.set_current_time(datetime(2021, 2, 2, 21))
+        next_prices = self.data_provider.get_last_available_price(self.tickers)
+        self.data_provider.get_last_available_price(self.tickers)
+
+        self.assertFalse(last_prices.equals(next_prices))
+        self.assertEqual(2, self.underlying_data_provider.get_last_available_price.call_count)
+        self.assertEqual((2, 2), (self.data_provider.hits, self.data_provider.misses))
+
+    def test_queries_are_not_memoized_with_real_timer(self):
+        self.underlying_data_provider.timer = RealTimer()
+        self.data_provider.get_price(self.tickers, PriceField.Close, datetime(2021, 1, 4), datetime(2021, 1, 29))
+        self.data_provider.get_price(self.tickers, PriceField.Close, datetime(2021, 1, 4), datetime(2021, 1, 29))
+
+        self.assertEqual(2, self.underlying_data_provider.get_price.call_count)
+        self.assertEqual((0, 0), (self.data_provider.hits, self.data_provider.misses))
+
+    def test_wrapper_implements_interfaces_of_wrapped_data_provider(self):
+        data_provider = create_memoizing_data_provider(self.underlying_data_provider)
+        self.assertNotIsInstance(data_provider, ExchangeRateProvider)
+        self.assertNotIsInstance(data_provider, FuturesDataProvider)
+
+        futures_data_provider = Mock(spec=PresetDataProvider)
+        futures_data_provider.timer = self.timer
+        data_provider = create_memoizing_data_provider(futures_data_provider)
+        self.assertIsInstance(data_provider, FuturesDataProvider)
+        self.assertNotIsInstance(data_provider, ExchangeRateProvider)
+
+        exchange_rate_provider = Mock(spec=BloombergDataProvider)
+        exchange_rate_provider.timer = self.timer
+        data_provider = create_memoizing_data_provider(exchange_rate_provider)
+        self.assertIsInstance(data_provider, FuturesDataProvider)
+        self.assertIsInstance(data_provider, ExchangeRateProvider)
+
+    def test_exchange_rates_are_memoized(self):
+        exchange_rate_provider = Mock(spec=BloombergDataProvider)
+        exchange_rate_provider.timer = self.timer
+        exchange_rate_provider.get_last_available_exchange_rate.return_value = 0.9
+        data_provider = create_memoizing_data_provider(exchange_rate_provider)
+
+        for _ in range(3):
+            self.assertEqual(0.9, data_provider.get_last_available_exchange_rate("USD", "CHF", Frequency.DAILY))
+        exchange_rate_provider.get_last_available_exchange_rate.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,15 +20,21 @@ import pandas as pd
 import numpy as np
 
 import qf_lib.tests.helpers.testing_tools.containers_comparison as tt
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.enums.security_type import SecurityType
 from qf_lib.common.tickers.tickers import BloombergTicker
 from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.dimension_names import DATES, TICKERS, FIELDS
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.data_providers.abstract_price_data_provider import AbstractPriceDataProvider
+from qf_lib.data_providers.bloomberg.bloomberg_data_provider import BloombergDataProvider
 from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 
 
 class TestPrefetchingDataProvider(unittest.TestCase):
@@ -117,5 +123,140 @@ class TestPrefetchingDataProvider(unittest.TestCase):
                                                          self.end_date + RelativeDelta(days=2), self.frequency)
 
 
+class TestPrefetchingDataProviderExtension(unittest.TestCase):
+    def setUp(self):
+        self.tickers = [BloombergTicker("MSFT US Equity"), BloombergTicker("GOOGL US Equity"),
+                        BloombergTicker("AAPL US Equity")]
+        self.fields = [PriceField.Open, PriceField.Close]
+        self.frequency = Frequency.DAILY
+
+        dates = pd.bdate_range(datetime(2018, 1, 1), datetime(2018, 3, 30), name=DATES)
+        rng = np.random.default_rng(2021)
+        self.data_array = QFDataArray.create(dates, self.tickers, self.fields,
+                                             rng.random((len(dates), len(self.tickers), len(self.fields))))
+
+        underlying_data_provider = PresetDataProvider(self.data_array, dates[0], dates[-1], self.frequency)
+        self.data_provider = Mock(spec=AbstractPriceDataProvider, wraps=underlying_data_provider)
+
+        self.start_date = datetime(2018, 2, 1)
+        self.end_date = datetime(2018, 2, 28)
+        self.prefetching_data_provider = PrefetchingDataProvider(self.data_provider, self.tickers[:2], self.fields,
+                                                                 self.start_date, self.end_date, self.frequency)
+
+    def test_extend_end_date(self):
+        new_end_date = datetime(2018, 3, 15)
+        self.prefetching_data_provider.extend(end_date=new_end_date)
+
+        self.assertEqual(self.prefetching_data_provider.end_date, new_end_date)
+        self.assertEqual(self.prefetching_data_provider.start_date, self.start_date)
+
+        # Only the missing dates (overlapping with the prefetched data by one bar) should be downloaded
+        _, args, kwargs = self.data_provider.get_price.mock_calls[-1]
+        self.assertEqual(args[2], self.end_date - RelativeDelta(days=1))
+        self.assertEqual(args[3], new_end_date)
+
+        expected = self.data_array.loc[self.start_date:new_end_date, self.tickers[:2], self.fields]
+        self.assertTrue(expected.equals(self.prefetching_data_provider.data_bundle))
+
+    def test_extend_tickers_and_start_date(self):
+        new_start_date = datetime(2018, 1, 15)
+        self.prefetching_data_provider.extend(self.tickers[2], start_date=new_start_date)
+
+        self.assertEqual(self.prefetching_data_provider.start_date, new_start_date)
+        self.assertEqual(self.prefetching_data_provider.cached_tickers, frozenset(self.tickers))
+
+        requested_ranges = [(call[1][0], call[1][2], call[1][3]) for call in self.data_provider.get_price.mock_calls]
+        self.assertCountEqual(requested_ranges[1:], [
+            ([self.tickers[2]], new_start_date, self.end_date),
+            (self.tickers[:2], new_start_date, self.start_date)
+        ])
+
+        expected = self.data_array.loc[new_start_date:self.end_date, self.tickers, self.fields]
+        self.assertTrue(expected.equals(self.prefetching_data_provider.data_bundle))
+
+        actual_prices = self.prefetching_data_provider.get_price(self.tickers[2], PriceField.Close, new_start_date,
+                                                                 self.end_date)
+        expected_prices = self.data_array.loc[new_start_date:self.end_date, self.tickers[2], PriceField.Close]
+        self.assertTrue(np.array_equal(expected_prices.values, actual_prices.values))
+
+    def test_extend_within_prefetched_range(self):
+        self.prefetching_data_provider.extend(self.tickers[0], datetime(2018, 2, 5), datetime(2018, 2, 20))
+
+        self.assertEqual(self.data_provider.get_price.call_count, 1)
+        self.assertEqual(self.prefetching_data_provider.start_date, self.start_date)
+        self.assertEqual(self.prefetching_data_provider.end_date, self.end_date)
+
+
+class TestPrefetchingDataProviderExchangeRates(unittest.TestCase):
+    def setUp(self):
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 0, "second": 0, "microsecond": 0})
+
+        self.usd_chf_ticker = BloombergTicker("USDCHF Curncy", SecurityType.FX)
+        self.eur_chf_ticker = BloombergTicker("EURCHF Curncy", SecurityType.FX)
+        self.tickers = [BloombergTicker("MSFT US Equity"), self.usd_chf_ticker, self.eur_chf_ticker]
+        self.fields = [PriceField.Open, PriceField.Close]
+        self.frequency = Frequency.DAILY
+
+        dates = pd.bdate_range(datetime(2018, 1, 1), datetime(2018, 3, 30), name=DATES)
+        rng = np.random.default_rng(2022)
+        values = rng.random((len(dates), len(self.tickers), len(self.fields)))
+        values[rng.random(values.shape[:2]) < 0.3] = np.nan
+        values[[5, 41, 42], :, 1] = np.nan  # only the Open prices are available
+        values[20:30, 1, :] = np.nan  # no rates for more than 7 days
+        self.data_array = QFDataArray.create(dates, self.tickers, self.fields, values)
+
+        self.timer = SettableTimer(datetime(2018, 1, 1))
+        self.preset_data_provider = PresetDataProvider(self.data_array, dates[0], dates[-1], self.frequency,
+                                                       timer=self.timer)
+
+        self.data_provider = Mock(spec=BloombergDataProvider)
+        self.data_provider.get_price.return_value = self.data_array
+        self.data_provider.create_exchange_rate_ticker.side_effect = \
+            lambda base, quote: BloombergTicker(f"{base}{quote} Curncy", SecurityType.FX)
+        self.data_provider.get_exchange_rate_quote_factor.return_value = 1.0
+
+        self.prefetching_data_provider = PrefetchingDataProvider(self.data_provider, self.tickers, self.fields,
+                                                                 dates[0], dates[-1], self.frequency, self.timer)
+
+    def test_exchange_rates_equal_last_available_prices(self):
+        for time in pd.date_range(datetime(2018, 1, 1, 10), datetime(2018, 3, 30, 10), freq="17h"):
+            self.timer.set_current_time(time)
+            for base_currency, ticker in (("USD", self.usd_chf_ticker), ("EUR", self.eur_chf_ticker)):
+                expected_rate = self.preset_data_provider.get_last_available_price(ticker, self.frequency)
+                actual_rate = self.prefetching_data_provider.get_last_available_exchange_rate(
+                    base_currency, "CHF", self.frequency)
+                np.testing.assert_equal(expected_rate, actual_rate)
+
+        self.data_provider.get_last_available_exchange_rate.assert_not_called()
+        self.assertEqual(self.data_provider.get_exchange_rate_quote_factor.call_count, 2)
+
+    def test_exchange_rates_of_not_prefetched_tickers(self):
+        self.data_provider.get_last_available_exchange_rate.return_value = 1.1
+        rate = self.prefetching_data_provider.get_last_available_exchange_rate("GBP", "CHF", self.frequency)
+
+        self.assertEqual(rate, 1.1)
+        self.data_provider.get_last_available_exchange_rate.assert_called_once_with("GBP", "CHF", self.frequency)
+
+    def test_exchange_rates_with_quote_factor(self):
+        self.data_provider.get_exchange_rate_quote_factor.return_value = 100.0
+        self.timer.set_current_time(datetime(2018, 3, 30, 23))
+
+        expected_rate = self.preset_data_provider.get_last_available_price(self.eur_chf_ticker, self.frequency)
+        actual_rate = self.prefetching_data_provider.get_last_available_exchange_rate("EUR", "CHF", self.frequency)
+        self.assertAlmostEqual(expected_rate / 100.0, actual_rate)
+
+    def test_exchange_rates_without_declared_quote_factor(self):
+        self.data_provider.get_exchange_rate_quote_factor.return_value = None
+        self.data_provider.get_last_available_exchange_rate.return_value = 0.9
+
+        for _ in range(2):
+            rate = self.prefetching_data_provider.get_last_available_exchange_rate("EUR", "CHF", self.frequency)
+            self.assertEqual(rate, 0.9)
+
+        self.assertEqual(self.data_provider.get_last_available_exchange_rate.call_count, 2)
+        self.data_provider.get_exchange_rate_quote_factor.assert_called_once_with("EUR", "CHF")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -25,7 +25,7 @@ from qf_lib.documents_utils.excel.write_mode import WriteMode
 class TestExcelExporter(unittest.TestCase):
 
     def setUp(self) -> None:
-        load_workbook_patcher = patch('qf_lib.documents_utils.excel.excel_exporter.load_workbook')
+        load_workbook_patcher = patch('openpyxl.load_workbook')
         self.load_workbook = load_workbook_patcher.start()
         self.addCleanup(load_workbook_patcher.stop)
 
@@ -104,7 +104,7 @@ class TestExcelExporter(unittest.TestCase):
         dirname.assert_called_once_with(file_path)
         makedirs.assert_called_once()
 
-    @patch('qf_lib.documents_utils.excel.excel_exporter.Workbook')
+    @patch('openpyxl.Workbook')
     def test_get_workbook__file_does_not_exist__create(self, workbook):
         excel_exporter = ExcelExporter(Mock())
         file_path = Mock()